@@ -0,0 +1,67 @@
+"""modules table untuk konfigurasi supplier
+
+Revision ID: 3a5a09ce42e1
+Revises: 7572a49c25bf
+Create Date: 2025-08-26 08:41:37.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a5a09ce42e1'
+down_revision: Union[str, Sequence[str], None] = '7572a49c25bf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('modules',
+    sa.Column('moduleid', sa.String(length=32), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('provider', sa.String(length=16), nullable=False),
+    sa.Column('username', sa.String(length=100), nullable=False),
+    sa.Column('msisdn', sa.String(length=20), nullable=False),
+    sa.Column('pin', sa.String(length=255), nullable=False),
+    sa.Column('password', sa.String(length=255), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('base_url', sa.String(length=2048), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('is_deleted_flag', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('deleted_by', sa.String(length=36), nullable=True),
+    sa.Column('created_by', sa.String(length=36), nullable=True),
+    sa.Column('updated_by', sa.String(length=36), nullable=True),
+    sa.PrimaryKeyConstraint('moduleid')
+    )
+    op.create_index(op.f('ix_modules_created_at'), 'modules', ['created_at'], unique=False)
+    op.create_index(op.f('ix_modules_created_by'), 'modules', ['created_by'], unique=False)
+    op.create_index(op.f('ix_modules_deleted_at'), 'modules', ['deleted_at'], unique=False)
+    op.create_index(op.f('ix_modules_deleted_by'), 'modules', ['deleted_by'], unique=False)
+    op.create_index(op.f('ix_modules_is_active'), 'modules', ['is_active'], unique=False)
+    op.create_index(op.f('ix_modules_is_deleted_flag'), 'modules', ['is_deleted_flag'], unique=False)
+    op.create_index(op.f('ix_modules_moduleid'), 'modules', ['moduleid'], unique=True)
+    op.create_index(op.f('ix_modules_provider'), 'modules', ['provider'], unique=False)
+    op.create_index(op.f('ix_modules_updated_at'), 'modules', ['updated_at'], unique=False)
+    op.create_index(op.f('ix_modules_updated_by'), 'modules', ['updated_by'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_modules_updated_by'), table_name='modules')
+    op.drop_index(op.f('ix_modules_updated_at'), table_name='modules')
+    op.drop_index(op.f('ix_modules_provider'), table_name='modules')
+    op.drop_index(op.f('ix_modules_moduleid'), table_name='modules')
+    op.drop_index(op.f('ix_modules_is_deleted_flag'), table_name='modules')
+    op.drop_index(op.f('ix_modules_is_active'), table_name='modules')
+    op.drop_index(op.f('ix_modules_deleted_by'), table_name='modules')
+    op.drop_index(op.f('ix_modules_deleted_at'), table_name='modules')
+    op.drop_index(op.f('ix_modules_created_by'), table_name='modules')
+    op.drop_index(op.f('ix_modules_created_at'), table_name='modules')
+    op.drop_table('modules')
@@ -0,0 +1,49 @@
+"""member balances dan ledger entries
+
+Revision ID: 5c1d9e2a7b40
+Revises: 7af4e08bb127
+Create Date: 2025-08-28 09:41:17.203114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1d9e2a7b40'
+down_revision: Union[str, Sequence[str], None] = '7af4e08bb127'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('member_balances',
+    sa.Column('memberid', sa.String(length=32), nullable=False),
+    sa.Column('balance', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.CheckConstraint('balance >= 0', name='ck_member_balance'),
+    sa.PrimaryKeyConstraint('memberid')
+    )
+    op.create_table('ledger_entries',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('memberid', sa.String(length=32), nullable=False),
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('amount', sa.BigInteger(), nullable=False),
+    sa.Column('balance_after', sa.BigInteger(), nullable=False),
+    sa.Column('ref', sa.String(length=64), nullable=True),
+    sa.Column('note', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('ref')
+    )
+    op.create_index('ix_ledger_member_created', 'ledger_entries', ['memberid', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ledger_member_created', table_name='ledger_entries')
+    op.drop_table('ledger_entries')
+    op.drop_table('member_balances')
@@ -0,0 +1,99 @@
+"""inbox, transactions dan outbox dengan lease
+
+Revision ID: 7572a49c25bf
+Revises: f98f8488dbbf
+Create Date: 2025-08-25 10:02:11.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7572a49c25bf'
+down_revision: Union[str, Sequence[str], None] = 'f98f8488dbbf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('inbox',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('request_id', sa.String(length=64), nullable=False),
+    sa.Column('memberid', sa.String(length=32), nullable=True),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_inbox_created_at'), 'inbox', ['created_at'], unique=False)
+    op.create_index(op.f('ix_inbox_memberid'), 'inbox', ['memberid'], unique=False)
+    op.create_index(op.f('ix_inbox_request_id'), 'inbox', ['request_id'], unique=True)
+    op.create_index(op.f('ix_inbox_status'), 'inbox', ['status'], unique=False)
+    op.create_table('transactions',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('inbox_id', sa.Integer(), nullable=True),
+    sa.Column('memberid', sa.String(length=32), nullable=True),
+    sa.Column('refid', sa.String(length=64), nullable=True),
+    sa.Column('product', sa.String(length=32), nullable=True),
+    sa.Column('dest', sa.String(length=32), nullable=True),
+    sa.Column('moduleid', sa.String(length=32), nullable=True),
+    sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=True),
+    sa.Column('sn', sa.String(length=128), nullable=True),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['inbox_id'], ['inbox.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_transactions_member_refid', 'transactions', ['memberid', 'refid'], unique=False)
+    op.create_index(op.f('ix_transactions_created_at'), 'transactions', ['created_at'], unique=False)
+    op.create_index(op.f('ix_transactions_inbox_id'), 'transactions', ['inbox_id'], unique=False)
+    op.create_index(op.f('ix_transactions_moduleid'), 'transactions', ['moduleid'], unique=False)
+    op.create_index(op.f('ix_transactions_product'), 'transactions', ['product'], unique=False)
+    op.create_index(op.f('ix_transactions_status'), 'transactions', ['status'], unique=False)
+    op.create_table('outbox',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('transaction_id', sa.Integer(), nullable=True),
+    sa.Column('moduleid', sa.String(length=32), nullable=False),
+    sa.Column('supplier_request', sa.JSON(), nullable=True),
+    sa.Column('supplier_response', sa.JSON(), nullable=True),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('claimed_by', sa.String(length=64), nullable=True),
+    sa.Column('lease_expires_at', sa.Float(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.String(length=512), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['transaction_id'], ['transactions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_status_lease', 'outbox', ['status', 'lease_expires_at'], unique=False)
+    op.create_index(op.f('ix_outbox_created_at'), 'outbox', ['created_at'], unique=False)
+    op.create_index(op.f('ix_outbox_moduleid'), 'outbox', ['moduleid'], unique=False)
+    op.create_index(op.f('ix_outbox_transaction_id'), 'outbox', ['transaction_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_outbox_transaction_id'), table_name='outbox')
+    op.drop_index(op.f('ix_outbox_moduleid'), table_name='outbox')
+    op.drop_index(op.f('ix_outbox_created_at'), table_name='outbox')
+    op.drop_index('ix_outbox_status_lease', table_name='outbox')
+    op.drop_table('outbox')
+    op.drop_index(op.f('ix_transactions_status'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_product'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_moduleid'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_inbox_id'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_created_at'), table_name='transactions')
+    op.drop_index('ix_transactions_member_refid', table_name='transactions')
+    op.drop_table('transactions')
+    op.drop_index(op.f('ix_inbox_status'), table_name='inbox')
+    op.drop_index(op.f('ix_inbox_request_id'), table_name='inbox')
+    op.drop_index(op.f('ix_inbox_memberid'), table_name='inbox')
+    op.drop_index(op.f('ix_inbox_created_at'), table_name='inbox')
+    op.drop_table('inbox')
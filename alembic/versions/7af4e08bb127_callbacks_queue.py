@@ -0,0 +1,52 @@
+"""callbacks queue untuk delivery report ke member
+
+Revision ID: 7af4e08bb127
+Revises: 3a5a09ce42e1
+Create Date: 2025-08-26 10:12:05.418233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7af4e08bb127'
+down_revision: Union[str, Sequence[str], None] = '3a5a09ce42e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('callbacks',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('memberid', sa.String(length=32), nullable=False),
+    sa.Column('refid', sa.String(length=64), nullable=False),
+    sa.Column('transaction_id', sa.Integer(), nullable=True),
+    sa.Column('report_url', sa.String(length=2048), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('coalesced', sa.Integer(), nullable=False),
+    sa.Column('enqueued_at', sa.Float(), nullable=False),
+    sa.Column('next_attempt_at', sa.Float(), nullable=False),
+    sa.Column('claimed_by', sa.String(length=64), nullable=True),
+    sa.Column('lease_expires_at', sa.Float(), nullable=True),
+    sa.Column('delivered_at', sa.Float(), nullable=True),
+    sa.Column('last_error', sa.String(length=512), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_callbacks_due', 'callbacks', ['status', 'next_attempt_at'], unique=False)
+    op.create_index('ix_callbacks_member_refid', 'callbacks', ['memberid', 'refid'], unique=False)
+    op.create_index(op.f('ix_callbacks_created_at'), 'callbacks', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_callbacks_created_at'), table_name='callbacks')
+    op.drop_index('ix_callbacks_member_refid', table_name='callbacks')
+    op.drop_index('ix_callbacks_due', table_name='callbacks')
+    op.drop_table('callbacks')
@@ -0,0 +1,49 @@
+"""config versions
+
+Revision ID: a1f3c8e92d47
+Revises: e4a7c9d15f62
+Create Date: 2025-08-31 09:12:05.604218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1f3c8e92d47'
+down_revision: Union[str, Sequence[str], None] = 'e4a7c9d15f62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+WATCHED_TABLES = ('members', 'modules')
+ACTIONS = ('INSERT', 'UPDATE', 'DELETE')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('config_versions',
+    sa.Column('name', sa.String(length=32), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    for table in WATCHED_TABLES:
+        op.execute(
+            f"INSERT OR IGNORE INTO config_versions (name, version) VALUES ('{table}', 0)"
+        )
+        for action in ACTIONS:
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table}_config_{action.lower()} "
+                f"AFTER {action} ON {table} BEGIN "
+                f"UPDATE config_versions SET version = version + 1 WHERE name = '{table}'; "
+                "END"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in WATCHED_TABLES:
+        for action in ACTIONS:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_config_{action.lower()}")
+    op.drop_table('config_versions')
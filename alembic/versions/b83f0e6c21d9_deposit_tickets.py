@@ -0,0 +1,45 @@
+"""deposit tickets
+
+Revision ID: b83f0e6c21d9
+Revises: 5c1d9e2a7b40
+Create Date: 2025-08-29 14:06:52.771930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b83f0e6c21d9'
+down_revision: Union[str, Sequence[str], None] = '5c1d9e2a7b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('deposit_tickets',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('memberid', sa.String(length=32), nullable=False),
+    sa.Column('amount', sa.BigInteger(), nullable=False),
+    sa.Column('unique_code', sa.Integer(), nullable=False),
+    sa.Column('transfer_amount', sa.BigInteger(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('payment_ref', sa.String(length=64), nullable=True),
+    sa.Column('expires_at', sa.Float(), nullable=False),
+    sa.Column('paid_at', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('payment_ref')
+    )
+    op.create_index('uq_deposit_pending_transfer_amount', 'deposit_tickets', ['transfer_amount'], unique=True, sqlite_where=sa.text("status = 'pending'"))
+    op.create_index('ix_deposit_member_created', 'deposit_tickets', ['memberid', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_deposit_member_created', table_name='deposit_tickets')
+    op.drop_index('uq_deposit_pending_transfer_amount', table_name='deposit_tickets')
+    op.drop_table('deposit_tickets')
@@ -0,0 +1,43 @@
+"""callbacks: satu row pending per (memberid, refid)
+
+Revision ID: c7d2e4f81a93
+Revises: a1f3c8e92d47
+Create Date: 2025-09-02 08:41:17.203554
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e4f81a93'
+down_revision: Union[str, Sequence[str], None] = 'a1f3c8e92d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # duplikat pending yang sudah ada: hanya row terbaru per key yang dipertahankan
+    op.execute(
+        "UPDATE callbacks SET status = 'superseded' "
+        "WHERE status = 'pending' AND EXISTS ("
+        "SELECT 1 FROM callbacks AS newer "
+        "WHERE newer.memberid = callbacks.memberid "
+        "AND newer.refid = callbacks.refid "
+        "AND newer.status = 'pending' AND newer.id > callbacks.id)"
+    )
+    op.create_index(
+        'uq_callbacks_pending',
+        'callbacks',
+        ['memberid', 'refid'],
+        unique=True,
+        sqlite_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_callbacks_pending', table_name='callbacks')
@@ -0,0 +1,34 @@
+"""member admission limits
+
+Revision ID: e4a7c9d15f62
+Revises: b83f0e6c21d9
+Create Date: 2025-08-30 10:22:41.518306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c9d15f62'
+down_revision: Union[str, Sequence[str], None] = 'b83f0e6c21d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('members', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('max_inflight', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('rate_limit', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('rate_burst', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('members', schema=None) as batch_op:
+        batch_op.drop_column('rate_burst')
+        batch_op.drop_column('rate_limit')
+        batch_op.drop_column('max_inflight')
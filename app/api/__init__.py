@@ -1,4 +1,4 @@
-from app.api.v1 import user_router
+from app.api.v1 import admin_router, otomax_router, user_router
 from app.mlogg import logger
 
 
@@ -7,4 +7,6 @@ def register_routers(app):  # noqa: ANN001
     # app.include_router(member_router, dependencies=[Depends(get_current_user)])
     # app.include_router(module_router, dependencies=[Depends(get_current_user)])
     app.include_router(user_router)
+    app.include_router(admin_router)
+    app.include_router(otomax_router)
     logger.info("Routers registered successfully")
@@ -1,3 +1,5 @@
+from app.api.v1.rtr_admin import router as admin_router
+from app.api.v1.rtr_otomax import router as otomax_router
 from app.api.v1.rtr_user import router as user_router
 
-__all__ = ["user_router"]
+__all__ = ["admin_router", "otomax_router", "user_router"]
@@ -1,12 +1,28 @@
 """Admin router: user CRUD, hanya bisa diakses admin."""
 
+import tempfile
+from datetime import date, datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from app.deps.deps_security import DepCurrentAdmin
 from app.deps.deps_service import get_user_crud_service
+from app.parser import supplier_rules
+from app.schemas.sch_archive import ArchiveRunResult, TransactionRecord
+from app.schemas.sch_bulk_load import BulkFormat, BulkLoadKind, BulkLoadReport
+from app.schemas.sch_config_watch import ConfigReloadResult, ConfigWatchState
+from app.schemas.sch_deposit import DepositConfirmResult, DepositPayment
+from app.schemas.sch_load import LoadSnapshot
+from app.schemas.sch_module import ModuleHealth
+from app.schemas.sch_report import ReportFormat
 from app.schemas.sch_user import UserCreate, UserResponse
+from app.service.admission import load_shedder, member_admission
+from app.service.metrics import metrics
+from app.service.reply import reply_templates
+from app.service.routing import module_scorer, routing
+from app.service.supplier import module_guards
 from app.service.user import UserCrudService
 
 router = APIRouter(
@@ -14,6 +30,9 @@ router = APIRouter(
     tags=["Admin"],
 )
 
+# body upload bulk load di-spool ke memory sampai batas ini, lebih dari itu ke disk
+_BULK_SPOOL_BYTES = 8 * 1024 * 1024
+
 
 @router.post("/user", response_model=UserResponse, status_code=201)
 async def create_user_by_admin(
@@ -40,3 +59,162 @@ async def create_user_by_admin(
         ) from e
     else:
         return user
+
+
+@router.get("/metrics")
+async def read_metrics(current_admin: DepCurrentAdmin):  # noqa: ARG001
+    """Snapshot metrics in-process (counter, gauge, latency p50/p95/p99)."""
+    return metrics.snapshot()
+
+
+@router.get("/modules/health", response_model=list[ModuleHealth])
+async def read_modules_health(current_admin: DepCurrentAdmin):  # noqa: ARG001
+    """State circuit breaker dan adaptive concurrency limit tiap module."""
+    return module_guards.snapshot()
+
+
+@router.get("/load", response_model=LoadSnapshot)
+async def read_load_state(current_admin: DepCurrentAdmin):  # noqa: ARG001
+    """Level load shedding dan nilai tiap sinyal (queue, loop lag, DB wait)."""
+    return load_shedder.snapshot()
+
+
+@router.get("/members/admission")
+async def read_member_admission(current_admin: DepCurrentAdmin):  # noqa: ARG001
+    """In-flight, limit dan sisa token rate limit tiap member."""
+    return member_admission.snapshot()
+
+
+@router.get("/config", response_model=ConfigWatchState)
+async def read_config_state(
+    request: Request,
+    current_admin: DepCurrentAdmin,  # noqa: ARG001
+):
+    """Versi snapshot member / module yang sedang dipakai + hasil reload terakhir."""
+    return request.app.state.config_watcher.snapshot()
+
+
+@router.post("/config/reload", response_model=ConfigReloadResult)
+async def reload_config(
+    request: Request,
+    current_admin: DepCurrentAdmin,  # noqa: ARG001
+):
+    """Paksa baca ulang member / module dari DB lalu swap snapshot tanpa restart."""
+    return await request.app.state.config_watcher.reload()
+
+
+@router.post("/archive/run", response_model=ArchiveRunResult)
+async def run_archiver(
+    request: Request,
+    current_admin: DepCurrentAdmin,  # noqa: ARG001
+):
+    """Arsipkan transaksi final yang melewati `ARCHIVE_AFTER_DAYS` sekarang."""
+    return await request.app.state.archiver.run_once()
+
+
+@router.get("/transactions/history", response_model=list[TransactionRecord])
+async def read_transaction_history(
+    request: Request,
+    current_admin: DepCurrentAdmin,  # noqa: ARG001
+    memberid: Annotated[str, Query(description="ID member")],
+    refid: Annotated[str | None, Query(description="Ref ID transaksi")] = None,
+    since: Annotated[datetime | None, Query(description="created_at >= (UTC)")] = None,
+    until: Annotated[datetime | None, Query(description="created_at < (UTC)")] = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+):
+    """Riwayat transaksi member dari tabel aktif + file arsip bulanan."""
+    return await request.app.state.trx_history.history(
+        memberid, refid=refid, since=since, until=until, limit=limit
+    )
+
+
+@router.get("/reports/reconciliation")
+async def reconciliation_report(
+    request: Request,
+    current_admin: DepCurrentAdmin,  # noqa: ARG001
+    day: Annotated[
+        date, Query(description="Tanggal laporan (zona RECON_UTC_OFFSET_HOURS)")
+    ],
+    fmt: Annotated[
+        ReportFormat, Query(alias="format", description="Format laporan")
+    ] = ReportFormat.CSV,
+):
+    """Rekonsiliasi harian per member / module (count, amount, gagal, refund)."""
+    report = await request.app.state.reconciliation.build(day)
+    media_type = "text/csv" if fmt is ReportFormat.CSV else "application/x-ndjson"
+    filename = f"reconciliation_{day.isoformat()}.{fmt.value}"
+    return StreamingResponse(
+        report.iter_lines(fmt),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/bulk/{kind}", response_model=BulkLoadReport)
+async def bulk_load(
+    kind: BulkLoadKind,
+    request: Request,
+    current_admin: DepCurrentAdmin,
+    fmt: Annotated[
+        BulkFormat, Query(alias="format", description="Format body file")
+    ] = BulkFormat.YAML,
+    dry_run: Annotated[
+        bool, Query(description="Validasi + report saja, tanpa menulis DB")
+    ] = False,
+):
+    """Upsert member / module dari body file (YAML, CSV, NDJSON).
+
+    Body dibaca streaming ke spool file, lalu di-parse dan di-upsert per batch;
+    row duplikat / invalid dilaporkan tanpa membatalkan row lain.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=_BULK_SPOOL_BYTES) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        return await request.app.state.bulk_loader.load_bytes(
+            kind, spool, fmt, dry_run=dry_run, actor=str(current_admin.id)
+        )
+
+
+@router.post("/deposits/confirm", response_model=DepositConfirmResult)
+async def confirm_deposits(
+    payments: list[DepositPayment],
+    request: Request,
+    current_admin: DepCurrentAdmin,  # noqa: ARG001
+):
+    """Konfirmasi pembayaran deposit (mutasi bank) dalam satu batch.
+
+    Tiket yang cocok ditandai lunas dan saldo member di-credit; pembayaran
+    yang dikirim ulang dilaporkan `duplicate` tanpa menambah saldo.
+    """
+    return await request.app.state.deposits.confirm(payments)
+
+
+@router.post("/replies/reload")
+async def reload_reply_templates(current_admin: DepCurrentAdmin):  # noqa: ARG001
+    """Compile ulang template reply member dari file YAML tanpa restart."""
+    count = reply_templates.load()
+    return {"templates": count, "names": reply_templates.names()}
+
+
+@router.get("/parser/rules")
+async def read_supplier_rule_stats(current_admin: DepCurrentAdmin):  # noqa: ARG001
+    """Hit counter tiap rule parser supplier, plus daftar rule yang belum pernah match."""
+    return {"rules": supplier_rules.stats(), "dead": supplier_rules.dead_rules()}
+
+
+@router.post("/routing/reload")
+async def reload_routing_table(current_admin: DepCurrentAdmin):  # noqa: ARG001
+    """Bangun ulang tabel prefix operator dari YAML lalu swap tanpa restart."""
+    table = routing.load()
+    return {"prefixes": table.trie.size, "operators": sorted(table.operators)}
+
+
+@router.get("/routing/decide")
+async def explain_module_decision(
+    current_admin: DepCurrentAdmin,  # noqa: ARG001
+    dest: Annotated[str, Query(description="Nomor / ID tujuan")],
+    product: Annotated[str, Query(description="Kode produk")],
+):
+    """Simulasi pemilihan module untuk dest + produk, lengkap dengan skor tiap kandidat."""
+    return module_scorer.select(dest, product).as_dict()
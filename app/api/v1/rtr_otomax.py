@@ -0,0 +1,165 @@
+"""Endpoint transaksi OtomaX (GET query-string / POST form), cek saldo, tiket deposit.
+
+Urutan hot path: parse bytes mentah -> coalescing (memberid, refid) ->
+load shedding global -> admission per member (memori saja) -> intake (DB).
+Request yang ditolak shedder / melewati limit member langsung dibalas
+template `busy` tanpa menyentuh DB. Retry
+OtomaX yang datang selama request asli masih diproses tidak memproses ulang:
+menunggu dan menerima balasan yang sama. Cek saldo lewat jalur yang sama
+(coalescing -> shedder -> admission), saldo dibaca dari cache ledger
+(`LedgerService.balance`) sehingga polling beruntun tidak menjadi query per
+request. Semua balasan berupa template reply OtomaX.
+"""
+
+import time
+from typing import Annotated, Any, NamedTuple
+
+from fastapi import APIRouter, Query, Request, Response
+
+from app.custom.cst_singleflight import SingleFlight
+from app.custom.exceptions.cst_exceptions import (
+    DataNotFoundError,
+    RequestParseError,
+    SignatureInvalidError,
+)
+from app.parser import OtomaxRequest, parse_otomax_request
+from app.schemas.sch_deposit import DepositTicketPublic
+from app.schemas.sch_member import AdmissionVerdict
+from app.service.admission import load_shedder, member_admission
+from app.service.metrics import metrics
+from app.service.reply import reply_templates
+from app.service.transaction import TransactionIntake
+
+router = APIRouter(
+    prefix="/api/v1/otomax",
+    tags=["OtomaX"],
+)
+
+MEMBER_UNKNOWN = "Member tidak terdaftar"
+# produk prioritas shedding untuk cek saldo (lihat SHED_LOW_PRIORITY_PRODUCTS)
+BALANCE_PRODUCT = "CEKSALDO"
+SIGN_INVALID = "Signature tidak valid"
+
+
+class Reply(NamedTuple):
+    template: str
+    values: dict[str, Any]
+
+
+# (memberid, refid, raw request) -> proses yang sedang berjalan; hanya retry
+# OtomaX yang identik (sign ikut di raw) menunggu hasil request asli, request
+# dengan isi / sign berbeda tetap diproses (dan diverifikasi) sendiri
+trx_inflight: SingleFlight[tuple[str, str, bytes], Reply] = SingleFlight()
+# (memberid, sign) -> cek saldo yang sedang berjalan; polling konkuren berbagi
+balance_inflight: SingleFlight[tuple[str, str], Reply] = SingleFlight()
+
+
+def _reject(memberid: str, product: str, values: dict[str, Any]) -> Reply | None:
+    """Load shedding + admission member; Reply kalau request ditolak.
+
+    Kalau diterima (None), caller wajib `member_admission.release(memberid)`.
+    """
+    if not load_shedder.admit(load_shedder.priority_of(product)):
+        return Reply("busy", values)
+    verdict = member_admission.admit(memberid)
+    if verdict is not AdmissionVerdict.ADMITTED:
+        if verdict is AdmissionVerdict.UNKNOWN_MEMBER:
+            return Reply("error", {**values, "message": MEMBER_UNKNOWN})
+        return Reply("busy", values)
+    return None
+
+
+async def _process(intake: TransactionIntake, trx: OtomaxRequest, now: str) -> Reply:
+    values = {
+        "refid": trx.refid,
+        "memberid": trx.memberid,
+        "product": trx.product,
+        "dest": trx.dest,
+        "time": now,
+    }
+    rejected = _reject(trx.memberid, trx.product, values)
+    if rejected is not None:
+        return rejected
+    try:
+        with load_shedder.track():
+            await intake.accept(trx)
+    except DataNotFoundError:
+        return Reply("error", {**values, "message": MEMBER_UNKNOWN})
+    except SignatureInvalidError:
+        return Reply("error", {**values, "message": SIGN_INVALID})
+    finally:
+        member_admission.release(trx.memberid)
+    return Reply("received", values)
+
+
+@router.api_route("/trx", methods=["GET", "POST"], response_class=Response)
+async def otomax_trx(request: Request) -> Response:
+    """Terima request transaksi OtomaX dan balas dengan template reply."""
+    raw = (
+        request.scope["query_string"]
+        if request.method == "GET"
+        else await request.body()
+    )
+    now = time.strftime("%H:%M:%S")
+    try:
+        trx = parse_otomax_request(raw)
+    except RequestParseError as e:
+        return reply_templates.response(
+            "error", {"refid": "", "message": e.message, "time": now}
+        )
+    key = (trx.memberid.upper(), trx.refid, raw)
+    if key in trx_inflight:
+        metrics.inc("trx_coalesced")
+    reply = await trx_inflight.do(
+        key, lambda: _process(request.app.state.trx_intake, trx, now)
+    )
+    return reply_templates.response(reply.template, reply.values)
+
+
+async def _check_balance(
+    request: Request, memberid: str, sign: str | None, now: str
+) -> Reply:
+    values: dict[str, Any] = {"memberid": memberid, "refid": "", "time": now}
+    rejected = _reject(memberid, BALANCE_PRODUCT, values)
+    if rejected is not None:
+        return rejected
+    state = request.app.state
+    try:
+        with load_shedder.track():
+            member = await state.trx_intake.verify_balance_check(memberid, sign)
+            balance = await state.ledger.balance(member)
+    except DataNotFoundError:
+        return Reply("error", {**values, "message": MEMBER_UNKNOWN})
+    except SignatureInvalidError:
+        return Reply("error", {**values, "message": SIGN_INVALID})
+    finally:
+        member_admission.release(memberid)
+    return Reply("balance", {**values, "memberid": member, "balance": balance})
+
+
+@router.get("/balance", response_class=Response)
+async def otomax_balance(
+    request: Request,
+    memberid: Annotated[str, Query(alias="memberID", min_length=1, max_length=32)],
+    sign: Annotated[str | None, Query(description="Sign cek saldo")] = None,
+) -> Response:
+    """Cek saldo member, dibalas dengan template reply `balance`."""
+    now = time.strftime("%H:%M:%S")
+    key = (memberid.upper(), sign or "")
+    if key in balance_inflight:
+        metrics.inc("balance_coalesced")
+    reply = await balance_inflight.do(
+        key, lambda: _check_balance(request, memberid, sign, now)
+    )
+    return reply_templates.response(reply.template, reply.values)
+
+
+@router.get("/deposit", response_model=DepositTicketPublic)
+async def otomax_deposit_ticket(
+    request: Request,
+    memberid: Annotated[str, Query(alias="memberID", min_length=1, max_length=32)],
+    amount: Annotated[int, Query(gt=0, description="Nominal deposit (rupiah)")],
+    sign: Annotated[str | None, Query(description="Sign tiket deposit")] = None,
+):
+    """Buat tiket deposit; member mentransfer `transfer_amount` (nominal + kode unik)."""
+    return await request.app.state.deposits.create_ticket(memberid, amount, sign=sign)
@@ -13,6 +13,7 @@ import os
 from functools import lru_cache
 from pathlib import Path
 
+from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -43,6 +44,174 @@ class Settings(BaseSettings):
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int
     DB_URL: str = "sqlite+aiosqlite:///./mkit.db"
 
+    # Deadline per request (OtomaX berhenti menunggu setelah timeout tetap)
+    REQUEST_DEADLINE_SECONDS: float = 25.0
+    REQUEST_DEADLINE_HEADER: str = "X-Request-Timeout"
+    # prefix path job admin panjang (bukan request OtomaX) tanpa deadline
+    REQUEST_DEADLINE_EXEMPT_PATHS: list[str] = ["/api/v1/admin/bulk/"]
+
+    # Outbox dispatcher
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_LEASE_SECONDS: float = 30.0
+    OUTBOX_MAX_ATTEMPTS: int = 3
+    OUTBOX_MODULE_CONCURRENCY: int = 8
+    OUTBOX_IDLE_INTERVAL: float = 0.5
+    OUTBOX_DISPATCHER_ENABLED: bool = True
+
+    # Supplier HTTP clients (satu pool per module)
+    SUPPLIER_MAX_CONNECTIONS: int = 50
+    SUPPLIER_MAX_KEEPALIVE: int = 20
+    SUPPLIER_KEEPALIVE_EXPIRY: float = 60.0
+    SUPPLIER_HTTP2: bool = False
+    SUPPLIER_CONNECT_TIMEOUT: float = 3.0
+    SUPPLIER_READ_TIMEOUT: float = 30.0
+    SUPPLIER_WRITE_TIMEOUT: float = 5.0
+    SUPPLIER_POOL_TIMEOUT: float = 2.0
+    SUPPLIER_PRIME_ON_STARTUP: bool = True
+    # client lama (base_url module berubah) ditutup setelah request jalan selesai,
+    # paling lama menunggu DRAIN_TIMEOUT
+    SUPPLIER_CLIENT_DRAIN_TIMEOUT: float = 35.0
+
+    # Circuit breaker & AIMD concurrency limiter per module
+    BREAKER_WINDOW_SECONDS: int = 10
+    BREAKER_MIN_REQUESTS: int = 20
+    BREAKER_ERROR_RATE: float = 0.5
+    BREAKER_OPEN_SECONDS: float = 15.0
+    BREAKER_HALF_OPEN_PROBES: int = 3
+    AIMD_INITIAL_LIMIT: int = 16
+    AIMD_MIN_LIMIT: int = 1
+    AIMD_MAX_LIMIT: int = 64
+    AIMD_TARGET_LATENCY: float = 2.0
+    AIMD_BACKOFF: float = 0.7
+    GUARD_EWMA_ALPHA: float = 0.2
+
+    # Admission control per member di endpoint transaksi (default kalau kolom
+    # limit di row Member NULL); rate 0 = tanpa rate limit
+    MEMBER_MAX_INFLIGHT: int = 20
+    MEMBER_RATE_LIMIT: float = 10.0
+    MEMBER_RATE_BURST: int = 20
+
+    # Load shedding global: soft = tolak prioritas rendah, hard = tolak semua
+    # kerja baru. Turun level setelah sinyal < threshold * SHED_RECOVERY_RATIO
+    SHED_ENABLED: bool = True
+    SHED_SAMPLE_INTERVAL: float = 0.1
+    SHED_QUEUE_SOFT: int = 200
+    SHED_QUEUE_HARD: int = 500
+    SHED_BACKLOG_INTERVAL: float = 1.0
+    SHED_LOOP_LAG_SOFT: float = 0.1
+    SHED_LOOP_LAG_HARD: float = 0.5
+    SHED_DB_WAIT_SOFT: float = 0.2
+    SHED_DB_WAIT_HARD: float = 1.0
+    SHED_RECOVERY_RATIO: float = 0.8
+    SHED_EWMA_ALPHA: float = 0.3
+    SHED_LOW_PRIORITY_PRODUCTS: list[str] = [
+        "CEKSALDO",
+        "INQPLN",
+        "INQPDAM",
+        "INQBPJS",
+    ]
+
+    # Hedged request untuk produk idempotent (inquiry / cek saldo)
+    HEDGE_ENABLED: bool = True
+    HEDGE_IDEMPOTENT_PRODUCTS: list[str] = ["CEKSALDO", "INQPLN", "INQPDAM", "INQBPJS"]
+    HEDGE_BUDGET_RATIO: float = 0.1
+    HEDGE_BUDGET_BURST: float = 5.0
+    HEDGE_MIN_SAMPLES: int = 20
+    HEDGE_DEFAULT_DELAY: float = 1.0
+    HEDGE_MIN_DELAY: float = 0.05
+    HEDGE_DELAY_REFRESH: float = 1.0
+
+    # Callback delivery ke Member.report_url
+    CALLBACK_ENGINE_ENABLED: bool = True
+    CALLBACK_BATCH_SIZE: int = 100
+    CALLBACK_LEASE_SECONDS: float = 30.0
+    CALLBACK_MAX_ATTEMPTS: int = 8
+    CALLBACK_BACKOFF_BASE: float = 2.0
+    CALLBACK_BACKOFF_MAX: float = 300.0
+    CALLBACK_HOST_CONCURRENCY: int = 4
+    CALLBACK_TIMEOUT: float = 10.0
+    CALLBACK_IDLE_INTERVAL: float = 0.5
+    CALLBACK_HTTP_METHOD: str = "GET"
+
+    # Timer wheel timeout transaksi pending (status check + final timeout)
+    TIMEOUT_SCHEDULER_ENABLED: bool = True
+    TIMER_WHEEL_TICK: float = 0.1
+    TIMER_WHEEL_SLOTS: int = 256
+    TIMER_WHEEL_LEVELS: int = 4
+    TRX_PENDING_TIMEOUT: float = 1800.0
+
+    # Status poller transaksi pending (interval makin panjang seiring umur)
+    POLLER_ENABLED: bool = True
+    POLLER_FIRST_CHECK: float = 15.0
+    POLLER_BASE_INTERVAL: float = 15.0
+    POLLER_MAX_INTERVAL: float = 300.0
+    POLLER_AGE_FACTOR: float = 0.25
+    POLLER_ALIGN_SECONDS: float = 5.0
+    POLLER_MODULE_CONCURRENCY: int = 4
+
+    # Cache saldo member untuk cek saldo (TTL pendek + singleflight)
+    BALANCE_CACHE_TTL: float = 2.0
+    BALANCE_CACHE_MAX_ENTRIES: int = 10000
+
+    # Tiket deposit: nominal transfer = nominal + kode unik 1..UNIQUE_CODE_MAX
+    DEPOSIT_TICKET_TTL: float = 86400.0
+    DEPOSIT_MIN_AMOUNT: int = 10000
+    DEPOSIT_MAX_AMOUNT: int = 50_000_000
+    DEPOSIT_UNIQUE_CODE_MAX: int = 999
+
+    # Bulk loader member / module (YAML, CSV, NDJSON); REPORT_LIMIT membatasi
+    # jumlah row duplikat / invalid yang dicantumkan di report
+    BULK_LOAD_BATCH_SIZE: int = 1000
+    BULK_LOAD_REPORT_LIMIT: int = 200
+
+    # Hot reload member / module: poll PRAGMA data_version + tabel config_versions
+    # (trigger); CONFIG_SYNC_YAML = upsert file YAML ke DB saat mtime berubah
+    CONFIG_WATCH_ENABLED: bool = True
+    CONFIG_WATCH_INTERVAL: float = 1.0
+    CONFIG_SYNC_YAML: bool = False
+    MEMBERS_YAML_PATH: Path = BASE_DIR / "members.yaml"
+    MODULES_YAML_PATH: Path = BASE_DIR / "modules.yaml"
+
+    # Vault kredensial member / module: pin & password dienkripsi (Fernet) di
+    # DB; key diturunkan sekali saat startup (scrypt). Master key kosong =
+    # vault nonaktif, kredensial disimpan plaintext seperti sebelumnya
+    VAULT_MASTER_KEY: SecretStr | None = None
+    VAULT_KDF_SALT: str = "mkit-finalapiparser-vault"
+    VAULT_KDF_COST: int = 2**15
+
+    # Arsip bulanan transaksi final (+ outbox / inbox) lebih tua dari AFTER_DAYS
+    # ke ARCHIVE_DIR/transactions_YYYY_MM.db, per batch kecil dengan jeda
+    ARCHIVE_ENABLED: bool = False
+    ARCHIVE_DIR: Path = BASE_DIR / "archive"
+    ARCHIVE_AFTER_DAYS: int = 90
+    ARCHIVE_BATCH_SIZE: int = 500
+    ARCHIVE_BATCH_PAUSE: float = 0.05
+    ARCHIVE_INTERVAL: float = 3600.0
+    ARCHIVE_ATTACH_LIMIT: int = 8
+
+    # Laporan rekonsiliasi harian per member / module: agregasi per batch id
+    # (RECON_BATCH_SIZE row), batas hari di zona UTC+RECON_UTC_OFFSET_HOURS
+    # (offset tetap, default WIB; tanpa tzdata)
+    RECON_BATCH_SIZE: int = 5000
+    RECON_UTC_OFFSET_HOURS: float = 7.0
+
+    # Template reply ke member OtomaX (hot reload via cek mtime)
+    REPLY_TEMPLATES_PATH: Path = BASE_DIR / "replies.yaml"
+    REPLY_RELOAD_INTERVAL: float = 2.0
+
+    # Rule engine parser response supplier
+    SUPPLIER_RULES_PATH: Path = BASE_DIR / "supplier_rules.yaml"
+
+    # Routing dest -> operator -> module
+    ROUTING_TABLE_PATH: Path = BASE_DIR / "routing.yaml"
+
+    # Scorer pemilihan module (bobot komponen skor)
+    SCORER_W_SUCCESS: float = 1.0
+    SCORER_W_LATENCY: float = 0.3
+    SCORER_W_LOAD: float = 0.2
+    SCORER_W_COST: float = 0.5
+    SCORER_SUCCESS_PRIOR: int = 5
+
 
 @lru_cache
 def get_settings(_env_file: str | Path | None = None) -> Settings:
@@ -0,0 +1,94 @@
+"""Deadline per request yang ikut terbawa sampai DB dan panggilan supplier.
+
+OtomaX berhenti menunggu setelah timeout tetap; pekerjaan setelah itu hanya
+membakar kapasitas. Deadline absolut (`time.monotonic()`) disimpan di
+`ContextVar`, jadi otomatis ikut ke task yang dibuat dari request tersebut
+(`asyncio.create_task` / `gather` menyalin context).
+
+- `deadline(seconds)`: pasang deadline (tidak pernah memperpanjang deadline luar),
+- `remaining()` / `check_deadline(stage)`: sisa budget / fail-fast,
+- `deadline_scope(stage)`: `asyncio.timeout` sebesar sisa budget; timeout
+  diubah menjadi `DeadlineExceededError` (504).
+
+Tanpa deadline terpasang (job background, CLI) semua helper ini no-op.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextvars import ContextVar
+
+from app.custom.exceptions.cst_exceptions import DeadlineExceededError
+from app.service.metrics import metrics
+
+_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> float | None:
+    """Deadline absolut (`time.monotonic()`) request saat ini, kalau ada."""
+    return _deadline.get()
+
+
+def remaining() -> float | None:
+    """Sisa budget dalam detik (bisa negatif), None kalau tidak ada deadline."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+@contextlib.contextmanager
+def deadline(seconds: float | None) -> Iterator[float | None]:
+    """Pasang deadline `seconds` dari sekarang selama blok berjalan.
+
+    Kalau sudah ada deadline yang lebih dekat, deadline itu yang dipakai.
+    """
+    if seconds is None:
+        yield _deadline.get()
+        return
+    at = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None and outer < at:
+        at = outer
+    token = _deadline.set(at)
+    try:
+        yield at
+    finally:
+        _deadline.reset(token)
+
+
+def _exceeded(stage: str, budget: float | None = None) -> DeadlineExceededError:
+    metrics.inc("deadline_exceeded", stage=stage)
+    return DeadlineExceededError(
+        f"Request deadline exceeded at {stage}",
+        context={"stage": stage, "budget": budget},
+    )
+
+
+def check_deadline(stage: str) -> float | None:
+    """Raise `DeadlineExceededError` kalau deadline sudah lewat; return sisa budget."""
+    budget = remaining()
+    if budget is not None and budget <= 0:
+        raise _exceeded(stage, budget)
+    return budget
+
+
+@contextlib.asynccontextmanager
+async def deadline_scope(stage: str) -> AsyncIterator[float | None]:
+    """Jalankan blok dengan `asyncio.timeout` sebesar sisa budget request.
+
+    Raises:
+        DeadlineExceededError: deadline sudah lewat saat masuk, atau habis di
+            tengah blok (blok di-cancel).
+    """
+    budget = check_deadline(stage)
+    if budget is None:
+        yield None
+        return
+    timeout = asyncio.timeout(budget)
+    try:
+        async with timeout:
+            yield budget
+    except TimeoutError as e:
+        if not timeout.expired():
+            raise
+        raise _exceeded(stage, budget) from e
@@ -1,20 +1,97 @@
 from fastapi.concurrency import asynccontextmanager
 
 from app.config import get_settings
+from app.database import sessionmanager
 from app.deps.deps_service import get_admin_seed_service
 from app.mlogg.setup import init_logging, logger
+from app.parser import supplier_rules
+from app.service.admission import load_shedder, work_backlog
+from app.service.archive import TransactionArchiver, TransactionHistory
+from app.service.callback import CallbackDeliveryEngine
+from app.service.ledger import DepositService, LedgerService
+from app.service.loader import BulkLoader
+from app.service.outbox import OutboxDispatcher
+from app.service.poller import StatusPoller
+from app.service.reply import reply_templates
+from app.service.report import ReconciliationReporter
+from app.service.routing import routing
+from app.service.scheduler import PendingTimeouts, timeout_scheduler
+from app.service.security import vault
+from app.service.supplier import supplier_clients
+from app.service.transaction import TransactionIntake
+from app.service.watcher import ConfigWatcher
 
 ENV = get_settings().APP_ENV.value
 
 
 @asynccontextmanager
-async def app_lifespan(app):  # noqa: ANN001, ARG001
+async def app_lifespan(app):  # noqa: ANN001
     """Lifespan context manager for the FastAPI application."""
+    settings = get_settings()
     init_logging()
     logger.info("Application starting up")
     # Seed admin user
     admin_seed_service = await get_admin_seed_service()
     await admin_seed_service.seed_default_admin()
+    # Compile template reply, rule parser supplier & tabel routing di startup
+    reply_templates.load()
+    supplier_rules.load()
+    routing.load()
+    # Vault kredensial: key diturunkan sekali di sini, bukan per transaksi
+    vault.unlock_from_settings(settings)
+    # Snapshot member / module: tabel admission per member (in-flight cap +
+    # token bucket) dan client supplier per module; di-reload tanpa restart
+    config_watcher = ConfigWatcher(sessionmanager.engine, sessionmanager.session)
+    app.state.config_watcher = config_watcher
+    await config_watcher.reload()
+    app.state.trx_intake = TransactionIntake(sessionmanager.session)
+    app.state.bulk_loader = BulkLoader(sessionmanager.session)
+    if settings.SHED_ENABLED:
+        load_shedder.start(work_backlog(sessionmanager.session))
+    # Warm supplier HTTP clients (satu pool keep-alive per module)
+    await supplier_clients.warm(
+        config_watcher.modules(), prime=settings.SUPPLIER_PRIME_ON_STARTUP
+    )
+    if settings.CONFIG_WATCH_ENABLED:
+        config_watcher.start()
+    # ledger saldo member; sekaligus memasang loader cache saldo
+    app.state.ledger = LedgerService(sessionmanager.session)
+    app.state.deposits = DepositService(sessionmanager.session)
+    dispatcher = None
+    if settings.OUTBOX_DISPATCHER_ENABLED:
+        dispatcher = OutboxDispatcher(
+            sessionmanager.session, supplier_clients.send_outbox_claim
+        )
+        dispatcher.start()
+    callback_engine = None
+    if settings.CALLBACK_ENGINE_ENABLED:
+        callback_engine = CallbackDeliveryEngine(sessionmanager.session)
+        callback_engine.start()
+    if settings.TIMEOUT_SCHEDULER_ENABLED:
+        pending_timeouts = PendingTimeouts(sessionmanager.session)
+        if settings.POLLER_ENABLED:
+            app.state.status_poller = StatusPoller(
+                sessionmanager.session, pending_timeouts
+            )
+        await pending_timeouts.rearm()
+        timeout_scheduler.start()
+    # arsip bulanan transaksi selesai + lookup riwayat lintas arsip
+    archiver = TransactionArchiver(sessionmanager.engine)
+    app.state.archiver = archiver
+    app.state.trx_history = TransactionHistory(sessionmanager.engine)
+    app.state.reconciliation = ReconciliationReporter(sessionmanager.engine)
+    if settings.ARCHIVE_ENABLED:
+        archiver.start()
     yield
-    # cleanup
+    # cleanup (stop() no-op kalau loop belum pernah di-start)
+    await archiver.stop()
+    await config_watcher.stop()
+    await load_shedder.stop()
+    await timeout_scheduler.stop()
+    if dispatcher is not None:
+        await dispatcher.stop()
+    if callback_engine is not None:
+        await callback_engine.stop()
+    await supplier_clients.aclose()
+    vault.lock()
     logger.info("Application shutting down")
@@ -1,8 +1,12 @@
 import time
+from collections.abc import Iterable
 
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from app.config import get_settings
+from app.custom.cst_deadline import deadline
 from app.mlogg import logger
 
 
@@ -29,3 +33,51 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             f"Outgoing Response: {request.method} {request.url.path} - Status: {response.status_code} - Process Time: {process_time:.4f}s"
         )
         return response
+
+
+class DeadlineMiddleware:
+    """Pasang deadline per request (lihat `app.custom.cst_deadline`).
+
+    Budget default `REQUEST_DEADLINE_SECONDS`; client boleh memperpendek lewat
+    header `REQUEST_DEADLINE_HEADER` (detik), tapi tidak memperpanjang.
+    Path dengan prefix `REQUEST_DEADLINE_EXEMPT_PATHS` (job admin seperti bulk
+    load) berjalan tanpa deadline. Pure ASGI supaya tidak menambah task per
+    request.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        seconds: float | None = None,
+        exempt: Iterable[str] | None = None,
+    ):
+        settings = get_settings()
+        self.app = app
+        self.seconds = settings.REQUEST_DEADLINE_SECONDS if seconds is None else seconds
+        self.header = settings.REQUEST_DEADLINE_HEADER.lower().encode("latin-1")
+        self.exempt = tuple(
+            settings.REQUEST_DEADLINE_EXEMPT_PATHS if exempt is None else exempt
+        )
+
+    def _budget(self, scope: Scope) -> float:
+        for name, value in scope["headers"]:
+            if name == self.header:
+                try:
+                    requested = float(value)
+                except ValueError:
+                    break
+                if requested > 0:
+                    return min(requested, self.seconds)
+                break
+        return self.seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or self.seconds <= 0
+            or scope["path"].startswith(self.exempt)
+        ):
+            await self.app(scope, receive, send)
+            return
+        with deadline(self._budget(scope)):
+            await self.app(scope, receive, send)
@@ -0,0 +1,52 @@
+"""Singleflight: coalescing panggilan async konkuren dengan key yang sama.
+
+Caller pertama untuk sebuah key menjalankan loader; caller lain yang datang
+selama loader masih berjalan menunggu hasil (atau exception) yang sama, jadi
+N miss bersamaan hanya menghasilkan satu query / request.
+
+Loader berjalan sebagai task terpisah: caller yang di-cancel (mis. deadline
+request habis) tidak ikut membatalkan loader untuk caller lain.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class SingleFlight[K: Hashable, V]:
+    """Satu loader in-flight per key."""
+
+    def __init__(self) -> None:
+        self._inflight: dict[K, asyncio.Task[V]] = {}
+        self.shared = 0
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._inflight
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        """Jalankan `loader` untuk `key`, atau tunggu loader yang sedang jalan."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(loader())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._done(key, t))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key: K, task: asyncio.Task[V]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # exception sudah diteruskan ke caller; hindari warning "never retrieved"
+            task.exception()
+
+    def forget(self, key: K) -> None:
+        """Lepas loader in-flight `key`: caller berikutnya memulai load baru.
+
+        Dipakai saat data berubah di tengah load (hasil load lama mungkin basi);
+        caller yang sudah menunggu tetap menerima hasil load lama.
+        """
+        self._inflight.pop(key, None)
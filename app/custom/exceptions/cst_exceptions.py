@@ -152,9 +152,141 @@ class UserPasswordError(AuthError):
     status_code = 401
 
 
+class SignatureInvalidError(AuthError):
+    """Exception raised when a member request signature does not match."""
+
+    default_message = "Invalid request signature."
+    status_code = 401
+
+
 # ----------------- Service Exceptions -----------------
 class ServiceError(AppExceptionError):
     """Exception raised for service errors."""
 
     default_message = "Service error occurred."
     status_code = 503
+
+
+class DeadlineExceededError(AppExceptionError):
+    """Exception raised when a request's deadline has passed (caller gave up)."""
+
+    default_message = "Request deadline exceeded."
+    status_code = 504
+
+
+# ----------------- Supplier Exceptions -----------------
+class SupplierError(AppExceptionError):
+    """Exception raised when a supplier/module call fails."""
+
+    default_message = "Supplier service unavailable."
+    status_code = 502
+
+
+class SupplierNotConfiguredError(SupplierError):
+    """Exception raised when no HTTP client is registered for a module."""
+
+    default_message = "Supplier module is not configured."
+    status_code = 404
+
+
+class CircuitOpenError(SupplierError):
+    """Exception raised when a module's circuit breaker is open (load shed)."""
+
+    default_message = "Supplier module circuit is open."
+    status_code = 503
+
+
+class ModuleOverloadedError(SupplierError):
+    """Exception raised when a module's adaptive concurrency limit is reached."""
+
+    default_message = "Supplier module concurrency limit reached."
+    status_code = 503
+
+
+# ----------------- Parser / Template Exceptions -----------------
+class RequestParseError(AppExceptionError):
+    """Exception raised when an incoming raw request cannot be parsed."""
+
+    default_message = "Invalid request format."
+    status_code = 400
+
+
+class ReplyTemplateError(AppExceptionError):
+    """Exception raised when reply templates cannot be loaded or rendered."""
+
+    default_message = "Reply template error."
+    status_code = 500
+
+
+class SupplierRuleError(AppExceptionError):
+    """Exception raised when supplier response rules cannot be compiled."""
+
+    default_message = "Supplier response rule error."
+    status_code = 500
+
+
+# ----------------- Routing Exceptions -----------------
+class RoutingError(AppExceptionError):
+    """Exception raised when a destination cannot be routed to a module."""
+
+    default_message = "Destination cannot be routed."
+    status_code = 422
+
+
+class RoutingConfigError(AppExceptionError):
+    """Exception raised when the routing table cannot be loaded."""
+
+    default_message = "Routing table error."
+    status_code = 500
+
+
+# ----------------- Ledger Exceptions -----------------
+class LedgerError(AppExceptionError):
+    """Base exception for member balance ledger errors."""
+
+    default_message = "Ledger error."
+    status_code = 409
+
+
+class InsufficientBalanceError(LedgerError):
+    """Exception raised when a debit exceeds the member's balance."""
+
+    default_message = "Insufficient balance."
+    status_code = 402
+
+
+class LedgerAccountNotFoundError(LedgerError):
+    """Exception raised when a member has no balance account."""
+
+    default_message = "Member balance account not found."
+    status_code = 404
+
+
+class DuplicateLedgerEntryError(LedgerError):
+    """Exception raised when a ledger reference was already applied."""
+
+    default_message = "Ledger entry already applied."
+    status_code = 409
+
+
+class DepositTicketError(LedgerError):
+    """Exception raised for invalid deposit ticket requests."""
+
+    default_message = "Invalid deposit ticket request."
+    status_code = 400
+
+
+# ----------------- Bulk Load Exceptions -----------------
+class BulkLoadError(AppExceptionError):
+    """Exception raised when a bulk load file cannot be read or parsed."""
+
+    default_message = "Bulk load file cannot be read."
+    status_code = 400
+
+
+# ----------------- Vault Exceptions -----------------
+class VaultError(AppExceptionError):
+    """Exception raised when a stored credential cannot be sealed or unsealed."""
+
+    default_message = "Credential vault error."
+    status_code = 500
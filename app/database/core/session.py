@@ -1,6 +1,9 @@
 import contextlib
+import time
 from collections.abc import AsyncIterator
+from typing import Any
 
+from sqlalchemy import Engine, event
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
@@ -11,17 +14,44 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from app.config import get_settings
-from app.custom.exceptions import ServiceError
+from app.custom.cst_deadline import deadline_scope
+from app.custom.exceptions import AppExceptionError, ServiceError
 from app.mlogg import logger
+from app.service.metrics import metrics
 
 settings = get_settings()
 
+_WRITE_START = "write_started"
+
+
+def _before_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:  # noqa: ARG001
+    conn.info[_WRITE_START] = time.perf_counter()
+
+
+def _after_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:  # noqa: ARG001
+    started = conn.info.pop(_WRITE_START, None)
+    if started is not None and statement.lstrip()[:6].upper() in (
+        "INSERT",
+        "UPDATE",
+        "DELETE",
+    ):
+        # di SQLite durasi statement tulis = waktu tunggu write lock + eksekusi
+        metrics.observe("db_write_seconds", time.perf_counter() - started)
+
+
+def instrument_writes(engine: Engine) -> None:
+    """Catat durasi statement INSERT/UPDATE/DELETE ke `db_write_seconds`."""
+    if not event.contains(engine, "before_cursor_execute", _before_execute):
+        event.listen(engine, "before_cursor_execute", _before_execute)
+        event.listen(engine, "after_cursor_execute", _after_execute)
+
 
 class DatabaseSessionManager:
     """Manages async database connections and sessions."""
 
     def __init__(self, db_url: str):
         self.engine: AsyncEngine | None = create_async_engine(db_url, echo=False)
+        instrument_writes(self.engine.sync_engine)
         self._sessionmaker: async_sessionmaker[AsyncSession] | None = (
             async_sessionmaker(self.engine, expire_on_commit=False)
         )
@@ -55,15 +85,24 @@ class DatabaseSessionManager:
     async def session(self) -> AsyncIterator[AsyncSession]:
         """Provide an async session with rollback & close handling.
 
-        Caller is responsible for commit.
+        Caller is responsible for commit. Kalau request punya deadline
+        (`app.custom.cst_deadline`), session dibatasi sisa budget-nya dan
+        request yang sudah mati tidak membuka session baru.
         """
         if not self._sessionmaker:
             logger.error("Sessionmaker is not available")
             raise ServiceError("Sessionmaker is not available")
 
-        async with self._sessionmaker() as session:
+        async with (
+            deadline_scope("db_session"),
+            self._sessionmaker() as session,
+        ):
             try:
                 yield session
+            except AppExceptionError:
+                # error domain (deadline, saldo kurang, ...) diteruskan apa adanya
+                await session.rollback()
+                raise
             except SQLAlchemyError as e:
                 await session.rollback()
                 db_url = str(self.engine.url) if self.engine else "N/A"
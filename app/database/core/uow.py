@@ -1,7 +1,9 @@
+from contextlib import AsyncExitStack
 from types import TracebackType
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.custom.cst_deadline import check_deadline, deadline_scope
 from app.mlogg import logger
 
 
@@ -10,20 +12,27 @@ class UnitOfWork:
 
     NOTE: Service / caller wajib commit() atau rollback().
     Kalau lupa, __aexit__ akan auto commit jika belum ada commit.
+
+    Blok UoW dibatasi deadline request (kalau ada): lewat deadline, blok
+    di-cancel, transaksi di-rollback dan `DeadlineExceededError` di-raise.
+    Commit untuk request yang sudah mati juga ditolak.
     """
 
     def __init__(self, session: AsyncSession):
         self.session = session
         self._committed = False
+        self._scope = AsyncExitStack()
         with logger.contextualize(uow="UnitOfWork"):
             logger.debug("UnitOfWork initialized")
 
     async def __aenter__(self):
         with logger.contextualize(uow="UnitOfWork"):
             logger.debug("__aenter__ called")
+        await self._scope.enter_async_context(deadline_scope("uow"))
         return self
 
     async def commit(self):
+        check_deadline("uow_commit")
         await self.session.commit()
         self._committed = True
         with logger.contextualize(uow="UnitOfWork"):
@@ -42,9 +51,13 @@ class UnitOfWork:
     ):
         with logger.contextualize(uow="UnitOfWork"):
             logger.debug("__aexit__ called", exc_type=exc_type, exc=exc)
-        if exc_type:
-            await self.rollback()
-        elif not self._committed:
-            await self.commit()
+        try:
+            if exc_type:
+                await self.rollback()
+            elif not self._committed:
+                await self.commit()
+        finally:
+            # ubah cancel karena deadline menjadi DeadlineExceededError
+            await self._scope.__aexit__(exc_type, exc, tb)
         with logger.contextualize(uow="UnitOfWork"):
             logger.debug("UnitOfWork exited")
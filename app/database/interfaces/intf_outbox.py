@@ -0,0 +1,37 @@
+"""Interface untuk repository Outbox (claim / complete secara batch)."""
+
+from abc import ABC, abstractmethod
+
+from app.schemas.sch_transaction import OutboxClaim, OutboxResult
+
+
+class IOutboxRepo(ABC):
+    """Kontrak repository outbox yang dipakai dispatcher."""
+
+    @abstractmethod
+    async def claim_batch(
+        self,
+        worker_id: str,
+        limit: int,
+        lease_seconds: float,
+        max_attempts: int | None = None,
+    ) -> list[OutboxClaim]:
+        """Claim atomik sampai `limit` row pending / lease expired untuk worker_id."""
+        pass
+
+    @abstractmethod
+    async def complete_batch(
+        self, worker_id: str, results: list[OutboxResult], max_attempts: int
+    ) -> int:
+        """Tulis hasil dispatch satu batch. Return jumlah row yang ter-update."""
+        pass
+
+    @abstractmethod
+    async def reclaim_expired(self, max_attempts: int | None = None) -> int:
+        """Kembalikan row claimed dengan lease expired ke pending (atau failed)."""
+        pass
+
+    @abstractmethod
+    async def backlog(self) -> int:
+        """Jumlah row pending + claimed (sinyal queue depth load shedder)."""
+        pass
@@ -1,3 +1,19 @@
+from app.database.repositories.repo_callback import SQLiteCallbackRepository
+from app.database.repositories.repo_deposit import SQLiteDepositRepository
+from app.database.repositories.repo_ledger import SQLiteLedgerRepository
+from app.database.repositories.repo_member import SQLiteMemberRepository
+from app.database.repositories.repo_module import SQLiteModuleRepository
+from app.database.repositories.repo_outbox import SQLiteOutboxRepository
+from app.database.repositories.repo_transaction import SQLiteTransactionRepository
 from app.database.repositories.repo_user import SQLiteUserRepository
 
-__all__ = ["SQLiteUserRepository"]
+__all__ = [
+    "SQLiteCallbackRepository",
+    "SQLiteDepositRepository",
+    "SQLiteLedgerRepository",
+    "SQLiteMemberRepository",
+    "SQLiteModuleRepository",
+    "SQLiteOutboxRepository",
+    "SQLiteTransactionRepository",
+    "SQLiteUserRepository",
+]
@@ -0,0 +1,260 @@
+"""SQLiteArchiveRepository: pindah transaksi selesai ke file arsip bulanan.
+
+File arsip (`transactions_YYYY_MM.db`) di-ATTACH ke koneksi milik archiver,
+lalu tiap batch satu transaksi SQLite pendek: `INSERT OR IGNORE ... SELECT` ke
+tabel arsip + `DELETE` dari tabel aktif. Tabel arsip salinan kolom tabel aktif
+(tanpa FK) dengan PK yang sama, jadi batch yang diulang setelah crash tidak
+menggandakan row.
+
+Session harus terikat ke satu koneksi (`AsyncSession(bind=conn)`): ATTACH
+berlaku per koneksi dan tidak boleh dijalankan di tengah transaksi.
+"""
+
+from collections.abc import Sequence
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from sqlalchemy import (
+    Column,
+    Index,
+    MetaData,
+    Select,
+    Table,
+    and_,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.custom.exceptions.cst_exceptions import DataGenericError
+from app.mlogg import logger
+from app.models.db_transaction import InboxMessage, OutboxMessage, Transaction
+from app.schemas.sch_archive import TransactionRecord
+from app.schemas.sch_transaction import InboxStatus, OutboxStatus, TransactionStatus
+
+_trx = Transaction.__table__
+_inbox = InboxMessage.__table__
+_outbox = OutboxMessage.__table__
+
+FINAL_TRANSACTION = (
+    TransactionStatus.SUCCESS,
+    TransactionStatus.FAILED,
+    TransactionStatus.REFUNDED,
+)
+FINAL_INBOX = (InboxStatus.COMPLETED, InboxStatus.FAILED)
+OPEN_OUTBOX = (OutboxStatus.PENDING, OutboxStatus.CLAIMED)
+
+
+class ArchiveCounts(NamedTuple):
+    transactions: int = 0
+    outbox: int = 0
+    inbox: int = 0
+
+
+@lru_cache
+def archive_tables(schema: str) -> dict[str, Table]:
+    """Tabel inbox / transactions / outbox di schema (database ter-ATTACH)."""
+    metadata = MetaData(schema=schema)
+    tables = {
+        src.name: Table(
+            src.name,
+            metadata,
+            *(Column(c.name, c.type, primary_key=c.primary_key) for c in src.columns),
+        )
+        for src in (_inbox, _trx, _outbox)
+    }
+    trx = tables["transactions"]
+    # index untuk lookup riwayat (memberid + refid / rentang waktu)
+    Index("ix_archive_trx_member_refid", trx.c.memberid, trx.c.refid)
+    Index("ix_archive_trx_member_created", trx.c.memberid, trx.c.created_at)
+    Index("ix_archive_inbox_request_id", tables["inbox"].c.request_id)
+    Index("ix_archive_outbox_trx", tables["outbox"].c.transaction_id)
+    return tables
+
+
+def _month(column: Any) -> Any:
+    return func.strftime("%Y-%m", column)
+
+
+class SQLiteArchiveRepository:
+    def __init__(self, session: AsyncSession, autocommit: bool = True):
+        """Initialize repository.
+
+        Args:
+            session: Async DB session (terikat ke satu koneksi).
+            autocommit: If True, commit after each batch.
+        """
+        self.session = session
+        self.autocommit = autocommit
+        self.log = logger.bind(repo="SQLiteArchiveRepository")
+
+    async def _commit_or_flush(self) -> None:
+        try:
+            if self.autocommit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
+        except Exception as e:
+            self.log.exception("Database commit/flush failed", error=str(e))
+            raise DataGenericError("Failed to commit/flush transaction", cause=e) from e
+
+    # ------------------------
+    # ATTACH / DETACH
+    # ------------------------
+    async def attach(self, path: Path, schema: str, *, create: bool = True) -> None:
+        """ATTACH file arsip sebagai `schema` (dibuat + tabelnya kalau `create`)."""
+        await self.session.execute(
+            text(f"ATTACH DATABASE :path AS {schema}"), {"path": str(path)}
+        )
+        if create:
+            conn = await self.session.connection()
+            for table in archive_tables(schema).values():
+                await conn.execute(CreateTable(table, if_not_exists=True))
+                for index in table.indexes:
+                    await conn.execute(CreateIndex(index, if_not_exists=True))
+        await self.session.commit()
+
+    async def detach(self, schema: str) -> None:
+        await self.session.execute(text(f"DETACH DATABASE {schema}"))
+        await self.session.commit()
+
+    # ------------------------
+    # Kandidat arsip
+    # ------------------------
+    async def final_batch(self, cutoff: datetime, limit: int) -> list[tuple[int, str]]:
+        """`(id, bulan)` transaksi final sebelum `cutoff` yang outbox-nya selesai."""
+        open_outbox = exists().where(
+            _outbox.c.transaction_id == _trx.c.id, _outbox.c.status.in_(OPEN_OUTBOX)
+        )
+        stmt = (
+            select(_trx.c.id, _month(_trx.c.created_at))
+            .where(
+                _trx.c.status.in_(FINAL_TRANSACTION),
+                _trx.c.created_at < cutoff,
+                ~open_outbox,
+            )
+            .order_by(_trx.c.id)
+            .limit(limit)
+        )
+        return list((await self.session.execute(stmt)).tuples().all())
+
+    async def orphan_inbox_batch(
+        self, cutoff: datetime, limit: int
+    ) -> list[tuple[int, str]]:
+        """`(id, bulan)` inbox final sebelum `cutoff` tanpa transaksi aktif."""
+        has_trx = exists().where(_trx.c.inbox_id == _inbox.c.id)
+        stmt = (
+            select(_inbox.c.id, _month(_inbox.c.created_at))
+            .where(
+                _inbox.c.status.in_(FINAL_INBOX),
+                _inbox.c.created_at < cutoff,
+                ~has_trx,
+            )
+            .order_by(_inbox.c.id)
+            .limit(limit)
+        )
+        return list((await self.session.execute(stmt)).tuples().all())
+
+    # ------------------------
+    # Pindah batch
+    # ------------------------
+    async def _copy(self, schema: str, src: Table, where: Any) -> None:
+        dst = archive_tables(schema)[src.name]
+        cols = [c.name for c in src.columns]
+        stmt = (
+            insert(dst)
+            .from_select(cols, select(*(src.c[c] for c in cols)).where(where))
+            .prefix_with("OR IGNORE")
+        )
+        await self.session.execute(stmt)
+
+    async def _delete(self, table: Table, where: Any) -> int:
+        result = await self.session.execute(table.delete().where(where))
+        return result.rowcount  # type: ignore[attr-defined]
+
+    async def move_transactions(self, schema: str, ids: Sequence[int]) -> ArchiveCounts:
+        """Pindahkan transaksi `ids` + outbox + inbox-nya ke arsip `schema`."""
+        if not ids:
+            return ArchiveCounts()
+        ids = list(ids)
+        inbox_ids = list(
+            (
+                await self.session.execute(
+                    select(_trx.c.inbox_id).where(
+                        _trx.c.id.in_(ids), _trx.c.inbox_id.is_not(None)
+                    )
+                )
+            ).scalars()
+        )
+        await self._copy(schema, _inbox, _inbox.c.id.in_(inbox_ids))
+        await self._copy(schema, _trx, _trx.c.id.in_(ids))
+        await self._copy(schema, _outbox, _outbox.c.transaction_id.in_(ids))
+        outbox = await self._delete(_outbox, _outbox.c.transaction_id.in_(ids))
+        trx = await self._delete(_trx, _trx.c.id.in_(ids))
+        inbox = await self._delete(_inbox, _inbox.c.id.in_(inbox_ids))
+        await self._commit_or_flush()
+        return ArchiveCounts(trx, outbox, inbox)
+
+    async def move_inbox(self, schema: str, ids: Sequence[int]) -> ArchiveCounts:
+        """Pindahkan inbox `ids` (tanpa transaksi) ke arsip `schema`."""
+        if not ids:
+            return ArchiveCounts()
+        ids = list(ids)
+        await self._copy(schema, _inbox, _inbox.c.id.in_(ids))
+        inbox = await self._delete(_inbox, _inbox.c.id.in_(ids))
+        await self._commit_or_flush()
+        return ArchiveCounts(inbox=inbox)
+
+    # ------------------------
+    # Riwayat (tabel aktif + arsip)
+    # ------------------------
+    async def history(
+        self,
+        sources: Sequence[tuple[str, str]],
+        memberid: str,
+        *,
+        refid: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = 100,
+        include_live: bool = True,
+    ) -> list[TransactionRecord]:
+        """Transaksi member dari tabel aktif + arsip `(schema, bulan)` ter-ATTACH.
+
+        Satu `UNION ALL`, urut terbaru dulu.
+        """
+
+        def part(table: Table, source: str) -> Select[Any]:
+            cond = [table.c.memberid == memberid]
+            if refid is not None:
+                cond.append(table.c.refid == refid)
+            if since is not None:
+                cond.append(table.c.created_at >= since)
+            if until is not None:
+                cond.append(table.c.created_at < until)
+            cols = [table.c[c.name] for c in _trx.columns]
+            return select(*cols, literal(source).label("source")).where(and_(*cond))
+
+        parts = [part(_trx, "live")] if include_live else []
+        parts += [
+            part(archive_tables(schema)["transactions"], month)
+            for schema, month in sources
+        ]
+        if not parts:
+            return []
+        union = union_all(*parts).subquery()
+        stmt = (
+            select(union)
+            .order_by(union.c.created_at.desc(), union.c.id.desc())
+            .limit(limit)
+        )
+        rows = (await self.session.execute(stmt)).mappings().all()
+        return [TransactionRecord.model_validate(dict(row)) for row in rows]
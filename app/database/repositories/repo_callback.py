@@ -0,0 +1,337 @@
+"""SQLiteCallbackRepository: antrian callback durable dengan coalescing.
+
+- `enqueue` menimpa payload callback yang masih pending untuk
+  (memberid, refid) yang sama, jadi member yang tertinggal hanya menerima
+  status terakhir, bukan seluruh histori. Unique index parsial
+  `uq_callbacks_pending` menjamin paling banyak satu row pending per key;
+  coalescing = upsert ke index tersebut.
+- `claim_due` memakai pola yang sama dengan outbox: satu UPDATE ... RETURNING
+  dengan lease, hanya untuk row yang `next_attempt_at`-nya sudah lewat.
+  Row pending tidak di-claim selama row lain untuk key yang sama masih
+  dikirim (urutan status ke member terjaga).
+- Row yang gagal / lease-nya habis padahal sudah ada row pending yang lebih
+  baru untuk key yang sama tidak dikembalikan ke pending, tapi jadi
+  `superseded`: payload lama tidak pernah terkirim setelah yang baru.
+"""
+
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import (
+    and_,
+    bindparam,
+    case,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.custom.exceptions.cst_exceptions import DataGenericError
+from app.mlogg import logger
+from app.models.db_callback import CallbackMessage
+from app.models.db_member import Member
+from app.models.db_transaction import Transaction
+from app.schemas.sch_callback import CallbackClaim, CallbackResult, CallbackStatus
+
+_callbacks = CallbackMessage.__table__
+_sibling = _callbacks.alias("sibling")
+_trx = Transaction.__table__
+_members = Member.__table__
+
+
+def _has_sibling(status: CallbackStatus, *extra: Any) -> Any:
+    """Ada row lain dengan (memberid, refid) sama dan status `status`."""
+    return exists().where(
+        _sibling.c.memberid == _callbacks.c.memberid,
+        _sibling.c.refid == _callbacks.c.refid,
+        _sibling.c.id != _callbacks.c.id,
+        _sibling.c.status == status,
+        *extra,
+    )
+
+
+def _upsert(rows: Any) -> Any:
+    """INSERT callback pending; conflict di `uq_callbacks_pending` = coalesce."""
+    return rows.on_conflict_do_update(
+        index_elements=[_callbacks.c.memberid, _callbacks.c.refid],
+        index_where=_callbacks.c.status == CallbackStatus.PENDING.value,
+        set_={
+            "payload": rows.excluded.payload,
+            "report_url": rows.excluded.report_url,
+            "transaction_id": func.coalesce(
+                rows.excluded.transaction_id, _callbacks.c.transaction_id
+            ),
+            "coalesced": _callbacks.c.coalesced + 1,
+        },
+    )
+
+
+class SQLiteCallbackRepository:
+    def __init__(self, session: AsyncSession, autocommit: bool = True):
+        """Initialize repository.
+
+        Args:
+            session: Async DB session.
+            autocommit: If True, commit after each operation.
+        """
+        self.session = session
+        self.autocommit = autocommit
+        self.log = logger.bind(repo="SQLiteCallbackRepository")
+
+    async def _commit_or_flush(self) -> None:
+        try:
+            if self.autocommit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
+        except Exception as e:
+            self.log.exception("Database commit/flush failed", error=str(e))
+            raise DataGenericError("Failed to commit/flush transaction", cause=e) from e
+
+    async def enqueue(
+        self,
+        memberid: str,
+        refid: str,
+        report_url: str,
+        payload: dict[str, Any],
+        transaction_id: int | None = None,
+    ) -> int:
+        """Masukkan callback; coalesce ke row pending yang sama kalau ada.
+
+        Returns:
+            int: id row callback (baru atau yang di-coalesce).
+        """
+        now = time.time()
+        stmt = _upsert(
+            sqlite_insert(_callbacks).values(
+                memberid=memberid,
+                refid=refid,
+                transaction_id=transaction_id,
+                report_url=report_url,
+                payload=payload,
+                status=CallbackStatus.PENDING,
+                attempts=0,
+                coalesced=0,
+                enqueued_at=now,
+                next_attempt_at=now,
+            )
+        ).returning(_callbacks.c.id)
+        row_id = (await self.session.execute(stmt)).scalar_one()
+        await self._commit_or_flush()
+        return row_id
+
+    async def enqueue_final(self, transaction_ids: Sequence[int]) -> int:
+        """Callback status final untuk transaksi `transaction_ids` (satu statement).
+
+        Dipanggil di transaksi DB yang sama dengan update status final, jadi
+        callback tidak hilang kalau proses mati di antaranya. Transaksi tanpa
+        refid / member tanpa `report_url` dilewati.
+
+        Returns:
+            int: jumlah callback yang di-enqueue / di-coalesce.
+        """
+        if not transaction_ids:
+            return 0
+        now = time.time()
+        payload = func.json_object(
+            "refid", _trx.c.refid,
+            "memberid", _trx.c.memberid,
+            "product", _trx.c.product,
+            "dest", _trx.c.dest,
+            "status", _trx.c.status,
+            "sn", _trx.c.sn,
+            "price", _trx.c.amount,
+        )  # fmt: skip
+        source = select(
+            _trx.c.memberid,
+            _trx.c.refid,
+            _trx.c.id,
+            _members.c.report_url,
+            payload,
+            literal(CallbackStatus.PENDING.value),
+            literal(0),
+            literal(0),
+            literal(now),
+            literal(now),
+        ).where(
+            _trx.c.id.in_(list(transaction_ids)),
+            _trx.c.refid.is_not(None),
+            _members.c.memberid == _trx.c.memberid,
+            _members.c.report_url != "",
+        )
+        cols = [
+            "memberid",
+            "refid",
+            "transaction_id",
+            "report_url",
+            "payload",
+            "status",
+            "attempts",
+            "coalesced",
+            "enqueued_at",
+            "next_attempt_at",
+        ]
+        stmt = _upsert(sqlite_insert(_callbacks).from_select(cols, source))
+        count = (await self.session.execute(stmt)).rowcount or 0
+        await self._commit_or_flush()
+        return count
+
+    async def _fail_exhausted(self, now: float, max_attempts: int | None) -> int:
+        """Lease expired + attempts habis -> failed (poison row, worker crash)."""
+        if max_attempts is None:
+            return 0
+        stmt = (
+            update(_callbacks)
+            .where(
+                _callbacks.c.status == CallbackStatus.CLAIMED,
+                _callbacks.c.lease_expires_at < now,
+                _callbacks.c.attempts >= max_attempts,
+            )
+            .values(
+                status=CallbackStatus.FAILED,
+                claimed_by=None,
+                lease_expires_at=None,
+                last_error="lease expired after max attempts",
+            )
+        )
+        count = (await self.session.execute(stmt)).rowcount or 0
+        if count:
+            self.log.warning(
+                "Callbacks failed after max attempts",
+                count=count,
+                max_attempts=max_attempts,
+            )
+        return count
+
+    async def claim_due(
+        self,
+        worker_id: str,
+        limit: int,
+        lease_seconds: float,
+        max_attempts: int | None = None,
+    ) -> list[CallbackClaim]:
+        """Claim atomik callback yang sudah jatuh tempo / lease expired.
+
+        Row lease expired yang attempts-nya sudah `max_attempts` (worker crash
+        berulang di callback yang sama) dipindah ke failed, tidak di-claim lagi.
+        """
+        now = time.time()
+        expired = and_(
+            _callbacks.c.status == CallbackStatus.CLAIMED,
+            _callbacks.c.lease_expires_at < now,
+        )
+        # lease habis tapi sudah ada status yang lebih baru: jangan kirim ulang
+        await self.session.execute(
+            update(_callbacks)
+            .where(expired, _has_sibling(CallbackStatus.PENDING))
+            .values(
+                status=CallbackStatus.SUPERSEDED,
+                claimed_by=None,
+                lease_expires_at=None,
+            )
+        )
+        await self._fail_exhausted(now, max_attempts)
+        reclaim = expired
+        if max_attempts is not None:
+            reclaim = and_(expired, _callbacks.c.attempts < max_attempts)
+        in_flight = _has_sibling(
+            CallbackStatus.CLAIMED, _sibling.c.lease_expires_at >= now
+        )
+        claimable = or_(
+            and_(
+                _callbacks.c.status == CallbackStatus.PENDING,
+                _callbacks.c.next_attempt_at <= now,
+                ~in_flight,
+            ),
+            reclaim,
+        )
+        candidates = (
+            select(_callbacks.c.id)
+            .where(claimable)
+            .order_by(_callbacks.c.next_attempt_at)
+            .limit(limit)
+        )
+        stmt = (
+            update(_callbacks)
+            .where(_callbacks.c.id.in_(candidates))
+            .values(
+                status=CallbackStatus.CLAIMED,
+                claimed_by=worker_id,
+                lease_expires_at=now + lease_seconds,
+                attempts=_callbacks.c.attempts + 1,
+            )
+            .returning(
+                _callbacks.c.id,
+                _callbacks.c.memberid,
+                _callbacks.c.report_url,
+                _callbacks.c.payload,
+                _callbacks.c.attempts,
+                _callbacks.c.enqueued_at,
+            )
+        )
+        rows = (await self.session.execute(stmt)).mappings().all()
+        await self._commit_or_flush()
+        return [CallbackClaim.model_validate(dict(r)) for r in rows]
+
+    async def complete_batch(
+        self, worker_id: str, results: list[CallbackResult], max_attempts: int
+    ) -> int:
+        """Tulis hasil delivery satu batch (fenced dengan claimed_by)."""
+        if not results:
+            return 0
+        now = time.time()
+        fence = and_(
+            _callbacks.c.id == bindparam("b_id"),
+            _callbacks.c.claimed_by == worker_id,
+            _callbacks.c.status == CallbackStatus.CLAIMED,
+        )
+        delivered = [{"b_id": r.id} for r in results if r.ok]
+        failed = [
+            {
+                "b_id": r.id,
+                "b_error": (r.error or "")[:512],
+                "b_next": r.next_attempt_at or now,
+            }
+            for r in results
+            if not r.ok
+        ]
+        updated = 0
+        if delivered:
+            stmt = (
+                update(_callbacks)
+                .where(fence)
+                .values(
+                    status=CallbackStatus.DELIVERED,
+                    delivered_at=now,
+                    lease_expires_at=None,
+                )
+            )
+            updated += (await self.session.execute(stmt, delivered)).rowcount or 0
+        if failed:
+            stmt = (
+                update(_callbacks)
+                .where(fence)
+                .values(
+                    status=case(
+                        (
+                            _has_sibling(CallbackStatus.PENDING),
+                            CallbackStatus.SUPERSEDED,
+                        ),
+                        (_callbacks.c.attempts >= max_attempts, CallbackStatus.FAILED),
+                        else_=CallbackStatus.PENDING,
+                    ),
+                    claimed_by=None,
+                    lease_expires_at=None,
+                    next_attempt_at=bindparam("b_next"),
+                    last_error=bindparam("b_error"),
+                )
+            )
+            updated += (await self.session.execute(stmt, failed)).rowcount or 0
+        await self._commit_or_flush()
+        return updated
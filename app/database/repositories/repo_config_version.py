@@ -0,0 +1,26 @@
+"""SQLiteConfigVersionRepository: baca counter versi konfigurasi (hot reload)."""
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.mlogg import logger
+from app.models.db_config_version import ConfigVersion
+
+_versions = ConfigVersion.__table__
+
+
+class SQLiteConfigVersionRepository:
+    """Repository read-only untuk tabel config_versions."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.log = logger.bind(repo="SQLiteConfigVersionRepository")
+
+    async def versions(self) -> dict[str, int]:
+        """Versi tiap tabel konfigurasi, mis. `{"members": 12, "modules": 3}`."""
+        stmt = select(_versions.c.name, _versions.c.version)
+        return dict((await self.session.execute(stmt)).tuples().all())
+
+    async def data_version(self) -> int:
+        """`PRAGMA data_version` koneksi ini: naik setiap ada commit dari koneksi lain."""
+        return (await self.session.execute(text("PRAGMA data_version"))).scalar_one()
@@ -0,0 +1,143 @@
+"""SQLiteDepositRepository: tiket deposit dan pencocokan pembayaran.
+
+Konfirmasi dijalankan per batch: pencarian tiket untuk banyak pembayaran
+cukup satu SELECT, penandaan lunas satu UPDATE `CASE id WHEN ...` yang hanya
+menyentuh tiket yang masih pending (konfirmasi ulang tidak mengubah apa pun).
+"""
+
+from collections.abc import Sequence
+from typing import NamedTuple
+
+from sqlalchemy import case, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.custom.exceptions.cst_exceptions import (
+    DataDuplicationError,
+    DataGenericError,
+)
+from app.mlogg import logger
+from app.models.db_deposit import DepositTicket
+from app.schemas.sch_deposit import DepositTicketPublic, DepositTicketStatus
+
+_tickets = DepositTicket.__table__
+
+
+class PaidTicket(NamedTuple):
+    id: str
+    memberid: str
+    transfer_amount: int
+
+
+class SQLiteDepositRepository:
+    def __init__(self, session: AsyncSession, autocommit: bool = True):
+        """Initialize repository.
+
+        Args:
+            session: Async DB session.
+            autocommit: If True, commit after each operation.
+        """
+        self.session = session
+        self.autocommit = autocommit
+        self.log = logger.bind(repo="SQLiteDepositRepository")
+
+    async def _commit_or_flush(self) -> None:
+        try:
+            if self.autocommit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
+        except IntegrityError as e:
+            raise DataDuplicationError(
+                "Deposit ticket conflicts with an existing one", cause=e
+            ) from e
+        except Exception as e:
+            self.log.exception("Database commit/flush failed", error=str(e))
+            raise DataGenericError("Failed to commit/flush transaction", cause=e) from e
+
+    async def get(self, ticket_id: str) -> DepositTicketPublic | None:
+        obj = await self.session.get(DepositTicket, ticket_id)
+        return None if obj is None else DepositTicketPublic.model_validate(obj)
+
+    async def taken_transfer_amounts(self, low: int, high: int) -> set[int]:
+        """Nominal transfer tiket pending di rentang [low, high]."""
+        stmt = select(_tickets.c.transfer_amount).where(
+            _tickets.c.status == DepositTicketStatus.PENDING,
+            _tickets.c.transfer_amount.between(low, high),
+        )
+        return set((await self.session.execute(stmt)).scalars())
+
+    async def create(self, ticket: DepositTicket) -> DepositTicketPublic:
+        """Simpan tiket baru.
+
+        Raises:
+            DataDuplicationError: nominal transfer sudah dipakai tiket pending lain.
+        """
+        self.session.add(ticket)
+        await self._commit_or_flush()
+        return DepositTicketPublic.model_validate(ticket)
+
+    async def expire_stale(self, now: float) -> int:
+        """Tiket pending yang lewat `expires_at` -> expired (membebaskan kodenya)."""
+        stmt = (
+            update(_tickets)
+            .where(
+                _tickets.c.status == DepositTicketStatus.PENDING,
+                _tickets.c.expires_at <= now,
+            )
+            .values(status=DepositTicketStatus.EXPIRED)
+        )
+        result = await self.session.execute(stmt)
+        await self._commit_or_flush()
+        return result.rowcount  # type: ignore[attr-defined]
+
+    async def paid_refs(self, payment_refs: Sequence[str]) -> set[str]:
+        """`payment_ref` yang sudah pernah melunasi tiket (replay)."""
+        if not payment_refs:
+            return set()
+        stmt = select(_tickets.c.payment_ref).where(
+            _tickets.c.payment_ref.in_(payment_refs)
+        )
+        return set((await self.session.execute(stmt)).scalars())
+
+    async def find_pending(
+        self, ticket_ids: Sequence[str], transfer_amounts: Sequence[int], now: float
+    ) -> list[DepositTicketPublic]:
+        """Tiket pending (belum expired) by id atau nominal transfer, satu SELECT."""
+        if not ticket_ids and not transfer_amounts:
+            return []
+        stmt = select(DepositTicket).where(
+            DepositTicket.status == DepositTicketStatus.PENDING,
+            DepositTicket.expires_at > now,
+            or_(
+                DepositTicket.id.in_(ticket_ids),
+                DepositTicket.transfer_amount.in_(transfer_amounts),
+            ),
+        )
+        rows = (await self.session.execute(stmt)).scalars()
+        return [DepositTicketPublic.model_validate(row) for row in rows]
+
+    async def mark_paid(self, payments: dict[str, str], now: float) -> list[PaidTicket]:
+        """Tandai tiket lunas: `{ticket_id: payment_ref}`, satu UPDATE.
+
+        Hanya tiket yang masih pending yang berubah; tiket yang sudah lunas
+        (konfirmasi ganda / konkuren) tidak ikut di-return.
+        """
+        if not payments:
+            return []
+        stmt = (
+            update(_tickets)
+            .where(
+                _tickets.c.id.in_(list(payments)),
+                _tickets.c.status == DepositTicketStatus.PENDING,
+            )
+            .values(
+                status=DepositTicketStatus.PAID,
+                payment_ref=case(payments, value=_tickets.c.id),
+                paid_at=now,
+            )
+            .returning(_tickets.c.id, _tickets.c.memberid, _tickets.c.transfer_amount)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        await self._commit_or_flush()
+        return sorted((PaidTicket(*row) for row in rows), key=lambda t: t.id)
@@ -0,0 +1,288 @@
+"""SQLiteLedgerRepository: saldo member + jurnal ledger.
+
+Setiap mutasi saldo adalah satu statement atomik di row member:
+
+- debit: `UPDATE member_balances SET balance = balance - :amt
+  WHERE memberid = :m AND balance >= :amt RETURNING balance`,
+  jadi tidak ada read-modify-write di Python dan tidak ada lost update
+  walaupun banyak debit konkuren untuk member yang sama,
+- credit: upsert `INSERT ... ON CONFLICT(memberid) DO UPDATE SET
+  balance = balance + excluded.balance RETURNING balance`,
+- credit batch: ref yang sudah dibukukan dicari dulu dengan satu SELECT,
+  hanya credit yang benar-benar baru yang menambah saldo (replay gratis), lalu
+  entry-nya di-insert sekali dengan `balance_after` final (jurnal append-only).
+
+Entry `ledger_entries` ditulis di transaksi yang sama; caller (UoW) yang
+commit / rollback keduanya sekaligus.
+"""
+
+from collections import defaultdict
+from collections.abc import Sequence
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.custom.exceptions.cst_exceptions import (
+    DataGenericError,
+    DuplicateLedgerEntryError,
+    InsufficientBalanceError,
+    LedgerAccountNotFoundError,
+    LedgerError,
+)
+from app.mlogg import logger
+from app.models.db_ledger import LedgerEntry, MemberBalance
+from app.schemas.sch_ledger import LedgerCredit, LedgerKind, LedgerPosting
+
+_balances = MemberBalance.__table__
+_entries = LedgerEntry.__table__
+
+
+def _check_amount(amount: int) -> None:
+    if amount <= 0:
+        raise LedgerError("Ledger amount must be positive", context={"amount": amount})
+
+
+class SQLiteLedgerRepository:
+    def __init__(self, session: AsyncSession, autocommit: bool = True):
+        """Initialize repository.
+
+        Args:
+            session: Async DB session.
+            autocommit: If True, commit after each operation.
+        """
+        self.session = session
+        self.autocommit = autocommit
+        self.log = logger.bind(repo="SQLiteLedgerRepository")
+
+    async def _commit_or_flush(self) -> None:
+        try:
+            if self.autocommit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
+        except Exception as e:
+            self.log.exception("Database commit/flush failed", error=str(e))
+            raise DataGenericError("Failed to commit/flush transaction", cause=e) from e
+
+    async def get_balance(self, memberid: str) -> int | None:
+        """Saldo member, None kalau member belum punya akun saldo."""
+        stmt = select(_balances.c.balance).where(_balances.c.memberid == memberid)
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
+    async def open_account(self, memberid: str) -> None:
+        """Buat akun saldo 0 kalau belum ada (idempotent)."""
+        stmt = (
+            sqlite_insert(_balances)
+            .values(memberid=memberid, balance=0)
+            .on_conflict_do_nothing(index_elements=[_balances.c.memberid])
+        )
+        await self.session.execute(stmt)
+        await self._commit_or_flush()
+
+    async def debit(
+        self,
+        memberid: str,
+        amount: int,
+        *,
+        ref: str | None = None,
+        kind: LedgerKind = LedgerKind.DEBIT,
+        note: str | None = None,
+    ) -> LedgerPosting:
+        """Kurangi saldo dengan satu UPDATE ber-guard lalu catat entry-nya.
+
+        Raises:
+            InsufficientBalanceError: saldo lebih kecil dari `amount`.
+            LedgerAccountNotFoundError: member belum punya akun saldo.
+            DuplicateLedgerEntryError: `ref` sudah pernah dibukukan.
+        """
+        _check_amount(amount)
+        stmt = (
+            update(_balances)
+            .where(_balances.c.memberid == memberid, _balances.c.balance >= amount)
+            .values(balance=_balances.c.balance - amount, updated_at=func.now())
+            .returning(_balances.c.balance)
+        )
+        balance_after = (await self.session.execute(stmt)).scalar_one_or_none()
+        if balance_after is None:
+            # row tidak ter-update: bedakan saldo kurang vs akun tidak ada
+            balance = await self.get_balance(memberid)
+            context = {"memberid": memberid, "amount": amount, "balance": balance}
+            if balance is None:
+                raise LedgerAccountNotFoundError(
+                    f"Member {memberid} has no balance account", context=context
+                )
+            raise InsufficientBalanceError(
+                f"Insufficient balance for member {memberid}", context=context
+            )
+        return await self._record(memberid, kind, -amount, balance_after, ref, note)
+
+    async def credit(
+        self,
+        memberid: str,
+        amount: int,
+        *,
+        ref: str | None = None,
+        kind: LedgerKind = LedgerKind.CREDIT,
+        note: str | None = None,
+    ) -> LedgerPosting:
+        """Tambah saldo (akun dibuat otomatis) lalu catat entry-nya.
+
+        Raises:
+            DuplicateLedgerEntryError: `ref` sudah pernah dibukukan.
+        """
+        _check_amount(amount)
+        stmt = sqlite_insert(_balances).values(memberid=memberid, balance=amount)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_balances.c.memberid],
+            set_={
+                "balance": _balances.c.balance + stmt.excluded.balance,
+                "updated_at": func.now(),
+            },
+        ).returning(_balances.c.balance)
+        balance_after = (await self.session.execute(stmt)).scalar_one()
+        return await self._record(memberid, kind, amount, balance_after, ref, note)
+
+    async def credit_batch(
+        self, credits: Sequence[LedgerCredit]
+    ) -> list[LedgerPosting]:
+        """Bukukan banyak credit dengan tiga statement untuk seluruh batch.
+
+        1. SELECT `ref` yang sudah ada -> credit yang pernah dibukukan (atau
+           ref ganda di batch yang sama) dilewati,
+        2. satu upsert saldo multi-row (total per member) `RETURNING balance`,
+        3. satu INSERT multi-row entry baru dengan `balance_after` final.
+
+        Raises:
+            DuplicateLedgerEntryError: ref dibukukan transaksi lain di antara
+                SELECT dan INSERT (mutasi saldo batch ikut di-rollback).
+
+        Returns:
+            list[LedgerPosting]: posting yang baru dibukukan (urut input).
+        """
+        if not credits:
+            return []
+        _check_amount(min(c.amount for c in credits))
+        seen = set(
+            (
+                await self.session.execute(
+                    select(_entries.c.ref).where(
+                        _entries.c.ref.in_({c.ref for c in credits})
+                    )
+                )
+            ).scalars()
+        )
+        fresh: list[LedgerCredit] = []
+        for c in credits:
+            if c.ref not in seen:
+                seen.add(c.ref)
+                fresh.append(c)
+        skipped = len(credits) - len(fresh)
+        if skipped:
+            self.log.info("Ledger credits already applied", skipped=skipped)
+        if not fresh:
+            return []
+        totals: dict[str, int] = defaultdict(int)
+        for c in fresh:
+            totals[c.memberid] += c.amount
+        upsert = sqlite_insert(_balances).values(
+            [{"memberid": m, "balance": total} for m, total in totals.items()]
+        )
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[_balances.c.memberid],
+            set_={
+                "balance": _balances.c.balance + upsert.excluded.balance,
+                "updated_at": func.now(),
+            },
+        ).returning(_balances.c.memberid, _balances.c.balance)
+        finals = dict((await self.session.execute(upsert)).tuples().all())
+        # saldo berjalan per member, mulai dari saldo sebelum batch
+        running = {m: finals[m] - total for m, total in totals.items()}
+        postings: list[LedgerPosting] = []
+        for c in fresh:
+            running[c.memberid] += c.amount
+            postings.append(
+                LedgerPosting(
+                    memberid=c.memberid,
+                    kind=c.kind,
+                    amount=c.amount,
+                    balance_after=running[c.memberid],
+                    ref=c.ref,
+                )
+            )
+        try:
+            await self.session.execute(
+                insert(_entries).values(
+                    [
+                        {
+                            "memberid": p.memberid,
+                            "kind": p.kind.value,
+                            "amount": p.amount,
+                            "balance_after": p.balance_after,
+                            "ref": p.ref,
+                            "note": c.note,
+                        }
+                        for p, c in zip(postings, fresh, strict=True)
+                    ]
+                )
+            )
+        except IntegrityError as e:
+            if self.autocommit:
+                await self.session.rollback()
+            raise DuplicateLedgerEntryError(
+                "Ledger credit batch raced with another posting",
+                context={"refs": [c.ref for c in fresh]},
+                cause=e,
+            ) from e
+        await self._commit_or_flush()
+        return postings
+
+    async def _record(
+        self,
+        memberid: str,
+        kind: LedgerKind,
+        amount: int,
+        balance_after: int,
+        ref: str | None,
+        note: str | None,
+    ) -> LedgerPosting:
+        try:
+            await self.session.execute(
+                insert(_entries).values(
+                    memberid=memberid,
+                    kind=kind.value,
+                    amount=amount,
+                    balance_after=balance_after,
+                    ref=ref,
+                    note=note,
+                )
+            )
+        except IntegrityError as e:
+            # mutasi saldo di statement sebelumnya ikut dibatalkan (di dalam
+            # UoW rollback dilakukan oleh UoW)
+            if self.autocommit:
+                await self.session.rollback()
+            raise DuplicateLedgerEntryError(
+                f"Ledger entry {ref} already applied",
+                context={"memberid": memberid, "ref": ref},
+                cause=e,
+            ) from e
+        await self._commit_or_flush()
+        return LedgerPosting(
+            memberid=memberid,
+            kind=kind,
+            amount=amount,
+            balance_after=balance_after,
+            ref=ref,
+        )
+
+    async def entries(self, memberid: str, limit: int = 50) -> list[LedgerEntry]:
+        """Entry ledger terbaru milik member (paling baru dulu)."""
+        stmt = (
+            select(LedgerEntry)
+            .where(LedgerEntry.memberid == memberid)
+            .order_by(LedgerEntry.id.desc())
+            .limit(limit)
+        )
+        return list((await self.session.execute(stmt)).scalars())
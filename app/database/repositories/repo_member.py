@@ -0,0 +1,165 @@
+"""SQLiteMemberRepository: baca data member (kredensial untuk verifikasi sign).
+
+Sisi tulis hanya bulk upsert dari loader file member (`members.yaml` / CSV /
+NDJSON): satu `INSERT ... ON CONFLICT(memberid) DO UPDATE` per batch.
+"""
+
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.custom.exceptions.cst_exceptions import (
+    DataGenericError,
+    DataNotFoundError,
+    VaultError,
+)
+from app.database.repositories.helper_filters import valid_record_filter
+from app.mlogg import logger
+from app.models.db_member import Member
+from app.schemas.sch_member import MemberInDB, MemberLimits
+from app.service.security import SEALED_PREFIX, vault
+
+_members = Member.__table__
+
+
+class SQLiteMemberRepository:
+    """Repository untuk tabel members (read-side + bulk upsert)."""
+
+    def __init__(self, session: AsyncSession, autocommit: bool = True):
+        """Initialize repository.
+
+        Args:
+            session: Async DB session.
+            autocommit: If True, commit after each write operation.
+        """
+        self.session = session
+        self.autocommit = autocommit
+        self.log = logger.bind(repo="SQLiteMemberRepository")
+
+    async def _commit_or_flush(self) -> None:
+        try:
+            if self.autocommit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
+        except Exception as e:
+            self.log.exception("Database commit/flush failed", error=str(e))
+            raise DataGenericError("Failed to commit/flush transaction", cause=e) from e
+
+    async def get_by_id(self, memberid: str) -> MemberInDB:
+        """Ambil member aktif by memberid (case-insensitive) atau raise DataNotFoundError."""
+        stmt = select(Member).where(
+            Member.memberid == memberid.upper(), valid_record_filter(Member)
+        )
+        obj = (await self.session.execute(stmt)).scalar_one_or_none()
+        if obj is None:
+            self.log.error("Data not found", memberid=memberid)
+            raise DataNotFoundError(context={"memberid": memberid})
+        member = MemberInDB.model_validate(obj)
+        # kredensial sealed dibuka lewat cache vault (decrypt sekali per token)
+        owner = f"member:{obj.memberid}"
+        member.pin = vault.reveal(owner, "pin", obj.pin)
+        member.password = vault.reveal(owner, "password", obj.password)
+        return member
+
+    async def limit_rows(
+        self,
+    ) -> list[tuple[str, int | None, float | None, int | None]]:
+        """`(memberid, max_inflight, rate_limit, rate_burst)` semua member aktif."""
+        stmt = select(
+            Member.memberid, Member.max_inflight, Member.rate_limit, Member.rate_burst
+        ).where(valid_record_filter(Member))
+        return list((await self.session.execute(stmt)).tuples().all())
+
+    async def list_limits(self) -> list[MemberLimits]:
+        """Limit admission semua member aktif (satu SELECT kolom limit saja)."""
+        return [
+            MemberLimits(
+                memberid=memberid,
+                max_inflight=max_inflight,
+                rate_limit=rate_limit,
+                rate_burst=rate_burst,
+            )
+            for memberid, max_inflight, rate_limit, rate_burst in await self.limit_rows()
+        ]
+
+    async def existing_ids(self, memberids: Iterable[str]) -> set[str]:
+        """Memberid yang sudah ada di tabel (termasuk yang soft deleted)."""
+        stmt = select(_members.c.memberid).where(
+            _members.c.memberid.in_(list(memberids))
+        )
+        return set((await self.session.execute(stmt)).scalars().all())
+
+    async def upsert_many(
+        self, rows: Sequence[Mapping[str, Any]], actor: str | None = None
+    ) -> None:
+        """Insert / update banyak member sekaligus (executemany satu statement).
+
+        Semua row harus punya kolom yang sama. Member yang sudah ada ditimpa
+        dengan isi row dan di-restore kalau sebelumnya soft deleted. `pin` /
+        `password` di-seal vault (kalau master key di-set) sebelum ditulis.
+        """
+        if not rows:
+            return
+        stmt = sqlite_insert(_members)
+        updates: dict[str, Any] = {
+            col: stmt.excluded[col] for col in rows[0] if col != "memberid"
+        }
+        updates |= {
+            "updated_at": func.now(),
+            "updated_by": actor,
+            "is_deleted_flag": False,
+            "deleted_at": None,
+            "deleted_by": None,
+        }
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_members.c.memberid], set_=updates
+        )
+        # semua kolom diisi eksplisit: SQLAlchemy tidak perlu memproses default
+        # Python per row di executemany
+        extra = {"is_deleted_flag": False, "created_by": actor, "updated_by": actor}
+        await self.session.execute(
+            stmt, [{**vault.seal_row(row), **extra} for row in rows]
+        )
+        await self._commit_or_flush()
+        vault.invalidate(f"member:{row['memberid']}" for row in rows)
+
+    async def seal_plaintext(self) -> int:
+        """Seal `pin` / `password` row lama yang masih plaintext.
+
+        Termasuk row soft deleted.
+
+        Returns:
+            int: jumlah row yang ditulis ulang.
+
+        Raises:
+            VaultError: vault belum di-unlock.
+        """
+        if not vault.unlocked:
+            raise VaultError("Credential vault is locked")
+        c = _members.c
+        stmt = select(c.memberid, c.pin, c.password).where(
+            or_(
+                c.pin.not_like(f"{SEALED_PREFIX}%"),
+                c.password.not_like(f"{SEALED_PREFIX}%"),
+            )
+        )
+        rows = (await self.session.execute(stmt)).tuples().all()
+        if not rows:
+            return 0
+        params = [
+            {"b_key": key, "b_pin": vault.seal(pin), "b_password": vault.seal(password)}
+            for key, pin, password in rows
+        ]
+        upd = (
+            update(_members)
+            .where(c.memberid == bindparam("b_key"))
+            .values(pin=bindparam("b_pin"), password=bindparam("b_password"))
+        )
+        await self.session.execute(upd, params)
+        await self._commit_or_flush()
+        vault.invalidate(f"member:{key}" for key, _, _ in rows)
+        return len(rows)
@@ -0,0 +1,162 @@
+"""SQLiteModuleRepository: baca konfigurasi module supplier.
+
+Sisi tulis hanya bulk upsert dari loader file module (`modules.yaml` / CSV /
+NDJSON): satu `INSERT ... ON CONFLICT(moduleid) DO UPDATE` per batch.
+"""
+
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from pydantic import SecretStr
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.custom.exceptions.cst_exceptions import (
+    DataGenericError,
+    DataNotFoundError,
+    VaultError,
+)
+from app.database.repositories.helper_filters import valid_record_filter
+from app.mlogg import logger
+from app.models.db_module import Module
+from app.schemas.sch_module import ModuleInDB
+from app.service.security import SEALED_PREFIX, vault
+
+_modules = Module.__table__
+
+
+class SQLiteModuleRepository:
+    """Repository untuk tabel modules (read-side + bulk upsert)."""
+
+    def __init__(self, session: AsyncSession, autocommit: bool = True):
+        """Initialize repository.
+
+        Args:
+            session: Async DB session.
+            autocommit: If True, commit after each write operation.
+        """
+        self.session = session
+        self.autocommit = autocommit
+        self.log = logger.bind(repo="SQLiteModuleRepository")
+
+    async def _commit_or_flush(self) -> None:
+        try:
+            if self.autocommit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
+        except Exception as e:
+            self.log.exception("Database commit/flush failed", error=str(e))
+            raise DataGenericError("Failed to commit/flush transaction", cause=e) from e
+
+    @staticmethod
+    def _to_schema(obj: Module) -> ModuleInDB:
+        owner = f"module:{obj.moduleid}"
+        return ModuleInDB(
+            moduleid=obj.moduleid,
+            name=obj.name,
+            provider=obj.provider,  # type: ignore[arg-type]
+            username=obj.username,
+            msisdn=obj.msisdn,
+            email=obj.email,
+            base_url=obj.base_url,  # type: ignore[arg-type]
+            is_active=obj.is_active,
+            pin=SecretStr(vault.reveal(owner, "pin", obj.pin)),
+            password=SecretStr(vault.reveal(owner, "password", obj.password)),
+        )
+
+    async def get_by_id(self, moduleid: str) -> ModuleInDB:
+        """Ambil module by moduleid atau raise DataNotFoundError."""
+        stmt = select(Module).where(
+            Module.moduleid == moduleid, valid_record_filter(Module)
+        )
+        obj = (await self.session.execute(stmt)).scalar_one_or_none()
+        if obj is None:
+            self.log.error("Data not found", moduleid=moduleid)
+            raise DataNotFoundError(context={"moduleid": moduleid})
+        return self._to_schema(obj)
+
+    async def list_active(self) -> list[ModuleInDB]:
+        """List semua module aktif (tidak soft deleted)."""
+        stmt = select(Module).where(valid_record_filter(Module))
+        result = await self.session.execute(stmt)
+        return [self._to_schema(m) for m in result.scalars().all()]
+
+    async def existing_ids(self, moduleids: Iterable[str]) -> set[str]:
+        """Moduleid yang sudah ada di tabel (termasuk yang soft deleted)."""
+        stmt = select(_modules.c.moduleid).where(
+            _modules.c.moduleid.in_(list(moduleids))
+        )
+        return set((await self.session.execute(stmt)).scalars().all())
+
+    async def upsert_many(
+        self, rows: Sequence[Mapping[str, Any]], actor: str | None = None
+    ) -> None:
+        """Insert / update banyak module sekaligus (executemany satu statement).
+
+        Semua row harus punya kolom yang sama. Module yang sudah ada ditimpa
+        dengan isi row dan di-restore kalau sebelumnya soft deleted. `pin` /
+        `password` di-seal vault (kalau master key di-set) sebelum ditulis.
+        """
+        if not rows:
+            return
+        stmt = sqlite_insert(_modules)
+        updates: dict[str, Any] = {
+            col: stmt.excluded[col] for col in rows[0] if col != "moduleid"
+        }
+        updates |= {
+            "updated_at": func.now(),
+            "updated_by": actor,
+            "is_deleted_flag": False,
+            "deleted_at": None,
+            "deleted_by": None,
+        }
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_modules.c.moduleid], set_=updates
+        )
+        # semua kolom diisi eksplisit: SQLAlchemy tidak perlu memproses default
+        # Python per row di executemany
+        extra = {"is_deleted_flag": False, "created_by": actor, "updated_by": actor}
+        await self.session.execute(
+            stmt, [{**vault.seal_row(row), **extra} for row in rows]
+        )
+        await self._commit_or_flush()
+        vault.invalidate(f"module:{row['moduleid']}" for row in rows)
+
+    async def seal_plaintext(self) -> int:
+        """Seal `pin` / `password` row lama yang masih plaintext.
+
+        Termasuk row soft deleted.
+
+        Returns:
+            int: jumlah row yang ditulis ulang.
+
+        Raises:
+            VaultError: vault belum di-unlock.
+        """
+        if not vault.unlocked:
+            raise VaultError("Credential vault is locked")
+        c = _modules.c
+        stmt = select(c.moduleid, c.pin, c.password).where(
+            or_(
+                c.pin.not_like(f"{SEALED_PREFIX}%"),
+                c.password.not_like(f"{SEALED_PREFIX}%"),
+            )
+        )
+        rows = (await self.session.execute(stmt)).tuples().all()
+        if not rows:
+            return 0
+        params = [
+            {"b_key": key, "b_pin": vault.seal(pin), "b_password": vault.seal(password)}
+            for key, pin, password in rows
+        ]
+        upd = (
+            update(_modules)
+            .where(c.moduleid == bindparam("b_key"))
+            .values(pin=bindparam("b_pin"), password=bindparam("b_password"))
+        )
+        await self.session.execute(upd, params)
+        await self._commit_or_flush()
+        vault.invalidate(f"module:{key}" for key, _, _ in rows)
+        return len(rows)
@@ -0,0 +1,219 @@
+"""SQLiteOutboxRepository: claim batch atomik dengan lease.
+
+Claim dilakukan dengan satu statement
+``UPDATE outbox SET status='claimed', claimed_by=? ... WHERE id IN (SELECT ...) RETURNING``
+sehingga SQLite (single writer) menjamin satu row hanya dimiliki satu dispatcher.
+Update hasil dispatch selalu di-fence dengan ``claimed_by`` supaya worker yang
+lease-nya sudah diambil alih tidak bisa menimpa status.
+"""
+
+import time
+
+from sqlalchemy import and_, bindparam, case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.custom.exceptions.cst_exceptions import DataGenericError
+from app.database.interfaces.intf_outbox import IOutboxRepo
+from app.mlogg import logger
+from app.models.db_transaction import OutboxMessage
+from app.schemas.sch_transaction import OutboxClaim, OutboxResult, OutboxStatus
+
+_outbox = OutboxMessage.__table__
+
+
+class SQLiteOutboxRepository(IOutboxRepo):
+    def __init__(self, session: AsyncSession, autocommit: bool = True):
+        """Initialize repository.
+
+        Args:
+            session: Async DB session.
+            autocommit: If True, commit after each operation.
+        """
+        self.session = session
+        self.autocommit = autocommit
+        self.log = logger.bind(repo="SQLiteOutboxRepository")
+
+    async def _commit_or_flush(self) -> None:
+        try:
+            if self.autocommit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
+        except Exception as e:
+            self.log.exception("Database commit/flush failed", error=str(e))
+            raise DataGenericError("Failed to commit/flush transaction", cause=e) from e
+
+    @staticmethod
+    def _claimable(now: float):  # noqa: ANN205
+        return or_(
+            _outbox.c.status == OutboxStatus.PENDING,
+            and_(
+                _outbox.c.status == OutboxStatus.CLAIMED,
+                _outbox.c.lease_expires_at < now,
+            ),
+        )
+
+    async def _fail_exhausted(self, now: float, max_attempts: int | None) -> int:
+        """Lease expired + attempts habis -> failed (poison row, worker crash)."""
+        if max_attempts is None:
+            return 0
+        stmt = (
+            update(_outbox)
+            .where(
+                _outbox.c.status == OutboxStatus.CLAIMED,
+                _outbox.c.lease_expires_at < now,
+                _outbox.c.attempts >= max_attempts,
+            )
+            .values(
+                status=OutboxStatus.FAILED,
+                claimed_by=None,
+                lease_expires_at=None,
+                last_error="lease expired after max attempts",
+            )
+        )
+        res = await self.session.execute(stmt)
+        count = res.rowcount or 0
+        if count:
+            self.log.warning(
+                "Outbox rows failed after max attempts",
+                count=count,
+                max_attempts=max_attempts,
+            )
+        return count
+
+    async def claim_batch(
+        self,
+        worker_id: str,
+        limit: int,
+        lease_seconds: float,
+        max_attempts: int | None = None,
+    ) -> list[OutboxClaim]:
+        """Claim atomik sampai `limit` row pending / lease expired.
+
+        Row lease expired yang attempts-nya sudah `max_attempts` (worker crash
+        berulang di row yang sama) dipindah ke failed dulu, tidak di-claim lagi.
+        """
+        now = time.time()
+        await self._fail_exhausted(now, max_attempts)
+        candidates = (
+            select(_outbox.c.id)
+            .where(self._claimable(now))
+            .order_by(_outbox.c.id)
+            .limit(limit)
+        )
+        stmt = (
+            update(_outbox)
+            .where(_outbox.c.id.in_(candidates))
+            .values(
+                status=OutboxStatus.CLAIMED,
+                claimed_by=worker_id,
+                lease_expires_at=now + lease_seconds,
+                attempts=_outbox.c.attempts + 1,
+            )
+            .returning(
+                _outbox.c.id,
+                _outbox.c.transaction_id,
+                _outbox.c.moduleid,
+                _outbox.c.supplier_request,
+                _outbox.c.attempts,
+            )
+        )
+        result = await self.session.execute(stmt)
+        rows = result.mappings().all()
+        await self._commit_or_flush()
+        claims = [OutboxClaim.model_validate(dict(r)) for r in rows]
+        claims.sort(key=lambda c: c.id)
+        if claims:
+            self.log.debug("Outbox batch claimed", worker_id=worker_id, n=len(claims))
+        return claims
+
+    async def complete_batch(
+        self, worker_id: str, results: list[OutboxResult], max_attempts: int
+    ) -> int:
+        """Tulis hasil dispatch dalam satu executemany per jenis hasil.
+
+        Row gagal dikembalikan ke pending (retry) kecuali attempts sudah
+        mencapai `max_attempts`, maka status menjadi failed.
+        """
+        if not results:
+            return 0
+        fence = and_(
+            _outbox.c.id == bindparam("b_id"),
+            _outbox.c.claimed_by == worker_id,
+            _outbox.c.status == OutboxStatus.CLAIMED,
+        )
+        sent = [
+            {"b_id": r.id, "b_response": r.supplier_response} for r in results if r.ok
+        ]
+        failed = [
+            {"b_id": r.id, "b_error": (r.error or "")[:512]}
+            for r in results
+            if not r.ok
+        ]
+        updated = 0
+        if sent:
+            stmt = (
+                update(_outbox)
+                .where(fence)
+                .values(
+                    status=OutboxStatus.SENT,
+                    supplier_response=bindparam("b_response"),
+                    lease_expires_at=None,
+                )
+            )
+            res = await self.session.execute(stmt, sent)
+            updated += res.rowcount or 0
+        if failed:
+            stmt = (
+                update(_outbox)
+                .where(fence)
+                .values(
+                    status=case(
+                        (_outbox.c.attempts >= max_attempts, OutboxStatus.FAILED),
+                        else_=OutboxStatus.PENDING,
+                    ),
+                    claimed_by=None,
+                    lease_expires_at=None,
+                    last_error=bindparam("b_error"),
+                )
+            )
+            res = await self.session.execute(stmt, failed)
+            updated += res.rowcount or 0
+        await self._commit_or_flush()
+        if updated != len(results):
+            self.log.warning(
+                "Some outbox results lost their lease",
+                worker_id=worker_id,
+                expected=len(results),
+                updated=updated,
+            )
+        return updated
+
+    async def reclaim_expired(self, max_attempts: int | None = None) -> int:
+        """Kembalikan row claimed dengan lease expired (worker crash) ke pending.
+
+        Row yang attempts-nya sudah `max_attempts` menjadi failed.
+        """
+        now = time.time()
+        await self._fail_exhausted(now, max_attempts)
+        stmt = (
+            update(_outbox)
+            .where(
+                _outbox.c.status == OutboxStatus.CLAIMED,
+                _outbox.c.lease_expires_at < now,
+            )
+            .values(status=OutboxStatus.PENDING, claimed_by=None, lease_expires_at=None)
+        )
+        res = await self.session.execute(stmt)
+        await self._commit_or_flush()
+        count = res.rowcount or 0
+        if count:
+            self.log.warning("Expired outbox leases reclaimed", count=count)
+        return count
+
+    async def backlog(self) -> int:
+        """Jumlah row yang belum selesai dikirim (pending + claimed)."""
+        stmt = select(func.count()).where(
+            _outbox.c.status.in_((OutboxStatus.PENDING, OutboxStatus.CLAIMED))
+        )
+        return (await self.session.execute(stmt)).scalar_one()
@@ -0,0 +1,105 @@
+"""SQLiteReportRepository: query agregat laporan rekonsiliasi per batch id.
+
+Rentang waktu dipotong per batch keyset (`id > after AND id <= upper`), lalu
+tiap batch di-`GROUP BY memberid, moduleid, status` di SQLite: yang dibawa ke
+Python hanya agregat kecil per batch, bukan row transaksi.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    Integer,
+    String,
+    Table,
+    cast,
+    func,
+    select,
+    text,
+    type_coerce,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.mlogg import logger
+
+# (memberid, moduleid, status, jumlah transaksi, total amount dalam sen)
+AggregateRow = tuple[str | None, str | None, str, int, int]
+
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _in_range(table: Table, start: datetime, end: datetime) -> list[Any]:
+    # dibandingkan sebagai teks: `created_at` dari func.now() tanpa mikrodetik,
+    # dari Python dengan mikrodetik; batas tanpa mikrodetik benar untuk keduanya
+    created = type_coerce(table.c.created_at, String)
+    return [created >= start.strftime(_TS_FORMAT), created < end.strftime(_TS_FORMAT)]
+
+
+class SQLiteReportRepository:
+    def __init__(self, session: AsyncSession):
+        """Initialize repository (read-only).
+
+        Args:
+            session: Async DB session (terikat ke satu koneksi).
+        """
+        self.session = session
+        self.log = logger.bind(repo="SQLiteReportRepository")
+
+    async def journal_mode(self) -> str:
+        result = await self.session.execute(text("PRAGMA journal_mode"))
+        return str(result.scalar_one()).lower()
+
+    async def set_query_only(self, enabled: bool) -> None:
+        """`PRAGMA query_only`: tolak semua tulis di koneksi ini."""
+        await self.session.execute(text(f"PRAGMA query_only = {int(enabled)}"))
+
+    async def begin_snapshot(self) -> None:
+        """Mulai satu read transaction (snapshot konsisten di mode WAL)."""
+        await self.session.execute(text("BEGIN"))
+
+    async def end_snapshot(self) -> None:
+        await self.session.execute(text("COMMIT"))
+
+    async def batch_upper_id(
+        self,
+        table: Table,
+        start: datetime,
+        end: datetime,
+        after: int,
+        size: int,
+    ) -> int | None:
+        """Id terakhir batch berikutnya; None kalau sisa row < `size`."""
+        stmt = (
+            select(table.c.id)
+            .where(*_in_range(table, start, end), table.c.id > after)
+            .order_by(table.c.id)
+            .limit(1)
+            .offset(size - 1)
+        )
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
+    async def aggregate_batch(
+        self,
+        table: Table,
+        start: datetime,
+        end: datetime,
+        after: int,
+        upper: int | None,
+    ) -> list[AggregateRow]:
+        """Agregat `(memberid, moduleid, status)` untuk id di `(after, upper]`."""
+        cond = [*_in_range(table, start, end), table.c.id > after]
+        if upper is not None:
+            cond.append(table.c.id <= upper)
+        cents = cast(func.round(func.coalesce(table.c.amount, 0) * 100), Integer)
+        stmt = (
+            select(
+                table.c.memberid,
+                table.c.moduleid,
+                table.c.status,
+                func.count(),
+                func.coalesce(func.sum(cents), 0),
+            )
+            .where(*cond)
+            .group_by(table.c.memberid, table.c.moduleid, table.c.status)
+        )
+        return list((await self.session.execute(stmt)).tuples().all())
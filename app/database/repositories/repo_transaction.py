@@ -0,0 +1,197 @@
+"""SQLiteTransactionRepository: inbox request member + operasi transaksi pending.
+
+Timeout / status check dijalankan per batch (hasil satu tick timer wheel),
+jadi setiap operasi di sini satu statement untuk banyak id sekaligus.
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.custom.exceptions.cst_exceptions import DataGenericError
+from app.mlogg import logger
+from app.models.db_transaction import InboxMessage, Transaction
+from app.schemas.sch_transaction import (
+    InboxStatus,
+    PendingTransaction,
+    TransactionStatus,
+    TransactionStatusUpdate,
+)
+
+_trx = Transaction.__table__
+_inbox = InboxMessage.__table__
+
+
+def _epoch(value: datetime | None) -> float:
+    """`created_at` SQLite (naive, UTC) -> epoch detik."""
+    if value is None:
+        return datetime.now(UTC).timestamp()
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+class SQLiteTransactionRepository:
+    def __init__(self, session: AsyncSession, autocommit: bool = True):
+        """Initialize repository.
+
+        Args:
+            session: Async DB session.
+            autocommit: If True, commit after each operation.
+        """
+        self.session = session
+        self.autocommit = autocommit
+        self.log = logger.bind(repo="SQLiteTransactionRepository")
+
+    async def _commit_or_flush(self) -> None:
+        try:
+            if self.autocommit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
+        except Exception as e:
+            self.log.exception("Database commit/flush failed", error=str(e))
+            raise DataGenericError("Failed to commit/flush transaction", cause=e) from e
+
+    async def _pending(self, *where: Any) -> list[PendingTransaction]:
+        stmt = (
+            select(
+                _trx.c.id,
+                _trx.c.moduleid,
+                _trx.c.created_at,
+                _trx.c.refid,
+                _trx.c.inbox_id,
+            )
+            .where(_trx.c.status == TransactionStatus.PENDING, *where)
+            .order_by(_trx.c.id)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        return [
+            PendingTransaction(
+                id=row.id,
+                moduleid=row.moduleid,
+                created_at=_epoch(row.created_at),
+                refid=row.refid,
+                inbox_id=row.inbox_id,
+            )
+            for row in rows
+        ]
+
+    async def receive_inbox(
+        self, request_id: str, memberid: str, payload: dict[str, Any]
+    ) -> int | None:
+        """Catat request member ke inbox (idempotent per `request_id`).
+
+        Returns:
+            int | None: id inbox baru, None kalau request_id sudah pernah masuk.
+        """
+        stmt = (
+            sqlite_insert(_inbox)
+            .values(
+                request_id=request_id,
+                memberid=memberid,
+                payload=payload,
+                status=InboxStatus.RECEIVED,
+            )
+            .on_conflict_do_nothing(index_elements=[_inbox.c.request_id])
+            .returning(_inbox.c.id)
+        )
+        inbox_id = (await self.session.execute(stmt)).scalar_one_or_none()
+        await self._commit_or_flush()
+        return inbox_id
+
+    async def inbox_backlog(self) -> int:
+        """Jumlah request inbox yang belum selesai diproses (received + processing)."""
+        stmt = select(func.count()).where(
+            _inbox.c.status.in_((InboxStatus.RECEIVED, InboxStatus.PROCESSING))
+        )
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def list_pending(self) -> list[PendingTransaction]:
+        """Semua transaksi pending (untuk memasang ulang timer saat startup)."""
+        return await self._pending()
+
+    async def pending_by_ids(self, ids: Sequence[int]) -> list[PendingTransaction]:
+        """Transaksi dari `ids` yang masih pending (satu SELECT per batch poll)."""
+        if not ids:
+            return []
+        return await self._pending(_trx.c.id.in_(ids))
+
+    async def apply_status_batch(
+        self, updates: Sequence[TransactionStatusUpdate]
+    ) -> list[int]:
+        """Tulis status final satu batch: satu UPDATE transaksi + satu UPDATE inbox.
+
+        Nilai per row dipilih dengan `CASE id WHEN ...`; hanya row yang masih
+        pending yang berubah (status check yang telat tidak menimpa status final).
+
+        Returns:
+            list[int]: id transaksi yang ter-update.
+        """
+        if not updates:
+            return []
+        ids = [u.id for u in updates]
+        values: dict[str, Any] = {
+            "status": case({u.id: u.status.value for u in updates}, value=_trx.c.id)
+        }
+        sns = {u.id: u.sn for u in updates if u.sn is not None}
+        if sns:
+            values["sn"] = case(sns, value=_trx.c.id, else_=_trx.c.sn)
+        stmt = (
+            update(_trx)
+            .where(_trx.c.id.in_(ids), _trx.c.status == TransactionStatus.PENDING)
+            .values(**values)
+            .returning(_trx.c.id, _trx.c.inbox_id, _trx.c.status)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        inbox_status = {
+            row.inbox_id: (
+                InboxStatus.COMPLETED
+                if row.status == TransactionStatus.SUCCESS
+                else InboxStatus.FAILED
+            ).value
+            for row in rows
+            if row.inbox_id is not None
+        }
+        if inbox_status:
+            await self.session.execute(
+                update(_inbox)
+                .where(_inbox.c.id.in_(list(inbox_status)))
+                .values(status=case(inbox_status, value=_inbox.c.id))
+            )
+        await self._commit_or_flush()
+        return sorted(row.id for row in rows)
+
+    async def expire_pending(self, ids: Sequence[int]) -> list[int]:
+        """Gagalkan transaksi yang masih pending (final timeout) + inbox-nya.
+
+        Transaksi yang sudah final (success / failed) tidak disentuh.
+
+        Returns:
+            list[int]: id transaksi yang benar-benar di-expire.
+        """
+        if not ids:
+            return []
+        stmt = (
+            update(_trx)
+            .where(_trx.c.id.in_(ids), _trx.c.status == TransactionStatus.PENDING)
+            .values(status=TransactionStatus.FAILED)
+            .returning(_trx.c.id, _trx.c.inbox_id)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        inbox_ids = [row.inbox_id for row in rows if row.inbox_id is not None]
+        if inbox_ids:
+            await self.session.execute(
+                update(_inbox)
+                .where(_inbox.c.id.in_(inbox_ids))
+                .values(status=InboxStatus.FAILED)
+            )
+        await self._commit_or_flush()
+        expired = sorted(row.id for row in rows)
+        if expired:
+            self.log.warning("Pending transactions expired", n=len(expired))
+        return expired
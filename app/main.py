@@ -5,12 +5,13 @@ from fastapi.responses import JSONResponse
 from app.api import register_routers
 from app.custom.cst_cors import setup_cors
 from app.custom.cst_lifespan import app_lifespan
-from app.custom.cst_middleware import LoggingMiddleware
+from app.custom.cst_middleware import DeadlineMiddleware, LoggingMiddleware
 from app.custom.exceptions.cst_exceptions import (
     AppExceptionError,
 )
 
 app = FastAPI(lifespan=app_lifespan)
+app.add_middleware(DeadlineMiddleware)
 app.add_middleware(LoggingMiddleware)
 setup_cors(app)
 register_routers(app)
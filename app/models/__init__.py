@@ -10,7 +10,25 @@ class Base(DeclarativeBase):
     pass
 
 
+from app.models.db_callback import CallbackMessage  # noqa: F401
+from app.models.db_config_version import ConfigVersion  # noqa: F401
+from app.models.db_deposit import DepositTicket  # noqa: F401
+from app.models.db_ledger import LedgerEntry, MemberBalance  # noqa: F401
 from app.models.db_member import Member  # noqa: F401
+from app.models.db_module import Module  # noqa: F401
+from app.models.db_transaction import InboxMessage, OutboxMessage, Transaction  # noqa: F401
 from app.models.db_user import User  # noqa: F401
 
-__all__ = ["Member", "User"]
+__all__ = [
+    "CallbackMessage",
+    "ConfigVersion",
+    "DepositTicket",
+    "InboxMessage",
+    "LedgerEntry",
+    "Member",
+    "MemberBalance",
+    "Module",
+    "OutboxMessage",
+    "Transaction",
+    "User",
+]
@@ -0,0 +1,55 @@
+"""Model antrian callback (report) ke member."""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, DateTime, Float, Index, Integer, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+from app.schemas.sch_callback import CallbackStatus
+
+
+class CallbackMessage(Base):
+    """Callback status transaksi yang menunggu dikirim ke `Member.report_url`.
+
+    Waktu (`enqueued_at`, `next_attempt_at`, `lease_expires_at`, `delivered_at`)
+    disimpan sebagai epoch detik supaya query due / lease cukup compare float.
+    """
+
+    __tablename__ = "callbacks"
+    __table_args__ = (
+        Index("ix_callbacks_due", "status", "next_attempt_at"),
+        Index("ix_callbacks_member_refid", "memberid", "refid"),
+        # maksimal satu callback pending per (memberid, refid): target upsert
+        # coalescing di `enqueue`
+        Index(
+            "uq_callbacks_pending",
+            "memberid",
+            "refid",
+            unique=True,
+            sqlite_where=text(f"status = '{CallbackStatus.PENDING}'"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    memberid: Mapped[str] = mapped_column(String(32))
+    refid: Mapped[str] = mapped_column(String(64))
+    transaction_id: Mapped[int | None] = mapped_column(Integer, default=None)
+    report_url: Mapped[str] = mapped_column(String(2048))
+    payload: Mapped[dict[str, Any] | None] = mapped_column(JSON)
+    status: Mapped[str] = mapped_column(String(16), default=CallbackStatus.PENDING)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    coalesced: Mapped[int] = mapped_column(Integer, default=0)
+    enqueued_at: Mapped[float] = mapped_column(Float)
+    next_attempt_at: Mapped[float] = mapped_column(Float)
+    claimed_by: Mapped[str | None] = mapped_column(String(64), default=None)
+    lease_expires_at: Mapped[float | None] = mapped_column(Float, default=None)
+    delivered_at: Mapped[float | None] = mapped_column(Float, default=None)
+    last_error: Mapped[str | None] = mapped_column(String(512), default=None)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<CallbackMessage id={self.id} memberid={self.memberid} refid={self.refid}>"
@@ -0,0 +1,51 @@
+"""Counter versi konfigurasi member / module untuk hot reload.
+
+Satu row per tabel yang di-watch (`members`, `modules`). Trigger SQLite
+menaikkan `version` di setiap INSERT / UPDATE / DELETE row tabel tersebut,
+termasuk perubahan manual lewat `sqlite3` CLI, jadi watcher cukup membaca dua
+row kecil ini untuk tahu apakah snapshot in-memory perlu di-rebuild.
+
+NOTE: migration `batch_alter_table` (copy tabel) ikut membuang trigger tabel
+itu; migration tersebut wajib memasang ulang trigger-nya.
+"""
+
+from sqlalchemy import DDL, Integer, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+WATCHED_TABLES = ("members", "modules")
+
+
+class ConfigVersion(Base):
+    __tablename__ = "config_versions"
+
+    name: Mapped[str] = mapped_column(String(32), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+def _trigger_sql(table: str, action: str) -> str:
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table}_config_{action.lower()} "
+        f"AFTER {action} ON {table} BEGIN "
+        f"UPDATE config_versions SET version = version + 1 WHERE name = '{table}'; "
+        "END"
+    )
+
+
+CONFIG_VERSION_DDL: tuple[str, ...] = (
+    *(
+        f"INSERT OR IGNORE INTO config_versions (name, version) VALUES ('{t}', 0)"
+        for t in WATCHED_TABLES
+    ),
+    *(
+        _trigger_sql(table, action)
+        for table in WATCHED_TABLES
+        for action in ("INSERT", "UPDATE", "DELETE")
+    ),
+)
+
+# create_all (test / dev) ikut memasang seed row + trigger; migration
+# a1f3c8e92d47 menjalankan SQL yang sama
+for _sql in CONFIG_VERSION_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_sql).execute_if(dialect="sqlite"))
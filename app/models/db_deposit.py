@@ -0,0 +1,48 @@
+"""Model tiket deposit saldo member.
+
+Member minta tiket untuk nominal tertentu; nominal transfer = nominal + kode
+unik (1..`DEPOSIT_UNIQUE_CODE_MAX`), jadi mutasi bank yang masuk bisa
+dicocokkan ke tiket hanya dari nominalnya. Satu nominal transfer hanya boleh
+dipakai satu tiket pending (partial unique index).
+"""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Float, Index, Integer, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+
+class DepositTicket(Base):
+    __tablename__ = "deposit_tickets"
+    __table_args__ = (
+        Index(
+            "uq_deposit_pending_transfer_amount",
+            "transfer_amount",
+            unique=True,
+            sqlite_where=text("status = 'pending'"),
+        ),
+        Index("ix_deposit_member_created", "memberid", "created_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    memberid: Mapped[str] = mapped_column(String(32))
+    amount: Mapped[int] = mapped_column(BigInteger)
+    unique_code: Mapped[int] = mapped_column(Integer)
+    transfer_amount: Mapped[int] = mapped_column(BigInteger)
+    status: Mapped[str] = mapped_column(String(16), default="pending")
+    payment_ref: Mapped[str | None] = mapped_column(
+        String(64), unique=True, default=None
+    )
+    expires_at: Mapped[float] = mapped_column(Float)
+    paid_at: Mapped[float | None] = mapped_column(Float, default=None)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<DepositTicket id={self.id} memberid={self.memberid} "
+            f"transfer_amount={self.transfer_amount} status={self.status}>"
+        )
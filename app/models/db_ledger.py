@@ -0,0 +1,63 @@
+"""Model saldo member dan jurnal ledger (append-only).
+
+Nominal disimpan sebagai integer rupiah: SQLite tidak punya tipe desimal, dan
+`balance = balance - ?` di atas float berisiko selisih pembulatan.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+
+class MemberBalance(Base):
+    """Saldo berjalan satu member (satu row per member, hot row saat transaksi)."""
+
+    __tablename__ = "member_balances"
+    __table_args__ = (CheckConstraint("balance >= 0", name="ck_member_balance"),)
+
+    memberid: Mapped[str] = mapped_column(String(32), primary_key=True)
+    balance: Mapped[int] = mapped_column(BigInteger, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<MemberBalance memberid={self.memberid} balance={self.balance}>"
+
+
+class LedgerEntry(Base):
+    """Satu mutasi saldo. Tidak pernah di-update / dihapus.
+
+    `ref` unik (mis. `trx:123`, `ticket:T-1`): mutasi yang sama tidak bisa
+    tercatat dua kali.
+    """
+
+    __tablename__ = "ledger_entries"
+    __table_args__ = (Index("ix_ledger_member_created", "memberid", "created_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    memberid: Mapped[str] = mapped_column(String(32))
+    kind: Mapped[str] = mapped_column(String(16))
+    amount: Mapped[int] = mapped_column(BigInteger)
+    balance_after: Mapped[int] = mapped_column(BigInteger)
+    ref: Mapped[str | None] = mapped_column(String(64), unique=True, default=None)
+    note: Mapped[str | None] = mapped_column(String(255), default=None)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<LedgerEntry id={self.id} memberid={self.memberid} amount={self.amount}>"
+        )
@@ -1,6 +1,6 @@
 """Model Untuk Member / Concumer API / Otomax dan lain lain."""
 
-from sqlalchemy import Boolean, String
+from sqlalchemy import Boolean, Float, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models import Base
@@ -27,6 +27,10 @@ class Member(Base, AuditMixin):
     allow_nosign: Mapped[bool] = mapped_column(
         Boolean(), default=False, nullable=False, index=True
     )
+    # admission control per member; NULL = pakai default settings MEMBER_*
+    max_inflight: Mapped[int | None] = mapped_column(Integer, default=None)
+    rate_limit: Mapped[float | None] = mapped_column(Float, default=None)
+    rate_burst: Mapped[int | None] = mapped_column(Integer, default=None)
 
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
     is_deleted_flag: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
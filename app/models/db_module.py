@@ -0,0 +1,35 @@
+"""Model untuk Module / akun supplier (DIGIPOS, ISIMPLE, dst)."""
+
+from sqlalchemy import Boolean, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+from app.models.audit_mixin import AuditMixin
+
+
+class Module(Base, AuditMixin):
+    """schema untuk module supplier tempat transaksi member diteruskan."""
+
+    __tablename__ = "modules"
+
+    moduleid: Mapped[str] = mapped_column(
+        String(32), index=True, nullable=False, unique=True, primary_key=True
+    )
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    provider: Mapped[str] = mapped_column(String(16), nullable=False, index=True)
+    username: Mapped[str] = mapped_column(String(100), nullable=False)
+    msisdn: Mapped[str] = mapped_column(String(20), nullable=False)
+    pin: Mapped[str] = mapped_column(String(255), nullable=False)
+    password: Mapped[str] = mapped_column(String(255), nullable=False)
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
+    base_url: Mapped[str] = mapped_column(String(2048), nullable=False)
+
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
+    is_deleted_flag: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
+    # Audit fields & methods inherited from AuditMixin
+
+    def __repr__(self) -> str:
+        return f"<Module moduleid={self.moduleid} provider={self.provider}>"
+
+    def __str__(self) -> str:
+        return f"Module {self.name} (ID: {self.moduleid})"
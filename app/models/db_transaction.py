@@ -0,0 +1,105 @@
+"""Model untuk inbox (request masuk), transaksi, dan outbox (request ke supplier)."""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    JSON,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+from app.schemas.sch_transaction import InboxStatus, OutboxStatus, TransactionStatus
+
+
+class InboxMessage(Base):
+    """Request mentah dari member (OtomaX), satu row per request_id."""
+
+    __tablename__ = "inbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    request_id: Mapped[str] = mapped_column(String(64), unique=True, index=True)
+    memberid: Mapped[str | None] = mapped_column(String(32), index=True)
+    payload: Mapped[dict[str, Any] | None] = mapped_column(JSON)
+    status: Mapped[str] = mapped_column(
+        String(16), default=InboxStatus.RECEIVED, index=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<InboxMessage id={self.id} request_id={self.request_id}>"
+
+
+class Transaction(Base):
+    """Transaksi member yang diteruskan ke module supplier."""
+
+    __tablename__ = "transactions"
+    __table_args__ = (Index("ix_transactions_member_refid", "memberid", "refid"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    inbox_id: Mapped[int | None] = mapped_column(ForeignKey("inbox.id"), index=True)
+    memberid: Mapped[str | None] = mapped_column(String(32))
+    refid: Mapped[str | None] = mapped_column(String(64))
+    product: Mapped[str | None] = mapped_column(String(32), index=True)
+    dest: Mapped[str | None] = mapped_column(String(32))
+    moduleid: Mapped[str | None] = mapped_column(String(32), index=True)
+    amount: Mapped[float | None] = mapped_column(Numeric(14, 2))
+    sn: Mapped[str | None] = mapped_column(String(128))
+    status: Mapped[str] = mapped_column(
+        String(16), default=TransactionStatus.PENDING, index=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<Transaction id={self.id} refid={self.refid} status={self.status}>"
+
+
+class OutboxMessage(Base):
+    """Request ke supplier yang menunggu di-dispatch.
+
+    Lease (`claimed_by` + `lease_expires_at`, epoch detik) dipakai supaya satu row
+    hanya dikirim oleh satu dispatcher; lease yang expired bisa di-claim ulang.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (Index("ix_outbox_status_lease", "status", "lease_expires_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    transaction_id: Mapped[int | None] = mapped_column(
+        ForeignKey("transactions.id"), index=True
+    )
+    moduleid: Mapped[str] = mapped_column(String(32), index=True)
+    supplier_request: Mapped[dict[str, Any] | None] = mapped_column(JSON)
+    supplier_response: Mapped[dict[str, Any] | None] = mapped_column(JSON)
+    status: Mapped[str] = mapped_column(String(16), default=OutboxStatus.PENDING)
+    claimed_by: Mapped[str | None] = mapped_column(String(64), default=None)
+    lease_expires_at: Mapped[float | None] = mapped_column(Float, default=None)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[str | None] = mapped_column(String(512), default=None)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<OutboxMessage id={self.id} moduleid={self.moduleid} status={self.status}>"
@@ -0,0 +1,16 @@
+from app.parser.prs_otomax_request import OtomaxRequest, parse_otomax_request
+from app.parser.prs_supplier_response import (
+    ProviderRules,
+    SupplierParseResult,
+    SupplierRuleEngine,
+    supplier_rules,
+)
+
+__all__ = [
+    "OtomaxRequest",
+    "ProviderRules",
+    "SupplierParseResult",
+    "SupplierRuleEngine",
+    "parse_otomax_request",
+    "supplier_rules",
+]
@@ -0,0 +1,132 @@
+"""Replay corpus response supplier lewat rule engine (benchmark + regression).
+
+Corpus berupa file `*.jsonl` (satu response per baris:
+`{"id": ..., "provider": ..., "body": ...}`), golden file berupa JSON
+`{id: {"status", "sn", "price"}}`. Semua offline, tidak ada HTTP.
+"""
+
+import json
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from app.parser.prs_supplier_response import SupplierParseResult, SupplierRuleEngine
+from app.service.metrics import LatencyStats
+
+GOLDEN_FIELDS = ("status", "sn", "price")
+
+
+class CorpusRecord(NamedTuple):
+    id: str
+    provider: str
+    body: str
+
+
+class ReplayDiff(NamedTuple):
+    id: str
+    provider: str
+    expected: dict[str, Any] | None
+    actual: dict[str, Any]
+
+
+class ReplayReport:
+    """Ringkasan satu replay: throughput, latency per provider dan diff golden."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.elapsed = 0.0
+        self.latency: dict[str, LatencyStats] = {}
+        self.classified: dict[str, dict[str, Any]] = {}
+        self.diffs: list[ReplayDiff] = []
+
+    @property
+    def rps(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "responses": self.total,
+            "seconds": round(self.elapsed, 6),
+            "responses_per_second": round(self.rps, 1),
+            "providers": {
+                provider: {
+                    "count": stats.count,
+                    "p50_us": round(stats.percentile(50) * 1e6, 2),
+                    "p99_us": round(stats.percentile(99) * 1e6, 2),
+                }
+                for provider, stats in sorted(self.latency.items())
+            },
+            "diffs": len(self.diffs),
+        }
+
+
+def classify(result: SupplierParseResult) -> dict[str, Any]:
+    """Bagian hasil parse yang dibandingkan dengan golden file."""
+    data = result.as_dict()
+    return {field: data[field] for field in GOLDEN_FIELDS}
+
+
+def load_corpus(directory: Path) -> list[CorpusRecord]:
+    """Baca semua `*.jsonl` di direktori corpus (urut nama file)."""
+    records: list[CorpusRecord] = []
+    for path in sorted(Path(directory).glob("*.jsonl")):
+        with path.open(encoding="utf-8") as f:
+            records.extend(
+                CorpusRecord(str(row["id"]), str(row["provider"]), row["body"])
+                for row in map(json.loads, filter(str.strip, f))
+            )
+    return records
+
+
+def load_golden(path: Path) -> dict[str, dict[str, Any]]:
+    """Baca golden file; dict kosong kalau belum ada."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_golden(path: Path, classified: dict[str, dict[str, Any]]) -> None:
+    """Tulis ulang golden file dari hasil klasifikasi replay."""
+    with Path(path).open("w", encoding="utf-8") as f:
+        json.dump(dict(sorted(classified.items())), f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def replay_corpus(
+    engine: SupplierRuleEngine,
+    records: Iterable[CorpusRecord],
+    *,
+    rounds: int = 1,
+    golden: dict[str, dict[str, Any]] | None = None,
+) -> ReplayReport:
+    """Parse setiap record `rounds` kali; diff dihitung dari round pertama."""
+    records = list(records)
+    report = ReplayReport()
+    window = max(1024, len(records) * rounds)
+    rules = {r.provider: engine.get(r.provider) for r in records}
+    clock = time.perf_counter
+    started = clock()
+    for round_no in range(rounds):
+        for record in records:
+            stats = report.latency.get(record.provider)
+            if stats is None:
+                stats = report.latency[record.provider] = LatencyStats(window)
+            t0 = clock()
+            result = rules[record.provider].parse(record.body)
+            stats.observe(clock() - t0)
+            if round_no == 0:
+                report.classified[record.id] = classify(result)
+    report.elapsed = clock() - started
+    report.total = len(records) * rounds
+    if golden is not None:
+        for record in records:
+            actual = report.classified[record.id]
+            expected = golden.get(record.id)
+            if expected != actual:
+                report.diffs.append(
+                    ReplayDiff(record.id, record.provider, expected, actual)
+                )
+    return report
@@ -0,0 +1,145 @@
+"""Parser request OtomaX (query-string / form-urlencoded) langsung dari bytes.
+
+Dipakai di hot path transaksi: input berupa `request.scope["query_string"]`
+atau body form mentah, jadi tidak perlu lewat `QueryParams` / pydantic.
+
+- key case-insensitive (`memberID` == `memberid`), key yang tidak dikenal di-skip,
+- `unquote` hanya dijalankan kalau value memang mengandung `%`. `+` mentah
+  dibaca sebagai `+` (bukan spasi), sama dengan fast path: OtomaX mengirim
+  `dest=+62...` tanpa encoding dan tidak ada field yang boleh berisi spasi,
+- validasi memakai regex yang sudah di-compile sekali di level modul,
+- hasil di-map ke `OtomaxRequest` (`__slots__`, tanpa `__dict__`).
+"""
+
+import re
+from typing import Any
+from urllib.parse import unquote
+
+from app.custom.exceptions.cst_exceptions import RequestParseError
+
+MEMBERID_PATTERN = r"[A-Za-z0-9_-]{1,10}"
+PRODUCT_PATTERN = r"[A-Za-z0-9_.-]{1,32}"
+DEST_PATTERN = r"\+?[A-Za-z0-9_.@-]{3,32}"
+REFID_PATTERN = r"[A-Za-z0-9_.:-]{1,64}"
+SIGN_PATTERN = r"[A-Za-z0-9_-]{27}"
+PIN_PATTERN = r"[A-Za-z0-9]{1,32}"
+PASSWORD_PATTERN = r"[^\s&]{1,128}"
+
+# key -> (slot, fullmatch validator). Key lowercase + casing standar OtomaX
+# supaya `lower()` hanya dipanggil untuk casing yang tidak umum.
+_FIELDS: dict[str, tuple[str, Any]] = {
+    slot: (slot, re.compile(pattern).fullmatch)
+    for slot, pattern in (
+        ("memberid", MEMBERID_PATTERN),
+        ("product", PRODUCT_PATTERN),
+        ("dest", DEST_PATTERN),
+        ("refid", REFID_PATTERN),
+        ("sign", SIGN_PATTERN),
+        ("pin", PIN_PATTERN),
+        ("password", PASSWORD_PATTERN),
+    )
+}
+_FIELDS["memberID"] = _FIELDS["memberid"]
+_FIELDS["refID"] = _FIELDS["refid"]
+_REQUIRED = ("memberid", "product", "dest", "refid")
+
+# Fast path: urutan standar OtomaX (memberID, product, dest, refID, sign)
+# divalidasi dengan satu fullmatch; selain itu jatuh ke parser generik.
+_CANONICAL = re.compile(
+    rf"(?i:memberid)=({MEMBERID_PATTERN})&product=({PRODUCT_PATTERN})"
+    rf"&dest=({DEST_PATTERN})&(?i:refid)=({REFID_PATTERN})"
+    rf"&sign=({SIGN_PATTERN})"
+).fullmatch
+
+
+class OtomaxRequest:
+    """Request transaksi OtomaX yang sudah tervalidasi."""
+
+    __slots__ = ("dest", "memberid", "password", "pin", "product", "refid", "sign")
+
+    def __init__(
+        self,
+        memberid: str,
+        product: str,
+        dest: str,
+        refid: str,
+        sign: str | None = None,
+        pin: str | None = None,
+        password: str | None = None,
+    ):
+        self.memberid = memberid
+        self.product = product
+        self.dest = dest
+        self.refid = refid
+        self.sign = sign
+        self.pin = pin
+        self.password = password
+
+    def as_dict(self) -> dict[str, str | None]:
+        """Dict untuk disimpan sebagai payload inbox (tanpa pin / password)."""
+        return {
+            "memberid": self.memberid,
+            "product": self.product,
+            "dest": self.dest,
+            "refid": self.refid,
+            "sign": self.sign,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, OtomaxRequest):
+            return NotImplemented
+        return all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"<OtomaxRequest memberid={self.memberid} product={self.product} "
+            f"dest={self.dest} refid={self.refid}>"
+        )
+
+
+def parse_otomax_request(raw: bytes) -> OtomaxRequest:
+    """Parse query-string / form body OtomaX mentah.
+
+    Bytes di-decode sekali (latin-1, tidak pernah gagal); request berurutan
+    standar selesai dalam satu regex, sisanya lewat `_parse_generic`.
+
+    Args:
+        raw: bytes seperti `b"memberID=X&product=Y&dest=0812..&refID=1&sign=..."`.
+
+    Returns:
+        OtomaxRequest: request yang sudah tervalidasi.
+
+    Raises:
+        RequestParseError: field wajib hilang atau format value tidak valid.
+    """
+    text = raw.decode("latin-1")
+    match = _CANONICAL(text)
+    if match is not None:
+        return OtomaxRequest(*match.groups())
+    return _parse_generic(text)
+
+
+def _parse_generic(text: str) -> OtomaxRequest:
+    values: dict[str, str] = {}
+    for pair in text.split("&"):
+        key, _, value = pair.partition("=")
+        field = _FIELDS.get(key) or _FIELDS.get(key.lower())
+        if field is None:
+            continue
+        slot, validate = field
+        if "%" in value:
+            value = unquote(value, encoding="latin-1")
+        if validate(value) is None:
+            raise RequestParseError(
+                f"Invalid value for '{slot}'", context={"field": slot}
+            )
+        values[slot] = value
+    missing = [name for name in _REQUIRED if name not in values]
+    if missing:
+        raise RequestParseError(
+            f"Missing required field(s): {', '.join(missing)}",
+            context={"missing": missing},
+        )
+    return OtomaxRequest(**values)
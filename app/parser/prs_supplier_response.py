@@ -0,0 +1,373 @@
+"""Rule engine parser response supplier, di-compile dari `supplier_rules.yaml`.
+
+Per provider (lihat `ProviderEnums`) rule dideklarasikan di YAML:
+
+- `json`: path dot-separated untuk body JSON (`data.sn`, `items.0.sn`),
+- `regex`: extractor dengan named group `status` / `sn` / `price` / `message`,
+- `keywords`: status -> keyword (case-insensitive),
+- `status_map`: normalisasi kode / teks status mentah,
+- `status_check`: spesifikasi request cek status (lihat `StatusPoller`).
+
+Regex satu provider digabung menjadi satu pattern alternation
+(`(?P<_r0>...)|(?P<_r1>...)|...`), keyword menjadi pattern alternation kedua
+(`(?P<_k0>...)|...`); body di-scan sekali per pattern dan rule yang match
+dikenali dari `match.lastgroup`. Keyword sengaja di-scan terpisah: `finditer`
+tidak overlap, jadi di satu pattern gabungan extractor seperti `Ket: (?P<message>...)`
+akan "menelan" keyword status di dalamnya. Setiap rule punya hit counter untuk
+mencari rule yang mati; `profile()` mengukur biaya tiap rule sendiri-sendiri.
+"""
+
+import json
+import re
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from app.config import get_settings
+from app.custom.exceptions.cst_exceptions import SupplierRuleError
+from app.mlogg import logger
+from app.schemas.sch_transaction import TransactionStatus
+
+FIELDS = ("status", "sn", "price", "message")
+_GROUP_RE = re.compile(r"\(\?P(?P<kind>[<=])(?P<name>\w+)")
+_DECIMALS_RE = re.compile(r"[.,]\d{2}$")
+
+
+def _to_price(value: Any) -> int | None:
+    """Normalisasi harga ke rupiah (int): `10.500` / `10,500` / `10500.00`."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int | float):
+        return int(value)
+    text = _DECIMALS_RE.sub("", str(value).strip())
+    digits = text.replace(".", "").replace(",", "")
+    return int(digits) if digits.isdigit() else None
+
+
+class SupplierParseResult:
+    """Hasil klasifikasi satu response supplier."""
+
+    __slots__ = ("message", "price", "rules", "sn", "status")
+
+    def __init__(
+        self,
+        status: TransactionStatus | None = None,
+        sn: str | None = None,
+        price: int | None = None,
+        message: str | None = None,
+        rules: tuple[str, ...] = (),
+    ):
+        self.status = status
+        self.sn = sn
+        self.price = price
+        self.message = message
+        self.rules = rules
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "status": self.status.value if self.status else None,
+            "sn": self.sn,
+            "price": self.price,
+            "message": self.message,
+            "rules": list(self.rules),
+        }
+
+    def __repr__(self) -> str:
+        return f"<SupplierParseResult status={self.status} sn={self.sn} price={self.price}>"
+
+
+class ProviderRules:
+    """Rule satu provider: pattern gabungan extractor + pattern gabungan keyword."""
+
+    def __init__(self, provider: str, spec: Mapping[str, Any]):
+        self.provider = provider
+        self.status_map: dict[str, TransactionStatus] = {}
+        for raw, status in (spec.get("status_map") or {}).items():
+            self.status_map[str(raw).lower()] = self._status(status)
+
+        # json: (field, rule_name, path tuple)
+        self.json_rules: list[tuple[str, str, tuple[str, ...]]] = []
+        for field, paths in (spec.get("json") or {}).items():
+            self._check_field(field)
+            for path in [paths] if isinstance(paths, str) else paths:
+                self.json_rules.append(
+                    (field, f"json:{field}:{path}", tuple(str(path).split(".")))
+                )
+
+        extractors: list[str] = []
+        keywords: list[str] = []
+        # group wrapper -> (rule_name, [(field, inner group)] atau status keyword)
+        self._regex_groups: dict[str, tuple[str, list[tuple[str, str]]]] = {}
+        self._keyword_groups: dict[str, tuple[str, TransactionStatus, int]] = {}
+        self._sources: dict[str, str] = {}
+        for idx, rule in enumerate(spec.get("regex") or []):
+            name = f"regex:{rule.get('name', idx)}"
+            wrapper = f"_r{idx}"
+            source, groups = self._rename_groups(name, idx, rule.get("pattern", ""))
+            extractors.append(f"(?P<{wrapper}>{source})")
+            self._regex_groups[wrapper] = (name, groups)
+            self._sources[name] = rule.get("pattern", "")
+        for rank, (status, words) in enumerate((spec.get("keywords") or {}).items()):
+            wrapper = f"_k{rank}"
+            name = f"keyword:{status}"
+            words = [words] if isinstance(words, str) else list(words)
+            body = "|".join(
+                re.escape(str(w)) for w in sorted(words, key=len, reverse=True)
+            )
+            source = rf"(?i:(?<!\w)(?:{body})(?!\w))"
+            keywords.append(f"(?P<{wrapper}>{source})")
+            self._keyword_groups[wrapper] = (name, self._status(status), rank)
+            self._sources[name] = source
+        try:
+            self._extractors = re.compile("|".join(extractors)) if extractors else None
+            self._keywords = re.compile("|".join(keywords)) if keywords else None
+        except re.error as e:
+            raise SupplierRuleError(
+                f"Invalid rules for provider '{provider}'",
+                context={"provider": provider},
+                cause=e,
+            ) from e
+        self.hits: dict[str, int] = dict.fromkeys(self.rule_names(), 0)
+        self.responses = 0
+        self.status_check = self._status_check(spec.get("status_check"))
+
+    def _status_check(self, spec: Any) -> dict[str, Any] | None:
+        if spec is None:
+            return None
+        batch = spec.get("batch") if isinstance(spec, Mapping) else None
+        if not isinstance(spec, Mapping) or (
+            batch is not None
+            and not (isinstance(batch, Mapping) and batch.get("param"))
+        ):
+            raise SupplierRuleError(
+                f"Invalid status_check for provider '{self.provider}'",
+                context={"provider": self.provider},
+            )
+        return dict(spec)
+
+    def _check_field(self, field: str) -> None:
+        if field not in FIELDS:
+            raise SupplierRuleError(
+                f"Unknown field '{field}' in rules for provider '{self.provider}'",
+                context={"provider": self.provider, "field": field},
+            )
+
+    def _status(self, value: Any) -> TransactionStatus:
+        try:
+            return TransactionStatus(str(value).lower())
+        except ValueError as e:
+            raise SupplierRuleError(
+                f"Unknown status '{value}' in rules for provider '{self.provider}'",
+                context={"provider": self.provider},
+                cause=e,
+            ) from e
+
+    def _rename_groups(
+        self, name: str, idx: int, pattern: str
+    ) -> tuple[str, list[tuple[str, str]]]:
+        """Rename named group (`sn` -> `_r0_sn`) supaya unik di pattern gabungan."""
+        try:
+            fields = list(re.compile(pattern).groupindex)
+        except re.error as e:
+            raise SupplierRuleError(
+                f"Invalid regex rule '{name}' for provider '{self.provider}'",
+                context={"provider": self.provider, "rule": name},
+                cause=e,
+            ) from e
+        for field in fields:
+            self._check_field(field)
+        source = _GROUP_RE.sub(lambda m: f"(?P{m['kind']}_r{idx}_{m['name']}", pattern)
+        return source, [(field, f"_r{idx}_{field}") for field in fields]
+
+    def rule_names(self) -> list[str]:
+        return (
+            [name for _, name, _ in self.json_rules]
+            + [name for name, _ in self._regex_groups.values()]
+            + [name for name, _, _ in self._keyword_groups.values()]
+        )
+
+    @staticmethod
+    def _lookup(data: Any, path: tuple[str, ...]) -> Any:
+        for key in path:
+            if isinstance(data, Mapping):
+                data = data.get(key)
+            elif isinstance(data, list) and key.isdigit() and int(key) < len(data):
+                data = data[int(key)]
+            else:
+                return None
+        return data
+
+    def _map_status(self, raw: Any) -> TransactionStatus | None:
+        if raw is None:
+            return None
+        return self.status_map.get(str(raw).strip().lower())
+
+    def _extract_json(
+        self, text: str, values: dict[str, Any], matched: list[str]
+    ) -> None:
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return
+        hits = self.hits
+        for field, name, path in self.json_rules:
+            if field in values:
+                continue
+            value = self._lookup(data, path)
+            if value is not None and value != "":
+                values[field] = value
+                hits[name] += 1
+                matched.append(name)
+
+    def _scan(self, text: str, values: dict[str, Any], matched: list[str]) -> None:
+        """Satu kali `finditer` atas pattern gabungan semua extractor regex."""
+        hits = self.hits
+        for m in self._extractors.finditer(text):  # type: ignore[union-attr]
+            name, groups = self._regex_groups[m.lastgroup]  # type: ignore[index]
+            for field, group in groups:
+                if field not in values and m.group(group):
+                    values[field] = m.group(group)
+            hits[name] += 1
+            matched.append(name)
+
+    def _scan_keywords(self, text: str, matched: list[str]) -> TransactionStatus | None:
+        """Satu kali `finditer` atas pattern gabungan keyword; status rank terkecil."""
+        hits = self.hits
+        keyword_status: TransactionStatus | None = None
+        keyword_rank = len(self._keyword_groups)
+        for m in self._keywords.finditer(text):  # type: ignore[union-attr]
+            name, status, rank = self._keyword_groups[m.lastgroup]  # type: ignore[index]
+            if rank < keyword_rank:
+                keyword_status, keyword_rank = status, rank
+            hits[name] += 1
+            matched.append(name)
+        return keyword_status
+
+    def parse(self, body: str | bytes) -> SupplierParseResult:
+        text = body.decode("utf-8", "replace") if isinstance(body, bytes) else body
+        self.responses += 1
+        values: dict[str, Any] = {}
+        matched: list[str] = []
+        if self.json_rules and text.lstrip()[:1] in ("{", "["):
+            self._extract_json(text, values, matched)
+        if self._extractors is not None:
+            self._scan(text, values, matched)
+        keyword_status = None
+        if self._keywords is not None:
+            keyword_status = self._scan_keywords(text, matched)
+
+        status = self._map_status(values.get("status")) or keyword_status
+        sn = values.get("sn")
+        message = values.get("message")
+        return SupplierParseResult(
+            status=status,
+            sn=str(sn) if sn is not None else None,
+            price=_to_price(values.get("price")),
+            message=str(message).strip() if message is not None else None,
+            rules=tuple(dict.fromkeys(matched)),
+        )
+
+    def records(self, body: str | bytes, path: str) -> list[Any]:
+        """List record dari body JSON batch (path dot-separated, "" = root)."""
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return []
+        found = self._lookup(data, tuple(path.split("."))) if path else data
+        return found if isinstance(found, list) else []
+
+    def parse_record(self, record: Any) -> SupplierParseResult:
+        """Parse satu record hasil status batch dengan rule yang sama."""
+        return self.parse(json.dumps(record, ensure_ascii=False))
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [
+            {"provider": self.provider, "rule": name, "hits": hits}
+            for name, hits in self.hits.items()
+        ]
+
+    def profile(self, samples: Iterable[str]) -> dict[str, float]:
+        """Biaya rata-rata (mikrodetik / response) tiap regex/keyword rule sendiri."""
+        texts = list(samples)
+        cost: dict[str, float] = {}
+        if not texts:
+            return cost
+        for name, source in self._sources.items():
+            pattern = re.compile(source)
+            start = time.perf_counter()
+            for text in texts:
+                for _ in pattern.finditer(text):
+                    pass
+            cost[name] = (time.perf_counter() - start) / len(texts) * 1e6
+        return cost
+
+
+class SupplierRuleEngine:
+    """Registry `ProviderRules` per provider, di-load dari YAML."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path or get_settings().SUPPLIER_RULES_PATH)
+        self._providers: dict[str, ProviderRules] = {}
+        self._lock = threading.Lock()
+        self.log = logger.bind(service="SupplierRuleEngine")
+
+    def load(self, data: Mapping[str, Any] | None = None) -> int:
+        """Compile ulang semua rule (dari file, atau `data` kalau diberikan)."""
+        with self._lock:
+            if data is None:
+                try:
+                    with self.path.open(encoding="utf-8") as f:
+                        data = yaml.safe_load(f) or {}
+                except (OSError, yaml.YAMLError) as e:
+                    raise SupplierRuleError(
+                        "Failed to read supplier rules",
+                        context={"path": str(self.path)},
+                        cause=e,
+                    ) from e
+            providers = data.get("providers")
+            if not isinstance(providers, Mapping):
+                raise SupplierRuleError("Supplier rules must define 'providers'")
+            self._providers = {
+                str(name).upper(): ProviderRules(str(name).upper(), spec or {})
+                for name, spec in providers.items()
+            }
+        self.log.info("Supplier rules loaded", providers=sorted(self._providers))
+        return len(self._providers)
+
+    def get(self, provider: str) -> ProviderRules:
+        if not self._providers:
+            self.load()
+        rules = self._providers.get(str(provider).upper())
+        if rules is None:
+            raise SupplierRuleError(
+                f"No rules for provider '{provider}'", context={"provider": provider}
+            )
+        return rules
+
+    def __contains__(self, provider: str) -> bool:
+        if not self._providers:
+            self.load()
+        return str(provider).upper() in self._providers
+
+    def parse(self, provider: str, body: str | bytes) -> SupplierParseResult:
+        return self.get(provider).parse(body)
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [row for rules in self._providers.values() for row in rules.stats()]
+
+    def dead_rules(self) -> list[dict[str, Any]]:
+        """Rule yang belum pernah match (hanya provider yang sudah menerima response)."""
+        return [
+            row
+            for rules in self._providers.values()
+            if rules.responses
+            for row in rules.stats()
+            if row["hits"] == 0
+        ]
+
+
+supplier_rules = SupplierRuleEngine()
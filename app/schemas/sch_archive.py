@@ -0,0 +1,38 @@
+"""schemas untuk arsip bulanan transaksi selesai + lookup riwayat."""
+
+from datetime import datetime
+from decimal import Decimal
+
+from pydantic import BaseModel, Field
+
+
+class ArchiveRunResult(BaseModel):
+    """Hasil satu putaran archiver (semua batch sampai tidak ada sisa)."""
+
+    cutoff: datetime
+    batches: int = 0
+    transactions: int = 0
+    outbox: int = 0
+    inbox: int = 0
+    # transaksi + inbox tanpa transaksi yang dipindah per bulan ("2026-07": 1200)
+    months: dict[str, int] = Field(default_factory=dict)
+    seconds: float = 0.0
+
+
+class TransactionRecord(BaseModel):
+    """Satu transaksi dari tabel aktif atau dari file arsip bulanan."""
+
+    id: int
+    inbox_id: int | None = None
+    memberid: str | None = None
+    refid: str | None = None
+    product: str | None = None
+    dest: str | None = None
+    moduleid: str | None = None
+    amount: Decimal | None = None
+    sn: str | None = None
+    status: str
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    # "live" = tabel aktif, selain itu bulan arsip ("2026-07")
+    source: str = "live"
@@ -0,0 +1,43 @@
+"""schemas untuk bulk loader member / module (YAML, CSV, NDJSON)."""
+
+from enum import StrEnum
+
+from pydantic import BaseModel, Field
+
+
+class BulkLoadKind(StrEnum):
+    MEMBERS = "members"
+    MODULES = "modules"
+
+
+class BulkFormat(StrEnum):
+    YAML = "yaml"
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class BulkRowIssue(BaseModel):
+    """Satu row yang di-skip: duplikat di file atau gagal validasi.
+
+    `row` adalah nomor baris di file (YAML / CSV / NDJSON), 1-based.
+    """
+
+    row: int
+    key: str | None = None
+    detail: str
+
+
+class BulkLoadReport(BaseModel):
+    kind: BulkLoadKind
+    format: BulkFormat
+    dry_run: bool = False
+    total: int = 0
+    valid: int = 0
+    created: int = 0
+    updated: int = 0
+    duplicate_count: int = 0
+    invalid_count: int = 0
+    seconds: float = 0.0
+    # dibatasi BULK_LOAD_REPORT_LIMIT; jumlah lengkap ada di *_count
+    duplicates: list[BulkRowIssue] = Field(default_factory=list)
+    invalid: list[BulkRowIssue] = Field(default_factory=list)
@@ -0,0 +1,37 @@
+"""schemas untuk callback status transaksi ke Member.report_url."""
+
+from enum import StrEnum
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class CallbackStatus(StrEnum):
+    PENDING = "pending"
+    CLAIMED = "claimed"
+    DELIVERED = "delivered"
+    FAILED = "failed"
+    # digantikan callback pending yang lebih baru untuk (memberid, refid) sama
+    SUPERSEDED = "superseded"
+
+
+class CallbackClaim(BaseModel):
+    """Row callback yang sudah di-claim oleh delivery engine."""
+
+    id: int
+    memberid: str
+    report_url: str
+    payload: dict[str, Any] | None = None
+    attempts: int = 0
+    enqueued_at: float
+
+    model_config = {"from_attributes": True}
+
+
+class CallbackResult(BaseModel):
+    """Hasil satu percobaan delivery, ditulis balik secara batch."""
+
+    id: int
+    ok: bool
+    error: str | None = None
+    next_attempt_at: float | None = None
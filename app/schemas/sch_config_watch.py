@@ -0,0 +1,28 @@
+"""schemas untuk hot reload konfigurasi member / module."""
+
+from pydantic import BaseModel
+
+
+class ConfigReloadResult(BaseModel):
+    """Hasil satu reload: `version` hanya naik kalau ada yang berubah."""
+
+    version: int
+    changed: bool
+    sources: dict[str, int]
+    members: int
+    modules: int
+    members_changed: int = 0
+    members_removed: int = 0
+    modules_changed: int = 0
+    modules_removed: int = 0
+    seconds: float = 0.0
+
+
+class ConfigWatchState(BaseModel):
+    version: int
+    sources: dict[str, int]
+    members: int
+    modules: int
+    loaded_at: float | None = None
+    data_version: int | None = None
+    last_reload: ConfigReloadResult | None = None
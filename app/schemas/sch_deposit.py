@@ -0,0 +1,44 @@
+"""schemas untuk tiket deposit & konfirmasi pembayaran."""
+
+from enum import StrEnum
+
+from pydantic import BaseModel, Field
+
+
+class DepositTicketStatus(StrEnum):
+    PENDING = "pending"
+    PAID = "paid"
+    EXPIRED = "expired"
+
+
+class DepositTicketPublic(BaseModel):
+    """Tiket deposit yang dikembalikan ke member."""
+
+    id: str
+    memberid: str
+    amount: int
+    transfer_amount: int
+    status: DepositTicketStatus
+    expires_at: float
+
+    model_config = {"from_attributes": True}
+
+
+class DepositPayment(BaseModel):
+    """Pembayaran terkonfirmasi (mutasi bank / payment gateway).
+
+    Dicocokkan ke tiket pending lewat `ticket_id` kalau ada, selain itu lewat
+    `amount` == nominal transfer tiket. `payment_ref` unik per pembayaran.
+    """
+
+    payment_ref: str = Field(..., min_length=1, max_length=64)
+    amount: int = Field(..., gt=0)
+    ticket_id: str | None = None
+
+
+class DepositConfirmResult(BaseModel):
+    """Hasil satu batch konfirmasi."""
+
+    credited: list[str] = Field(default_factory=list)
+    duplicate: list[str] = Field(default_factory=list)
+    unmatched: list[str] = Field(default_factory=list)
@@ -0,0 +1,33 @@
+"""schemas untuk saldo member & jurnal ledger."""
+
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+
+class LedgerKind(StrEnum):
+    DEBIT = "debit"
+    CREDIT = "credit"
+    REFUND = "refund"
+    DEPOSIT = "deposit"
+    ADJUSTMENT = "adjustment"
+
+
+class LedgerPosting(BaseModel):
+    """Hasil satu mutasi saldo."""
+
+    memberid: str
+    kind: LedgerKind
+    amount: int
+    balance_after: int
+    ref: str | None = None
+
+
+class LedgerCredit(BaseModel):
+    """Satu credit dalam batch; `ref` wajib karena jadi kunci idempotensi."""
+
+    memberid: str
+    amount: int
+    ref: str
+    kind: LedgerKind = LedgerKind.CREDIT
+    note: str | None = None
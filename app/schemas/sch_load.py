@@ -0,0 +1,27 @@
+"""schemas untuk load shedding (admission global berdasarkan beban proses)."""
+
+from enum import IntEnum, StrEnum
+
+from pydantic import BaseModel
+
+
+class WorkPriority(StrEnum):
+    LOW = "low"
+    NORMAL = "normal"
+
+
+class ShedLevel(IntEnum):
+    """0 = terima semua, 1 = tolak prioritas rendah, 2 = tolak semua kerja baru."""
+
+    NORMAL = 0
+    SHED_LOW = 1
+    SHED_ALL = 2
+
+
+class LoadSnapshot(BaseModel):
+    level: ShedLevel
+    queue_depth: int
+    backlog: int = 0
+    loop_lag: float
+    db_write_wait: float
+    signals: dict[str, ShedLevel]
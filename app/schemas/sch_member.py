@@ -1,3 +1,5 @@
+from enum import StrEnum
+
 from pydantic import AnyHttpUrl, BaseModel, Field, IPvAnyAddress
 
 
@@ -17,6 +19,15 @@ class MemberBase(BaseModel):
     allow_nosign: bool = Field(
         default=False, description="Apakah member bisa hit tanpa signature"
     )
+    max_inflight: int | None = Field(
+        default=None, ge=1, description="Maks transaksi berjalan bersamaan"
+    )
+    rate_limit: float | None = Field(
+        default=None, ge=0, description="Transaksi per detik (0 = tanpa batas)"
+    )
+    rate_burst: int | None = Field(
+        default=None, ge=1, description="Burst token bucket rate limit"
+    )
     model_config = {
         "from_attributes": True,
         "str_strip_whitespace": True,
@@ -52,9 +63,30 @@ class MemberUpdate(BaseModel):
     ipaddress: IPvAnyAddress | None = None
     report_url: AnyHttpUrl | None = None
     allow_nosign: bool | None = None
+    max_inflight: int | None = None
+    rate_limit: float | None = None
+    rate_burst: int | None = None
 
     model_config = {
         "from_attributes": True,
         "str_strip_whitespace": True,
         "populate_by_name": True,
     }
+
+
+class MemberLimits(BaseModel):
+    """Limit admission satu member (None = default settings)."""
+
+    memberid: str
+    max_inflight: int | None = None
+    rate_limit: float | None = None
+    rate_burst: int | None = None
+
+    model_config = {"from_attributes": True}
+
+
+class AdmissionVerdict(StrEnum):
+    ADMITTED = "admitted"
+    INFLIGHT_LIMIT = "inflight_limit"
+    RATE_LIMIT = "rate_limit"
+    UNKNOWN_MEMBER = "unknown_member"
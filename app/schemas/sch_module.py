@@ -77,6 +77,15 @@ class ModuleCreate(BaseModel):
     model_config = ConfigDict(extra="forbid", use_enum_values=False)
 
 
+class ModuleImport(ModuleCreate):
+    """Row module dari file bulk load (`modules.yaml`): moduleid ikut di row."""
+
+    moduleid: str = Field(
+        description="ID unik untuk module", min_length=5, pattern=r"^[a-zA-Z0-9]*$"
+    )
+    is_active: bool = True
+
+
 class ModuleUpdate(BaseModel):
     name: str | None = None
     provider: ProviderEnums | None = None
@@ -107,3 +116,23 @@ class ModuleUpdate(BaseModel):
 
 class ModuleDelete(BaseModel):
     moduleid: str
+
+
+class BreakerState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class ModuleHealth(BaseModel):
+    """State circuit breaker + adaptive limit satu module (endpoint admin)."""
+
+    moduleid: str
+    state: BreakerState
+    error_rate: float
+    window_requests: int
+    open_remaining: float
+    concurrency_limit: float
+    in_flight: int
+    shed_count: int
+    ewma_latency: float | None = None
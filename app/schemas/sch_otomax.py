@@ -0,0 +1,25 @@
+"""schemas pydantic untuk request OtomaX.
+
+Padanan `app.parser.OtomaxRequest` lewat jalur pydantic; dipakai untuk
+dokumentasi OpenAPI dan sebagai baseline benchmark parser.
+"""
+
+from pydantic import BaseModel, Field
+
+from app.parser import prs_otomax_request as prs
+
+
+def _pattern(raw: str) -> str:
+    return f"^{raw}$"
+
+
+class OtomaxTrxRequest(BaseModel):
+    memberid: str = Field(..., pattern=_pattern(prs.MEMBERID_PATTERN))
+    product: str = Field(..., pattern=_pattern(prs.PRODUCT_PATTERN))
+    dest: str = Field(..., pattern=_pattern(prs.DEST_PATTERN))
+    refid: str = Field(..., pattern=_pattern(prs.REFID_PATTERN))
+    sign: str | None = Field(default=None, pattern=_pattern(prs.SIGN_PATTERN))
+    pin: str | None = Field(default=None, pattern=_pattern(prs.PIN_PATTERN))
+    password: str | None = Field(default=None, pattern=_pattern(prs.PASSWORD_PATTERN))
+
+    model_config = {"str_strip_whitespace": True}
@@ -0,0 +1,29 @@
+"""schemas untuk laporan rekonsiliasi harian per member / per module."""
+
+from datetime import date, datetime
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+
+class ReportFormat(StrEnum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ReconciliationSummary(BaseModel):
+    """Metadata satu laporan (tanpa baris per member / module)."""
+
+    day: date
+    # rentang created_at (UTC) yang dihitung: [start, end)
+    start: datetime
+    end: datetime
+    utc_offset_hours: float
+    # True = semua batch dibaca dari satu snapshot (DB mode WAL)
+    snapshot: bool
+    sources: list[str]
+    batches: int = 0
+    transactions: int = 0
+    members: int = 0
+    modules: int = 0
+    seconds: float = 0.0
@@ -0,0 +1,67 @@
+"""schemas untuk inbox / transaksi / outbox."""
+
+from enum import StrEnum
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class InboxStatus(StrEnum):
+    RECEIVED = "received"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class TransactionStatus(StrEnum):
+    PENDING = "pending"
+    SUCCESS = "success"
+    FAILED = "failed"
+    REFUNDED = "refunded"
+
+
+class OutboxStatus(StrEnum):
+    PENDING = "pending"
+    CLAIMED = "claimed"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class OutboxClaim(BaseModel):
+    """Row outbox yang sudah di-claim oleh satu dispatcher (hasil RETURNING)."""
+
+    id: int
+    transaction_id: int | None = None
+    moduleid: str
+    supplier_request: dict[str, Any] | None = None
+    attempts: int = 0
+
+    model_config = {"from_attributes": True}
+
+
+class OutboxResult(BaseModel):
+    """Hasil dispatch satu row outbox, ditulis balik secara batch."""
+
+    id: int
+    ok: bool
+    supplier_response: dict[str, Any] | None = None
+    error: str | None = None
+
+
+class PendingTransaction(BaseModel):
+    """Transaksi pending yang dilacak timer wheel (status check / final timeout)."""
+
+    id: int
+    moduleid: str | None = None
+    created_at: float
+    refid: str | None = None
+    inbox_id: int | None = None
+
+
+class TransactionStatusUpdate(BaseModel):
+    """Status final hasil status check, ditulis balik satu batch sekaligus."""
+
+    id: int
+    status: TransactionStatus
+    sn: str | None = None
+    inbox_id: int | None = None
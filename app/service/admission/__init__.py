@@ -0,0 +1,19 @@
+from app.service.admission.srv_load_shedder import (
+    LoadShedder,
+    load_shedder,
+    work_backlog,
+)
+from app.service.admission.srv_member_admission import (
+    MemberAdmission,
+    MemberSlot,
+    member_admission,
+)
+
+__all__ = [
+    "LoadShedder",
+    "MemberAdmission",
+    "MemberSlot",
+    "load_shedder",
+    "member_admission",
+    "work_backlog",
+]
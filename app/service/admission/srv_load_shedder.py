@@ -0,0 +1,244 @@
+"""Load shedding global berdasarkan beban proses.
+
+Saat backlog naik, latency naik untuk semua member sampai OtomaX timeout lalu
+retry (beban makin besar). `LoadShedder` memantau tiga sinyal:
+
+- queue depth: kerja transaksi yang sedang diproses (`track()`) ditambah
+  backlog worker (request inbox yang belum diproses + outbox pending / claimed,
+  di-sample tiap `SHED_BACKLOG_INTERVAL` lewat probe `work_backlog`); dicek
+  langsung di setiap `admit()`,
+- event-loop lag: keterlambatan bangun sampler task (EWMA),
+- DB write wait: rata-rata durasi statement tulis (`db_write_seconds`, diisi
+  hook engine) per interval sampling, EWMA. Di SQLite angka ini didominasi
+  waktu menunggu write lock.
+
+Tiap sinyal punya threshold soft (tolak prioritas rendah) dan hard (tolak semua
+kerja baru). Level turun lagi setelah sinyal di bawah `threshold * recovery`,
+supaya tidak flapping. Kerja yang sudah diterima tidak pernah dibatalkan.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager, suppress
+
+from app.config import get_settings
+from app.database.repositories.repo_outbox import SQLiteOutboxRepository
+from app.database.repositories.repo_transaction import SQLiteTransactionRepository
+from app.mlogg import logger
+from app.schemas.sch_load import LoadSnapshot, ShedLevel, WorkPriority
+from app.service.metrics import MetricsRegistry, metrics
+from app.service.outbox.srv_dispatcher import SessionFactory
+
+QUEUE = "queue_depth"
+LOOP_LAG = "loop_lag"
+DB_WAIT = "db_write_wait"
+DB_WRITE_METRIC = "db_write_seconds"
+
+BacklogProbe = Callable[[], Awaitable[int]]
+
+
+def work_backlog(session_factory: SessionFactory) -> BacklogProbe:
+    """Probe backlog worker: inbox received / processing + outbox pending / claimed."""
+
+    async def probe() -> int:
+        async with session_factory() as session:
+            inbox = await SQLiteTransactionRepository(session).inbox_backlog()
+            outbox = await SQLiteOutboxRepository(session).backlog()
+        return inbox + outbox
+
+    return probe
+
+
+class LoadShedder:
+    def __init__(
+        self,
+        *,
+        thresholds: dict[str, tuple[float, float]] | None = None,
+        interval: float | None = None,
+        recovery: float | None = None,
+        alpha: float | None = None,
+        enabled: bool | None = None,
+        backlog: BacklogProbe | None = None,
+        backlog_interval: float | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+        registry: MetricsRegistry | None = None,
+    ):
+        settings = get_settings()
+        self.thresholds = thresholds or {
+            QUEUE: (settings.SHED_QUEUE_SOFT, settings.SHED_QUEUE_HARD),
+            LOOP_LAG: (settings.SHED_LOOP_LAG_SOFT, settings.SHED_LOOP_LAG_HARD),
+            DB_WAIT: (settings.SHED_DB_WAIT_SOFT, settings.SHED_DB_WAIT_HARD),
+        }
+        self.interval = interval or settings.SHED_SAMPLE_INTERVAL
+        self.recovery = settings.SHED_RECOVERY_RATIO if recovery is None else recovery
+        self.alpha = alpha or settings.SHED_EWMA_ALPHA
+        self.enabled = settings.SHED_ENABLED if enabled is None else enabled
+        self.backlog_probe = backlog
+        self.backlog_interval = (
+            settings.SHED_BACKLOG_INTERVAL
+            if backlog_interval is None
+            else backlog_interval
+        )
+        self.low_priority = frozenset(
+            p.upper() for p in settings.SHED_LOW_PRIORITY_PRODUCTS
+        )
+        self.clock = clock
+        self.metrics = registry or metrics
+        self.in_flight = 0
+        self.backlog = 0
+        self.loop_lag = 0.0
+        self.db_write_wait = 0.0
+        self._levels = dict.fromkeys(self.thresholds, ShedLevel.NORMAL)
+        self._db_seen = (0, 0.0)
+        self._backlog_at: float | None = None
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+        self.log = logger.bind(service="LoadShedder")
+
+    # ---- sinyal -------------------------------------------------------------
+    def _signal(self, name: str, value: float) -> ShedLevel:
+        """Level satu sinyal dengan hysteresis terhadap level sebelumnya."""
+        soft, hard = self.thresholds[name]
+        current = self._levels[name]
+        if value >= hard:
+            level = ShedLevel.SHED_ALL
+        elif value >= soft:
+            level = ShedLevel.SHED_LOW
+        else:
+            level = ShedLevel.NORMAL
+        if level < current:
+            floor = hard if current is ShedLevel.SHED_ALL else soft
+            if value >= floor * self.recovery:
+                level = current
+        self._levels[name] = level
+        return level
+
+    def observe_loop_lag(self, lag: float) -> None:
+        self.loop_lag += self.alpha * (max(0.0, lag) - self.loop_lag)
+
+    def sample_db_wait(self) -> None:
+        """Rata-rata durasi write sejak sample sebelumnya -> EWMA."""
+        stats = self.metrics.latency(DB_WRITE_METRIC)
+        count, total = (stats.count, stats.total) if stats else (0, 0.0)
+        seen_count, seen_total = self._db_seen
+        self._db_seen = (count, total)
+        n = count - seen_count
+        # tanpa write di interval ini: wait dianggap 0 (antrean kosong)
+        avg = (total - seen_total) / n if n > 0 else 0.0
+        self.db_write_wait += self.alpha * (avg - self.db_write_wait)
+
+    async def sample_backlog(self) -> None:
+        """Hitung ulang backlog worker lewat probe (paling sering tiap interval)."""
+        if self.backlog_probe is None:
+            return
+        now = self.clock()
+        if (
+            self._backlog_at is not None
+            and now - self._backlog_at < self.backlog_interval
+        ):
+            return
+        self._backlog_at = now
+        try:
+            self.backlog = await self.backlog_probe()
+        except Exception as e:
+            # nilai lama tetap dipakai; sinyal lain tetap jalan
+            self.log.warning("Backlog probe failed", error=str(e))
+
+    @property
+    def queue_depth(self) -> int:
+        return self.in_flight + self.backlog
+
+    def evaluate(self) -> ShedLevel:
+        """Hitung ulang level dari semua sinyal lalu publish ke metrics."""
+        self._signal(LOOP_LAG, self.loop_lag)
+        self._signal(DB_WAIT, self.db_write_wait)
+        level = max(self._signal(QUEUE, self.queue_depth), *self._levels.values())
+        gauge = self.metrics.set_gauge
+        gauge("shed_level", int(level))
+        gauge("shed_queue_depth", self.queue_depth)
+        gauge("shed_backlog", self.backlog)
+        gauge("shed_loop_lag_seconds", round(self.loop_lag, 6))
+        gauge("shed_db_write_wait_seconds", round(self.db_write_wait, 6))
+        return level
+
+    @property
+    def level(self) -> ShedLevel:
+        return max(self._levels.values())
+
+    # ---- admission ----------------------------------------------------------
+    def priority_of(self, product: str) -> WorkPriority:
+        if product.upper() in self.low_priority:
+            return WorkPriority.LOW
+        return WorkPriority.NORMAL
+
+    def admit(self, priority: WorkPriority = WorkPriority.NORMAL) -> bool:
+        """True kalau kerja baru dengan prioritas ini boleh masuk."""
+        if not self.enabled:
+            return True
+        level = max(self._signal(QUEUE, self.queue_depth), self.level)
+        if level is ShedLevel.NORMAL or (
+            level is ShedLevel.SHED_LOW and priority is not WorkPriority.LOW
+        ):
+            return True
+        self.metrics.inc("shed_rejected", priority=priority.value, level=int(level))
+        return False
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Hitung kerja yang sedang diproses (queue depth)."""
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def snapshot(self) -> LoadSnapshot:
+        return LoadSnapshot(
+            level=self.level,
+            queue_depth=self.queue_depth,
+            backlog=self.backlog,
+            loop_lag=round(self.loop_lag, 6),
+            db_write_wait=round(self.db_write_wait, 6),
+            signals=dict(self._levels),
+        )
+
+    # ---- sampler ------------------------------------------------------------
+    async def run_forever(self) -> None:
+        self.log.info("Load shedder started", interval=self.interval)
+        previous = ShedLevel.NORMAL
+        while True:
+            started = self.clock()
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), self.interval)
+            if self._stop.is_set():
+                break
+            self.observe_loop_lag(self.clock() - started - self.interval)
+            self.sample_db_wait()
+            await self.sample_backlog()
+            level = self.evaluate()
+            if level != previous:
+                self.log.warning(
+                    "Load shed level changed",
+                    level=level.name,
+                    signals={k: v.name for k, v in self._levels.items()},
+                )
+                previous = level
+        self.log.info("Load shedder stopped")
+
+    def start(self, backlog: BacklogProbe | None = None) -> asyncio.Task:
+        if backlog is not None:
+            self.backlog_probe = backlog
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+
+load_shedder = LoadShedder()
@@ -0,0 +1,159 @@
+"""Admission control per member di depan handler transaksi OtomaX.
+
+Satu member yang membanjiri endpoint tidak boleh menghabiskan worker / koneksi
+DB untuk member lain. Tiap member punya satu slot kecil di tabel in-memory:
+
+- in-flight cap: jumlah transaksi yang sedang diproses bersamaan,
+- token bucket: `rate_limit` token per detik, maksimal `rate_burst` token.
+
+Limit diambil dari kolom `Member.max_inflight / rate_limit / rate_burst`
+(NULL = default settings `MEMBER_*`). `admit()` hanya cek counter di memori,
+jadi request yang ditolak dibalas "busy" tanpa menyentuh DB.
+"""
+
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from app.config import get_settings
+from app.mlogg import logger
+from app.schemas.sch_member import AdmissionVerdict, MemberLimits
+from app.service.metrics import MetricsRegistry, metrics
+
+_ADMITTED = AdmissionVerdict.ADMITTED
+
+
+class MemberSlot:
+    """State admission satu member."""
+
+    __slots__ = ("burst", "in_flight", "max_inflight", "rate", "stamp", "tokens")
+
+    def __init__(self, max_inflight: int, rate: float, burst: int, now: float):
+        self.max_inflight = max_inflight
+        self.rate = rate
+        self.burst = burst
+        self.in_flight = 0
+        self.tokens = float(burst)
+        self.stamp = now
+
+    def configure(self, max_inflight: int, rate: float, burst: int) -> None:
+        """Ganti limit; in-flight dan token yang ada dipertahankan."""
+        self.max_inflight = max_inflight
+        self.rate = rate
+        self.burst = burst
+        self.tokens = min(self.tokens, float(burst))
+
+
+class MemberAdmission:
+    """Tabel admission per memberid (uppercase)."""
+
+    def __init__(
+        self,
+        *,
+        max_inflight: int | None = None,
+        rate: float | None = None,
+        burst: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        registry: MetricsRegistry | None = None,
+    ):
+        settings = get_settings()
+        self.default_max_inflight = max_inflight or settings.MEMBER_MAX_INFLIGHT
+        self.default_rate = settings.MEMBER_RATE_LIMIT if rate is None else rate
+        self.default_burst = burst or settings.MEMBER_RATE_BURST
+        self.clock = clock
+        self.metrics = registry or metrics
+        self._slots: dict[str, MemberSlot] = {}
+        self.log = logger.bind(service="MemberAdmission")
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, memberid: str) -> bool:
+        return memberid.upper() in self._slots
+
+    def _limits(self, limits: MemberLimits) -> tuple[int, float, int]:
+        return (
+            limits.max_inflight or self.default_max_inflight,
+            self.default_rate if limits.rate_limit is None else limits.rate_limit,
+            limits.rate_burst or self.default_burst,
+        )
+
+    def configure(self, limits: MemberLimits) -> None:
+        """Tambah / update limit satu member."""
+        key = limits.memberid.upper()
+        slot = self._slots.get(key)
+        if slot is None:
+            self._slots[key] = MemberSlot(*self._limits(limits), now=self.clock())
+        else:
+            slot.configure(*self._limits(limits))
+
+    def load(self, members: Iterable[MemberLimits]) -> int:
+        """Set ulang tabel dari daftar member aktif. Return jumlah member.
+
+        Member yang masih ada mempertahankan counter-nya; member yang hilang
+        (nonaktif / dihapus) dibuang, request berikutnya ditolak.
+        """
+        keep: set[str] = set()
+        for limits in members:
+            self.configure(limits)
+            keep.add(limits.memberid.upper())
+        for key in [k for k in self._slots if k not in keep]:
+            del self._slots[key]
+        self.log.info("Member admission table loaded", members=len(self._slots))
+        return len(self._slots)
+
+    def remove(self, memberid: str) -> None:
+        self._slots.pop(memberid.upper(), None)
+
+    def admit(self, memberid: str) -> AdmissionVerdict:
+        """Coba ambil satu slot in-flight + satu token untuk member.
+
+        Kalau hasilnya `ADMITTED`, caller wajib memanggil `release()` setelah
+        transaksi selesai diproses.
+        """
+        slot = self._slots.get(memberid) or self._slots.get(memberid.upper())
+        if slot is None:
+            verdict = AdmissionVerdict.UNKNOWN_MEMBER
+        elif slot.in_flight >= slot.max_inflight:
+            verdict = AdmissionVerdict.INFLIGHT_LIMIT
+        elif slot.rate > 0 and not self._take_token(slot):
+            verdict = AdmissionVerdict.RATE_LIMIT
+        else:
+            slot.in_flight += 1
+            return _ADMITTED
+        self.metrics.inc("member_admission_rejected", reason=verdict.value)
+        return verdict
+
+    def _take_token(self, slot: MemberSlot) -> bool:
+        now = self.clock()
+        tokens = slot.tokens + (now - slot.stamp) * slot.rate
+        slot.stamp = now
+        if tokens > slot.burst:
+            tokens = float(slot.burst)
+        if tokens < 1.0:
+            slot.tokens = tokens
+            return False
+        slot.tokens = tokens - 1.0
+        return True
+
+    def release(self, memberid: str) -> None:
+        slot = self._slots.get(memberid) or self._slots.get(memberid.upper())
+        if slot is not None and slot.in_flight > 0:
+            slot.in_flight -= 1
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """State semua member (endpoint admin / debugging)."""
+        return [
+            {
+                "memberid": key,
+                "in_flight": slot.in_flight,
+                "max_inflight": slot.max_inflight,
+                "rate_limit": slot.rate,
+                "rate_burst": slot.burst,
+                "tokens": round(slot.tokens, 2),
+            }
+            for key, slot in sorted(self._slots.items())
+        ]
+
+
+member_admission = MemberAdmission()
@@ -0,0 +1,4 @@
+from app.service.archive.srv_archiver import TransactionArchiver
+from app.service.archive.srv_history import TransactionHistory
+
+__all__ = ["TransactionArchiver", "TransactionHistory"]
@@ -0,0 +1,201 @@
+"""Archiver bulanan transaksi selesai supaya tabel aktif tetap kecil.
+
+Transaksi final (success / failed / refunded) yang lebih tua dari
+`ARCHIVE_AFTER_DAYS` beserta outbox + inbox-nya dipindah ke file SQLite per
+bulan `created_at` (`ARCHIVE_DIR/transactions_YYYY_MM.db`). Inbox final tanpa
+transaksi (request ditolak / duplikat) ikut dipindah.
+
+Pemindahan dilakukan per batch kecil (`ARCHIVE_BATCH_SIZE`): satu transaksi
+SQLite pendek per batch lalu jeda `ARCHIVE_BATCH_PAUSE`, jadi lock tulis tidak
+pernah ditahan lama dan request transaksi tetap bisa menulis di sela batch.
+Transaksi yang outbox-nya masih pending / claimed tidak disentuh.
+"""
+
+import asyncio
+import re
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+from itertools import groupby
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.config import get_settings
+from app.database.repositories.repo_archive import (
+    ArchiveCounts,
+    SQLiteArchiveRepository,
+)
+from app.mlogg import logger
+from app.schemas.sch_archive import ArchiveRunResult
+from app.service.metrics import MetricsRegistry, metrics
+
+ARCHIVE_SCHEMA = "archive"
+_FILE_RE = re.compile(r"transactions_(\d{4})_(\d{2})\.db")
+
+BatchFetcher = Callable[[datetime, int], Awaitable[list[tuple[int, str]]]]
+BatchMover = Callable[[str, Sequence[int]], Awaitable[ArchiveCounts]]
+
+
+def archive_path(archive_dir: Path, month: str) -> Path:
+    """Path file arsip untuk bulan `YYYY-MM`."""
+    return Path(archive_dir) / f"transactions_{month.replace('-', '_')}.db"
+
+
+def archive_months(archive_dir: Path) -> list[str]:
+    """Bulan (`YYYY-MM`) yang punya file arsip, urut terbaru dulu."""
+    months = []
+    for path in Path(archive_dir).glob("transactions_*.db"):
+        match = _FILE_RE.fullmatch(path.name)
+        if match:
+            months.append(f"{match[1]}-{match[2]}")
+    return sorted(months, reverse=True)
+
+
+def utc_naive(value: datetime) -> datetime:
+    """Datetime -> UTC naive (format `created_at` dari `func.now()` SQLite)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value
+
+
+class TransactionArchiver:
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        archive_dir: Path | None = None,
+        after_days: int | None = None,
+        batch_size: int | None = None,
+        pause: float | None = None,
+        interval: float | None = None,
+        registry: MetricsRegistry | None = None,
+    ):
+        settings = get_settings()
+        self.engine = engine
+        self.archive_dir = Path(archive_dir or settings.ARCHIVE_DIR)
+        self.after_days = (
+            settings.ARCHIVE_AFTER_DAYS if after_days is None else after_days
+        )
+        self.batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+        self.pause = settings.ARCHIVE_BATCH_PAUSE if pause is None else pause
+        self.interval = interval or settings.ARCHIVE_INTERVAL
+        self.metrics = registry or metrics
+        self._lock = asyncio.Lock()
+        # bulan yang file arsipnya sedang ter-ATTACH di koneksi archiver
+        self._attached: str | None = None
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.log = logger.bind(service="TransactionArchiver")
+
+    async def run_once(self, now: datetime | None = None) -> ArchiveRunResult:
+        """Arsipkan semua kandidat sampai habis (batch demi batch)."""
+        now = now or datetime.now(UTC)
+        cutoff = utc_naive(now) - timedelta(days=self.after_days)
+        result = ArchiveRunResult(cutoff=cutoff)
+        started = time.perf_counter()
+        async with self._lock:
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            async with self.engine.connect() as conn:
+                session = AsyncSession(bind=conn)
+                repo = SQLiteArchiveRepository(session)
+                try:
+                    await self._drain(
+                        repo, result, repo.final_batch, repo.move_transactions
+                    )
+                    await self._drain(
+                        repo, result, repo.orphan_inbox_batch, repo.move_inbox
+                    )
+                finally:
+                    await session.rollback()
+                    await self._detach(repo, conn)
+                    await session.close()
+        result.seconds = round(time.perf_counter() - started, 6)
+        if result.batches:
+            self.log.info(
+                "Transactions archived",
+                cutoff=str(cutoff),
+                transactions=result.transactions,
+                outbox=result.outbox,
+                inbox=result.inbox,
+                months=result.months,
+                seconds=result.seconds,
+            )
+        return result
+
+    async def _drain(
+        self,
+        repo: SQLiteArchiveRepository,
+        result: ArchiveRunResult,
+        fetch: BatchFetcher,
+        move: BatchMover,
+    ) -> None:
+        while not self._stop.is_set() and (
+            batch := await fetch(result.cutoff, self.batch_size)
+        ):
+            started = time.perf_counter()
+            for month, rows in groupby(batch, key=lambda row: row[1]):
+                if self._attached != month:
+                    # id naik seiring waktu: ganti file arsip jarang terjadi
+                    if self._attached is not None:
+                        await repo.detach(ARCHIVE_SCHEMA)
+                        self._attached = None
+                    path = archive_path(self.archive_dir, month)
+                    await repo.attach(path, ARCHIVE_SCHEMA)
+                    self._attached = month
+                ids = [row[0] for row in rows]
+                counts = await move(ARCHIVE_SCHEMA, ids)
+                result.transactions += counts.transactions
+                result.outbox += counts.outbox
+                result.inbox += counts.inbox
+                result.months[month] = result.months.get(month, 0) + len(ids)
+                for table, n in zip(ArchiveCounts._fields, counts, strict=True):
+                    if n:
+                        self.metrics.inc("archive_rows", n, table=table)
+            result.batches += 1
+            self.metrics.observe("archive_batch_seconds", time.perf_counter() - started)
+            # beri kesempatan writer lain mengambil lock tulis
+            await asyncio.sleep(self.pause)
+
+    async def _detach(
+        self, repo: SQLiteArchiveRepository, conn: AsyncConnection
+    ) -> None:
+        if self._attached is None:
+            return
+        try:
+            await repo.detach(ARCHIVE_SCHEMA)
+        except Exception:
+            # koneksi masih ter-ATTACH: jangan dikembalikan ke pool
+            self.log.exception("Archive detach failed")
+            await conn.invalidate()
+        self._attached = None
+
+    # ------------------------
+    # Background loop
+    # ------------------------
+    async def run_forever(self) -> None:
+        self.log.info("Archiver started", interval=self.interval)
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                self.log.exception("Archive run failed")
+                self.metrics.inc("archive_error")
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), self.interval)
+            if self._stop.is_set():
+                break
+        self.log.info("Archiver stopped")
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
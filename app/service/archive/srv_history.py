@@ -0,0 +1,130 @@
+"""Lookup riwayat transaksi member lintas tabel aktif + file arsip bulanan.
+
+Pemanggil tidak perlu tahu transaksi sudah diarsip atau belum: file arsip
+bulan yang masuk rentang `since` / `until` di-ATTACH ke satu koneksi lalu
+di-`UNION ALL` dengan tabel aktif. SQLite membatasi jumlah ATTACH per koneksi,
+jadi arsip dibaca per kelompok `ARCHIVE_ATTACH_LIMIT` bulan dari yang terbaru;
+kelompok yang lebih tua dilewati begitu `limit` row terbaru sudah pasti
+didapat.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.config import get_settings
+from app.database.repositories.repo_archive import SQLiteArchiveRepository
+from app.mlogg import logger
+from app.schemas.sch_archive import TransactionRecord
+from app.service.archive.srv_archiver import archive_months, archive_path, utc_naive
+
+
+class TransactionHistory:
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        archive_dir: Path | None = None,
+        attach_limit: int | None = None,
+    ):
+        settings = get_settings()
+        self.engine = engine
+        self.archive_dir = Path(archive_dir or settings.ARCHIVE_DIR)
+        self.attach_limit = attach_limit or settings.ARCHIVE_ATTACH_LIMIT
+        self.log = logger.bind(service="TransactionHistory")
+
+    def _months(self, since: datetime | None, until: datetime | None) -> list[str]:
+        months = archive_months(self.archive_dir)
+        if since is not None:
+            first = since.strftime("%Y-%m")
+            months = [m for m in months if m >= first]
+        if until is not None:
+            last = until.strftime("%Y-%m")
+            months = [m for m in months if m <= last]
+        return months
+
+    async def history(
+        self,
+        memberid: str,
+        *,
+        refid: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = 100,
+    ) -> list[TransactionRecord]:
+        """Transaksi member (terbaru dulu) dari tabel aktif + arsip."""
+        memberid = memberid.upper()
+        since = utc_naive(since) if since is not None else None
+        until = utc_naive(until) if until is not None else None
+        months = self._months(since, until)
+        records: list[TransactionRecord] = []
+        async with self.engine.connect() as conn:
+            session = AsyncSession(bind=conn)
+            repo = SQLiteArchiveRepository(session)
+            try:
+                records = await repo.history(
+                    [], memberid, refid=refid, since=since, until=until, limit=limit
+                )
+                for start in range(0, len(months), self.attach_limit):
+                    group = months[start : start + self.attach_limit]
+                    # row kelompok ini semuanya lebih tua dari row ke-`limit`
+                    # yang sudah didapat: kelompok berikutnya juga, selesai
+                    if len(records) >= limit and self._complete(records[-1], group[0]):
+                        break
+                    records = await self._read_group(
+                        repo, group, records, memberid, refid, since, until, limit
+                    )
+            finally:
+                await session.rollback()
+                await session.close()
+        return records
+
+    @staticmethod
+    def _complete(oldest: TransactionRecord, next_month: str) -> bool:
+        if oldest.created_at is None:
+            return False
+        created = utc_naive(oldest.created_at)
+        # row bulan `next_month` < awal bulan sesudahnya
+        year, month = map(int, next_month.split("-"))
+        end = datetime(year + month // 12, month % 12 + 1, 1)
+        return created >= end
+
+    async def _read_group(
+        self,
+        repo: SQLiteArchiveRepository,
+        months: list[str],
+        records: list[TransactionRecord],
+        memberid: str,
+        refid: str | None,
+        since: datetime | None,
+        until: datetime | None,
+        limit: int,
+    ) -> list[TransactionRecord]:
+        sources = [(f"arc{i}", month) for i, month in enumerate(months)]
+        attached: list[str] = []
+        try:
+            for schema, month in sources:
+                await repo.attach(
+                    archive_path(self.archive_dir, month), schema, create=False
+                )
+                attached.append(schema)
+            rows = await repo.history(
+                sources,
+                memberid,
+                refid=refid,
+                since=since,
+                until=until,
+                limit=limit,
+                include_live=False,
+            )
+        finally:
+            await repo.session.rollback()
+            for schema in attached:
+                await repo.detach(schema)
+        merged = sorted(
+            [*records, *rows],
+            key=lambda r: (r.created_at or datetime.min, r.id),
+            reverse=True,
+        )
+        return merged[:limit]
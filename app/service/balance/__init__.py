@@ -0,0 +1,3 @@
+from app.service.balance.srv_balance_cache import BalanceCache, balance_cache
+
+__all__ = ["BalanceCache", "balance_cache"]
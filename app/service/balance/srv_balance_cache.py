@@ -0,0 +1,103 @@
+"""Cache saldo member (TTL pendek, rupiah integer) untuk request cek saldo OtomaX.
+
+Member mengirim cek saldo berkali-kali per detik; tanpa cache setiap cek
+berarti satu query ke ledger. Cache ini:
+
+- entry per memberid dengan TTL `BALANCE_CACHE_TTL` detik,
+- miss konkuren untuk member yang sama di-coalesce (`SingleFlight`),
+- `invalidate(memberid)` dipanggil setiap write ke ledger: entry dibuang dan
+  generation dinaikkan, jadi load yang sedang berjalan (yang mungkin membaca
+  saldo sebelum write) tidak disimpan ke cache,
+- jumlah entry dibatasi `BALANCE_CACHE_MAX_ENTRIES` (yang paling lama dibuang).
+"""
+
+import time
+from collections.abc import Awaitable, Callable
+
+from app.config import get_settings
+from app.custom.cst_singleflight import SingleFlight
+from app.custom.exceptions.cst_exceptions import ServiceError
+from app.service.metrics import MetricsRegistry, metrics
+
+BalanceLoader = Callable[[str], Awaitable[int]]
+
+
+class BalanceCache:
+    """Cache read-through saldo per memberid."""
+
+    def __init__(
+        self,
+        loader: BalanceLoader | None = None,
+        *,
+        ttl: float | None = None,
+        max_entries: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        registry: MetricsRegistry | None = None,
+    ):
+        settings = get_settings()
+        self.loader = loader
+        self.ttl = settings.BALANCE_CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or settings.BALANCE_CACHE_MAX_ENTRIES
+        self.clock = clock
+        self.metrics = registry or metrics
+        # memberid -> (saldo, expires_at)
+        self._entries: dict[str, tuple[int, float]] = {}
+        self._generation: dict[str, int] = {}
+        self._flight: SingleFlight[str, int] = SingleFlight()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def bind(self, loader: BalanceLoader) -> None:
+        """Pasang loader saldo (dipanggil oleh ledger saat dibuat)."""
+        self.loader = loader
+
+    def peek(self, memberid: str) -> int | None:
+        """Saldo dari cache tanpa load (None kalau miss / expired)."""
+        entry = self._entries.get(memberid)
+        if entry is None or entry[1] <= self.clock():
+            return None
+        return entry[0]
+
+    async def get(self, memberid: str) -> int:
+        """Saldo member: dari cache kalau masih segar, selain itu satu load bersama."""
+        entry = self._entries.get(memberid)
+        if entry is not None and entry[1] > self.clock():
+            self.metrics.inc("balance_cache_hit")
+            return entry[0]
+        self.metrics.inc("balance_cache_miss")
+        return await self._flight.do(memberid, lambda: self._load(memberid))
+
+    async def _load(self, memberid: str) -> int:
+        if self.loader is None:
+            raise ServiceError("Balance cache has no loader bound")
+        generation = self._generation.get(memberid, 0)
+        balance = await self.loader(memberid)
+        # write ledger selama load: hasil ini mungkin basi, jangan di-cache
+        if self._generation.get(memberid, 0) == generation:
+            self._store(memberid, balance)
+        return balance
+
+    def _store(self, memberid: str, balance: int) -> None:
+        entries = self._entries
+        entries.pop(memberid, None)
+        if len(entries) >= self.max_entries:
+            now = self.clock()
+            for key in [k for k, (_, exp) in entries.items() if exp <= now]:
+                del entries[key]
+            while len(entries) >= self.max_entries:
+                del entries[next(iter(entries))]
+        entries[memberid] = (balance, self.clock() + self.ttl)
+
+    def invalidate(self, memberid: str) -> None:
+        """Buang entry member; dipanggil di setiap write ledger."""
+        self._entries.pop(memberid, None)
+        self._generation[memberid] = self._generation.get(memberid, 0) + 1
+        self._flight.forget(memberid)
+
+    def clear(self) -> None:
+        for memberid in list(self._entries):
+            self.invalidate(memberid)
+
+
+balance_cache = BalanceCache()
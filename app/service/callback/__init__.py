@@ -0,0 +1,7 @@
+from app.service.callback.srv_delivery import (
+    CallbackDeliveryEngine,
+    HostClientPool,
+    backoff_delay,
+)
+
+__all__ = ["CallbackDeliveryEngine", "HostClientPool", "backoff_delay"]
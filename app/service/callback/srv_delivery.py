@@ -0,0 +1,209 @@
+"""Callback delivery engine untuk `Member.report_url`.
+
+Worker transaksi cukup `enqueue` ke tabel callbacks (durable); pengiriman ke
+server member yang lambat dilakukan engine ini di background:
+
+- client HTTP pooled per host tujuan + cap konkurensi per host,
+- retry dengan exponential backoff + jitter,
+- metrics per member: delivered / failed, success rate, lag (enqueue → delivered),
+- satu batch dikirim di bawah deadline sepanjang lease; pengiriman yang belum
+  selesai saat lease habis di-abandon dan dijadwalkan ulang (row-nya bisa saja
+  sudah di-claim worker lain).
+"""
+
+import asyncio
+import random
+import time
+import uuid
+from contextlib import suppress
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import get_settings
+from app.custom.cst_deadline import deadline, deadline_scope
+from app.custom.exceptions.cst_exceptions import DeadlineExceededError
+from app.database.repositories.repo_callback import SQLiteCallbackRepository
+from app.mlogg import logger
+from app.schemas.sch_callback import CallbackClaim, CallbackResult
+from app.service.metrics import MetricsRegistry, metrics
+from app.service.outbox.srv_dispatcher import SessionFactory
+
+
+def backoff_delay(attempts: int, base: float, cap: float) -> float:
+    """Exponential backoff dengan equal jitter: d/2 + U(0, d/2), d = base * 2^(n-1)."""
+    delay = min(cap, base * (2 ** max(0, attempts - 1)))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class HostClientPool:
+    """Satu `httpx.AsyncClient` + semaphore per host tujuan callback."""
+
+    def __init__(
+        self,
+        per_host_concurrency: int,
+        timeout: float,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.per_host_concurrency = per_host_concurrency
+        self.timeout = timeout
+        self._transport = transport
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def client(self, host: str) -> httpx.AsyncClient:
+        client = self._clients.get(host)
+        if client is None:
+            client = self._clients[host] = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.per_host_concurrency,
+                    max_keepalive_connections=self.per_host_concurrency,
+                ),
+                transport=self._transport,
+            )
+        return client
+
+    def semaphore(self, host: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(host)
+        if sem is None:
+            sem = self._semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return sem
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        await asyncio.gather(*(c.aclose() for c in clients), return_exceptions=True)
+
+
+class CallbackDeliveryEngine:
+    """Claim callback jatuh tempo lalu kirim konkuren dengan cap per host."""
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        *,
+        worker_id: str | None = None,
+        batch_size: int | None = None,
+        lease_seconds: float | None = None,
+        max_attempts: int | None = None,
+        host_concurrency: int | None = None,
+        idle_interval: float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        registry: MetricsRegistry | None = None,
+    ):
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.worker_id = worker_id or f"callback-{uuid.uuid4().hex[:12]}"
+        self.batch_size = batch_size or settings.CALLBACK_BATCH_SIZE
+        self.lease_seconds = lease_seconds or settings.CALLBACK_LEASE_SECONDS
+        self.max_attempts = max_attempts or settings.CALLBACK_MAX_ATTEMPTS
+        self.idle_interval = idle_interval or settings.CALLBACK_IDLE_INTERVAL
+        self.backoff_base = settings.CALLBACK_BACKOFF_BASE
+        self.backoff_max = settings.CALLBACK_BACKOFF_MAX
+        self.method = settings.CALLBACK_HTTP_METHOD.upper()
+        self.pool = HostClientPool(
+            host_concurrency or settings.CALLBACK_HOST_CONCURRENCY,
+            settings.CALLBACK_TIMEOUT,
+            transport=transport,
+        )
+        self.metrics = registry or metrics
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+        self.log = logger.bind(service="CallbackDeliveryEngine")
+
+    async def _send(self, claim: CallbackClaim) -> httpx.Response:
+        host = self.pool.host_key(claim.report_url)
+        async with deadline_scope("callback"), self.pool.semaphore(host):
+            client = self.pool.client(host)
+            if self.method == "GET":
+                return await client.get(claim.report_url, params=claim.payload)
+            return await client.request(
+                self.method, claim.report_url, data=claim.payload
+            )
+
+    async def _deliver_one(self, claim: CallbackClaim) -> CallbackResult:
+        member = claim.memberid
+        error: str | None = None
+        try:
+            response = await self._send(claim)
+            if response.is_success:
+                now = time.time()
+                self.metrics.inc("callback_delivered", member=member)
+                self.metrics.observe(
+                    "callback_lag_seconds", now - claim.enqueued_at, member=member
+                )
+                return CallbackResult(id=claim.id, ok=True)
+            error = f"HTTP {response.status_code}"
+        except (httpx.HTTPError, DeadlineExceededError) as e:
+            error = f"{type(e).__name__}: {e}"
+        self.metrics.inc("callback_failed", member=member)
+        self.log.warning(
+            "Callback delivery failed",
+            callback_id=claim.id,
+            memberid=member,
+            attempts=claim.attempts,
+            error=error,
+        )
+        delay = backoff_delay(claim.attempts, self.backoff_base, self.backoff_max)
+        return CallbackResult(
+            id=claim.id, ok=False, error=error, next_attempt_at=time.time() + delay
+        )
+
+    def _update_success_rate(self, members: set[str]) -> None:
+        for member in members:
+            ok = self.metrics.counter_value("callback_delivered", member=member)
+            failed = self.metrics.counter_value("callback_failed", member=member)
+            total = ok + failed
+            if total:
+                self.metrics.set_gauge(
+                    "callback_success_rate", ok / total, member=member
+                )
+
+    async def run_once(self) -> int:
+        """Satu siklus claim → deliver → complete. Return jumlah callback."""
+        async with self.session_factory() as session:
+            claims = await SQLiteCallbackRepository(session).claim_due(
+                self.worker_id, self.batch_size, self.lease_seconds, self.max_attempts
+            )
+        if not claims:
+            return 0
+        with deadline(self.lease_seconds):
+            results = await asyncio.gather(*(self._deliver_one(c) for c in claims))
+        async with self.session_factory() as session:
+            await SQLiteCallbackRepository(session).complete_batch(
+                self.worker_id, list(results), self.max_attempts
+            )
+        self._update_success_rate({c.memberid for c in claims})
+        return len(claims)
+
+    async def run_forever(self) -> None:
+        self.log.info("Callback delivery engine started")
+        while not self._stop.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception as e:
+                self.log.exception("Callback delivery cycle error", error=str(e))
+                processed = 0
+            if processed < self.batch_size:
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(self._stop.wait(), self.idle_interval)
+        self.log.info("Callback delivery engine stopped")
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.pool.aclose()
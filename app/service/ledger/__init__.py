@@ -0,0 +1,4 @@
+from app.service.ledger.srv_deposit import DepositService
+from app.service.ledger.srv_ledger import LedgerService
+
+__all__ = ["DepositService", "LedgerService"]
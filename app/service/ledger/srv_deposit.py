@@ -0,0 +1,238 @@
+"""Tiket deposit member: pembuatan, verifikasi sign, konfirmasi pembayaran.
+
+- tiket dibuat setelah sign OtomaX (`OtomaxSignatureService
+  .generate_deposit_ticket_signature`) cocok dengan kredensial member,
+- nominal transfer = nominal + kode unik, jadi pembayaran tanpa id tiket
+  tetap bisa dicocokkan dari nominalnya,
+- konfirmasi banyak pembayaran = satu UoW: tiket ditandai lunas dan saldo
+  di-credit lewat `credit_batch` dengan ref `ticket:<id>`; pembayaran yang
+  dikirim ulang tidak menambah saldo lagi.
+"""
+
+import random
+import secrets
+import time
+from collections.abc import Callable, Sequence
+
+from app.config import get_settings
+from app.custom.exceptions.cst_exceptions import (
+    DataDuplicationError,
+    DepositTicketError,
+    SignatureInvalidError,
+)
+from app.database.core.uow import UnitOfWork
+from app.database.repositories.repo_deposit import SQLiteDepositRepository
+from app.database.repositories.repo_ledger import SQLiteLedgerRepository
+from app.database.repositories.repo_member import SQLiteMemberRepository
+from app.mlogg import logger
+from app.models.db_deposit import DepositTicket
+from app.schemas.sch_deposit import (
+    DepositConfirmResult,
+    DepositPayment,
+    DepositTicketPublic,
+    DepositTicketStatus,
+)
+from app.schemas.sch_ledger import LedgerCredit, LedgerKind
+from app.service.balance import BalanceCache, balance_cache
+from app.service.metrics import MetricsRegistry, metrics
+from app.service.outbox.srv_dispatcher import SessionFactory
+from app.service.security import OtomaxSignatureService
+
+_CREATE_ATTEMPTS = 3
+
+
+def ticket_ref(ticket_id: str) -> str:
+    """Ref ledger untuk credit tiket (kunci idempotensi)."""
+    return f"ticket:{ticket_id}"
+
+
+class DepositService:
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        *,
+        cache: BalanceCache | None = None,
+        registry: MetricsRegistry | None = None,
+        clock: Callable[[], float] = time.time,
+        rng: random.Random | None = None,
+    ):
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.cache = cache if cache is not None else balance_cache
+        self.metrics = registry or metrics
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.ttl = settings.DEPOSIT_TICKET_TTL
+        self.min_amount = settings.DEPOSIT_MIN_AMOUNT
+        self.max_amount = settings.DEPOSIT_MAX_AMOUNT
+        self.code_max = settings.DEPOSIT_UNIQUE_CODE_MAX
+        self.log = logger.bind(service="DepositService")
+
+    async def verify_signature(
+        self, memberid: str, amount: int, sign: str | None
+    ) -> None:
+        """Cocokkan sign tiket dengan kredensial member.
+
+        Raises:
+            DataNotFoundError: member tidak ada / tidak aktif.
+            SignatureInvalidError: sign kosong / tidak cocok.
+        """
+        async with self.session_factory() as session:
+            member = await SQLiteMemberRepository(session).get_by_id(memberid)
+        if member.allow_nosign:
+            return
+        expected = OtomaxSignatureService.generate_deposit_ticket_signature(
+            member.memberid, member.pin, member.password, str(amount)
+        )
+        if not OtomaxSignatureService.verify(expected, sign):
+            self.metrics.inc("deposit_sign_invalid")
+            raise SignatureInvalidError(context={"memberid": memberid})
+
+    async def create_ticket(
+        self, memberid: str, amount: int, *, sign: str | None = None
+    ) -> DepositTicketPublic:
+        """Buat tiket deposit pending dengan kode unik yang belum dipakai.
+
+        Raises:
+            DepositTicketError: nominal di luar batas / semua kode unik terpakai.
+            SignatureInvalidError: sign tidak cocok.
+        """
+        if not self.min_amount <= amount <= self.max_amount:
+            raise DepositTicketError(
+                f"Deposit amount must be between {self.min_amount} "
+                f"and {self.max_amount}",
+                context={"memberid": memberid, "amount": amount},
+            )
+        await self.verify_signature(memberid, amount, sign)
+        memberid = memberid.upper()
+        for attempt in range(_CREATE_ATTEMPTS):
+            try:
+                ticket = await self._create(memberid, amount)
+            except DataDuplicationError:
+                # tiket lain mengambil kode yang sama di antara SELECT dan INSERT
+                self.log.info("Deposit unique code taken, retrying", attempt=attempt)
+                continue
+            self.metrics.inc("deposit_ticket_created")
+            return ticket
+        raise DepositTicketError(
+            "Could not allocate a deposit unique code",
+            context={"memberid": memberid, "amount": amount},
+        )
+
+    async def _create(self, memberid: str, amount: int) -> DepositTicketPublic:
+        now = self.clock()
+        async with self.session_factory() as session, UnitOfWork(session) as uow:
+            repo = SQLiteDepositRepository(session, autocommit=False)
+            await repo.expire_stale(now)
+            taken = await repo.taken_transfer_amounts(
+                amount + 1, amount + self.code_max
+            )
+            free = [c for c in range(1, self.code_max + 1) if amount + c not in taken]
+            if not free:
+                raise DepositTicketError(
+                    "All deposit unique codes are in use for this amount",
+                    context={"memberid": memberid, "amount": amount},
+                )
+            code = self.rng.choice(free)
+            ticket = await repo.create(
+                DepositTicket(
+                    id=f"DT{secrets.token_hex(6).upper()}",
+                    memberid=memberid,
+                    amount=amount,
+                    unique_code=code,
+                    transfer_amount=amount + code,
+                    status=DepositTicketStatus.PENDING,
+                    expires_at=now + self.ttl,
+                )
+            )
+            await uow.commit()
+        return ticket
+
+    async def confirm(self, payments: Sequence[DepositPayment]) -> DepositConfirmResult:
+        """Konfirmasi banyak pembayaran dalam satu transaksi DB.
+
+        Hasil dikelompokkan per `payment_ref`: `credited` (saldo bertambah),
+        `duplicate` (pembayaran sudah pernah diproses), `unmatched` (tidak ada
+        tiket pending yang cocok).
+        """
+        result = DepositConfirmResult()
+        if not payments:
+            return result
+        now = self.clock()
+        async with self.session_factory() as session, UnitOfWork(session) as uow:
+            repo = SQLiteDepositRepository(session, autocommit=False)
+            seen = await repo.paid_refs([p.payment_ref for p in payments])
+            fresh: list[DepositPayment] = []
+            for payment in payments:
+                if payment.payment_ref in seen:
+                    result.duplicate.append(payment.payment_ref)
+                else:
+                    seen.add(payment.payment_ref)
+                    fresh.append(payment)
+            matches = await self._match(repo, fresh, now, result)
+            paid = await repo.mark_paid(matches, now)
+            postings = await SQLiteLedgerRepository(
+                session, autocommit=False
+            ).credit_batch(
+                [
+                    LedgerCredit(
+                        memberid=t.memberid,
+                        amount=t.transfer_amount,
+                        ref=ticket_ref(t.id),
+                        kind=LedgerKind.DEPOSIT,
+                        note=matches[t.id],
+                    )
+                    for t in paid
+                ]
+            )
+            await uow.commit()
+        credited = {p.ref for p in postings}
+        for ticket_id, payment_ref in matches.items():
+            if ticket_ref(ticket_id) in credited:
+                result.credited.append(payment_ref)
+            else:
+                result.duplicate.append(payment_ref)
+        for memberid in {p.memberid for p in postings}:
+            self.cache.invalidate(memberid)
+        self._observe(result)
+        return result
+
+    @staticmethod
+    async def _match(
+        repo: SQLiteDepositRepository,
+        payments: Sequence[DepositPayment],
+        now: float,
+        result: DepositConfirmResult,
+    ) -> dict[str, str]:
+        """`{ticket_id: payment_ref}` untuk pembayaran yang cocok dengan tiket."""
+        tickets = await repo.find_pending(
+            [p.ticket_id for p in payments if p.ticket_id],
+            [p.amount for p in payments if not p.ticket_id],
+            now,
+        )
+        by_id = {t.id: t for t in tickets}
+        by_amount = {t.transfer_amount: t for t in tickets}
+        matches: dict[str, str] = {}
+        for payment in payments:
+            ticket = (
+                by_id.get(payment.ticket_id)
+                if payment.ticket_id
+                else by_amount.get(payment.amount)
+            )
+            if (
+                ticket is None
+                or ticket.transfer_amount != payment.amount
+                or ticket.id in matches
+            ):
+                result.unmatched.append(payment.payment_ref)
+                continue
+            matches[ticket.id] = payment.payment_ref
+        return matches
+
+    def _observe(self, result: DepositConfirmResult) -> None:
+        for outcome in ("credited", "duplicate", "unmatched"):
+            count = len(getattr(result, outcome))
+            if count:
+                self.metrics.inc("deposit_payment", count, outcome=outcome)
+        if result.unmatched:
+            self.log.warning("Unmatched deposit payments", refs=result.unmatched)
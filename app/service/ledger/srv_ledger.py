@@ -0,0 +1,103 @@
+"""Service ledger saldo member.
+
+Satu mutasi = satu UoW: UPDATE saldo ber-guard + INSERT entry jurnal, commit
+bersama. Setelah commit, entry cache saldo member di-invalidate supaya cek
+saldo berikutnya membaca nilai baru.
+"""
+
+from app.custom.exceptions.cst_exceptions import InsufficientBalanceError
+from app.database.core.uow import UnitOfWork
+from app.database.repositories.repo_ledger import SQLiteLedgerRepository
+from app.mlogg import logger
+from app.schemas.sch_ledger import LedgerKind, LedgerPosting
+from app.service.balance import BalanceCache, balance_cache
+from app.service.metrics import MetricsRegistry, metrics
+from app.service.outbox.srv_dispatcher import SessionFactory
+
+
+class LedgerService:
+    """Debit / credit saldo member lewat `SQLiteLedgerRepository`."""
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        *,
+        cache: BalanceCache | None = None,
+        registry: MetricsRegistry | None = None,
+    ):
+        self.session_factory = session_factory
+        self.cache = cache if cache is not None else balance_cache
+        self.metrics = registry or metrics
+        self.cache.bind(self._load_balance)
+        self.log = logger.bind(service="LedgerService")
+
+    async def _load_balance(self, memberid: str) -> int:
+        async with self.session_factory() as session:
+            balance = await SQLiteLedgerRepository(session).get_balance(memberid)
+        return balance or 0
+
+    async def balance(self, memberid: str) -> int:
+        """Saldo member (lewat cache TTL pendek). Member tanpa akun = 0."""
+        return await self.cache.get(memberid)
+
+    async def debit(
+        self,
+        memberid: str,
+        amount: int,
+        *,
+        ref: str | None = None,
+        note: str | None = None,
+    ) -> LedgerPosting:
+        """Potong saldo member secara atomik.
+
+        Raises:
+            InsufficientBalanceError: saldo tidak cukup (tidak ada yang berubah).
+            LedgerAccountNotFoundError: member belum punya akun saldo.
+            DuplicateLedgerEntryError: `ref` sudah pernah dibukukan.
+        """
+        try:
+            async with self.session_factory() as session, UnitOfWork(session) as uow:
+                posting = await SQLiteLedgerRepository(session, autocommit=False).debit(
+                    memberid, amount, ref=ref, note=note
+                )
+                await uow.commit()
+        except InsufficientBalanceError:
+            self.metrics.inc("ledger_insufficient")
+            raise
+        finally:
+            self.cache.invalidate(memberid)
+        self.metrics.inc("ledger_posting", kind=LedgerKind.DEBIT.value)
+        return posting
+
+    async def credit(
+        self,
+        memberid: str,
+        amount: int,
+        *,
+        ref: str | None = None,
+        kind: LedgerKind = LedgerKind.CREDIT,
+        note: str | None = None,
+    ) -> LedgerPosting:
+        """Tambah saldo member (akun dibuat otomatis).
+
+        Raises:
+            DuplicateLedgerEntryError: `ref` sudah pernah dibukukan.
+        """
+        try:
+            async with self.session_factory() as session, UnitOfWork(session) as uow:
+                posting = await SQLiteLedgerRepository(
+                    session, autocommit=False
+                ).credit(memberid, amount, ref=ref, kind=kind, note=note)
+                await uow.commit()
+        finally:
+            self.cache.invalidate(memberid)
+        self.metrics.inc("ledger_posting", kind=kind.value)
+        return posting
+
+    async def refund(
+        self, memberid: str, amount: int, *, ref: str, note: str | None = None
+    ) -> LedgerPosting:
+        """Kembalikan saldo transaksi gagal (idempotent per `ref`)."""
+        return await self.credit(
+            memberid, amount, ref=ref, kind=LedgerKind.REFUND, note=note
+        )
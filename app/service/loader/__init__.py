@@ -0,0 +1,3 @@
+from app.service.loader.srv_bulk_loader import BulkLoader, detect_format
+
+__all__ = ["BulkLoader", "detect_format"]
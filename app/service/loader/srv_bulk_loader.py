@@ -0,0 +1,487 @@
+"""Bulk loader member / module dari file YAML, CSV atau NDJSON (upsert).
+
+- file dibaca streaming: YAML lewat event libyaml per item list (tidak ada node
+  tree satu dokumen penuh), CSV lewat `csv.DictReader`, NDJSON per baris,
+- row divalidasi `TypeAdapter` yang dibuat sekali per jenis
+  (`MemberCreate` / `ModuleImport`),
+- key duplikat di dalam file dilaporkan, row pertama yang dipakai,
+- seluruh file di-parse + divalidasi dulu di worker thread (`asyncio.to_thread`)
+  sebelum session DB dibuka; row valid ditahan di memory per batch (member /
+  module: ribuan row, bukan jutaan),
+- baru setelah itu semua batch di-upsert (`INSERT ... ON CONFLICT DO UPDATE`)
+  dalam satu transaksi: write lock SQLite hanya ditahan selama fase tulis, dan
+  gagal di tengah = tidak ada yang berubah.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any, NamedTuple
+
+import yaml
+from pydantic import TypeAdapter, ValidationError
+from yaml.events import (
+    AliasEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+)
+from yaml.nodes import ScalarNode
+
+from app.config import get_settings
+from app.custom.exceptions.cst_exceptions import BulkLoadError
+from app.database.core.uow import UnitOfWork
+from app.database.repositories.repo_member import SQLiteMemberRepository
+from app.database.repositories.repo_module import SQLiteModuleRepository
+from app.mlogg import logger
+from app.schemas.sch_bulk_load import (
+    BulkFormat,
+    BulkLoadKind,
+    BulkLoadReport,
+    BulkRowIssue,
+)
+from app.schemas.sch_member import MemberCreate
+from app.schemas.sch_module import ModuleImport
+from app.service.admission import MemberAdmission, member_admission
+from app.service.metrics import MetricsRegistry, metrics
+from app.service.outbox.srv_dispatcher import SessionFactory
+
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_STR_TAG = "tag:yaml.org,2002:str"
+_SUFFIXES = {
+    ".yaml": BulkFormat.YAML,
+    ".yml": BulkFormat.YAML,
+    ".csv": BulkFormat.CSV,
+    ".ndjson": BulkFormat.NDJSON,
+    ".jsonl": BulkFormat.NDJSON,
+}
+
+
+class RawRow(NamedTuple):
+    row: int
+    data: Any
+    error: str | None = None
+
+
+class _Spec(NamedTuple):
+    key: str
+    adapter: TypeAdapter[Any]
+    # field yang selalu dibaca sebagai teks (PIN `012345` bukan oktal / int)
+    text_fields: frozenset[str]
+    upper_fields: tuple[str, ...]
+    repository: type[SQLiteMemberRepository] | type[SQLiteModuleRepository]
+
+
+_SPECS: dict[BulkLoadKind, _Spec] = {
+    BulkLoadKind.MEMBERS: _Spec(
+        "memberid",
+        TypeAdapter(MemberCreate),
+        frozenset({"memberid", "name", "pin", "password"}),
+        ("memberid",),
+        SQLiteMemberRepository,
+    ),
+    BulkLoadKind.MODULES: _Spec(
+        "moduleid",
+        TypeAdapter(ModuleImport),
+        frozenset({"moduleid", "name", "username", "msisdn", "pin", "password"}),
+        ("provider",),
+        SQLiteModuleRepository,
+    ),
+}
+
+
+# ------------------------
+# Streaming readers
+# ------------------------
+def detect_format(path: Path) -> BulkFormat:
+    """Format file dari ekstensinya."""
+    fmt = _SUFFIXES.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise BulkLoadError("Unknown bulk file format", context={"path": str(path)})
+    return fmt
+
+
+class _YamlRows:
+    """Builder objek langsung dari event YAML, satu item list per langkah."""
+
+    def __init__(self, stream: IO[str], text_fields: frozenset[str]):
+        self.loader = _YamlLoader(stream)
+        self.text_fields = text_fields
+        self.anchors: dict[str, Any] = {}
+
+    def _event(self) -> Any:
+        return self.loader.get_event()
+
+    def _next_is(self, cls: type) -> bool:
+        return self.loader.check_event(cls)
+
+    def _scalar(self, ev: ScalarEvent) -> Any:
+        tag = ev.tag
+        if tag is None or tag == "!":
+            # quoted / block scalar selalu string, plain di-resolve (int, bool, ..)
+            if ev.style:
+                return ev.value
+            tag = self.loader.resolve(ScalarNode, ev.value, ev.implicit)
+        if tag == _STR_TAG:
+            return ev.value
+        constructor = self.loader.yaml_constructors.get(tag)
+        if constructor is None:
+            return ev.value
+        return constructor(self.loader, ScalarNode(tag, ev.value))
+
+    def value(self, *, raw: bool = False) -> Any:
+        ev = self._event()
+        cls = ev.__class__
+        if cls is ScalarEvent:
+            out = ev.value if raw else self._scalar(ev)
+        elif cls is MappingStartEvent:
+            out = self._mapping()
+        elif cls is SequenceStartEvent:
+            out = []
+            while not self._next_is(SequenceEndEvent):
+                out.append(self.value())
+            self._event()
+        elif cls is AliasEvent:
+            if ev.anchor not in self.anchors:
+                raise BulkLoadError(
+                    f"Unknown YAML alias '{ev.anchor}'",
+                    context={"line": ev.start_mark.line + 1},
+                )
+            return self.anchors[ev.anchor]
+        else:
+            raise BulkLoadError(
+                "Unexpected YAML structure", context={"line": ev.start_mark.line + 1}
+            )
+        if ev.anchor is not None:
+            self.anchors[ev.anchor] = out
+        return out
+
+    def _mapping(self) -> dict[Any, Any]:
+        out: dict[Any, Any] = {}
+        merged: dict[Any, Any] = {}
+        while not self._next_is(MappingEndEvent):
+            key = self.value()
+            if key == "<<":
+                merge = self.value()
+                for part in merge if isinstance(merge, list) else [merge]:
+                    if isinstance(part, dict):
+                        merged = {**part, **merged}
+                continue
+            out[key] = self.value(
+                raw=key in self.text_fields and self._next_is(ScalarEvent)
+            )
+        self._event()
+        return {**merged, **out} if merged else out
+
+    def items(self, section: str) -> Iterator[RawRow]:
+        self._event()  # StreamStart
+        if self._next_is(StreamEndEvent):
+            return  # file kosong
+        self._event()  # DocumentStart
+        if self._next_is(ScalarEvent) and self.value() is None:
+            return  # dokumen kosong / `~`
+        if self._next_is(SequenceStartEvent):
+            self._event()
+            yield from self._sequence_items()
+            return
+        if not self._next_is(MappingStartEvent):
+            raise BulkLoadError(f"YAML file must contain a '{section}' list")
+        self._event()
+        while not self._next_is(MappingEndEvent):
+            key = self.value()
+            if key == section and self._next_is(SequenceStartEvent):
+                self._event()
+                yield from self._sequence_items()
+            else:
+                self.value()  # section lain di-skip
+
+    def _sequence_items(self) -> Iterator[RawRow]:
+        while not self._next_is(SequenceEndEvent):
+            line = self.loader.peek_event().start_mark.line + 1
+            yield RawRow(line, self.value())
+        self._event()
+
+
+def iter_yaml_rows(
+    stream: IO[str], section: str, text_fields: frozenset[str] = frozenset()
+) -> Iterator[RawRow]:
+    """Item list `section:` (atau list di root) dari file YAML, satu per satu."""
+    try:
+        yield from _YamlRows(stream, text_fields).items(section)
+    except yaml.YAMLError as e:
+        raise BulkLoadError(
+            "Malformed YAML bulk file", context={"error": str(e)}, cause=e
+        ) from e
+
+
+def iter_csv_rows(stream: IO[str]) -> Iterator[RawRow]:
+    """Row CSV (header = nama field); kolom kosong dianggap tidak diisi."""
+    reader = csv.DictReader(stream)
+    for record in reader:
+        yield RawRow(
+            reader.line_num,
+            {
+                key.strip(): value
+                for key, value in record.items()
+                if key is not None and value not in ("", None)
+            },
+        )
+
+
+def iter_ndjson_rows(stream: IO[str]) -> Iterator[RawRow]:
+    """Satu objek JSON per baris; baris kosong di-skip."""
+    for line_no, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield RawRow(line_no, json.loads(line))
+        except ValueError as e:
+            yield RawRow(line_no, None, f"invalid JSON: {e}")
+
+
+def iter_rows(stream: IO[str], fmt: BulkFormat, kind: BulkLoadKind) -> Iterator[RawRow]:
+    """Reader streaming sesuai format file."""
+    if fmt is BulkFormat.YAML:
+        return iter_yaml_rows(stream, kind.value, _SPECS[kind].text_fields)
+    if fmt is BulkFormat.CSV:
+        return iter_csv_rows(stream)
+    return iter_ndjson_rows(stream)
+
+
+# ------------------------
+# Validasi
+# ------------------------
+def _error_detail(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, err['loc'])) or 'row'}: {err['msg']}"
+        for err in e.errors(include_url=False)
+    )
+
+
+def validate_row(spec: _Spec, raw: RawRow) -> dict[str, Any]:
+    """Normalisasi + validasi satu row menjadi dict kolom tabel.
+
+    Raises:
+        ValueError: row tidak bisa di-parse / gagal validasi (pesan siap
+            dilaporkan).
+    """
+    if raw.error is not None:
+        raise ValueError(raw.error)
+    data = raw.data
+    if isinstance(data, dict):
+        # angka di field teks (PIN / MSISDN dari NDJSON) jadi string
+        data = {
+            key: str(value)
+            if key in spec.text_fields and value.__class__ in (int, float)
+            else value
+            for key, value in data.items()
+        }
+        for field in spec.upper_fields:
+            if isinstance(data.get(field), str):
+                data[field] = data[field].upper()
+    try:
+        model = spec.adapter.validate_python(data)
+    except ValidationError as e:
+        raise ValueError(_error_detail(e)) from e
+    return model.model_dump(mode="json")
+
+
+class _LoadState:
+    """Status satu load; hanya disentuh dari satu thread pada satu waktu."""
+
+    def __init__(self, report: BulkLoadReport, report_limit: int):
+        self.report = report
+        self.report_limit = report_limit
+        self.seen: dict[str, int] = {}
+
+    def issue(self, kind: str, raw: RawRow, key: Any, detail: str) -> None:
+        report = self.report
+        if kind == "duplicate":
+            report.duplicate_count += 1
+            issues = report.duplicates
+        else:
+            report.invalid_count += 1
+            issues = report.invalid
+        if len(issues) < self.report_limit:
+            issues.append(
+                BulkRowIssue(
+                    row=raw.row,
+                    key=None if key is None else str(key),
+                    detail=detail,
+                )
+            )
+
+
+class BulkLoader:
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        *,
+        batch_size: int | None = None,
+        report_limit: int | None = None,
+        admission: MemberAdmission | None = None,
+        registry: MetricsRegistry | None = None,
+    ):
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.BULK_LOAD_BATCH_SIZE
+        self.report_limit = (
+            settings.BULK_LOAD_REPORT_LIMIT if report_limit is None else report_limit
+        )
+        self.admission = member_admission if admission is None else admission
+        self.metrics = registry or metrics
+        self.log = logger.bind(service="BulkLoader")
+
+    def _next_batch(
+        self, rows: Iterator[RawRow], spec: _Spec, state: _LoadState
+    ) -> list[dict[str, Any]]:
+        """Ambil sampai `batch_size` row valid berikutnya (list kosong = habis)."""
+        batch: list[dict[str, Any]] = []
+        report = state.report
+        for raw in rows:
+            report.total += 1
+            key = raw.data.get(spec.key) if isinstance(raw.data, dict) else None
+            try:
+                row = validate_row(spec, raw)
+            except ValueError as e:
+                state.issue("invalid", raw, key, str(e))
+                continue
+            key = row[spec.key]
+            first = state.seen.get(key)
+            if first is not None:
+                state.issue("duplicate", raw, key, f"duplicate of row {first}")
+                continue
+            state.seen[key] = raw.row
+            report.valid += 1
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                break
+        return batch
+
+    def _validate_all(
+        self, rows: Iterator[RawRow], spec: _Spec, state: _LoadState
+    ) -> list[list[dict[str, Any]]]:
+        """Parse + validasi seluruh file (worker thread); return batch row valid."""
+        batches: list[list[dict[str, Any]]] = []
+        while batch := self._next_batch(rows, spec, state):
+            batches.append(batch)
+        return batches
+
+    async def _write(
+        self,
+        kind: BulkLoadKind,
+        spec: _Spec,
+        batches: list[list[dict[str, Any]]],
+        report: BulkLoadReport,
+        actor: str | None,
+    ) -> None:
+        """Upsert semua batch dalam satu UoW (tanpa parsing di tengahnya)."""
+        async with self.session_factory() as session, UnitOfWork(session) as uow:
+            repo = spec.repository(session, autocommit=False)
+            for batch in batches:
+                existing = await repo.existing_ids(r[spec.key] for r in batch)
+                await repo.upsert_many(batch, actor=actor)
+                report.updated += len(existing)
+                report.created += len(batch) - len(existing)
+            await uow.commit()
+            if kind is BulkLoadKind.MEMBERS:
+                # member baru / limit baru langsung berlaku di admission
+                self.admission.load(await SQLiteMemberRepository(session).list_limits())
+
+    async def load(
+        self,
+        kind: BulkLoadKind,
+        stream: IO[str],
+        fmt: BulkFormat,
+        *,
+        dry_run: bool = False,
+        actor: str | None = None,
+    ) -> BulkLoadReport:
+        """Validasi semua row dulu, lalu upsert semua batch dalam satu transaksi.
+
+        Row invalid / duplikat di-skip dan dicatat di report; error baca file
+        (YAML rusak, format tidak dikenal) membatalkan seluruh load sebelum
+        ada yang ditulis. `dry_run` tidak membuka session DB sama sekali.
+
+        Raises:
+            BulkLoadError: file tidak bisa dibaca / di-parse.
+        """
+        spec = _SPECS[kind]
+        report = BulkLoadReport(kind=kind, format=fmt, dry_run=dry_run)
+        state = _LoadState(report, self.report_limit)
+        started = time.perf_counter()
+        batches = await asyncio.to_thread(
+            self._validate_all, iter_rows(stream, fmt, kind), spec, state
+        )
+        if batches and not dry_run:
+            await self._write(kind, spec, batches, report, actor)
+        report.seconds = round(time.perf_counter() - started, 6)
+        self._observe(report)
+        return report
+
+    async def load_file(
+        self,
+        kind: BulkLoadKind,
+        path: Path,
+        *,
+        fmt: BulkFormat | None = None,
+        dry_run: bool = False,
+        actor: str | None = None,
+    ) -> BulkLoadReport:
+        """`load` dari file di disk; format dari ekstensi kalau tidak diberikan."""
+        path = Path(path)
+        fmt = fmt or detect_format(path)
+        try:
+            stream = path.open(encoding="utf-8-sig", newline="")
+        except OSError as e:
+            raise BulkLoadError(
+                "Failed to open bulk file", context={"path": str(path)}, cause=e
+            ) from e
+        with stream:
+            return await self.load(kind, stream, fmt, dry_run=dry_run, actor=actor)
+
+    async def load_bytes(
+        self,
+        kind: BulkLoadKind,
+        stream: IO[bytes],
+        fmt: BulkFormat,
+        *,
+        dry_run: bool = False,
+        actor: str | None = None,
+    ) -> BulkLoadReport:
+        """`load` dari stream biner (upload admin), di-decode utf-8."""
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        try:
+            return await self.load(kind, text, fmt, dry_run=dry_run, actor=actor)
+        finally:
+            text.detach()
+
+    def _observe(self, report: BulkLoadReport) -> None:
+        for outcome in ("created", "updated", "duplicate_count", "invalid_count"):
+            value = getattr(report, outcome)
+            if value:
+                self.metrics.inc(
+                    "bulk_load_rows",
+                    value,
+                    kind=report.kind.value,
+                    outcome=outcome.removesuffix("_count"),
+                )
+        self.log.info(
+            "Bulk load finished",
+            kind=report.kind.value,
+            format=report.format.value,
+            dry_run=report.dry_run,
+            total=report.total,
+            created=report.created,
+            updated=report.updated,
+            duplicates=report.duplicate_count,
+            invalid=report.invalid_count,
+            seconds=report.seconds,
+        )
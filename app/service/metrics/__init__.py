@@ -0,0 +1,3 @@
+from app.service.metrics.srv_metrics import LatencyStats, MetricsRegistry, metrics
+
+__all__ = ["LatencyStats", "MetricsRegistry", "metrics"]
@@ -0,0 +1,128 @@
+"""In-process metrics registry (counter, gauge, latency).
+
+Sengaja dibuat ringan (tanpa prometheus client) supaya bisa dipanggil di hot path
+tanpa alokasi berat. Label disimpan sebagai tuple terurut agar key hashable.
+"""
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_str(key: LabelKey) -> str:
+    return ",".join(f"{k}={v}" for k, v in key) or "_"
+
+
+class LatencyStats:
+    """Rolling window latency samples (detik) dengan percentile on-demand."""
+
+    __slots__ = ("_samples", "count", "max", "total")
+
+    def __init__(self, window: int = 1024):
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Percentile dari window saat ini, q di range 0..100."""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        idx = min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1)))
+        return ordered[idx]
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class MetricsRegistry:
+    """Registry metrics in-memory, di-share satu instance per proses."""
+
+    def __init__(self, window: int = 1024):
+        self._window = window
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._gauges: dict[str, dict[LabelKey, float]] = {}
+        self._latencies: dict[str, dict[LabelKey, LatencyStats]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        series = self._counters.setdefault(name, {})
+        key = _label_key(labels)
+        series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        series = self._latencies.setdefault(name, {})
+        key = _label_key(labels)
+        stats = series.get(key)
+        if stats is None:
+            stats = series[key] = LatencyStats(self._window)
+        stats.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Context manager untuk mencatat durasi blok ke latency `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter_value(self, name: str, **labels: Any) -> float:
+        return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def gauge_value(self, name: str, **labels: Any) -> float | None:
+        return self._gauges.get(name, {}).get(_label_key(labels))
+
+    def latency(self, name: str, **labels: Any) -> LatencyStats | None:
+        return self._latencies.get(name, {}).get(_label_key(labels))
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Dump semua metrics ke dict JSON-friendly (untuk endpoint admin)."""
+        return {
+            "counters": {
+                name: {_label_str(k): v for k, v in series.items()}
+                for name, series in self._counters.items()
+            },
+            "gauges": {
+                name: {_label_str(k): v for k, v in series.items()}
+                for name, series in self._gauges.items()
+            },
+            "latencies": {
+                name: {_label_str(k): s.snapshot() for k, s in series.items()}
+                for name, series in self._latencies.items()
+            },
+        }
+
+    def reset(self) -> None:
+        self._counters.clear()
+        self._gauges.clear()
+        self._latencies.clear()
+
+
+# Singleton instance untuk seluruh aplikasi
+metrics = MetricsRegistry()
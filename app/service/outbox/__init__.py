@@ -0,0 +1,3 @@
+from app.service.outbox.srv_dispatcher import OutboxDispatcher
+
+__all__ = ["OutboxDispatcher"]
@@ -0,0 +1,143 @@
+"""Outbox dispatcher: claim batch atomik lalu kirim ke supplier secara konkuren.
+
+Alur satu siklus (`run_once`):
+    1. claim sampai `batch_size` row (pending / lease expired) dalam satu UPDATE.
+    2. dispatch semua row konkuren, dibatasi semaphore per moduleid.
+    3. tulis hasil satu batch sekaligus (fenced dengan worker_id).
+
+Kalau proses crash di tengah jalan, row tetap berstatus claimed sampai lease
+habis lalu otomatis di-claim ulang oleh dispatcher lain / proses berikutnya.
+"""
+
+import asyncio
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, suppress
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database.repositories.repo_outbox import SQLiteOutboxRepository
+from app.mlogg import logger
+from app.schemas.sch_transaction import OutboxClaim, OutboxResult
+from app.service.metrics import MetricsRegistry, metrics
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+OutboxSender = Callable[[OutboxClaim], Awaitable[dict[str, Any]]]
+
+
+class OutboxDispatcher:
+    """Dispatcher outbox dengan claim batch dan limit konkurensi per module."""
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        sender: OutboxSender,
+        *,
+        worker_id: str | None = None,
+        batch_size: int | None = None,
+        lease_seconds: float | None = None,
+        max_attempts: int | None = None,
+        module_concurrency: int | None = None,
+        module_limits: dict[str, int] | None = None,
+        idle_interval: float | None = None,
+        registry: MetricsRegistry | None = None,
+    ):
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.sender = sender
+        self.worker_id = worker_id or f"dispatcher-{uuid.uuid4().hex[:12]}"
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.lease_seconds = lease_seconds or settings.OUTBOX_LEASE_SECONDS
+        self.max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+        self.module_concurrency = (
+            module_concurrency or settings.OUTBOX_MODULE_CONCURRENCY
+        )
+        self.module_limits = module_limits or {}
+        self.idle_interval = idle_interval or settings.OUTBOX_IDLE_INTERVAL
+        self.metrics = registry or metrics
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+        self.log = logger.bind(service="OutboxDispatcher", worker_id=self.worker_id)
+
+    def _semaphore(self, moduleid: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(moduleid)
+        if sem is None:
+            limit = self.module_limits.get(moduleid, self.module_concurrency)
+            sem = self._semaphores[moduleid] = asyncio.Semaphore(limit)
+        return sem
+
+    async def _dispatch_one(self, claim: OutboxClaim) -> OutboxResult:
+        async with self._semaphore(claim.moduleid):
+            start = time.perf_counter()
+            try:
+                response = await self.sender(claim)
+            except Exception as e:
+                self.metrics.inc("outbox_dispatch_failed", module=claim.moduleid)
+                self.log.warning(
+                    "Outbox dispatch failed",
+                    outbox_id=claim.id,
+                    moduleid=claim.moduleid,
+                    error=str(e),
+                )
+                return OutboxResult(id=claim.id, ok=False, error=str(e))
+            finally:
+                self.metrics.observe(
+                    "outbox_dispatch_seconds",
+                    time.perf_counter() - start,
+                    module=claim.moduleid,
+                )
+        self.metrics.inc("outbox_dispatch_sent", module=claim.moduleid)
+        return OutboxResult(id=claim.id, ok=True, supplier_response=response)
+
+    async def run_once(self) -> int:
+        """Jalankan satu siklus claim → dispatch → complete. Return jumlah row."""
+        start = time.perf_counter()
+        async with self.session_factory() as session:
+            claims = await SQLiteOutboxRepository(session).claim_batch(
+                self.worker_id, self.batch_size, self.lease_seconds, self.max_attempts
+            )
+        self.metrics.observe("outbox_claim_seconds", time.perf_counter() - start)
+        self.metrics.set_gauge("outbox_last_batch_size", len(claims))
+        if not claims:
+            return 0
+
+        results = await asyncio.gather(*(self._dispatch_one(c) for c in claims))
+
+        async with self.session_factory() as session:
+            await SQLiteOutboxRepository(session).complete_batch(
+                self.worker_id, list(results), self.max_attempts
+            )
+        self.metrics.observe("outbox_batch_seconds", time.perf_counter() - start)
+        return len(claims)
+
+    async def run_forever(self) -> None:
+        """Loop dispatcher sampai `stop()` dipanggil; idle saat outbox kosong."""
+        self.log.info("Outbox dispatcher started")
+        while not self._stop.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception as e:
+                self.log.exception("Outbox dispatcher cycle error", error=str(e))
+                processed = 0
+            if processed < self.batch_size:
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(self._stop.wait(), self.idle_interval)
+        self.log.info("Outbox dispatcher stopped")
+
+    def start(self) -> asyncio.Task:
+        """Start loop dispatcher sebagai background task."""
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop loop dispatcher; batch yang sedang jalan diselesaikan dulu."""
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
@@ -0,0 +1,3 @@
+from app.service.poller.srv_status_poller import StatusPoller
+
+__all__ = ["StatusPoller"]
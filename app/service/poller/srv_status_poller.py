@@ -0,0 +1,308 @@
+"""Status poller untuk transaksi yang masih pending di supplier.
+
+Digerakkan timer `status_check` dari `PendingTimeouts` (timer wheel), jadi
+tidak ada loop / task per transaksi. Satu batch timer yang jatuh tempo:
+
+1. satu SELECT untuk transaksi yang masih pending,
+2. dikelompokkan per module; per module status dicek dengan request batch
+   (kalau provider mendukung, lihat `status_check.batch` di
+   `supplier_rules.yaml`) atau pipelined lewat pool keep-alive module dengan
+   konkurensi terbatas,
+3. status final ditulis dengan satu UPDATE transaksi + satu UPDATE inbox,
+   callback ke member di-enqueue di transaksi DB yang sama,
+4. yang masih pending dijadwalkan ulang dengan interval yang makin panjang
+   seiring umur transaksi, dibulatkan ke kelipatan `POLLER_ALIGN_SECONDS`
+   supaya check jatuh di tick yang sama dan batch-nya besar.
+"""
+
+import asyncio
+import math
+import time
+from collections import defaultdict
+from collections.abc import Hashable, Mapping, Sequence
+from typing import Any
+
+from app.config import get_settings
+from app.custom.exceptions.cst_exceptions import SupplierError, SupplierRuleError
+from app.database.core.uow import UnitOfWork
+from app.database.repositories.repo_callback import SQLiteCallbackRepository
+from app.database.repositories.repo_transaction import SQLiteTransactionRepository
+from app.mlogg import logger
+from app.parser import (
+    ProviderRules,
+    SupplierParseResult,
+    SupplierRuleEngine,
+    supplier_rules,
+)
+from app.schemas.sch_transaction import (
+    PendingTransaction,
+    TransactionStatus,
+    TransactionStatusUpdate,
+)
+from app.service.metrics import MetricsRegistry, metrics
+from app.service.outbox.srv_dispatcher import SessionFactory
+from app.service.scheduler import PendingTimeouts
+from app.service.supplier import SupplierClientRegistry, supplier_clients
+
+_FINAL = {
+    TransactionStatus.SUCCESS: TransactionStatus.SUCCESS,
+    TransactionStatus.FAILED: TransactionStatus.FAILED,
+    TransactionStatus.REFUNDED: TransactionStatus.FAILED,
+}
+
+
+def _render(value: Any, fields: Mapping[str, Any]) -> Any:
+    """Isi placeholder `{refid}` / `{id}` di spec request (dict / list / str)."""
+    if isinstance(value, str):
+        return value.format_map(fields)
+    if isinstance(value, Mapping):
+        return {k: _render(v, fields) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_render(v, fields) for v in value]
+    return value
+
+
+class StatusPoller:
+    """Cek status transaksi pending per module secara batch."""
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        timeouts: PendingTimeouts,
+        *,
+        clients: SupplierClientRegistry | None = None,
+        rules: SupplierRuleEngine | None = None,
+        registry: MetricsRegistry | None = None,
+        clock=time.time,  # noqa: ANN001
+    ):
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.timeouts = timeouts
+        self.clients = clients or supplier_clients
+        self.rules = rules or supplier_rules
+        self.metrics = registry or metrics
+        self.clock = clock
+        self.base_interval = settings.POLLER_BASE_INTERVAL
+        self.max_interval = settings.POLLER_MAX_INTERVAL
+        self.age_factor = settings.POLLER_AGE_FACTOR
+        self.align = settings.POLLER_ALIGN_SECONDS
+        self.module_concurrency = settings.POLLER_MODULE_CONCURRENCY
+        self.first_check = settings.POLLER_FIRST_CHECK
+        timeouts.on_status_check(self.poll)
+        self.log = logger.bind(service="StatusPoller")
+
+    def track(self, transaction_id: int, created_at: float | None = None) -> None:
+        """Mulai lacak transaksi pending: final timeout + status check pertama."""
+        self.timeouts.track(
+            transaction_id, created_at=created_at, check_in=self.first_check
+        )
+
+    def next_delay(self, age: float) -> float:
+        """Delay check berikutnya: `age * factor` dibatasi [base, max], lalu di-align."""
+        interval = min(
+            self.max_interval, max(self.base_interval, age * self.age_factor)
+        )
+        if self.align <= 0:
+            return interval
+        now = self.clock()
+        return math.ceil((now + interval) / self.align) * self.align - now
+
+    async def poll(self, ids: Sequence[Hashable]) -> int:
+        """Handler timer `status_check`. Return jumlah transaksi yang jadi final.
+
+        Timer batch ini sudah jatuh tempo, jadi apa pun yang gagal (SELECT,
+        request ke module, write status) semua transaksi yang belum final
+        tetap dijadwalkan ulang sebelum error diteruskan ke scheduler.
+        """
+        transaction_ids = [int(i) for i in ids]  # type: ignore[call-overload]
+        targets: list[PendingTransaction] | None = None
+        applied: set[int] = set()
+        try:
+            async with self.session_factory() as session:
+                targets = await SQLiteTransactionRepository(session).pending_by_ids(
+                    transaction_ids
+                )
+            updates = await self._poll_modules(targets)
+            if updates:
+                async with (
+                    self.session_factory() as session,
+                    UnitOfWork(session) as uow,
+                ):
+                    repo = SQLiteTransactionRepository(uow.session, autocommit=False)
+                    resolved = set(await repo.apply_status_batch(updates))
+                    # callback status final ke member, atomik dengan update status
+                    await SQLiteCallbackRepository(
+                        uow.session, autocommit=False
+                    ).enqueue_final(sorted(resolved))
+                applied = resolved
+            for update in updates:
+                self.metrics.inc("poller_resolved", status=update.status.value)
+        finally:
+            self._reschedule(transaction_ids, targets, applied)
+        return len(applied)
+
+    async def _poll_modules(
+        self, targets: list[PendingTransaction]
+    ) -> list[TransactionStatusUpdate]:
+        """Cek semua module paralel; module yang error dilewati (tetap pending)."""
+        by_module: dict[str, list[PendingTransaction]] = defaultdict(list)
+        for target in targets:
+            if target.moduleid:
+                by_module[target.moduleid].append(target)
+        results = await asyncio.gather(
+            *(self._poll_module(m, batch) for m, batch in by_module.items()),
+            return_exceptions=True,
+        )
+        updates: list[TransactionStatusUpdate] = []
+        for moduleid, result in zip(by_module, results, strict=True):
+            if isinstance(result, BaseException):
+                self.metrics.inc("poller_errors", module=moduleid)
+                self.log.error(
+                    "Status check batch failed", moduleid=moduleid, error=repr(result)
+                )
+                continue
+            updates.extend(result)
+        return updates
+
+    def _reschedule(
+        self,
+        ids: list[int],
+        targets: list[PendingTransaction] | None,
+        applied: set[int],
+    ) -> None:
+        """Lepas timer yang sudah final, jadwalkan ulang sisanya dengan backoff."""
+        now = self.clock()
+        if targets is None:
+            # SELECT gagal, umur transaksi tidak diketahui: mundur ke interval maks
+            delay = self.next_delay(math.inf)
+            for transaction_id in ids:
+                self.timeouts.schedule_check(transaction_id, delay)
+            self.metrics.inc("poller_rescheduled", len(ids))
+            return
+        for target in targets:
+            if target.id in applied:
+                self.timeouts.resolve(target.id)
+            else:
+                self.timeouts.schedule_check(
+                    target.id, self.next_delay(now - target.created_at)
+                )
+
+    def _rules_for(self, moduleid: str) -> ProviderRules | None:
+        provider = self.clients.provider_of(moduleid)
+        if provider is None:
+            return None
+        try:
+            rules = self.rules.get(provider)
+        except SupplierRuleError:
+            return None
+        return rules if rules.status_check else None
+
+    async def _poll_module(
+        self, moduleid: str, targets: list[PendingTransaction]
+    ) -> list[TransactionStatusUpdate]:
+        rules = self._rules_for(moduleid)
+        if rules is None:
+            self.metrics.inc("poller_unsupported", len(targets), module=moduleid)
+            return []
+        spec = rules.status_check or {}
+        if spec.get("batch"):
+            parsed = await self._fetch_batch(moduleid, rules, spec, targets)
+        else:
+            parsed = await self._fetch_each(moduleid, rules, spec, targets)
+        updates: list[TransactionStatusUpdate] = []
+        for target in targets:
+            result = parsed.get(target.id)
+            status = _FINAL.get(result.status) if result is not None else None
+            if status is not None:
+                updates.append(
+                    TransactionStatusUpdate(
+                        id=target.id,
+                        status=status,
+                        sn=result.sn,  # type: ignore[union-attr]
+                        inbox_id=target.inbox_id,
+                    )
+                )
+        return updates
+
+    async def _request(
+        self, moduleid: str, spec: Mapping[str, Any], fields: Mapping[str, Any]
+    ) -> str | None:
+        kwargs = {
+            key: _render(spec[key], fields)
+            for key in ("params", "data", "json")
+            if spec.get(key) is not None
+        }
+        self.metrics.inc("poller_requests", module=moduleid)
+        try:
+            response = await self.clients.request(
+                moduleid,
+                spec.get("method", "GET"),
+                _render(spec.get("path", "/"), fields),
+                **kwargs,
+            )
+        except SupplierError as e:
+            self.metrics.inc("poller_errors", module=moduleid)
+            self.log.warning("Status check failed", moduleid=moduleid, error=str(e))
+            return None
+        if response.status_code >= 500:
+            self.metrics.inc("poller_errors", module=moduleid)
+            return None
+        return response.text
+
+    async def _fetch_each(
+        self,
+        moduleid: str,
+        rules: ProviderRules,
+        spec: Mapping[str, Any],
+        targets: list[PendingTransaction],
+    ) -> dict[int, SupplierParseResult]:
+        """Satu request per transaksi, pipelined dengan konkurensi terbatas."""
+        semaphore = asyncio.Semaphore(self.module_concurrency)
+
+        async def check(target: PendingTransaction) -> SupplierParseResult | None:
+            async with semaphore:
+                body = await self._request(
+                    moduleid, spec, {"refid": target.refid or "", "id": target.id}
+                )
+            return rules.parse(body) if body is not None else None
+
+        results = await asyncio.gather(*(check(t) for t in targets))
+        return {
+            t.id: result for t, result in zip(targets, results, strict=True) if result
+        }
+
+    async def _fetch_batch(
+        self,
+        moduleid: str,
+        rules: ProviderRules,
+        spec: Mapping[str, Any],
+        targets: list[PendingTransaction],
+    ) -> dict[int, SupplierParseResult]:
+        """Banyak refid per request; hasil dicocokkan lewat refid tiap record."""
+        batch = spec["batch"]
+        size = max(1, int(batch.get("size", 50)))
+        separator = str(batch.get("separator", ","))
+        refid_key = str(batch.get("refid", "refid"))
+        by_refid = {t.refid: t for t in targets if t.refid}
+        refids = list(by_refid)
+        chunks = [refids[i : i + size] for i in range(0, len(refids), size)]
+        semaphore = asyncio.Semaphore(self.module_concurrency)
+
+        async def check(chunk: list[str]) -> str | None:
+            request = dict(spec)
+            param = {str(batch["param"]): separator.join(chunk)}
+            request["params"] = {**(spec.get("params") or {}), **param}
+            async with semaphore:
+                return await self._request(moduleid, request, {"refid": "", "id": ""})
+
+        parsed: dict[int, SupplierParseResult] = {}
+        for body in await asyncio.gather(*(check(c) for c in chunks)):
+            if body is None:
+                continue
+            for record in rules.records(body, str(batch.get("records", ""))):
+                if not isinstance(record, Mapping):
+                    continue
+                target = by_refid.get(str(record.get(refid_key)))
+                if target is not None:
+                    parsed[target.id] = rules.parse_record(record)
+        return parsed
@@ -0,0 +1,13 @@
+from app.service.reply.srv_reply_template import (
+    ReplyTemplate,
+    ReplyTemplateRegistry,
+    compile_reply_templates,
+    reply_templates,
+)
+
+__all__ = [
+    "ReplyTemplate",
+    "ReplyTemplateRegistry",
+    "compile_reply_templates",
+    "reply_templates",
+]
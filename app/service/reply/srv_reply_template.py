@@ -0,0 +1,352 @@
+"""Template reply ke member OtomaX, di-compile sekali dari `replies.yaml`.
+
+- template text divalidasi sekali saat load (nama field harus identifier, spec
+  dibatasi ke karakter format-spec standar, tanpa atribut / index), lalu
+  dirender dengan `str.format_map` lewat mapping yang mengisi field kosong /
+  None dengan nilai blank (`format(blank, spec apa pun) == ""`),
+- format `json`: key di-escape sekali saat compile, tiap member jadi satu
+  fungsi render; value di-encode per field (str/None/int tanpa `json.dumps`),
+- hasil render langsung `bytes`, `Content-Type` dihitung sekali per template,
+- reload: file di-`stat` paling sering tiap `reload_interval` detik; kalau mtime
+  berubah, semua template di-compile ulang lalu di-swap sekaligus.
+"""
+
+import json
+import re
+import string
+import threading
+import time
+from collections.abc import Callable, Mapping
+from json.encoder import encode_basestring
+from pathlib import Path
+from typing import Any
+
+import yaml
+from fastapi import Response
+
+from app.config import get_settings
+from app.custom.exceptions.cst_exceptions import ReplyTemplateError
+from app.mlogg import logger
+
+_DEFAULT_CONTENT_TYPES = {
+    "text": "text/plain; charset=utf-8",
+    "json": "application/json",
+}
+_SPEC_RE = re.compile(r"[\w<>=^+\- #.,%]*")
+_formatter = string.Formatter()
+_json_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+Renderer = Callable[[Mapping[str, Any]], str]
+
+
+def _json_value(value: Any) -> str:
+    if value.__class__ is str:
+        return encode_basestring(value)
+    if value is None:
+        return "null"
+    if value.__class__ is int:
+        return int.__repr__(value)
+    return _json_encode(value)
+
+
+class _Blank:
+    """Nilai field yang tidak ada / None: dirender kosong untuk spec apa pun."""
+
+    __slots__ = ()
+
+    def __format__(self, spec: str) -> str:
+        return ""
+
+    def __str__(self) -> str:
+        return ""
+
+    __repr__ = __str__
+
+
+_BLANK = _Blank()
+
+
+class _Values:
+    """Mapping untuk `str.format_map`: field kosong / None -> `_BLANK`."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: Mapping[str, Any]):
+        self.values = values
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.values.get(key)
+        return _BLANK if value is None else value
+
+
+def _field(name: str, field: str) -> str:
+    if not field.isidentifier():
+        raise ReplyTemplateError(
+            f"Invalid placeholder '{field}' in reply template '{name}'",
+            context={"template": name},
+        )
+    return field
+
+
+def _parse_text(name: str, template: str) -> list[tuple[str, str | None, str]]:
+    """Segmen `(literal, field, spec)` template text yang sudah divalidasi."""
+    parts: list[tuple[str, str | None, str]] = []
+    for literal, field, spec, conv in _formatter.parse(template):
+        if field is not None:
+            if not _SPEC_RE.fullmatch(spec or "") or conv not in (None, "s", "r"):
+                raise ReplyTemplateError(
+                    f"Unsupported format spec in reply template '{name}'",
+                    context={"template": name, "field": field},
+                )
+            _field(name, field)
+        parts.append((literal, field, spec or ""))
+    return parts
+
+
+class ReplyTemplate:
+    """Satu template yang sudah divalidasi + di-compile sekali saat load."""
+
+    __slots__ = (
+        "_format",
+        "_members",
+        "_parts",
+        "content_type",
+        "fields",
+        "is_json",
+        "name",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        template: str | None = None,
+        json_fields: Mapping[str, Any] | None = None,
+        content_type: str,
+    ):
+        self.name = name
+        self.content_type = content_type
+        self.is_json = json_fields is not None
+        self._parts: list[tuple[str, str | None, str]] = []
+        self._members: list[tuple[str, Renderer]] = []
+        fields: set[str] = set()
+        try:
+            if json_fields is None:
+                template = template or ""
+                self._parts = _parse_text(name, template)
+                fields.update(f for _, f, _ in self._parts if f is not None)
+                # format_map mem-parse string format di C, tanpa eval / codegen
+                self._format = template.format_map
+            else:
+                self._members = [
+                    self._json_member(key, value, fields)
+                    for key, value in json_fields.items()
+                ]
+        except ValueError as e:
+            raise ReplyTemplateError(
+                f"Invalid reply template '{name}'", context={"template": name}, cause=e
+            ) from e
+        self.fields = frozenset(fields)
+
+    def _json_member(
+        self, key: Any, value: Any, fields: set[str]
+    ) -> tuple[str, Renderer]:
+        prefix = encode_basestring(str(key)) + ":"
+        placeholder = _single_placeholder(value)
+        if placeholder is not None:
+            field = _field(self.name, placeholder)
+            fields.add(field)
+            return prefix, lambda v: _json_value(v.get(field))
+        if isinstance(value, str):
+            nested = ReplyTemplate(
+                f"{self.name}.{key}", template=value, content_type=""
+            )
+            fields.update(nested.fields)
+            return prefix, lambda v: _json_value(nested.render_text(v))
+        encoded = _json_encode(value)
+        return prefix, lambda _v: encoded
+
+    def render_text(self, values: Mapping[str, Any]) -> str:
+        """Render ke str. Field yang tidak ada / None dirender kosong (text)."""
+        if self.is_json:
+            return (
+                "{" + ",".join(p + render(values) for p, render in self._members) + "}"
+            )
+        try:
+            return self._format(_Values(values))
+        except (ValueError, TypeError):
+            # value tidak cocok dengan spec (mis. str di `{price:,}`)
+            return self._render_parts(values)
+
+    def render(self, values: Mapping[str, Any]) -> bytes:
+        """Render template ke bytes (utf-8)."""
+        return self.render_text(values).encode()
+
+    def _render_parts(self, values: Mapping[str, Any]) -> str:
+        out: list[str] = []
+        for literal, field, spec in self._parts:
+            out.append(literal)
+            if field is None:
+                continue
+            value = values.get(field)
+            if value is None:
+                continue
+            try:
+                out.append(format(value, spec))
+            except (ValueError, TypeError):
+                out.append(str(value))
+        return "".join(out)
+
+
+def _single_placeholder(value: Any) -> str | None:
+    """Return nama field kalau value persis `"{nama}"` (tipe asli dipertahankan)."""
+    if not isinstance(value, str):
+        return None
+    parsed = list(_formatter.parse(value))
+    if len(parsed) == 1:
+        literal, field, spec, conv = parsed[0]
+        if not literal and field and not spec and not conv:
+            return field
+    return None
+
+
+def compile_reply_templates(data: Mapping[str, Any]) -> dict[str, ReplyTemplate]:
+    """Compile isi YAML (`{"replies": {...}}`) menjadi dict template."""
+    replies = data.get("replies")
+    if not isinstance(replies, Mapping):
+        raise ReplyTemplateError("Reply template file must define 'replies' mapping")
+    compiled: dict[str, ReplyTemplate] = {}
+    for name, spec in replies.items():
+        if not isinstance(spec, Mapping):
+            raise ReplyTemplateError(
+                f"Reply template '{name}' must be a mapping", context={"template": name}
+            )
+        fmt = spec.get("format", "text")
+        if fmt not in _DEFAULT_CONTENT_TYPES:
+            raise ReplyTemplateError(
+                f"Unknown format '{fmt}' in reply template '{name}'",
+                context={"template": name},
+            )
+        content_type = spec.get("content_type") or _DEFAULT_CONTENT_TYPES[fmt]
+        if fmt == "text":
+            template = spec.get("template")
+            if not isinstance(template, str):
+                raise ReplyTemplateError(
+                    f"Reply template '{name}' needs a 'template' string",
+                    context={"template": name},
+                )
+            compiled[name] = ReplyTemplate(
+                name, template=template, content_type=content_type
+            )
+        else:
+            fields = spec.get("fields")
+            if not isinstance(fields, Mapping):
+                raise ReplyTemplateError(
+                    f"Reply template '{name}' needs a 'fields' mapping",
+                    context={"template": name},
+                )
+            compiled[name] = ReplyTemplate(
+                name, json_fields=fields, content_type=content_type
+            )
+    return compiled
+
+
+class ReplyTemplateRegistry:
+    """Registry template reply yang bisa di-reload tanpa restart."""
+
+    def __init__(self, path: Path | None = None, reload_interval: float | None = None):
+        settings = get_settings()
+        self.path = Path(path or settings.REPLY_TEMPLATES_PATH)
+        self.reload_interval = (
+            settings.REPLY_RELOAD_INTERVAL
+            if reload_interval is None
+            else reload_interval
+        )
+        self._templates: dict[str, ReplyTemplate] = {}
+        self._mtime: float | None = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.log = logger.bind(service="ReplyTemplateRegistry")
+
+    def load(self) -> int:
+        """Compile ulang semua template dari file. Return jumlah template.
+
+        Kalau gagal, template lama tetap dipakai dan error di-raise.
+        """
+        with self._lock:
+            try:
+                mtime = self.path.stat().st_mtime
+                with self.path.open(encoding="utf-8") as f:
+                    data = yaml.safe_load(f) or {}
+            except (OSError, yaml.YAMLError) as e:
+                self.log.exception(
+                    "Failed to read reply templates", path=str(self.path)
+                )
+                raise ReplyTemplateError(
+                    "Failed to read reply templates",
+                    context={"path": str(self.path)},
+                    cause=e,
+                ) from e
+            templates = compile_reply_templates(data)
+            self._templates = templates
+            self._mtime = mtime
+            self._next_check = time.monotonic() + self.reload_interval
+        self.log.info("Reply templates loaded", count=len(templates))
+        return len(templates)
+
+    def reload_if_changed(self) -> bool:
+        """Reload kalau mtime file berubah. Return True kalau reload terjadi."""
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        try:
+            self.load()
+        except ReplyTemplateError:
+            # file setengah tertulis / invalid: tetap pakai versi lama
+            self._mtime = mtime
+            return False
+        return True
+
+    def _maybe_reload(self) -> None:
+        if not self._templates:
+            self.load()
+            return
+        if self.reload_interval <= 0:
+            return
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.reload_interval
+            self.reload_if_changed()
+
+    def get(self, name: str) -> ReplyTemplate:
+        self._maybe_reload()
+        template = self._templates.get(name)
+        if template is None:
+            raise ReplyTemplateError(
+                f"Reply template '{name}' not found", context={"template": name}
+            )
+        return template
+
+    def names(self) -> list[str]:
+        self._maybe_reload()
+        return sorted(self._templates)
+
+    def render(self, name: str, values: Mapping[str, Any]) -> bytes:
+        return self.get(name).render(values)
+
+    def response(
+        self, name: str, values: Mapping[str, Any], status_code: int = 200
+    ) -> Response:
+        """Render template ke `Response` dengan Content-Type yang sudah di-cache."""
+        template = self.get(name)
+        return Response(
+            content=template.render(values),
+            status_code=status_code,
+            media_type=template.content_type,
+        )
+
+
+reply_templates = ReplyTemplateRegistry()
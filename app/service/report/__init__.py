@@ -0,0 +1,7 @@
+from app.service.report.srv_reconciliation import (
+    ReconciliationReport,
+    ReconciliationReporter,
+    RecoTotals,
+)
+
+__all__ = ["ReconciliationReport", "ReconciliationReporter", "RecoTotals"]
@@ -0,0 +1,272 @@
+"""Laporan rekonsiliasi harian per member + per module (count, sum, gagal, refund).
+
+Tidak ada row transaksi yang dikumpulkan di memory:
+
+1. rentang satu hari (zona `RECON_UTC_OFFSET_HOURS`, default WIB) dipotong
+   per batch keyset id (`RECON_BATCH_SIZE`),
+2. tiap batch di-agregasi SQLite (`GROUP BY memberid, moduleid, status`),
+3. agregat batch digabung ke akumulator `RecoTotals` (slot int, amount dalam
+   sen) per member dan per module,
+4. hasilnya ditulis baris demi baris sebagai CSV / NDJSON ke file atau
+   response streaming.
+
+Koneksi laporan khusus dan `PRAGMA query_only`. Di mode WAL semua batch dibaca
+dari satu read transaction (snapshot konsisten, writer tidak pernah menunggu);
+di mode journal lain tiap batch read transaction sendiri, jadi writer paling
+lama tertahan satu batch. File arsip bulan tersebut (kalau ada) ikut dihitung.
+"""
+
+import csv
+import io
+import json
+import time
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, TextIO
+
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.config import get_settings
+from app.database.repositories.repo_archive import (
+    SQLiteArchiveRepository,
+    archive_tables,
+)
+from app.database.repositories.repo_report import AggregateRow, SQLiteReportRepository
+from app.mlogg import logger
+from app.models.db_transaction import Transaction
+from app.schemas.sch_report import ReconciliationSummary, ReportFormat
+from app.schemas.sch_transaction import TransactionStatus
+from app.service.archive.srv_archiver import archive_path
+from app.service.metrics import MetricsRegistry, metrics
+
+REPORT_SCHEMA = "report_archive"
+_STATUSES = (
+    TransactionStatus.SUCCESS,
+    TransactionStatus.FAILED,
+    TransactionStatus.REFUNDED,
+    TransactionStatus.PENDING,
+)
+COLUMNS = (
+    "scope",
+    "key",
+    "count",
+    "amount",
+    *(f"{s}_{part}" for s in _STATUSES for part in ("count", "amount")),
+)
+
+
+def _money(cents: int) -> str:
+    return str(Decimal(cents).scaleb(-2))
+
+
+class RecoTotals:
+    """Akumulator satu member / module: count + amount (sen) total & per status."""
+
+    __slots__ = ("amount", "by_status", "count")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.amount = 0
+        # status -> [count, amount sen]
+        self.by_status: dict[str, list[int]] = {}
+
+    def add(self, status: str, count: int, cents: int) -> None:
+        self.count += count
+        self.amount += cents
+        slot = self.by_status.get(status)
+        if slot is None:
+            self.by_status[status] = [count, cents]
+        else:
+            slot[0] += count
+            slot[1] += cents
+
+    def row(self, scope: str, key: str) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "scope": scope,
+            "key": key,
+            "count": self.count,
+            "amount": _money(self.amount),
+        }
+        for status in _STATUSES:
+            count, cents = self.by_status.get(status, (0, 0))
+            out[f"{status}_count"] = count
+            out[f"{status}_amount"] = _money(cents)
+        return out
+
+
+class ReconciliationReport:
+    """Hasil agregasi satu hari; baris ditulis berurutan member, module, total."""
+
+    def __init__(self, summary: ReconciliationSummary):
+        self.summary = summary
+        self.members: dict[str, RecoTotals] = {}
+        self.modules: dict[str, RecoTotals] = {}
+        self.total = RecoTotals()
+
+    def merge(self, rows: list[AggregateRow]) -> int:
+        """Gabungkan agregat satu batch; return jumlah transaksi di batch."""
+        members, modules, total = self.members, self.modules, self.total
+        scanned = 0
+        for memberid, moduleid, status, count, cents in rows:
+            for bucket, key in ((members, memberid or ""), (modules, moduleid or "")):
+                totals = bucket.get(key)
+                if totals is None:
+                    totals = bucket[key] = RecoTotals()
+                totals.add(status, count, cents)
+            total.add(status, count, cents)
+            scanned += count
+        return scanned
+
+    def rows(self) -> Iterator[dict[str, Any]]:
+        for key in sorted(self.members):
+            yield self.members[key].row("member", key)
+        for key in sorted(self.modules):
+            yield self.modules[key].row("module", key)
+        yield self.total.row("total", "")
+
+    def iter_lines(self, fmt: ReportFormat) -> Iterator[str]:
+        """Baris CSV (dengan header) / NDJSON, satu string per baris."""
+        if fmt is ReportFormat.NDJSON:
+            for row in self.rows():
+                yield json.dumps(row, separators=(",", ":")) + "\n"
+            return
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        for row in self.rows():
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    def write(self, fp: TextIO, fmt: ReportFormat) -> None:
+        fp.writelines(self.iter_lines(fmt))
+
+    def write_file(self, path: Path, fmt: ReportFormat) -> Path:
+        with Path(path).open("w", encoding="utf-8", newline="") as fp:
+            self.write(fp, fmt)
+        return Path(path)
+
+
+class ReconciliationReporter:
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        batch_size: int | None = None,
+        utc_offset_hours: float | None = None,
+        archive_dir: Path | None = None,
+        registry: MetricsRegistry | None = None,
+    ):
+        settings = get_settings()
+        self.engine = engine
+        self.batch_size = batch_size or settings.RECON_BATCH_SIZE
+        self.utc_offset_hours = (
+            settings.RECON_UTC_OFFSET_HOURS
+            if utc_offset_hours is None
+            else utc_offset_hours
+        )
+        self.archive_dir = Path(archive_dir or settings.ARCHIVE_DIR)
+        self.metrics = registry or metrics
+        self.log = logger.bind(service="ReconciliationReporter")
+
+    def day_range(self, day: date) -> tuple[datetime, datetime]:
+        """Rentang `[start, end)` UTC naive untuk hari `day` di zona laporan."""
+        tz = timezone(timedelta(hours=self.utc_offset_hours))
+        start = datetime(day.year, day.month, day.day, tzinfo=tz).astimezone(UTC)
+        start = start.replace(tzinfo=None)
+        return start, start + timedelta(days=1)
+
+    def _archives(self, start: datetime, end: datetime) -> list[tuple[str, Path]]:
+        # rentang satu hari bisa menyentuh dua bulan (zona != UTC)
+        last = end - timedelta(seconds=1)
+        months = sorted({start.strftime("%Y-%m"), last.strftime("%Y-%m")})
+        found = [(m, archive_path(self.archive_dir, m)) for m in months]
+        return [(m, path) for m, path in found if path.exists()]
+
+    async def build(self, day: date) -> ReconciliationReport:
+        """Agregasi semua transaksi `day` (tabel aktif + arsip) per batch."""
+        started = time.perf_counter()
+        start, end = self.day_range(day)
+        async with self.engine.connect() as conn:
+            session = AsyncSession(bind=conn)
+            repo = SQLiteReportRepository(session)
+            archive = SQLiteArchiveRepository(session)
+            sources: list[tuple[str, Table]] = [("live", Transaction.__table__)]
+            attached: list[str] = []
+            try:
+                for i, (month, path) in enumerate(self._archives(start, end)):
+                    schema = f"{REPORT_SCHEMA}{i}"
+                    await archive.attach(path, schema, create=False)
+                    attached.append(schema)
+                    sources.append((month, archive_tables(schema)["transactions"]))
+                snapshot = await repo.journal_mode() == "wal"
+                await repo.set_query_only(True)
+                report = ReconciliationReport(
+                    ReconciliationSummary(
+                        day=day,
+                        start=start,
+                        end=end,
+                        utc_offset_hours=self.utc_offset_hours,
+                        snapshot=snapshot,
+                        sources=[name for name, _ in sources],
+                    )
+                )
+                if snapshot:
+                    await repo.begin_snapshot()
+                for _, table in sources:
+                    await self._scan(repo, table, report, per_batch_read=not snapshot)
+                if snapshot:
+                    await repo.end_snapshot()
+            finally:
+                await session.rollback()
+                await repo.set_query_only(False)
+                for schema in attached:
+                    await archive.detach(schema)
+                await session.close()
+        summary = report.summary
+        summary.members = len(report.members)
+        summary.modules = len(report.modules)
+        summary.seconds = round(time.perf_counter() - started, 6)
+        self.metrics.observe("recon_report_seconds", summary.seconds)
+        self.log.info(
+            "Reconciliation report built",
+            day=str(day),
+            transactions=summary.transactions,
+            batches=summary.batches,
+            snapshot=summary.snapshot,
+            seconds=summary.seconds,
+        )
+        return report
+
+    async def _scan(
+        self,
+        repo: SQLiteReportRepository,
+        table: Table,
+        report: ReconciliationReport,
+        *,
+        per_batch_read: bool,
+    ) -> None:
+        summary = report.summary
+        after = 0
+        while True:
+            started = time.perf_counter()
+            upper = await repo.batch_upper_id(
+                table, summary.start, summary.end, after, self.batch_size
+            )
+            rows = await repo.aggregate_batch(
+                table, summary.start, summary.end, after, upper
+            )
+            if per_batch_read:
+                # tidak ada read lock yang ditahan di sela batch
+                await repo.session.rollback()
+            summary.transactions += report.merge(rows)
+            self.metrics.observe("recon_batch_seconds", time.perf_counter() - started)
+            if rows:
+                summary.batches += 1
+            if upper is None:
+                return
+            after = upper
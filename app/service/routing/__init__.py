@@ -0,0 +1,30 @@
+from app.service.routing.srv_msisdn import normalize_msisdn, to_international
+from app.service.routing.srv_scorer import (
+    CandidateScore,
+    ModuleDecision,
+    ModuleScorer,
+    module_scorer,
+)
+from app.service.routing.srv_routing import (
+    OperatorRoute,
+    PrefixTrie,
+    RouteResult,
+    RoutingRegistry,
+    RoutingTable,
+    routing,
+)
+
+__all__ = [
+    "CandidateScore",
+    "ModuleDecision",
+    "ModuleScorer",
+    "OperatorRoute",
+    "PrefixTrie",
+    "RouteResult",
+    "RoutingRegistry",
+    "RoutingTable",
+    "module_scorer",
+    "normalize_msisdn",
+    "routing",
+    "to_international",
+]
@@ -0,0 +1,47 @@
+"""Normalisasi nomor tujuan (MSISDN) Indonesia.
+
+`dest` dari member datang dalam format campur: `08xx`, `628xx`, `+628xx`,
+kadang dengan spasi / strip. Semua dinormalisasi ke format lokal `08xx`
+(format yang dipakai tabel prefix operator).
+"""
+
+_SEPARATORS = str.maketrans("", "", " -.()")
+MIN_LENGTH = 10  # 08 + 8 digit
+MAX_LENGTH = 13  # 08 + 11 digit
+
+
+def normalize_msisdn(dest: str) -> str | None:
+    """Normalisasi ke format lokal `08xx`.
+
+    Returns:
+        str | None: nomor format lokal, atau None kalau bukan nomor seluler
+        (mis. ID pelanggan PLN) sehingga routing prefix tidak berlaku.
+
+    Examples:
+        >>> normalize_msisdn("+62 812-9522-1639")
+        '081295221639'
+        >>> normalize_msisdn("6281295221639")
+        '081295221639'
+        >>> normalize_msisdn("12345678901") is None
+        True
+    """
+    number = dest.translate(_SEPARATORS)
+    if number.startswith("+"):
+        number = number[1:]
+    if number.startswith("628"):
+        number = "0" + number[2:]
+    elif number.startswith("8"):
+        number = "0" + number
+    if (
+        not number.startswith("08")
+        or not MIN_LENGTH <= len(number) <= MAX_LENGTH
+        or not number.isdigit()
+    ):
+        return None
+    return number
+
+
+def to_international(dest: str) -> str | None:
+    """Format `628xx` (tanpa `+`) untuk supplier yang meminta format E.164."""
+    number = normalize_msisdn(dest)
+    return None if number is None else "62" + number[1:]
@@ -0,0 +1,208 @@
+"""Routing tujuan transaksi: dest -> operator -> module / produk.
+
+Tabel prefix operator disimpan sebagai trie digit (nested dict), lookup
+longest-prefix hanya beberapa dict hop. Tabel dibangun utuh dari
+`routing.yaml` lalu di-swap sebagai satu referensi, jadi reload tidak pernah
+membuat request melihat tabel setengah jadi.
+"""
+
+import threading
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import yaml
+
+from app.config import get_settings
+from app.custom.exceptions.cst_exceptions import RoutingConfigError, RoutingError
+from app.mlogg import logger
+from app.service.routing.srv_msisdn import normalize_msisdn
+
+_END = ""  # key terminal di node trie (digit tidak pernah string kosong)
+
+
+class PrefixTrie:
+    """Trie digit untuk longest-prefix match."""
+
+    __slots__ = ("_root", "size")
+
+    def __init__(self, items: Iterable[tuple[str, Any]] = ()):
+        self._root: dict[str, Any] = {}
+        self.size = 0
+        for prefix, value in items:
+            self.insert(prefix, value)
+
+    def insert(self, prefix: str, value: Any) -> None:
+        if not prefix.isdigit():
+            raise RoutingConfigError(
+                f"Invalid prefix '{prefix}'", context={"prefix": prefix}
+            )
+        node = self._root
+        for digit in prefix:
+            node = node.setdefault(digit, {})
+        if _END not in node:
+            self.size += 1
+        node[_END] = value
+
+    def longest_match(self, number: str) -> Any | None:
+        node = self._root
+        found = None
+        for digit in number:
+            node = node.get(digit)
+            if node is None:
+                break
+            if _END in node:
+                found = node[_END]
+        return found
+
+
+class OperatorRoute(NamedTuple):
+    operator: str
+    modules: tuple[str, ...]
+    products: frozenset[str]
+
+
+class RouteResult(NamedTuple):
+    dest: str
+    operator: str | None
+    modules: tuple[str, ...]
+
+
+class RoutingTable:
+    """Snapshot immutable tabel routing (trie prefix + route per operator)."""
+
+    __slots__ = ("candidates", "operators", "routes", "trie")
+
+    def __init__(self, data: Mapping[str, Any]):
+        operators = data.get("operators") or {}
+        if not isinstance(operators, Mapping):
+            raise RoutingConfigError("Routing table 'operators' must be a mapping")
+        self.trie = PrefixTrie(
+            (str(prefix), str(operator).upper())
+            for operator, prefixes in operators.items()
+            for prefix in prefixes or []
+        )
+        self.operators = frozenset(str(op).upper() for op in operators)
+        self.routes: dict[str, OperatorRoute] = {}
+        for operator, route in (data.get("routes") or {}).items():
+            name = str(operator).upper()
+            if name not in self.operators:
+                raise RoutingConfigError(
+                    f"Route for unknown operator '{operator}'",
+                    context={"operator": operator},
+                )
+            route = route or {}
+            self.routes[name] = OperatorRoute(
+                name,
+                tuple(str(m) for m in route.get("modules") or ()),
+                frozenset(str(p).upper() for p in route.get("products") or ()),
+            )
+        # produk -> ((moduleid, cost), ...) urut cost, dihitung sekali saat load
+        self.candidates: dict[str, tuple[tuple[str, float], ...]] = {}
+        for product, costs in (data.get("products") or {}).items():
+            if not isinstance(costs, Mapping):
+                raise RoutingConfigError(
+                    f"Product '{product}' must map moduleid -> cost",
+                    context={"product": product},
+                )
+            self.candidates[str(product).upper()] = tuple(
+                sorted(
+                    ((str(mid), float(cost)) for mid, cost in costs.items()),
+                    key=lambda item: item[1],
+                )
+            )
+
+    def candidates_for(
+        self, product: str, eligible: tuple[str, ...] = ()
+    ) -> tuple[tuple[str, float], ...]:
+        """Kandidat (moduleid, cost) produk, dibatasi ke module eligible route."""
+        candidates = self.candidates.get(product.upper())
+        if candidates is None:
+            return tuple((mid, 0.0) for mid in eligible)
+        if not eligible:
+            return candidates
+        return tuple(c for c in candidates if c[0] in eligible)
+
+    def operator_of(self, dest: str) -> str | None:
+        number = normalize_msisdn(dest)
+        return None if number is None else self.trie.longest_match(number)
+
+    def resolve(self, dest: str, product: str | None = None) -> RouteResult:
+        """Resolve dest (+ produk) ke operator dan module yang eligible.
+
+        Dest non-seluler (mis. ID PLN) lolos dengan `operator=None` dan
+        `modules=()`, biar pemilihan module diserahkan ke konfigurasi produk.
+
+        Raises:
+            RoutingError: nomor seluler tanpa operator / route, atau produk
+                tidak valid untuk operator tujuan.
+        """
+        number = normalize_msisdn(dest)
+        if number is None:
+            return RouteResult(dest, None, ())
+        operator = self.trie.longest_match(number)
+        if operator is None:
+            raise RoutingError(
+                "Unknown operator prefix for destination", context={"dest": number}
+            )
+        route = self.routes.get(operator)
+        if route is None or not route.modules:
+            raise RoutingError(
+                f"No module serves operator {operator}",
+                context={"dest": number, "operator": operator},
+            )
+        if (
+            product is not None
+            and route.products
+            and product.upper() not in route.products
+        ):
+            raise RoutingError(
+                f"Product {product} is not valid for operator {operator}",
+                context={"dest": number, "operator": operator, "product": product},
+            )
+        return RouteResult(number, operator, route.modules)
+
+
+class RoutingRegistry:
+    """Pegang `RoutingTable` aktif; `load()` membangun tabel baru lalu swap."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path or get_settings().ROUTING_TABLE_PATH)
+        self._table: RoutingTable | None = None
+        self._lock = threading.Lock()
+        self.log = logger.bind(service="RoutingRegistry")
+
+    @property
+    def table(self) -> RoutingTable:
+        table = self._table
+        if table is None:
+            self.load()
+            table = self._table
+        return table  # type: ignore[return-value]
+
+    def load(self, data: Mapping[str, Any] | None = None) -> RoutingTable:
+        with self._lock:
+            if data is None:
+                try:
+                    with self.path.open(encoding="utf-8") as f:
+                        data = yaml.safe_load(f) or {}
+                except (OSError, yaml.YAMLError) as e:
+                    raise RoutingConfigError(
+                        "Failed to read routing table",
+                        context={"path": str(self.path)},
+                        cause=e,
+                    ) from e
+            table = RoutingTable(data)
+            self._table = table
+        self.log.info(
+            "Routing table loaded",
+            prefixes=table.trie.size,
+            operators=len(table.operators),
+        )
+        return table
+
+    def resolve(self, dest: str, product: str | None = None) -> RouteResult:
+        return self.table.resolve(dest, product)
+
+
+routing = RoutingRegistry()
@@ -0,0 +1,144 @@
+"""Scorer pemilihan module per transaksi (success rate, latency, load, cost).
+
+Kandidat per produk sudah dihitung saat tabel routing di-load
+(`RoutingTable.candidates`), jadi satu keputusan cukup O(kandidat):
+
+    score = W_SUCCESS * success_rate
+          - W_LATENCY * min(ewma_latency / target_latency, 2)
+          - W_LOAD    * in_flight / concurrency_limit
+          - W_COST    * (cost - cost_termurah) / cost_termurah
+
+Success rate di-smoothing dengan prior (`SCORER_SUCCESS_PRIOR` request sukses
+semu) supaya module baru / sepi tidak langsung menang atau kalah. Module dengan
+breaker OPEN atau limiter penuh dikeluarkan dengan alasan yang tercatat.
+"""
+
+from typing import Any, NamedTuple
+
+from app.config import get_settings
+from app.custom.exceptions.cst_exceptions import RoutingError
+from app.schemas.sch_module import BreakerState
+from app.service.metrics import MetricsRegistry, metrics
+from app.service.routing.srv_routing import RoutingRegistry, routing
+from app.service.supplier import ModuleGuardRegistry, module_guards
+
+
+class CandidateScore(NamedTuple):
+    moduleid: str
+    score: float
+    success_rate: float
+    ewma_latency: float | None
+    in_flight: int
+    cost: float
+    excluded: str | None = None
+
+
+class ModuleDecision(NamedTuple):
+    product: str
+    moduleid: str
+    score: float
+    candidates: tuple[CandidateScore, ...]
+
+    def ranked(self) -> list[str]:
+        """Moduleid kandidat yang tidak dikeluarkan, urut score tertinggi dulu."""
+        return [
+            c.moduleid
+            for c in sorted(self.candidates, key=lambda c: c.score, reverse=True)
+            if c.excluded is None
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Alasan keputusan untuk debugging (endpoint admin / log)."""
+        return {
+            "product": self.product,
+            "moduleid": self.moduleid,
+            "score": round(self.score, 4),
+            "candidates": [
+                {**c._asdict(), "score": round(c.score, 4)} for c in self.candidates
+            ],
+        }
+
+
+class ModuleScorer:
+    def __init__(
+        self,
+        *,
+        guards: ModuleGuardRegistry | None = None,
+        routes: RoutingRegistry | None = None,
+        registry: MetricsRegistry | None = None,
+    ):
+        settings = get_settings()
+        self.guards = guards or module_guards
+        self.routes = routes or routing
+        self.metrics = registry or metrics
+        self.w_success = settings.SCORER_W_SUCCESS
+        self.w_latency = settings.SCORER_W_LATENCY
+        self.w_load = settings.SCORER_W_LOAD
+        self.w_cost = settings.SCORER_W_COST
+        self.prior = settings.SCORER_SUCCESS_PRIOR
+        self.target_latency = settings.AIMD_TARGET_LATENCY
+
+    def _score(self, moduleid: str, cost: float, cheapest: float) -> CandidateScore:
+        guard = self.guards.guard(moduleid)
+        total, ok = guard.success_counts()
+        success_rate = (ok + self.prior) / (total + self.prior)
+        ewma = guard.ewma_latency
+        in_flight = guard.limiter.in_flight
+        limit = guard.limiter.limit
+
+        excluded = None
+        if guard.breaker.state is BreakerState.OPEN:
+            excluded = "circuit_open"
+        elif in_flight >= int(limit):
+            excluded = "concurrency_limit"
+
+        latency_ratio = 0.5 if ewma is None else min(ewma / self.target_latency, 2.0)
+        cost_premium = (cost - cheapest) / cheapest if cheapest > 0 else 0.0
+        score = (
+            self.w_success * success_rate
+            - self.w_latency * latency_ratio
+            - self.w_load * (in_flight / limit)
+            - self.w_cost * cost_premium
+        )
+        return CandidateScore(
+            moduleid, score, success_rate, ewma, in_flight, cost, excluded
+        )
+
+    def choose(self, product: str, eligible: tuple[str, ...] = ()) -> ModuleDecision:
+        """Pilih module terbaik untuk produk dari kandidat yang sudah dihitung.
+
+        Raises:
+            RoutingError: tidak ada kandidat, atau semua kandidat sedang dikeluarkan.
+        """
+        candidates = self.routes.table.candidates_for(product, eligible)
+        if not candidates:
+            raise RoutingError(
+                f"No module configured for product {product}",
+                context={"product": product},
+            )
+        cheapest = min((cost for _, cost in candidates if cost > 0), default=0.0)
+        scored = tuple(self._score(mid, cost, cheapest) for mid, cost in candidates)
+        best: CandidateScore | None = None
+        for candidate in scored:
+            if candidate.excluded is None and (
+                best is None or candidate.score > best.score
+            ):
+                best = candidate
+        if best is None:
+            raise RoutingError(
+                f"No available module for product {product}",
+                context={
+                    "product": product,
+                    "excluded": {c.moduleid: c.excluded for c in scored},
+                },
+            )
+        self.metrics.inc("scorer_choice", module=best.moduleid)
+        return ModuleDecision(product.upper(), best.moduleid, best.score, scored)
+
+    def select(self, dest: str, product: str) -> ModuleDecision:
+        """Resolve dest lewat tabel routing lalu pilih module untuk produk."""
+        route = self.routes.resolve(dest, product)
+        return self.choose(product, route.modules)
+
+
+module_scorer = ModuleScorer()
@@ -0,0 +1,21 @@
+from app.service.scheduler.srv_pending_timeouts import (
+    EXPIRE,
+    STATUS_CHECK,
+    PendingTimeouts,
+)
+from app.service.scheduler.srv_timer_wheel import (
+    TimeoutScheduler,
+    TimerHandle,
+    TimerWheel,
+    timeout_scheduler,
+)
+
+__all__ = [
+    "EXPIRE",
+    "STATUS_CHECK",
+    "PendingTimeouts",
+    "TimeoutScheduler",
+    "TimerHandle",
+    "TimerWheel",
+    "timeout_scheduler",
+]
@@ -0,0 +1,116 @@
+"""Timer status check & final timeout untuk transaksi pending di supplier.
+
+Setiap transaksi pending punya dua timer di `TimeoutScheduler` (bukan task
+asyncio per transaksi):
+
+- `status_check`: kapan transaksi perlu dicek ke supplier (dipakai poller),
+- `expire`: batas akhir pending; lewat itu transaksi + inbox di-fail dalam
+  satu UPDATE per batch timer yang jatuh tempo (+ callback status ke member).
+
+Saat startup, `rearm()` memasang ulang timer dari transaksi pending di DB.
+"""
+
+import time
+from collections.abc import Hashable
+
+from app.config import get_settings
+from app.database.core.uow import UnitOfWork
+from app.database.repositories.repo_callback import SQLiteCallbackRepository
+from app.database.repositories.repo_transaction import SQLiteTransactionRepository
+from app.mlogg import logger
+from app.service.metrics import MetricsRegistry, metrics
+from app.service.outbox.srv_dispatcher import SessionFactory
+from app.service.scheduler.srv_timer_wheel import (
+    TimeoutHandler,
+    TimeoutScheduler,
+    timeout_scheduler,
+)
+
+STATUS_CHECK = "status_check"
+EXPIRE = "expire"
+
+
+class PendingTimeouts:
+    """Lacak transaksi pending: jadwal status check + final timeout."""
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        *,
+        scheduler: TimeoutScheduler | None = None,
+        registry: MetricsRegistry | None = None,
+        pending_timeout: float | None = None,
+        clock=time.time,  # noqa: ANN001
+    ):
+        self.session_factory = session_factory
+        self.scheduler = scheduler or timeout_scheduler
+        self.metrics = registry or metrics
+        self.pending_timeout = pending_timeout or get_settings().TRX_PENDING_TIMEOUT
+        self.clock = clock
+        self.scheduler.on(EXPIRE, self._expire)
+        self.log = logger.bind(service="PendingTimeouts")
+
+    def on_status_check(self, handler: TimeoutHandler) -> None:
+        """Handler batch untuk timer status check yang jatuh tempo (poller)."""
+        self.scheduler.on(STATUS_CHECK, handler)
+
+    def track(
+        self,
+        transaction_id: int,
+        *,
+        created_at: float | None = None,
+        check_in: float | None = None,
+    ) -> None:
+        """Pasang timer final timeout (dan status check kalau `check_in` diisi).
+
+        Args:
+            transaction_id: id transaksi pending.
+            created_at: epoch transaksi dibuat; default sekarang.
+            check_in: detik sampai status check pertama.
+        """
+        age = 0.0 if created_at is None else max(0.0, self.clock() - created_at)
+        self.scheduler.schedule(
+            EXPIRE, transaction_id, max(0.0, self.pending_timeout - age)
+        )
+        if check_in is not None:
+            self.schedule_check(transaction_id, check_in)
+
+    def schedule_check(self, transaction_id: int, delay: float) -> None:
+        """Jadwalkan (ulang) status check; tidak melewati final timeout."""
+        expire = self.scheduler.wheel.get((EXPIRE, transaction_id))
+        if expire is not None:
+            delay = min(delay, max(0.0, expire.deadline - self.scheduler.wheel.clock()))
+        self.scheduler.schedule(STATUS_CHECK, transaction_id, delay)
+
+    def resolve(self, transaction_id: int) -> None:
+        """Transaksi sudah final: lepas semua timer-nya."""
+        self.scheduler.cancel(STATUS_CHECK, transaction_id)
+        self.scheduler.cancel(EXPIRE, transaction_id)
+
+    def is_tracked(self, transaction_id: int) -> bool:
+        return self.scheduler.pending(EXPIRE, transaction_id)
+
+    async def _expire(self, ids: list[Hashable]) -> None:
+        async with self.session_factory() as session, UnitOfWork(session) as uow:
+            expired = await SQLiteTransactionRepository(
+                uow.session, autocommit=False
+            ).expire_pending(
+                [int(i) for i in ids]  # type: ignore[call-overload]
+            )
+            await SQLiteCallbackRepository(uow.session, autocommit=False).enqueue_final(
+                expired
+            )
+        for transaction_id in ids:
+            self.scheduler.cancel(STATUS_CHECK, transaction_id)
+        if expired:
+            self.metrics.inc("trx_expired", len(expired))
+
+    async def rearm(self) -> int:
+        """Pasang ulang timer untuk semua transaksi pending di DB."""
+        async with self.session_factory() as session:
+            pending = await SQLiteTransactionRepository(session).list_pending()
+        check_in = 0.0 if self.scheduler.handles(STATUS_CHECK) else None
+        for trx in pending:
+            self.track(trx.id, created_at=trx.created_at, check_in=check_in)
+        self.log.info("Pending transaction timers armed", n=len(pending))
+        return len(pending)
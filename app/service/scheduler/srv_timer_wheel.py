@@ -0,0 +1,237 @@
+"""Hierarchical timer wheel untuk timeout transaksi pending.
+
+Ribuan transaksi pending dengan satu `call_later` / task `sleep` masing-masing
+berarti heap O(log n) per insert, handle asyncio per timer, dan cancel yang
+meninggalkan sampah di heap. Wheel ini:
+
+- insert & cancel O(1): timer disimpan di dict per slot, di-index per key,
+- `levels` wheel bertingkat dengan `slots` slot; slot level `l` mencakup
+  `slots**l` tick, timer jauh turun (cascade) ke level bawah saat waktunya dekat,
+- satu task driver (`TimeoutScheduler`) maju tiap `tick` detik dan memanggil
+  handler per jenis timer dengan satu batch key sekaligus.
+
+Resolusi = `tick`: timer tidak pernah jalan lebih awal dari deadline-nya,
+paling lambat satu tick setelahnya.
+"""
+
+import asyncio
+import math
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from contextlib import suppress
+
+from app.config import get_settings
+from app.mlogg import logger
+from app.service.metrics import MetricsRegistry, metrics
+
+Clock = Callable[[], float]
+# toleransi pembulatan float saat konversi detik -> nomor tick
+_EPS = 1e-9
+TimeoutHandler = Callable[[list[Hashable]], Awaitable[None]]
+
+
+class TimerHandle:
+    """Satu timer di wheel; `bucket` = dict slot tempat timer sedang berada."""
+
+    __slots__ = ("bucket", "deadline", "key", "kind", "tick")
+
+    def __init__(self, key: Hashable, kind: str, deadline: float, tick: int):
+        self.key = key
+        self.kind = kind
+        self.deadline = deadline
+        self.tick = tick
+        self.bucket: dict[Hashable, TimerHandle] | None = None
+
+    def __repr__(self) -> str:
+        return f"<TimerHandle key={self.key!r} kind={self.kind} deadline={self.deadline:.3f}>"
+
+
+class TimerWheel:
+    """Hierarchical timer wheel dengan key unik per timer."""
+
+    def __init__(
+        self,
+        tick: float | None = None,
+        slots: int | None = None,
+        levels: int | None = None,
+        clock: Clock = time.monotonic,
+    ):
+        settings = get_settings()
+        self.tick = tick or settings.TIMER_WHEEL_TICK
+        self.slots = slots or settings.TIMER_WHEEL_SLOTS
+        self.levels = levels or settings.TIMER_WHEEL_LEVELS
+        self.clock = clock
+        self._spans = [self.slots**level for level in range(self.levels)]
+        self._max_delta = self.slots**self.levels - 1
+        self._wheels: list[list[dict[Hashable, TimerHandle]]] = [
+            [{} for _ in range(self.slots)] for _ in range(self.levels)
+        ]
+        self._handles: dict[Hashable, TimerHandle] = {}
+        self._now_tick = int(clock() / self.tick)
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._handles
+
+    def get(self, key: Hashable) -> TimerHandle | None:
+        return self._handles.get(key)
+
+    def _place(self, handle: TimerHandle) -> bool:
+        """Taruh handle di slot yang sesuai; False kalau sudah jatuh tempo."""
+        delta = handle.tick - self._now_tick
+        if delta <= 0:
+            return False
+        if delta < self.slots:
+            bucket = self._wheels[0][handle.tick % self.slots]
+        else:
+            target = handle.tick
+            if delta > self._max_delta:
+                target = self._now_tick + self._max_delta
+            level = 1
+            while level < self.levels - 1 and delta >= self._spans[level + 1]:
+                level += 1
+            bucket = self._wheels[level][(target // self._spans[level]) % self.slots]
+        bucket[handle.key] = handle
+        handle.bucket = bucket
+        return True
+
+    def schedule(self, key: Hashable, deadline: float, kind: str = "") -> TimerHandle:
+        """Pasang timer `key` (timer lama dengan key sama diganti). O(1)."""
+        if key in self._handles:
+            self.cancel(key)
+        tick = math.ceil(deadline / self.tick - _EPS)
+        if tick <= self._now_tick:
+            tick = self._now_tick + 1
+        handle = TimerHandle(key, kind, deadline, tick)
+        self._handles[key] = handle
+        self._place(handle)
+        return handle
+
+    def schedule_in(self, key: Hashable, delay: float, kind: str = "") -> TimerHandle:
+        return self.schedule(key, self.clock() + delay, kind)
+
+    def cancel(self, key: Hashable) -> bool:
+        """Batalkan timer `key`. O(1); False kalau tidak ada."""
+        handle = self._handles.pop(key, None)
+        if handle is None:
+            return False
+        if handle.bucket is not None:
+            handle.bucket.pop(key, None)
+            handle.bucket = None
+        return True
+
+    def _cascade(self, level: int, tick: int, expired: list[TimerHandle]) -> None:
+        bucket = self._wheels[level][(tick // self._spans[level]) % self.slots]
+        if not bucket:
+            return
+        handles = list(bucket.values())
+        bucket.clear()
+        for handle in handles:
+            if not self._place(handle):
+                self._expire(handle, expired)
+
+    def _expire(self, handle: TimerHandle, expired: list[TimerHandle]) -> None:
+        handle.bucket = None
+        del self._handles[handle.key]
+        expired.append(handle)
+
+    def advance(self, now: float | None = None) -> list[TimerHandle]:
+        """Majukan wheel sampai `now`; return timer yang jatuh tempo (urut tick)."""
+        target = int((self.clock() if now is None else now) / self.tick + _EPS)
+        expired: list[TimerHandle] = []
+        spans = self._spans
+        level0 = self._wheels[0]
+        while self._now_tick < target:
+            if not self._handles:
+                self._now_tick = target
+                break
+            self._now_tick += 1
+            tick = self._now_tick
+            for level in range(self.levels - 1, 0, -1):
+                if tick % spans[level] == 0:
+                    self._cascade(level, tick, expired)
+            bucket = level0[tick % self.slots]
+            if bucket:
+                for handle in list(bucket.values()):
+                    self._expire(handle, expired)
+                bucket.clear()
+        return expired
+
+
+class TimeoutScheduler:
+    """Driver asyncio untuk `TimerWheel`: satu task, handler batch per jenis."""
+
+    def __init__(
+        self,
+        wheel: TimerWheel | None = None,
+        *,
+        registry: MetricsRegistry | None = None,
+    ):
+        self.wheel = wheel if wheel is not None else TimerWheel()
+        self.metrics = registry or metrics
+        self._handlers: dict[str, TimeoutHandler] = {}
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+        self.log = logger.bind(service="TimeoutScheduler")
+
+    def on(self, kind: str, handler: TimeoutHandler) -> None:
+        """Daftarkan handler untuk timer jenis `kind` (dipanggil dengan list key)."""
+        self._handlers[kind] = handler
+
+    def handles(self, kind: str) -> bool:
+        return kind in self._handlers
+
+    def schedule(self, kind: str, key: Hashable, delay: float) -> TimerHandle:
+        return self.wheel.schedule_in((kind, key), delay, kind)
+
+    def cancel(self, kind: str, key: Hashable) -> bool:
+        return self.wheel.cancel((kind, key))
+
+    def pending(self, kind: str, key: Hashable) -> bool:
+        return (kind, key) in self.wheel
+
+    async def fire_due(self, now: float | None = None) -> int:
+        """Jalankan handler untuk semua timer yang jatuh tempo. Return jumlahnya."""
+        expired = self.wheel.advance(now)
+        if not expired:
+            return 0
+        batches: dict[str, list[Hashable]] = {}
+        for handle in expired:
+            batches.setdefault(handle.kind, []).append(handle.key[1])
+        for kind, keys in batches.items():
+            self.metrics.inc("timers_fired", len(keys), kind=kind)
+            handler = self._handlers.get(kind)
+            if handler is None:
+                self.log.warning("No handler for timer kind", kind=kind, n=len(keys))
+                continue
+            try:
+                await handler(keys)
+            except Exception as e:
+                self.log.exception("Timeout handler failed", kind=kind, error=str(e))
+        self.metrics.set_gauge("timers_outstanding", len(self.wheel))
+        return len(expired)
+
+    async def run_forever(self) -> None:
+        self.log.info("Timeout scheduler started", tick=self.wheel.tick)
+        while not self._stop.is_set():
+            await self.fire_due()
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), self.wheel.tick)
+        self.log.info("Timeout scheduler stopped")
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+
+timeout_scheduler = TimeoutScheduler()
@@ -1,3 +1,11 @@
 from app.service.security.srv_hasher import HasherService
+from app.service.security.srv_signature import OtomaxSignatureService
+from app.service.security.srv_vault import SEALED_PREFIX, CredentialVault, vault
 
-__all__ = ["HasherService"]
+__all__ = [
+    "SEALED_PREFIX",
+    "CredentialVault",
+    "HasherService",
+    "OtomaxSignatureService",
+    "vault",
+]
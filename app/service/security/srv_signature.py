@@ -2,6 +2,7 @@
 
 import base64
 import hashlib
+import hmac
 
 
 class OtomaxSignatureService:
@@ -111,3 +112,10 @@ class OtomaxSignatureService:
         signature = base64.b64encode(sha1_digest).decode().rstrip("=")
         signature = signature.replace("+", "-").replace("/", "_")
         return signature
+
+    @staticmethod
+    def verify(expected: str, sign: str | None) -> bool:
+        """Bandingkan signature dari member dengan yang diharapkan (constant time)."""
+        if not sign:
+            return False
+        return hmac.compare_digest(expected.encode(), sign.encode())
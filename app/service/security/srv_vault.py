@@ -0,0 +1,150 @@
+"""Vault kredensial member / module (pin & password) terenkripsi di DB.
+
+Nilai di kolom `pin` / `password` disimpan sebagai `vault:v1:<token Fernet>`.
+Key Fernet diturunkan SEKALI saat startup dari `VAULT_MASTER_KEY` (scrypt,
+sengaja mahal); setelah itu hot path verifikasi sign hanya membaca cache
+plaintext in-memory:
+
+- cache per pemilik (`member:<id>` / `module:<id>`), tiap entry menyimpan token
+  asal; token di row berbeda (di-update lewat repo / edit manual) = decrypt
+  ulang, jadi cache tidak pernah mengembalikan kredensial basi,
+- `invalidate()` dipanggil repo setelah upsert,
+- `lock()` membuang key + seluruh cache; instance tidak bisa di-pickle dan
+  `repr()` tidak pernah menampilkan isi.
+
+Row lama yang masih plaintext tetap terbaca apa adanya (migrasi bertahap, lihat
+`scripts/vault_seal.py`). Tanpa master key vault nonaktif: `seal()` tidak
+mengubah nilai.
+"""
+
+import base64
+from collections.abc import Iterable, Mapping
+from typing import Any, NoReturn
+
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+
+from app.config import Settings, get_settings
+from app.custom.exceptions.cst_exceptions import VaultError
+from app.mlogg import logger
+from app.service.metrics import MetricsRegistry, metrics
+
+SEALED_PREFIX = "vault:v1:"
+SECRET_FIELDS = ("pin", "password")
+
+
+def derive_key(passphrase: str, salt: str, cost: int = 2**15) -> bytes:
+    """Turunkan key Fernet (urlsafe base64, 32 byte) dari passphrase."""
+    kdf = Scrypt(salt=salt.encode(), length=32, n=cost, r=8, p=1)
+    return base64.urlsafe_b64encode(kdf.derive(passphrase.encode()))
+
+
+class CredentialVault:
+    __slots__ = ("_cache", "_fernet", "log", "metrics")
+
+    def __init__(self, *, registry: MetricsRegistry | None = None):
+        self._fernet: Fernet | None = None
+        # owner -> field -> (nilai tersimpan, plaintext)
+        self._cache: dict[str, dict[str, tuple[str, str]]] = {}
+        self.metrics = registry or metrics
+        self.log = logger.bind(service="CredentialVault")
+
+    def __repr__(self) -> str:
+        return f"<CredentialVault unlocked={self.unlocked} cached={len(self._cache)}>"
+
+    def __reduce__(self) -> NoReturn:
+        raise TypeError("CredentialVault cannot be pickled")
+
+    @property
+    def unlocked(self) -> bool:
+        return self._fernet is not None
+
+    # ------------------------
+    # Key
+    # ------------------------
+    def unlock(self, passphrase: str, salt: str, cost: int = 2**15) -> None:
+        """Turunkan key dari passphrase lalu buka vault (cache lama dibuang)."""
+        self._fernet = Fernet(derive_key(passphrase, salt, cost))
+        self._cache.clear()
+
+    def unlock_from_settings(self, settings: Settings | None = None) -> bool:
+        """Buka vault dari `VAULT_MASTER_KEY`; False kalau master key kosong."""
+        settings = settings or get_settings()
+        if settings.VAULT_MASTER_KEY is None:
+            self.log.warning("VAULT_MASTER_KEY not set, credentials stay plaintext")
+            return False
+        self.unlock(
+            settings.VAULT_MASTER_KEY.get_secret_value(),
+            settings.VAULT_KDF_SALT,
+            settings.VAULT_KDF_COST,
+        )
+        self.log.info("Credential vault unlocked")
+        return True
+
+    def lock(self) -> None:
+        self._fernet = None
+        self._cache.clear()
+
+    # ------------------------
+    # Seal / reveal
+    # ------------------------
+    @staticmethod
+    def is_sealed(value: str) -> bool:
+        return value.startswith(SEALED_PREFIX)
+
+    def seal(self, plaintext: str) -> str:
+        """Enkripsi satu nilai; tanpa master key / sudah sealed = apa adanya."""
+        if self._fernet is None or self.is_sealed(plaintext):
+            return plaintext
+        return SEALED_PREFIX + self._fernet.encrypt(plaintext.encode()).decode()
+
+    def seal_row(
+        self, row: Mapping[str, Any], fields: Iterable[str] = SECRET_FIELDS
+    ) -> dict[str, Any]:
+        """Salinan `row` dengan kolom rahasia yang ada di-seal."""
+        sealed = dict(row)
+        for field in fields:
+            value = sealed.get(field)
+            if isinstance(value, str):
+                sealed[field] = self.seal(value)
+        return sealed
+
+    def _decrypt(self, owner: str, field: str, stored: str) -> str:
+        if self._fernet is None:
+            raise VaultError(
+                "Credential vault is locked", context={"owner": owner, "field": field}
+            )
+        try:
+            token = stored.removeprefix(SEALED_PREFIX).encode()
+            return self._fernet.decrypt(token).decode()
+        except InvalidToken as e:
+            raise VaultError(
+                "Stored credential cannot be decrypted with the current master key",
+                context={"owner": owner, "field": field},
+                cause=e,
+            ) from e
+
+    def reveal(self, owner: str, field: str, stored: str) -> str:
+        """Plaintext kredensial `field` milik `owner` (cache selama token sama).
+
+        Raises:
+            VaultError: vault terkunci / token tidak cocok dengan master key.
+        """
+        if not stored.startswith(SEALED_PREFIX):
+            return stored
+        fields = self._cache.get(owner)
+        if fields is not None:
+            entry = fields.get(field)
+            if entry is not None and entry[0] == stored:
+                return entry[1]
+        plaintext = self._decrypt(owner, field, stored)
+        self._cache.setdefault(owner, {})[field] = (stored, plaintext)
+        self.metrics.inc("vault_decrypt")
+        return plaintext
+
+    def invalidate(self, owners: Iterable[str]) -> None:
+        for owner in owners:
+            self._cache.pop(owner, None)
+
+
+vault = CredentialVault()
@@ -0,0 +1,31 @@
+from app.service.supplier.srv_circuit_breaker import (
+    AIMDLimiter,
+    CircuitBreaker,
+    ModuleGuard,
+    ModuleGuardRegistry,
+    module_guards,
+)
+from app.service.supplier.srv_client_registry import (
+    SupplierClientRegistry,
+    supplier_clients,
+)
+from app.service.supplier.srv_hedging import (
+    HedgeBudget,
+    HedgeResult,
+    SupplierHedger,
+    supplier_hedger,
+)
+
+__all__ = [
+    "AIMDLimiter",
+    "CircuitBreaker",
+    "HedgeBudget",
+    "HedgeResult",
+    "ModuleGuard",
+    "ModuleGuardRegistry",
+    "SupplierClientRegistry",
+    "SupplierHedger",
+    "module_guards",
+    "supplier_clients",
+    "supplier_hedger",
+]
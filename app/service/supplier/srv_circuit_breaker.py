@@ -0,0 +1,317 @@
+"""Circuit breaker + AIMD adaptive concurrency limiter per module.
+
+Kalau satu module DIGIPOS melambat / error, worker tidak boleh ikut menumpuk
+di module itu. Tiap `moduleid` punya:
+
+- `CircuitBreaker`: closed → open (error rate rolling window lewat threshold)
+  → half_open (beberapa probe) → closed / open lagi.
+- `AIMDLimiter`: limit konkurensi naik additive saat latency sehat, turun
+  multiplicative saat latency lewat target atau error.
+
+`ModuleGuard.acquire()` menolak request dalam hitungan mikrodetik (cek state
++ counter, tanpa I/O) dengan `CircuitOpenError` / `ModuleOverloadedError`.
+"""
+
+import time
+from collections.abc import Callable
+
+from app.config import get_settings
+from app.custom.exceptions.cst_exceptions import (
+    CircuitOpenError,
+    ModuleOverloadedError,
+)
+from app.mlogg import logger
+from app.schemas.sch_module import BreakerState, ModuleHealth
+
+Clock = Callable[[], float]
+
+
+class CircuitBreaker:
+    """Circuit breaker berbasis error rate pada rolling window per-detik."""
+
+    __slots__ = (
+        "_buckets",
+        "_clock",
+        "_half_open_in_flight",
+        "_half_open_successes",
+        "error_rate_threshold",
+        "half_open_probes",
+        "min_requests",
+        "open_seconds",
+        "open_until",
+        "state",
+        "window",
+    )
+
+    def __init__(
+        self,
+        *,
+        window: int,
+        min_requests: int,
+        error_rate_threshold: float,
+        open_seconds: float,
+        half_open_probes: int,
+        clock: Clock = time.monotonic,
+    ):
+        self.window = window
+        self.min_requests = min_requests
+        self.error_rate_threshold = error_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._clock = clock
+        # ring buffer: [second, total, errors] per slot
+        self._buckets: list[list[int]] = [[0, 0, 0] for _ in range(window)]
+        self.state = BreakerState.CLOSED
+        self.open_until = 0.0
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+
+    def _bucket(self, now: float) -> list[int]:
+        second = int(now)
+        bucket = self._buckets[second % self.window]
+        if bucket[0] != second:
+            bucket[0], bucket[1], bucket[2] = second, 0, 0
+        return bucket
+
+    def counts(self) -> tuple[int, int]:
+        """Total request dan error dalam window saat ini."""
+        oldest = int(self._clock()) - self.window
+        total = errors = 0
+        for second, t, e in self._buckets:
+            if second > oldest:
+                total += t
+                errors += e
+        return total, errors
+
+    def allow(self) -> bool:
+        """Cek murah apakah request boleh lewat (dipanggil di hot path)."""
+        if self.state is BreakerState.CLOSED:
+            return True
+        if self.state is BreakerState.OPEN:
+            if self._clock() < self.open_until:
+                return False
+            self.state = BreakerState.HALF_OPEN
+            self._half_open_in_flight = 0
+            self._half_open_successes = 0
+        if self._half_open_in_flight >= self.half_open_probes:
+            return False
+        self._half_open_in_flight += 1
+        return True
+
+    def record(self, success: bool) -> None:
+        now = self._clock()
+        if self.state is BreakerState.HALF_OPEN:
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+            if not success:
+                self._trip(now)
+                return
+            self._half_open_successes += 1
+            if self._half_open_successes >= self.half_open_probes:
+                self._reset()
+            return
+        bucket = self._bucket(now)
+        bucket[1] += 1
+        if not success:
+            bucket[2] += 1
+            total, errors = self.counts()
+            if (
+                total >= self.min_requests
+                and errors / total >= self.error_rate_threshold
+            ):
+                self._trip(now)
+
+    def cancel(self) -> None:
+        """Kembalikan slot probe half-open yang tidak jadi dipakai."""
+        if self.state is BreakerState.HALF_OPEN:
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def _trip(self, now: float) -> None:
+        self.state = BreakerState.OPEN
+        self.open_until = now + self.open_seconds
+
+    def _reset(self) -> None:
+        self.state = BreakerState.CLOSED
+        self.open_until = 0.0
+        for bucket in self._buckets:
+            bucket[0], bucket[1], bucket[2] = 0, 0, 0
+
+
+class AIMDLimiter:
+    """Additive-increase / multiplicative-decrease concurrency limit."""
+
+    __slots__ = (
+        "_clock",
+        "_last_decrease",
+        "backoff",
+        "in_flight",
+        "limit",
+        "max_limit",
+        "min_limit",
+        "target_latency",
+    )
+
+    def __init__(
+        self,
+        *,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        target_latency: float,
+        backoff: float,
+        clock: Clock = time.monotonic,
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.in_flight = 0
+        self._clock = clock
+        self._last_decrease = 0.0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float, success: bool) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+        if success and latency <= self.target_latency:
+            # +1 per "satu limit penuh" request sukses
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            return
+        now = self._clock()
+        # turunkan maksimal sekali per target_latency agar satu burst lambat
+        # tidak langsung menjatuhkan limit ke minimum
+        if now - self._last_decrease >= self.target_latency:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+            self._last_decrease = now
+
+
+class ModuleGuard:
+    """Gabungan breaker + limiter untuk satu module."""
+
+    __slots__ = (
+        "_clock",
+        "breaker",
+        "ewma_alpha",
+        "ewma_latency",
+        "limiter",
+        "moduleid",
+        "shed_count",
+    )
+
+    def __init__(
+        self,
+        moduleid: str,
+        breaker: CircuitBreaker,
+        limiter: AIMDLimiter,
+        clock: Clock = time.monotonic,
+        ewma_alpha: float = 0.2,
+    ):
+        self.moduleid = moduleid
+        self.breaker = breaker
+        self.limiter = limiter
+        self.shed_count = 0
+        self.ewma_alpha = ewma_alpha
+        self.ewma_latency: float | None = None
+        self._clock = clock
+
+    def acquire(self) -> float:
+        """Ambil slot atau raise segera. Return timestamp start untuk `release`."""
+        if not self.breaker.allow():
+            self.shed_count += 1
+            raise CircuitOpenError(context={"moduleid": self.moduleid})
+        if not self.limiter.try_acquire():
+            self.shed_count += 1
+            self.breaker.cancel()
+            raise ModuleOverloadedError(context={"moduleid": self.moduleid})
+        return self._clock()
+
+    def release(self, started: float, success: bool) -> None:
+        latency = self._clock() - started
+        self.limiter.release(latency, success)
+        self.breaker.record(success)
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency += self.ewma_alpha * (latency - self.ewma_latency)
+
+    def cancel(self) -> None:
+        """Lepas slot tanpa mencatat outcome (request dibatalkan, mis. kalah hedge)."""
+        self.limiter.in_flight = max(0, self.limiter.in_flight - 1)
+        self.breaker.cancel()
+
+    def success_counts(self) -> tuple[int, int]:
+        """(total, sukses) request dalam window breaker."""
+        total, errors = self.breaker.counts()
+        return total, total - errors
+
+    def health(self) -> ModuleHealth:
+        total, errors = self.breaker.counts()
+        remaining = 0.0
+        if self.breaker.state is BreakerState.OPEN:
+            remaining = max(0.0, self.breaker.open_until - self._clock())
+        return ModuleHealth(
+            moduleid=self.moduleid,
+            state=self.breaker.state,
+            error_rate=errors / total if total else 0.0,
+            window_requests=total,
+            open_remaining=remaining,
+            concurrency_limit=round(self.limiter.limit, 2),
+            in_flight=self.limiter.in_flight,
+            shed_count=self.shed_count,
+            ewma_latency=round(self.ewma_latency, 4)
+            if self.ewma_latency is not None
+            else None,
+        )
+
+
+class ModuleGuardRegistry:
+    """Registry `ModuleGuard` per moduleid, dibuat lazy dari settings."""
+
+    def __init__(self, clock: Clock = time.monotonic):
+        self._clock = clock
+        self._guards: dict[str, ModuleGuard] = {}
+        self.log = logger.bind(service="ModuleGuardRegistry")
+
+    def guard(self, moduleid: str) -> ModuleGuard:
+        guard = self._guards.get(moduleid)
+        if guard is None:
+            guard = self._guards[moduleid] = self._build(moduleid)
+        return guard
+
+    def _build(self, moduleid: str) -> ModuleGuard:
+        settings = get_settings()
+        breaker = CircuitBreaker(
+            window=settings.BREAKER_WINDOW_SECONDS,
+            min_requests=settings.BREAKER_MIN_REQUESTS,
+            error_rate_threshold=settings.BREAKER_ERROR_RATE,
+            open_seconds=settings.BREAKER_OPEN_SECONDS,
+            half_open_probes=settings.BREAKER_HALF_OPEN_PROBES,
+            clock=self._clock,
+        )
+        limiter = AIMDLimiter(
+            initial=settings.AIMD_INITIAL_LIMIT,
+            min_limit=settings.AIMD_MIN_LIMIT,
+            max_limit=settings.AIMD_MAX_LIMIT,
+            target_latency=settings.AIMD_TARGET_LATENCY,
+            backoff=settings.AIMD_BACKOFF,
+            clock=self._clock,
+        )
+        self.log.debug("Module guard created", moduleid=moduleid)
+        return ModuleGuard(
+            moduleid,
+            breaker,
+            limiter,
+            clock=self._clock,
+            ewma_alpha=settings.GUARD_EWMA_ALPHA,
+        )
+
+    def snapshot(self) -> list[ModuleHealth]:
+        return [g.health() for g in self._guards.values()]
+
+
+# Singleton instance untuk FastAPI
+module_guards = ModuleGuardRegistry()
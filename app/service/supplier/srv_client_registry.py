@@ -0,0 +1,300 @@
+"""Registry HTTP client supplier: satu `httpx.AsyncClient` long-lived per module.
+
+Membuat client per request (seperti `_call_supplier_api` di sample) berarti
+handshake TCP/TLS setiap transaksi. Registry ini membuat satu pool keep-alive
+per `moduleid` (base_url module), di-warm saat lifespan startup dan ditutup
+saat shutdown.
+"""
+
+import asyncio
+import importlib.util
+import time
+from collections.abc import Iterable
+from typing import Any
+
+import httpx
+
+from app.config import get_settings
+from app.custom.cst_deadline import check_deadline, deadline_scope
+from app.custom.exceptions.cst_exceptions import (
+    DeadlineExceededError,
+    SupplierError,
+    SupplierNotConfiguredError,
+)
+from app.mlogg import logger
+from app.parser import supplier_rules
+from app.schemas.sch_module import ModuleInDB
+from app.schemas.sch_transaction import OutboxClaim
+from app.service.metrics import MetricsRegistry, metrics
+from app.service.supplier.srv_circuit_breaker import ModuleGuardRegistry, module_guards
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class SupplierClientRegistry:
+    """Pool `httpx.AsyncClient` per moduleid dengan limits & timeout per fase."""
+
+    def __init__(
+        self,
+        *,
+        limits: httpx.Limits | None = None,
+        timeout: httpx.Timeout | None = None,
+        http2: bool | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        registry: MetricsRegistry | None = None,
+        guards: ModuleGuardRegistry | None = None,
+        drain_timeout: float | None = None,
+    ):
+        settings = get_settings()
+        self.limits = limits or httpx.Limits(
+            max_connections=settings.SUPPLIER_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SUPPLIER_MAX_KEEPALIVE,
+            keepalive_expiry=settings.SUPPLIER_KEEPALIVE_EXPIRY,
+        )
+        self.timeout = timeout or httpx.Timeout(
+            connect=settings.SUPPLIER_CONNECT_TIMEOUT,
+            read=settings.SUPPLIER_READ_TIMEOUT,
+            write=settings.SUPPLIER_WRITE_TIMEOUT,
+            pool=settings.SUPPLIER_POOL_TIMEOUT,
+        )
+        want_http2 = settings.SUPPLIER_HTTP2 if http2 is None else http2
+        self.http2 = want_http2 and HTTP2_AVAILABLE
+        # transport custom hanya untuk test (httpx.MockTransport)
+        self._transport = transport
+        self.metrics = registry or metrics
+        self.guards = guards or module_guards
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._base_urls: dict[str, str] = {}
+        self._providers: dict[str, str] = {}
+        self.drain_timeout = (
+            settings.SUPPLIER_CLIENT_DRAIN_TIMEOUT
+            if drain_timeout is None
+            else drain_timeout
+        )
+        # request yang sedang memakai tiap client; client lama ditutup saat 0
+        self._in_flight: dict[httpx.AsyncClient, int] = {}
+        self._idle: dict[httpx.AsyncClient, asyncio.Event] = {}
+        self._retired: set[httpx.AsyncClient] = set()
+        self._closing: set[asyncio.Task[None]] = set()
+        self.log = logger.bind(service="SupplierClientRegistry")
+        if want_http2 and not HTTP2_AVAILABLE:
+            self.log.warning("SUPPLIER_HTTP2 aktif tapi paket 'h2' tidak terpasang")
+
+    def _build_client(self, base_url: str) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=base_url,
+            limits=self.limits,
+            timeout=self.timeout,
+            http2=self.http2,
+            transport=self._transport,
+        )
+
+    def register(self, module: ModuleInDB) -> httpx.AsyncClient:
+        """Daftarkan / ganti client untuk satu module.
+
+        Client lama (kalau base_url berubah) ditutup di background setelah
+        request yang sedang memakainya selesai (maks `drain_timeout`), jadi
+        request yang sedang jalan tidak terputus paksa.
+        """
+        base_url = str(module.base_url).rstrip("/")
+        self._providers[module.moduleid] = module.provider
+        current = self._clients.get(module.moduleid)
+        if current is not None and self._base_urls.get(module.moduleid) == base_url:
+            return current
+        client = self._build_client(base_url)
+        self._clients[module.moduleid] = client
+        self._base_urls[module.moduleid] = base_url
+        if current is not None:
+            self._close_later(current)
+        self.log.info(
+            "Supplier client registered", moduleid=module.moduleid, base_url=base_url
+        )
+        return client
+
+    def unregister(self, moduleid: str) -> None:
+        client = self._clients.pop(moduleid, None)
+        self._base_urls.pop(moduleid, None)
+        self._providers.pop(moduleid, None)
+        if client is not None:
+            self._close_later(client)
+
+    def _close_later(self, client: httpx.AsyncClient) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # tidak ada loop berjalan (mis. saat teardown sync): biarkan GC
+            return
+        self._retired.add(client)
+        task = loop.create_task(self._drain_and_close(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _drain_and_close(self, client: httpx.AsyncClient) -> None:
+        """Tunggu request yang masih memakai `client` selesai, lalu tutup."""
+        try:
+            if self._in_flight.get(client):
+                idle = self._idle.setdefault(client, asyncio.Event())
+                try:
+                    await asyncio.wait_for(idle.wait(), self.drain_timeout)
+                except TimeoutError:
+                    self.log.warning(
+                        "Supplier client drain timeout, closing anyway",
+                        in_flight=self._in_flight.get(client, 0),
+                    )
+            await client.aclose()
+        finally:
+            self._idle.pop(client, None)
+            self._retired.discard(client)
+
+    def _acquire(self, client: httpx.AsyncClient) -> None:
+        self._in_flight[client] = self._in_flight.get(client, 0) + 1
+
+    def _release(self, client: httpx.AsyncClient) -> None:
+        left = self._in_flight[client] - 1
+        if left:
+            self._in_flight[client] = left
+            return
+        del self._in_flight[client]
+        idle = self._idle.get(client)
+        if idle is not None:
+            idle.set()
+
+    async def warm(self, modules: Iterable[ModuleInDB], prime: bool = False) -> int:
+        """Buat client untuk semua module aktif; optional buka koneksi awal."""
+        count = 0
+        for module in modules:
+            if not module.is_active:
+                continue
+            self.register(module)
+            count += 1
+        if prime and self._clients:
+            await asyncio.gather(
+                *(self._prime(mid, c) for mid, c in self._clients.items())
+            )
+        self.log.info("Supplier clients warmed", count=count, http2=self.http2)
+        return count
+
+    async def _prime(self, moduleid: str, client: httpx.AsyncClient) -> None:
+        """Buka koneksi (TCP/TLS) lebih awal; gagal prime tidak fatal."""
+        try:
+            await client.head("/", timeout=self.timeout.connect)
+        except httpx.HTTPError as e:
+            self.log.warning("Supplier prime failed", moduleid=moduleid, error=str(e))
+
+    def get(self, moduleid: str) -> httpx.AsyncClient:
+        client = self._clients.get(moduleid)
+        if client is None:
+            raise SupplierNotConfiguredError(context={"moduleid": moduleid})
+        return client
+
+    def __contains__(self, moduleid: str) -> bool:
+        return moduleid in self._clients
+
+    def provider_of(self, moduleid: str) -> str | None:
+        """Provider module (kunci rule parser response), None kalau belum terdaftar."""
+        return self._providers.get(moduleid)
+
+    @property
+    def moduleids(self) -> list[str]:
+        return list(self._clients)
+
+    async def request(
+        self, moduleid: str, method: str, path: str, **kwargs: Any
+    ) -> httpx.Response:
+        """Kirim request ke module via client pooled miliknya.
+
+        Request lewat `ModuleGuard` module: ditolak segera kalau breaker open
+        atau limit konkurensi adaptif penuh; outcome & latency dicatat balik.
+        Request yang di-cancel hanya melepas slot, tidak dihitung gagal.
+        Deadline request (kalau ada) membatasi waktu tunggu; request yang
+        deadline-nya sudah lewat tidak dikirim sama sekali.
+        """
+        client = self.get(moduleid)
+        guard = self.guards.guard(moduleid)
+        check_deadline("supplier")
+        try:
+            started = guard.acquire()
+        except SupplierError:
+            self.metrics.inc("supplier_shed", module=moduleid)
+            raise
+        t0 = time.perf_counter()
+        self._acquire(client)
+        try:
+            async with deadline_scope("supplier"):
+                response = await client.request(method, path, **kwargs)
+        except (asyncio.CancelledError, DeadlineExceededError):
+            # dibatalkan pemanggil (kalah hedge / deadline habis): bukan kegagalan module
+            guard.cancel()
+            self.metrics.inc("supplier_cancelled", module=moduleid)
+            raise
+        except httpx.HTTPError as e:
+            guard.release(started, False)
+            self.metrics.observe(
+                "supplier_request_seconds", time.perf_counter() - t0, module=moduleid
+            )
+            self.metrics.inc("supplier_request_errors", module=moduleid)
+            raise SupplierError(
+                context={"moduleid": moduleid, "path": path}, cause=e
+            ) from e
+        except Exception:
+            # error di luar transport (mis. httpx.InvalidURL, argumen salah):
+            # slot guard tetap dilepas supaya limiter tidak bocor
+            guard.release(started, False)
+            self.metrics.inc("supplier_request_errors", module=moduleid)
+            raise
+        finally:
+            self._release(client)
+        guard.release(started, response.status_code < 500)
+        self.metrics.observe(
+            "supplier_request_seconds", time.perf_counter() - t0, module=moduleid
+        )
+        self.metrics.inc(
+            "supplier_responses", module=moduleid, status=response.status_code
+        )
+        return response
+
+    async def send_outbox_claim(self, claim: OutboxClaim) -> dict[str, Any]:
+        """Sender untuk OutboxDispatcher.
+
+        `supplier_request` berisi ``method``, ``path`` dan ``params`` / ``data`` /
+        ``json`` sesuai format provider. Body response diklasifikasi dengan rule
+        provider module (status / sn / price / message) di key ``parsed``.
+        """
+        req = claim.supplier_request or {}
+        response = await self.request(
+            claim.moduleid,
+            req.get("method", "GET"),
+            req.get("path", "/"),
+            params=req.get("params"),
+            data=req.get("data"),
+            json=req.get("json"),
+        )
+        if response.status_code >= 500:
+            raise SupplierError(
+                f"Supplier returned HTTP {response.status_code}",
+                context={"moduleid": claim.moduleid},
+            )
+        body = response.text
+        result: dict[str, Any] = {"status_code": response.status_code, "body": body}
+        provider = self._providers.get(claim.moduleid)
+        if provider is not None and provider in supplier_rules:
+            result["parsed"] = supplier_rules.parse(provider, body).as_dict()
+        return result
+
+    async def aclose(self) -> None:
+        """Tutup semua client (dipanggil saat lifespan shutdown)."""
+        # client lama yang masih drain ikut ditutup sekarang
+        clients = [*self._clients.values(), *self._retired]
+        for task in list(self._closing):
+            task.cancel()
+        await asyncio.gather(*self._closing, return_exceptions=True)
+        self._clients.clear()
+        self._base_urls.clear()
+        self._providers.clear()
+        self._retired.clear()
+        await asyncio.gather(*(c.aclose() for c in clients), return_exceptions=True)
+        self.log.info("Supplier clients closed", count=len(clients))
+
+
+# Singleton instance untuk FastAPI
+supplier_clients = SupplierClientRegistry()
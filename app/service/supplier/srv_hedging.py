@@ -0,0 +1,238 @@
+"""Hedged request ke supplier untuk produk idempotent (inquiry / cek saldo).
+
+Request dikirim ke module utama; kalau belum selesai dalam p95 latency module
+tersebut, request kedua dikirim ke module berikutnya dan jawaban valid yang
+datang duluan dipakai. Request yang kalah di-cancel (slot guard dilepas tanpa
+dihitung gagal, lihat `SupplierClientRegistry.request`).
+
+Beban tambahan dibatasi `HedgeBudget` per module tujuan: setiap request utama
+menambah `HEDGE_BUDGET_RATIO` token (maks `HEDGE_BUDGET_BURST`), satu hedge
+memakai satu token, jadi hedge tidak pernah lebih dari ~ratio x trafik normal.
+
+Belum ada pemanggil di tree ini: belum ada jalur inquiry / cek saldo ke
+supplier. Row outbox membawa `supplier_request` yang sudah dirakit untuk satu
+module (format provider berbeda-beda) sehingga tidak bisa di-hedge ke module
+lain, dan cek status `StatusPoller` harus ke module yang memegang transaksi.
+Jalur inquiry nanti memanggil `supplier_hedger.request(product,
+decision.ranked(), build)` dengan `build` yang merakit request per module.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable, Mapping, Sequence
+from contextlib import suppress
+from typing import Any, NamedTuple
+
+import httpx
+
+from app.config import get_settings
+from app.custom.exceptions.cst_exceptions import SupplierError
+from app.mlogg import logger
+from app.service.metrics import MetricsRegistry, metrics
+from app.service.supplier.srv_client_registry import (
+    SupplierClientRegistry,
+    supplier_clients,
+)
+
+RequestBuilder = Callable[[str], Mapping[str, Any]]
+ResponseCheck = Callable[[httpx.Response], bool]
+
+
+class HedgeResult(NamedTuple):
+    moduleid: str
+    response: httpx.Response
+    hedged: bool
+
+
+class HedgeBudget:
+    """Token bucket per module tujuan hedge, diisi oleh request utama."""
+
+    def __init__(self, ratio: float, burst: float):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens: dict[str, float] = {}
+
+    def deposit(self, moduleid: str) -> None:
+        tokens = self._tokens.get(moduleid, 0.0) + self.ratio
+        self._tokens[moduleid] = min(tokens, self.burst)
+
+    def try_spend(self, moduleid: str) -> bool:
+        tokens = self._tokens.get(moduleid, 0.0)
+        if tokens < 1.0:
+            return False
+        self._tokens[moduleid] = tokens - 1.0
+        return True
+
+    def tokens(self, moduleid: str) -> float:
+        return self._tokens.get(moduleid, 0.0)
+
+
+class SupplierHedger:
+    """Kirim request idempotent dengan hedge ke module cadangan."""
+
+    def __init__(
+        self,
+        *,
+        clients: SupplierClientRegistry | None = None,
+        registry: MetricsRegistry | None = None,
+        budget: HedgeBudget | None = None,
+    ):
+        settings = get_settings()
+        self.clients = clients or supplier_clients
+        self.metrics = registry or metrics
+        self.enabled = settings.HEDGE_ENABLED
+        self.idempotent = frozenset(
+            p.upper() for p in settings.HEDGE_IDEMPOTENT_PRODUCTS
+        )
+        self.budget = budget or HedgeBudget(
+            settings.HEDGE_BUDGET_RATIO, settings.HEDGE_BUDGET_BURST
+        )
+        self.min_samples = settings.HEDGE_MIN_SAMPLES
+        self.default_delay = settings.HEDGE_DEFAULT_DELAY
+        self.min_delay = settings.HEDGE_MIN_DELAY
+        self.delay_refresh = settings.HEDGE_DELAY_REFRESH
+        # moduleid -> (delay, berlaku sampai); sort window p95 cukup sesekali
+        self._delays: dict[str, tuple[float, float]] = {}
+        self.log = logger.bind(service="SupplierHedger")
+
+    def is_idempotent(self, product: str) -> bool:
+        return product.upper() in self.idempotent
+
+    def hedge_delay(self, moduleid: str) -> float:
+        """Delay sebelum hedge: p95 latency module (default kalau sampel kurang)."""
+        now = time.monotonic()
+        cached = self._delays.get(moduleid)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        stats = self.metrics.latency("supplier_request_seconds", module=moduleid)
+        if stats is None or stats.count < self.min_samples:
+            delay = self.default_delay
+        else:
+            delay = stats.percentile(95)
+        delay = max(delay, self.min_delay)
+        self._delays[moduleid] = (delay, now + self.delay_refresh)
+        return delay
+
+    @staticmethod
+    def _accept(
+        task: "asyncio.Task[httpx.Response]", is_valid: ResponseCheck | None
+    ) -> bool:
+        if task.cancelled() or task.exception() is not None:
+            return False
+        response = task.result()
+        if response.status_code >= 500:
+            return False
+        return is_valid is None or is_valid(response)
+
+    async def request(
+        self,
+        product: str,
+        modules: Sequence[str],
+        build: RequestBuilder,
+        *,
+        is_valid: ResponseCheck | None = None,
+    ) -> HedgeResult:
+        """Kirim request ke `modules[0]`, hedge ke `modules[1]` bila perlu.
+
+        Args:
+            product: kode produk; hedge hanya untuk produk idempotent.
+            modules: moduleid urut prioritas (mis. `ModuleDecision.ranked()`).
+            build: moduleid -> kwargs `SupplierClientRegistry.request`
+                (`method`, `path`, dan opsional `params` / `json` / ...).
+            is_valid: cek tambahan apakah response boleh dipakai.
+
+        Raises:
+            SupplierError: tidak ada module, atau semua percobaan gagal.
+        """
+        if not modules:
+            raise SupplierError(
+                "No module to send request to", context={"product": product}
+            )
+        primary = modules[0]
+        backup = modules[1] if len(modules) > 1 else None
+        if backup is None or not self.enabled or not self.is_idempotent(product):
+            kwargs = dict(build(primary))
+            response = await self.clients.request(
+                primary, kwargs.pop("method", "GET"), kwargs.pop("path", ""), **kwargs
+            )
+            return HedgeResult(primary, response, False)
+
+        self.budget.deposit(backup)
+        return await self._race(primary, backup, build, is_valid)
+
+    async def _race(
+        self,
+        primary: str,
+        backup: str,
+        build: RequestBuilder,
+        is_valid: ResponseCheck | None,
+    ) -> HedgeResult:
+        """Primary vs backup (setelah delay hedge); jawaban valid pertama menang."""
+        started = {self._start(primary, build): primary}
+        pending = set(started)
+        hedge_at: float | None = time.monotonic() + self.hedge_delay(primary)
+        try:
+            while pending:
+                timeout = None
+                if hedge_at is not None:
+                    timeout = max(0.0, hedge_at - time.monotonic())
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if self._accept(task, is_valid):
+                        moduleid = started[task]
+                        if moduleid != primary:
+                            self.metrics.inc("hedge_won", module=moduleid)
+                        return HedgeResult(moduleid, task.result(), len(started) > 1)
+                if hedge_at is None:
+                    continue
+                hedge_at = None
+                if done:
+                    # primary gagal sebelum delay hedge: langsung ke backup
+                    self.metrics.inc("hedge_failover", module=backup)
+                elif self.budget.try_spend(backup):
+                    self.metrics.inc("hedge_fired", module=backup)
+                else:
+                    # budget habis: tunggu module utama saja
+                    self.metrics.inc("hedge_budget_exhausted", module=backup)
+                    continue
+                task = self._start(backup, build)
+                started[task] = backup
+                pending.add(task)
+        finally:
+            await self._cancel(pending)
+        return self._raise_last(started)
+
+    def _start(
+        self, moduleid: str, build: RequestBuilder
+    ) -> "asyncio.Task[httpx.Response]":
+        kwargs = dict(build(moduleid))
+        method = kwargs.pop("method", "GET")
+        path = kwargs.pop("path", "")
+        return asyncio.create_task(
+            self.clients.request(moduleid, method, path, **kwargs)
+        )
+
+    @staticmethod
+    async def _cancel(tasks: set["asyncio.Task[httpx.Response]"]) -> None:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError, Exception):
+                await task
+
+    @staticmethod
+    def _raise_last(
+        started: Mapping["asyncio.Task[httpx.Response]", str],
+    ) -> HedgeResult:
+        """Tidak ada jawaban valid: return / raise hasil percobaan terakhir."""
+        task, moduleid = list(started.items())[-1]
+        error = task.exception()
+        if error is not None:
+            raise error
+        return HedgeResult(moduleid, task.result(), len(started) > 1)
+
+
+# Singleton instance untuk jalur inquiry / cek saldo (lihat docstring modul)
+supplier_hedger = SupplierHedger()
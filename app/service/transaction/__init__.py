@@ -0,0 +1,7 @@
+from app.service.transaction.srv_intake import (
+    TransactionIntake,
+    verify_balance_check,
+    verify_request,
+)
+
+__all__ = ["TransactionIntake", "verify_balance_check", "verify_request"]
@@ -0,0 +1,113 @@
+"""Intake request transaksi OtomaX: verifikasi member + catat ke inbox.
+
+Dipanggil setelah request lolos admission control (`MemberAdmission`), jadi
+ini bagian pertama yang menyentuh DB. Request dengan `refid` yang sama dari
+member yang sama hanya tercatat sekali (retry OtomaX).
+"""
+
+import hmac
+
+from app.custom.exceptions.cst_exceptions import SignatureInvalidError
+from app.database.repositories.repo_member import SQLiteMemberRepository
+from app.database.repositories.repo_transaction import SQLiteTransactionRepository
+from app.mlogg import logger
+from app.parser import OtomaxRequest
+from app.schemas.sch_member import MemberInDB
+from app.service.metrics import MetricsRegistry, metrics
+from app.service.outbox.srv_dispatcher import SessionFactory
+from app.service.security import OtomaxSignatureService
+
+
+def verify_request(member: MemberInDB, trx: OtomaxRequest) -> None:
+    """Cek `sign` (atau pin + password) request terhadap kredensial member.
+
+    Raises:
+        SignatureInvalidError: kredensial tidak ada / tidak cocok.
+    """
+    if member.allow_nosign:
+        return
+    if trx.sign:
+        expected = OtomaxSignatureService.generate_transaction_signature(
+            member.memberid,
+            trx.product,
+            trx.dest,
+            trx.refid,
+            member.pin,
+            member.password,
+        )
+        if OtomaxSignatureService.verify(expected, trx.sign):
+            return
+    elif trx.pin and trx.password:
+        pin_ok = hmac.compare_digest(member.pin.encode(), trx.pin.encode())
+        password_ok = hmac.compare_digest(
+            member.password.encode(), trx.password.encode()
+        )
+        if pin_ok and password_ok:
+            return
+    raise SignatureInvalidError(context={"memberid": trx.memberid, "refid": trx.refid})
+
+
+def verify_balance_check(member: MemberInDB, sign: str | None) -> None:
+    """Cek `sign` request cek saldo terhadap kredensial member.
+
+    Raises:
+        SignatureInvalidError: sign kosong / tidak cocok.
+    """
+    if member.allow_nosign:
+        return
+    expected = OtomaxSignatureService.generate_balance_check_signature(
+        member.memberid, member.pin, member.password
+    )
+    if not OtomaxSignatureService.verify(expected, sign):
+        raise SignatureInvalidError(context={"memberid": member.memberid})
+
+
+class TransactionIntake:
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        *,
+        registry: MetricsRegistry | None = None,
+    ):
+        self.session_factory = session_factory
+        self.metrics = registry or metrics
+        self.log = logger.bind(service="TransactionIntake")
+
+    async def accept(self, trx: OtomaxRequest) -> int | None:
+        """Verifikasi lalu catat request ke inbox.
+
+        Returns:
+            int | None: id inbox, None kalau request (memberid, refid) duplikat.
+
+        Raises:
+            DataNotFoundError: member tidak ada / nonaktif.
+            SignatureInvalidError: sign tidak cocok.
+        """
+        async with self.session_factory() as session:
+            member = await SQLiteMemberRepository(session).get_by_id(trx.memberid)
+            try:
+                verify_request(member, trx)
+            except SignatureInvalidError:
+                self.metrics.inc("trx_sign_invalid")
+                raise
+            inbox_id = await SQLiteTransactionRepository(session).receive_inbox(
+                f"{member.memberid}:{trx.refid}", member.memberid, trx.as_dict()
+            )
+        self.metrics.inc("trx_received", duplicate=str(inbox_id is None).lower())
+        return inbox_id
+
+    async def verify_balance_check(self, memberid: str, sign: str | None) -> str:
+        """Verifikasi request cek saldo; return memberid kanonik.
+
+        Raises:
+            DataNotFoundError: member tidak ada / nonaktif.
+            SignatureInvalidError: sign tidak cocok.
+        """
+        async with self.session_factory() as session:
+            member = await SQLiteMemberRepository(session).get_by_id(memberid)
+        try:
+            verify_balance_check(member, sign)
+        except SignatureInvalidError:
+            self.metrics.inc("balance_sign_invalid")
+            raise
+        return member.memberid
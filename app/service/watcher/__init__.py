@@ -0,0 +1,3 @@
+from app.service.watcher.srv_config_watcher import ConfigWatcher, diff_config
+
+__all__ = ["ConfigWatcher", "diff_config"]
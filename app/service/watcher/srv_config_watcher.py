@@ -0,0 +1,347 @@
+"""Hot reload konfigurasi member / module tanpa restart uvicorn.
+
+Snapshot in-memory yang bergantung ke tabel `members` / `modules`:
+
+- tabel admission per member (`MemberAdmission`: member aktif + limit),
+- HTTP client per module (`SupplierClientRegistry`: base_url + provider).
+
+`ConfigWatcher` mem-poll tiap `CONFIG_WATCH_INTERVAL` detik lewat satu koneksi
+khusus:
+
+1. `PRAGMA data_version` (SQLite): tidak berubah = tidak ada commit dari
+   koneksi lain, selesai tanpa query tabel,
+2. `config_versions` (dinaikkan trigger di setiap perubahan row
+   members / modules): sama dengan snapshot = perubahan di tabel lain,
+3. kalau berbeda: baca ulang member aktif + module aktif, diff terhadap
+   snapshot di worker thread, lalu terapkan hanya bagian yang berubah di event
+   loop (tanpa `await` di tengah, jadi atomik untuk request lain). Counter
+   in-flight member tetap; client module lama ditutup di background setelah
+   request yang sedang jalan selesai.
+
+Opsional (`CONFIG_SYNC_YAML`): `members.yaml` / `modules.yaml` di-cek mtime-nya
+dan di-upsert ke DB lewat `BulkLoader` saat berubah; reload berikutnya berjalan
+lewat jalur DB yang sama.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable, Iterable
+from contextlib import suppress
+from pathlib import Path
+from typing import NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.config import get_settings
+from app.custom.exceptions.cst_exceptions import AppExceptionError
+from app.database.repositories.repo_config_version import (
+    SQLiteConfigVersionRepository,
+)
+from app.database.repositories.repo_member import SQLiteMemberRepository
+from app.database.repositories.repo_module import SQLiteModuleRepository
+from app.mlogg import logger
+from app.schemas.sch_bulk_load import BulkLoadKind
+from app.schemas.sch_config_watch import ConfigReloadResult, ConfigWatchState
+from app.schemas.sch_member import MemberLimits
+from app.schemas.sch_module import ModuleInDB
+from app.service.admission import MemberAdmission, member_admission
+from app.service.loader import BulkLoader
+from app.service.metrics import MetricsRegistry, metrics
+from app.service.outbox.srv_dispatcher import SessionFactory
+from app.service.supplier import SupplierClientRegistry, supplier_clients
+
+LimitRow = tuple[str, int | None, float | None, int | None]
+LimitKey = tuple[int | None, float | None, int | None]
+
+
+class ConfigSnapshot(NamedTuple):
+    version: int
+    sources: dict[str, int]
+    members: dict[str, LimitKey]
+    modules: dict[str, ModuleInDB]
+    loaded_at: float | None = None
+
+
+class ConfigDiff(NamedTuple):
+    members: dict[str, LimitKey]
+    modules: dict[str, ModuleInDB]
+    changed_members: list[MemberLimits]
+    removed_members: list[str]
+    changed_modules: list[ModuleInDB]
+    removed_modules: list[str]
+
+    @property
+    def changed(self) -> bool:
+        return bool(
+            self.changed_members
+            or self.removed_members
+            or self.changed_modules
+            or self.removed_modules
+        )
+
+
+EMPTY_SNAPSHOT = ConfigSnapshot(0, {}, {}, {})
+
+
+def diff_config(
+    current: ConfigSnapshot,
+    member_rows: Iterable[LimitRow],
+    modules: Iterable[ModuleInDB],
+) -> ConfigDiff:
+    """Bandingkan isi tabel terbaru dengan snapshot (dijalankan di worker thread)."""
+    members = {
+        memberid.upper(): (max_inflight, rate_limit, rate_burst)
+        for memberid, max_inflight, rate_limit, rate_burst in member_rows
+    }
+    by_id = {module.moduleid: module for module in modules}
+    old_members, old_modules = current.members, current.modules
+    return ConfigDiff(
+        members=members,
+        modules=by_id,
+        changed_members=[
+            MemberLimits(
+                memberid=memberid,
+                max_inflight=limits[0],
+                rate_limit=limits[1],
+                rate_burst=limits[2],
+            )
+            for memberid, limits in members.items()
+            if old_members.get(memberid) != limits
+        ],
+        removed_members=[m for m in old_members if m not in members],
+        changed_modules=[
+            module for mid, module in by_id.items() if old_modules.get(mid) != module
+        ],
+        removed_modules=[mid for mid in old_modules if mid not in by_id],
+    )
+
+
+class ConfigWatcher:
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        session_factory: SessionFactory,
+        *,
+        admission: MemberAdmission | None = None,
+        clients: SupplierClientRegistry | None = None,
+        loader: BulkLoader | None = None,
+        interval: float | None = None,
+        sync_yaml: bool | None = None,
+        yaml_paths: dict[BulkLoadKind, Path] | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+        registry: MetricsRegistry | None = None,
+    ):
+        settings = get_settings()
+        self.engine = engine
+        self.session_factory = session_factory
+        self.admission = member_admission if admission is None else admission
+        self.clients = supplier_clients if clients is None else clients
+        self.interval = interval or settings.CONFIG_WATCH_INTERVAL
+        self.sync_yaml = settings.CONFIG_SYNC_YAML if sync_yaml is None else sync_yaml
+        self.yaml_paths = yaml_paths or {
+            BulkLoadKind.MEMBERS: settings.MEMBERS_YAML_PATH,
+            BulkLoadKind.MODULES: settings.MODULES_YAML_PATH,
+        }
+        self.loader = loader or BulkLoader(session_factory, admission=self.admission)
+        self.clock = clock
+        self.metrics = registry or metrics
+        self._current = EMPTY_SNAPSHOT
+        self._last: ConfigReloadResult | None = None
+        self._lock = asyncio.Lock()
+        self._conn: AsyncConnection | None = None
+        self._watch_session: AsyncSession | None = None
+        self._data_version: int | None = None
+        self._yaml_mtimes: dict[BulkLoadKind, float] = {}
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.log = logger.bind(service="ConfigWatcher")
+
+    @property
+    def version(self) -> int:
+        return self._current.version
+
+    def modules(self) -> list[ModuleInDB]:
+        """Module aktif di snapshot saat ini."""
+        return list(self._current.modules.values())
+
+    # ------------------------
+    # Reload
+    # ------------------------
+    async def reload(self) -> ConfigReloadResult:
+        """Baca ulang member / module aktif lalu terapkan perubahannya.
+
+        Versi sumber dibaca lebih dulu dari row-nya: perubahan yang masuk di
+        antara keduanya paling buruk memicu satu reload tambahan, tidak hilang.
+        """
+        async with self._lock:
+            started = self.clock()
+            async with self.session_factory() as session:
+                sources = await SQLiteConfigVersionRepository(session).versions()
+                member_rows = await SQLiteMemberRepository(session).limit_rows()
+                modules = await SQLiteModuleRepository(session).list_active()
+            current = self._current
+            diff = await asyncio.to_thread(diff_config, current, member_rows, modules)
+            first = current is EMPTY_SNAPSHOT
+            self._apply(diff, first=first)
+            version = current.version + 1 if diff.changed or first else current.version
+            self._current = ConfigSnapshot(
+                version, sources, diff.members, diff.modules, time.time()
+            )
+            result = ConfigReloadResult(
+                version=version,
+                changed=diff.changed,
+                sources=sources,
+                members=len(diff.members),
+                modules=len(diff.modules),
+                members_changed=len(diff.changed_members),
+                members_removed=len(diff.removed_members),
+                modules_changed=len(diff.changed_modules),
+                modules_removed=len(diff.removed_modules),
+                seconds=round(self.clock() - started, 6),
+            )
+        self._last = result
+        self._observe(result)
+        return result
+
+    def _apply(self, diff: ConfigDiff, *, first: bool) -> None:
+        """Terapkan diff ke snapshot in-memory (sync, tanpa await)."""
+        if first:
+            self.admission.load(diff.changed_members)
+        else:
+            for limits in diff.changed_members:
+                self.admission.configure(limits)
+            for memberid in diff.removed_members:
+                self.admission.remove(memberid)
+        for module in diff.changed_modules:
+            self.clients.register(module)
+        for moduleid in diff.removed_modules:
+            self.clients.unregister(moduleid)
+
+    def _observe(self, result: ConfigReloadResult) -> None:
+        self.metrics.observe("config_reload_seconds", result.seconds)
+        self.metrics.inc(
+            "config_reload", outcome="changed" if result.changed else "unchanged"
+        )
+        self.metrics.set_gauge("config_version", result.version)
+        self.metrics.set_gauge("config_members", result.members)
+        self.metrics.set_gauge("config_modules", result.modules)
+        if result.changed:
+            self.log.info(
+                "Config reloaded",
+                version=result.version,
+                members_changed=result.members_changed,
+                members_removed=result.members_removed,
+                modules_changed=result.modules_changed,
+                modules_removed=result.modules_removed,
+                seconds=result.seconds,
+            )
+
+    # ------------------------
+    # Polling
+    # ------------------------
+    async def _session(self) -> AsyncSession:
+        if self._watch_session is None:
+            self._conn = await self.engine.connect()
+            self._watch_session = AsyncSession(bind=self._conn)
+            self._data_version = None
+        return self._watch_session
+
+    async def _close_session(self) -> None:
+        session, conn = self._watch_session, self._conn
+        self._watch_session = self._conn = None
+        if session is not None:
+            with suppress(Exception):
+                await session.close()
+        if conn is not None:
+            with suppress(Exception):
+                await conn.close()
+
+    async def _poll_sources(self) -> dict[str, int] | None:
+        """Versi sumber terbaru, None kalau belum ada commit baru sama sekali."""
+        session = await self._session()
+        try:
+            repo = SQLiteConfigVersionRepository(session)
+            if self.engine.dialect.name == "sqlite":
+                data_version = await repo.data_version()
+                if data_version == self._data_version:
+                    return None
+                self._data_version = data_version
+            return await repo.versions()
+        finally:
+            await session.rollback()
+
+    async def _sync_yaml(self) -> None:
+        for kind, path in self.yaml_paths.items():
+            try:
+                mtime = Path(path).stat().st_mtime
+            except OSError:
+                continue
+            if self._yaml_mtimes.get(kind) == mtime:
+                continue
+            # dicatat dulu: file invalid tidak di-load ulang tiap poll
+            self._yaml_mtimes[kind] = mtime
+            try:
+                report = await self.loader.load_file(
+                    kind, Path(path), actor="config-watcher"
+                )
+            except AppExceptionError:
+                self.log.exception("YAML config sync failed", path=str(path))
+                self.metrics.inc("config_reload", outcome="yaml_error")
+                continue
+            self.log.info(
+                "YAML config synced",
+                path=str(path),
+                created=report.created,
+                updated=report.updated,
+                invalid=report.invalid_count,
+            )
+
+    async def check(self) -> ConfigReloadResult | None:
+        """Satu putaran poll; return hasil reload kalau reload dijalankan."""
+        if self.sync_yaml:
+            await self._sync_yaml()
+        sources = await self._poll_sources()
+        if sources is None or sources == self._current.sources:
+            return None
+        return await self.reload()
+
+    def snapshot(self) -> ConfigWatchState:
+        current = self._current
+        return ConfigWatchState(
+            version=current.version,
+            sources=current.sources,
+            members=len(current.members),
+            modules=len(current.modules),
+            loaded_at=current.loaded_at,
+            data_version=self._data_version,
+            last_reload=self._last,
+        )
+
+    async def run_forever(self) -> None:
+        self.log.info("Config watcher started", interval=self.interval)
+        while True:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), self.interval)
+            if self._stop.is_set():
+                break
+            try:
+                await self.check()
+            except Exception:
+                # snapshot lama tetap dipakai; koneksi watch dibuka ulang
+                self.log.exception("Config watch poll failed")
+                self.metrics.inc("config_reload", outcome="error")
+                await self._close_session()
+        await self._close_session()
+        self.log.info("Config watcher stopped")
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
@@ -0,0 +1,124 @@
+"""Benchmark archiver transaksi ke file arsip bulanan di SQLite sementara.
+
+Generate N transaksi final (+ inbox + outbox) tersebar di 6 bulan, lalu satu
+`run_once()`. Yang dilaporkan: row/detik, jumlah batch dan durasi batch
+(p50 / p99 / max = lama lock tulis ditahan per batch), lalu latency lookup
+riwayat yang meng-union tabel aktif + semua file arsip.
+
+Jalankan dari root repo:
+
+    python -m scripts.bench_archiver -n 200000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from app.database.core.session import DatabaseSessionManager
+from app.database.core.table import create_tables
+from app.models.db_transaction import InboxMessage, OutboxMessage, Transaction
+from app.service.archive import TransactionArchiver, TransactionHistory
+from app.service.metrics import MetricsRegistry
+from sqlalchemy import insert
+
+# created_at di DB: UTC naive
+START = datetime(2026, 1, 1)
+NOW = datetime(2026, 9, 1, tzinfo=UTC)
+MEMBERS = 100
+
+
+async def seed(db: DatabaseSessionManager, n: int) -> None:
+    """N transaksi final, created_at merata Januari - Juni."""
+    step = timedelta(days=180) / n
+    for offset in range(0, n, 10_000):
+        ids = range(offset + 1, min(offset + 10_000, n) + 1)
+        times = {i: START + step * i for i in ids}
+        inbox = [
+            {
+                "id": i,
+                "request_id": f"M{i % MEMBERS}:{i}",
+                "memberid": f"M{i % MEMBERS}",
+                "payload": {"refid": str(i)},
+                "status": "completed",
+                "created_at": times[i],
+            }
+            for i in ids
+        ]
+        trx = [
+            {
+                "id": i,
+                "inbox_id": i,
+                "memberid": f"M{i % MEMBERS}",
+                "refid": str(i),
+                "product": "TSEL10",
+                "dest": "081234567890",
+                "moduleid": "MOD01",
+                "status": "success",
+                "created_at": times[i],
+            }
+            for i in ids
+        ]
+        outbox = [
+            {
+                "id": i,
+                "transaction_id": i,
+                "moduleid": "MOD01",
+                "supplier_request": {"refid": str(i)},
+                "status": "sent",
+                "created_at": times[i],
+            }
+            for i in ids
+        ]
+        async with db.session() as session:
+            await session.execute(insert(InboxMessage), inbox)
+            await session.execute(insert(Transaction), trx)
+            await session.execute(insert(OutboxMessage), outbox)
+            await session.commit()
+
+
+async def main(n: int, batch_size: int) -> None:
+    """Seed N transaksi, arsipkan semuanya, lalu ukur lookup riwayat."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseSessionManager(f"sqlite+aiosqlite:///{Path(tmp) / 'live.db'}")
+        await create_tables(db.engine)
+        await seed(db, n)
+        registry = MetricsRegistry()
+        archiver = TransactionArchiver(
+            db.engine,
+            archive_dir=Path(tmp) / "archive",
+            after_days=30,
+            batch_size=batch_size,
+            pause=0,
+            registry=registry,
+        )
+        result = await archiver.run_once(now=NOW)
+        stats = registry.latency("archive_batch_seconds").snapshot()
+        print(
+            f"archived {result.transactions} trx / {result.outbox} outbox / "
+            f"{result.inbox} inbox in {result.seconds:.2f}s "
+            f"({result.transactions / result.seconds:.0f} trx/s), "
+            f"{result.batches} batches, months {sorted(result.months)}"
+        )
+        print(
+            "batch ms  "
+            + "  ".join(f"{k} {v * 1000:.1f}" for k, v in stats.items() if k != "count")
+        )
+        history = TransactionHistory(db.engine, archive_dir=Path(tmp) / "archive")
+        started = time.perf_counter()
+        rows = await history.history("M7", limit=500)
+        print(
+            f"history M7 limit 500: {len(rows)} rows in "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=200_000, help="jumlah transaksi")
+    parser.add_argument("-b", type=int, default=500, help="ukuran batch arsip")
+    args = parser.parse_args()
+    asyncio.run(main(args.n, args.b))
@@ -0,0 +1,99 @@
+"""Benchmark bulk loader member (YAML / CSV / NDJSON) ke SQLite sementara.
+
+Generate N member sintetis (1% duplikat, 1% invalid) per format, lalu:
+
+- load pertama: semua row valid di-insert,
+- load kedua:   file yang sama, semua row valid jadi update (upsert).
+
+Yang dilaporkan: row/detik dan jumlah created / updated / duplikat / invalid.
+
+Jalankan dari root repo:
+
+    python -m scripts.bench_bulk_loader -n 50000
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import yaml
+from app.database.core.session import DatabaseSessionManager
+from app.database.core.table import create_tables
+from app.schemas.sch_bulk_load import BulkFormat, BulkLoadKind
+from app.service.admission import MemberAdmission
+from app.service.loader import BulkLoader
+from app.service.metrics import MetricsRegistry
+
+FIELDS = ("memberid", "name", "pin", "password", "ipaddress", "report_url")
+
+
+def member_rows(n: int) -> list[dict[str, Any]]:
+    """Member sintetis; tiap row ke-100 duplikat, tiap row ke-101 invalid."""
+    rows: list[dict[str, Any]] = []
+    for i in range(n):
+        memberid = f"M{i - 50 if i % 100 == 99 else i:07d}"
+        rows.append(
+            {
+                "memberid": memberid,
+                "name": f"member {i}",
+                "pin": f"{i % 1_000_000:06d}",
+                "password": f"secret{i}",
+                "ipaddress": "10.0.0.1" if i % 101 != 100 else "not-an-ip",
+                "report_url": f"http://10.0.0.1:8080/report/{i}",
+            }
+        )
+    return rows
+
+
+def write_file(directory: Path, fmt: BulkFormat, rows: list[dict[str, Any]]) -> Path:
+    """Tulis rows ke file sesuai format."""
+    path = directory / f"members.{fmt.value}"
+    with path.open("w", encoding="utf-8", newline="") as f:
+        if fmt is BulkFormat.YAML:
+            yaml.safe_dump({"members": rows}, f, sort_keys=False)
+        elif fmt is BulkFormat.CSV:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+    return path
+
+
+async def main(n: int, batch_size: int) -> None:
+    """Load N member per format, dua kali (insert lalu upsert)."""
+    rows = member_rows(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in BulkFormat:
+            path = write_file(Path(tmp), fmt, rows)
+            db = DatabaseSessionManager(
+                f"sqlite+aiosqlite:///{Path(tmp) / f'{fmt}.db'}"
+            )
+            await create_tables(db.engine)
+            loader = BulkLoader(
+                db.session,
+                batch_size=batch_size,
+                admission=MemberAdmission(),
+                registry=MetricsRegistry(),
+            )
+            for label in ("insert", "upsert"):
+                report = await loader.load_file(BulkLoadKind.MEMBERS, path)
+                print(
+                    f"{fmt.value:<7} {label:<7} {report.total / report.seconds:9.0f} rows/s  "
+                    f"{report.seconds:6.2f}s  created {report.created:6d}  "
+                    f"updated {report.updated:6d}  dup {report.duplicate_count:4d}  "
+                    f"invalid {report.invalid_count:4d}"
+                )
+            await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=50_000, help="jumlah member")
+    parser.add_argument("-b", type=int, default=1000, help="ukuran batch upsert")
+    args = parser.parse_args()
+    asyncio.run(main(args.n, args.b))
@@ -0,0 +1,116 @@
+"""Benchmark debit konkuren ke satu member (hot row).
+
+Dua skenario di atas SQLite file sementara, N debit konkuren ke member yang
+sama dengan saldo awal cukup untuk semuanya:
+
+- guarded: `LedgerService.debit` (satu UPDATE ber-guard + INSERT jurnal),
+- naive:   SELECT saldo -> hitung di Python -> UPDATE `balance = :nilai`.
+
+Yang dilaporkan: debit/detik, p50/p99 latency, dan selisih saldo akhir dengan
+saldo yang seharusnya (naive kehilangan update saat debit saling tumpang).
+
+Jalankan dari root repo:
+
+    python -m scripts.bench_ledger_debit -n 2000 -c 32
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from app.database.core.session import DatabaseSessionManager
+from app.database.core.table import create_tables
+from app.models.db_ledger import MemberBalance
+from app.service.balance import BalanceCache
+from app.service.ledger import LedgerService
+from app.service.metrics import LatencyStats, MetricsRegistry
+from sqlalchemy import select, update
+
+MEMBER = "HOT01"
+AMOUNT = 1_000
+
+
+async def reset(db: DatabaseSessionManager, balance: int) -> None:
+    """Set saldo awal member hot."""
+    async with db.session() as session:
+        await session.merge(MemberBalance(memberid=MEMBER, balance=balance))
+        await session.commit()
+
+
+async def final_balance(db: DatabaseSessionManager) -> int:
+    """Saldo member hot setelah semua debit selesai."""
+    async with db.session() as session:
+        stmt = select(MemberBalance.balance).where(MemberBalance.memberid == MEMBER)
+        return (await session.execute(stmt)).scalar_one()
+
+
+async def naive_debit(db: DatabaseSessionManager, amount: int) -> None:
+    """Read-modify-write: pola yang dihindari ledger."""
+    async with db.session() as session:
+        stmt = select(MemberBalance.balance).where(MemberBalance.memberid == MEMBER)
+        balance = (await session.execute(stmt)).scalar_one()
+        await session.commit()
+    if balance < amount:
+        return
+    async with db.session() as session:
+        await session.execute(
+            update(MemberBalance)
+            .where(MemberBalance.memberid == MEMBER)
+            .values(balance=balance - amount)
+        )
+        await session.commit()
+
+
+async def run(label: str, debit, n: int, concurrency: int, db) -> None:  # noqa: ANN001
+    """Jalankan `n` debit dengan paling banyak `concurrency` yang berjalan."""
+    start_balance = n * AMOUNT * 2
+    await reset(db, start_balance)
+    stats = LatencyStats(max(1024, n))
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with gate:
+            t0 = time.perf_counter()
+            await debit(i)
+            stats.observe(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+    elapsed = time.perf_counter() - t0
+    lost = await final_balance(db) - (start_balance - n * AMOUNT)
+    print(
+        f"{label:<8} {n / elapsed:9.0f} debit/s  "
+        f"p50 {stats.percentile(50) * 1e3:7.2f}ms  "
+        f"p99 {stats.percentile(99) * 1e3:7.2f}ms  "
+        f"lost updates {lost // AMOUNT:6d}"
+    )
+
+
+async def main(n: int, concurrency: int) -> None:
+    """Bandingkan guarded vs naive di DB SQLite sementara."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseSessionManager(f"sqlite+aiosqlite:///{Path(tmp) / 'ledger.db'}")
+        await create_tables(db.engine)
+        ledger = LedgerService(
+            db.session, cache=BalanceCache(), registry=MetricsRegistry()
+        )
+        print(f"{n} debit, concurrency {concurrency}, member {MEMBER}")
+        await run(
+            "guarded",
+            lambda i: ledger.debit(MEMBER, AMOUNT, ref=f"bench:{i}"),
+            n,
+            concurrency,
+            db,
+        )
+        await run("naive", lambda _: naive_debit(db, AMOUNT), n, concurrency, db)
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=2000, help="jumlah debit")
+    parser.add_argument("-c", type=int, default=32, help="debit konkuren")
+    args = parser.parse_args()
+    asyncio.run(main(args.n, args.c))
@@ -0,0 +1,58 @@
+"""Benchmark parser request OtomaX: raw-bytes parser vs jalur pydantic.
+
+Jalankan dari root repo:
+
+    python -m scripts.bench_otomax_parser -n 200000
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from urllib.parse import parse_qsl
+
+from app.parser import parse_otomax_request
+from app.schemas.sch_otomax import OtomaxTrxRequest
+
+SAMPLES: list[bytes] = [
+    b"memberID=OTOTEST1&product=CLPDATA&dest=081295221639&refID=3040881"
+    b"&sign=MsP6Aticed6s1rlEhvj4NKceFVQ",
+    b"memberid=OTOTEST1&product=TSEL10&dest=%2B6281295221639&refid=INV-20250826-1"
+    b"&pin=777999&password=secret123",
+    b"memberID=OTOTEST1&product=PLN20&dest=12345678901&refID=3040881LIST"
+    b"&sign=pEGjrgXE0kSHupl8uSjPbODg7R4&extra=ignored",
+]
+
+
+def pydantic_path(raw: bytes) -> OtomaxTrxRequest:
+    """Baseline: decode → parse_qsl → lowercase key → model_validate."""
+    pairs = parse_qsl(raw.decode(), keep_blank_values=True)
+    return OtomaxTrxRequest.model_validate({k.lower(): v for k, v in pairs})
+
+
+def bench(name: str, fn: Callable[[bytes], object], n: int) -> float:
+    """Jalankan `fn` n kali atas SAMPLES (round-robin), return req/s."""
+    samples = SAMPLES
+    size = len(samples)
+    for i in range(min(n, 1000)):  # warmup
+        fn(samples[i % size])
+    start = time.perf_counter()
+    for i in range(n):
+        fn(samples[i % size])
+    elapsed = time.perf_counter() - start
+    rps = n / elapsed
+    print(f"{name:<12} {n:>9} req  {elapsed:8.3f}s  {rps:>12,.0f} req/s")
+    return rps
+
+
+def main() -> None:
+    """Entry point CLI benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=100_000, help="jumlah iterasi")
+    args = parser.parse_args()
+    fast = bench("raw-bytes", parse_otomax_request, args.n)
+    slow = bench("pydantic", pydantic_path, args.n)
+    print(f"speedup      {fast / slow:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
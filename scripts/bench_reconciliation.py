@@ -0,0 +1,95 @@
+"""Benchmark laporan rekonsiliasi harian di SQLite sementara.
+
+Generate N transaksi dalam satu hari (M member, 20 module, status campur),
+lalu bangun laporan dua kali: mode journal default (read per batch) dan mode
+WAL (satu snapshot). Yang dilaporkan: row/detik, jumlah batch, durasi batch
+dan peak memory Python selama agregasi (harus datar terhadap N).
+
+Jalankan dari root repo:
+
+    python -m scripts.bench_reconciliation -n 500000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from app.database.core.session import DatabaseSessionManager
+from app.database.core.table import create_tables
+from app.models.db_transaction import Transaction
+from app.service.report import ReconciliationReporter
+from sqlalchemy import insert, text
+
+DAY = date(2026, 5, 10)
+# 00:00 WIB dalam UTC naive
+START = datetime(2026, 5, 9, 17)
+STATUSES = ("success", "success", "success", "failed", "refunded", "pending")
+
+
+async def seed(db: DatabaseSessionManager, n: int, members: int) -> None:
+    """N transaksi merata dalam satu hari WIB."""
+    step = timedelta(days=1) / n
+    for offset in range(0, n, 10_000):
+        rows = [
+            {
+                "memberid": f"M{i % members}",
+                "refid": str(i),
+                "product": "TSEL10",
+                "moduleid": f"MOD{i % 20:02d}",
+                "amount": 10_000 + i % 7,
+                "status": STATUSES[i % len(STATUSES)],
+                "created_at": START + step * i,
+            }
+            for i in range(offset, min(offset + 10_000, n))
+        ]
+        async with db.session() as session:
+            await session.execute(insert(Transaction), rows)
+            await session.commit()
+
+
+async def run(reporter: ReconciliationReporter, label: str) -> None:
+    """Bangun laporan sekali, cetak throughput + durasi batch + peak memory."""
+    tracemalloc.start()
+    report = await reporter.build(DAY)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    summary = report.summary
+    stats = reporter.metrics.latency("recon_batch_seconds").snapshot()
+    print(
+        f"{label}: {summary.transactions} trx in {summary.seconds:.2f}s "
+        f"({summary.transactions / summary.seconds:.0f} trx/s), "
+        f"{summary.batches} batches, {summary.members} members, "
+        f"snapshot={summary.snapshot}, peak {peak / 1024:.0f} KiB"
+    )
+    print(
+        "  batch ms  "
+        + "  ".join(f"{k} {v * 1000:.1f}" for k, v in stats.items() if k != "count")
+    )
+
+
+async def main(n: int, members: int, batch_size: int) -> None:
+    """Seed N transaksi lalu ukur laporan di mode journal default dan WAL."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseSessionManager(f"sqlite+aiosqlite:///{Path(tmp) / 'live.db'}")
+        await create_tables(db.engine)
+        await seed(db, n, members)
+        reporter = ReconciliationReporter(
+            db.engine, batch_size=batch_size, archive_dir=Path(tmp)
+        )
+        await run(reporter, "journal")
+        async with db.engine.connect() as conn:
+            await conn.execute(text("PRAGMA journal_mode = WAL"))
+        await run(reporter, "wal")
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=200_000, help="jumlah transaksi")
+    parser.add_argument("-m", type=int, default=1_000, help="jumlah member")
+    parser.add_argument("-b", type=int, default=5_000, help="ukuran batch")
+    args = parser.parse_args()
+    asyncio.run(main(args.n, args.m, args.b))
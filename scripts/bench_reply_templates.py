@@ -0,0 +1,92 @@
+"""Benchmark render template reply member: compiled template vs format ad-hoc.
+
+Jalankan dari root repo:
+
+    python -m scripts.bench_reply_templates -n 200000
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+
+from app.service.reply import reply_templates
+
+VALUES = {
+    "refid": "3040881",
+    "memberid": "OTOTEST1",
+    "product": "CLPDATA",
+    "dest": "081295221639",
+    "status": "success",
+    "sn": "0412345678901234",
+    "price": 10500,
+    "balance": 1500000,
+    "message": "",
+    "time": "12:00:01",
+}
+
+
+def adhoc_text(v: dict) -> tuple[bytes, str]:
+    """Baseline: f-string + encode + content type dihitung per request."""
+    body = (
+        f"R#{v['refid']} {v['product']}.{v['dest']} SUKSES. SN:{v['sn']}. "
+        f"Harga {v['price']:,}. Saldo {v['balance']:,} @{v['time']}"
+    )
+    return body.encode("utf-8"), "text/plain" + "; charset=utf-8"
+
+
+SUCCESS_TEMPLATE = (
+    "R#{refid} {product}.{dest} SUKSES. SN:{sn}. Harga {price:,}. "
+    "Saldo {balance:,} @{time}"
+)
+
+
+def adhoc_format(v: dict) -> tuple[bytes, str]:
+    """Baseline: template runtime via str.format (di-parse ulang tiap request)."""
+    return SUCCESS_TEMPLATE.format(**v).encode("utf-8"), "text/plain; charset=utf-8"
+
+
+def adhoc_json(v: dict) -> tuple[bytes, str]:
+    """Baseline: json.dumps dict baru per request."""
+    keys = ("refid", "product", "dest", "status", "sn", "price", "balance", "message")
+    return json.dumps({k: v.get(k) for k in keys}).encode(), "application/json"
+
+
+def compiled(name: str) -> Callable[[dict], tuple[bytes, str]]:
+    """Render via registry (lookup + render + content type cached)."""
+
+    def render(v: dict) -> tuple[bytes, str]:
+        template = reply_templates.get(name)
+        return template.render(v), template.content_type
+
+    return render
+
+
+def bench(label: str, fn: Callable[[dict], object], n: int) -> float:
+    """Jalankan `fn` n kali, return render/s."""
+    for _ in range(min(n, 1000)):
+        fn(VALUES)
+    start = time.perf_counter()
+    for _ in range(n):
+        fn(VALUES)
+    elapsed = time.perf_counter() - start
+    rps = n / elapsed
+    print(f"{label:<18} {n:>9} render  {elapsed:8.3f}s  {rps:>12,.0f} render/s")
+    return rps
+
+
+def main() -> None:
+    """Entry point CLI benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=100_000, help="jumlah iterasi")
+    args = parser.parse_args()
+    reply_templates.load()
+    bench("text compiled", compiled("success"), args.n)
+    bench("text f-string", adhoc_text, args.n)
+    bench("text str.format", adhoc_format, args.n)
+    bench("json compiled", compiled("json_status"), args.n)
+    bench("json json.dumps", adhoc_json, args.n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Replay corpus response supplier lewat rule engine: throughput + golden diff.
+
+Jalankan dari root repo (offline):
+
+    python -m scripts.bench_supplier_corpus --rounds 200
+    python -m scripts.bench_supplier_corpus --update-golden   # setelah rule diubah
+
+Exit code 1 kalau ada klasifikasi yang berbeda dari golden file.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from app.parser import SupplierRuleEngine
+from app.parser.prs_corpus_replay import (
+    load_corpus,
+    load_golden,
+    replay_corpus,
+    write_golden,
+)
+
+DEFAULT_CORPUS = Path("tests/fixtures/supplier_corpus")
+
+
+def main() -> int:
+    """Entry point CLI benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--golden", type=Path, default=None)
+    parser.add_argument("--rules", type=Path, default=None)
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--update-golden", action="store_true")
+    args = parser.parse_args()
+
+    golden_path = args.golden or args.corpus / "golden.json"
+    engine = SupplierRuleEngine(args.rules)
+    engine.load()
+    records = load_corpus(args.corpus)
+    golden = None if args.update_golden else load_golden(golden_path)
+    report = replay_corpus(engine, records, rounds=args.rounds, golden=golden)
+
+    print(json.dumps(report.summary(), indent=2))
+    if args.update_golden:
+        write_golden(golden_path, report.classified)
+        print(f"golden updated: {golden_path} ({len(report.classified)} records)")
+        return 0
+    for diff in report.diffs:
+        print(f"DIFF {diff.id} [{diff.provider}]")
+        print(f"  expected: {diff.expected}")
+        print(f"  actual:   {diff.actual}")
+    dead = engine.dead_rules()
+    if dead:
+        print("dead rules: " + ", ".join(f"{r['provider']}/{r['rule']}" for r in dead))
+    return 1 if report.diffs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Benchmark 100k timer outstanding: TimerWheel vs `loop.call_later` vs task sleep.
+
+Skenario per implementasi: pasang N timer (deadline acak 1..1800 detik),
+cancel setengahnya (transaksi selesai sebelum timeout), lalu majukan waktu
+sampai semua sisa timer jatuh tempo. Memory dihitung dengan tracemalloc.
+
+Jalankan dari root repo:
+
+    python -m scripts.bench_timer_wheel -n 100000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from app.service.scheduler import TimerWheel
+
+
+class FakeClock:
+    """Clock manual supaya wheel bisa dimajukan tanpa menunggu."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def measure(label: str, fn: Callable[[], dict[str, float]]) -> None:
+    """Jalankan skenario dua kali: timing (tanpa tracemalloc) lalu peak memory."""
+    phases = fn()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    cols = "  ".join(f"{name} {secs * 1e3:8.1f}ms" for name, secs in phases.items())
+    print(f"{label:<12} {cols}  peak {peak / 2**20:7.1f} MiB")
+
+
+def bench_wheel(delays: list[float]) -> dict[str, float]:
+    """Timer wheel: insert / cancel O(1), expire per tick."""
+    clock = FakeClock()
+    wheel = TimerWheel(tick=0.1, slots=256, levels=4, clock=clock)
+    t0 = time.perf_counter()
+    for i, delay in enumerate(delays):
+        wheel.schedule(i, delay)
+    t1 = time.perf_counter()
+    for i in range(0, len(delays), 2):
+        wheel.cancel(i)
+    t2 = time.perf_counter()
+    fired = 0
+    while len(wheel):
+        clock.now += 1.0
+        fired += len(wheel.advance())
+    t3 = time.perf_counter()
+    assert fired == len(delays) // 2
+    return {"insert": t1 - t0, "cancel": t2 - t1, "expire": t3 - t2}
+
+
+def bench_call_later(delays: list[float]) -> dict[str, float]:
+    """Satu `loop.call_later` per transaksi (heap event loop)."""
+    loop = asyncio.new_event_loop()
+    try:
+        t0 = time.perf_counter()
+        handles = [loop.call_later(delay, int) for delay in delays]
+        t1 = time.perf_counter()
+        for handle in handles[::2]:
+            handle.cancel()
+        t2 = time.perf_counter()
+        # expire tidak bisa di-fast-forward; ukur biaya pop heap sisa handle
+        for handle in handles[1::2]:
+            handle.cancel()
+        loop.run_until_complete(asyncio.sleep(0))
+        t3 = time.perf_counter()
+    finally:
+        loop.close()
+    return {"insert": t1 - t0, "cancel": t2 - t1, "expire": t3 - t2}
+
+
+def bench_tasks(delays: list[float]) -> dict[str, float]:
+    """Satu task `asyncio.sleep` per transaksi (pola naif)."""
+
+    async def run() -> dict[str, float]:
+        t0 = time.perf_counter()
+        tasks = [asyncio.create_task(asyncio.sleep(delay)) for delay in delays]
+        await asyncio.sleep(0)
+        t1 = time.perf_counter()
+        for task in tasks[::2]:
+            task.cancel()
+        await asyncio.sleep(0)
+        t2 = time.perf_counter()
+        for task in tasks[1::2]:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        t3 = time.perf_counter()
+        return {"insert": t1 - t0, "cancel": t2 - t1, "expire": t3 - t2}
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    """Entry point CLI benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=100_000, help="jumlah timer")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    delays = [rng.uniform(1.0, 1800.0) for _ in range(args.n)]
+    print(f"{args.n:,} timer, cancel 50%, sisa dijalankan / dibuang")
+    measure("timer wheel", lambda: bench_wheel(delays))
+    measure("call_later", lambda: bench_call_later(delays))
+    measure("task+sleep", lambda: bench_tasks(delays))
+
+
+if __name__ == "__main__":
+    main()
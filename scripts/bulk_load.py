@@ -0,0 +1,47 @@
+"""Bulk load member / module dari file YAML, CSV atau NDJSON ke DB aplikasi.
+
+Upsert per memberid / moduleid; row duplikat dan invalid dilaporkan (JSON).
+Format diambil dari ekstensi file kalau `--format` tidak diberikan.
+
+Jalankan dari root repo:
+
+    python -m scripts.bulk_load members members.yaml
+    python -m scripts.bulk_load modules modules.yaml --dry-run
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from app.database import sessionmanager
+from app.schemas.sch_bulk_load import BulkFormat, BulkLoadKind
+from app.service.loader import BulkLoader
+from app.service.security import vault
+
+
+async def main(
+    kind: BulkLoadKind, path: Path, fmt: BulkFormat | None, dry_run: bool
+) -> None:
+    """Load satu file lalu cetak report."""
+    # pin / password ditulis sealed kalau VAULT_MASTER_KEY di-set
+    vault.unlock_from_settings()
+    loader = BulkLoader(sessionmanager.session)
+    try:
+        report = await loader.load_file(
+            kind, path, fmt=fmt, dry_run=dry_run, actor="cli"
+        )
+    finally:
+        await sessionmanager.close()
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("kind", type=BulkLoadKind, choices=list(BulkLoadKind))
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", type=BulkFormat, choices=list(BulkFormat))
+    parser.add_argument(
+        "--dry-run", action="store_true", help="validasi saja, tanpa menulis DB"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.kind, args.path, args.format, args.dry_run))
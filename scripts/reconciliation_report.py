@@ -0,0 +1,52 @@
+"""Laporan rekonsiliasi harian per member / module ke file CSV atau NDJSON.
+
+Hari dihitung di zona `RECON_UTC_OFFSET_HOURS` (default WIB); default kemarin.
+Tanpa `--out` laporan ditulis ke stdout, ringkasan (JSON) ke stderr.
+
+Jalankan dari root repo:
+
+    python -m scripts.reconciliation_report --day 2026-05-10 --out reco.csv
+    python -m scripts.reconciliation_report --format ndjson > reco.ndjson
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+from app.config import get_settings
+from app.database import sessionmanager
+from app.schemas.sch_report import ReportFormat
+from app.service.report import ReconciliationReporter
+
+
+def yesterday() -> date:
+    """Tanggal kemarin di zona laporan."""
+    offset = timedelta(hours=get_settings().RECON_UTC_OFFSET_HOURS)
+    return (datetime.now(UTC) + offset).date() - timedelta(days=1)
+
+
+async def main(day: date, fmt: ReportFormat, out: Path | None) -> None:
+    """Bangun laporan satu hari lalu tulis ke `out` / stdout."""
+    reporter = ReconciliationReporter(sessionmanager.engine)
+    try:
+        report = await reporter.build(day)
+    finally:
+        await sessionmanager.close()
+    if out is None:
+        report.write(sys.stdout, fmt)
+    else:
+        report.write_file(out, fmt)
+    print(report.summary.model_dump_json(indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--day", type=date.fromisoformat, default=None)
+    parser.add_argument(
+        "--format", type=ReportFormat, choices=list(ReportFormat), default="csv"
+    )
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.day or yesterday(), ReportFormat(args.format), args.out))
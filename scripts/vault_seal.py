@@ -0,0 +1,35 @@
+"""Enkripsi pin / password member & module yang masih plaintext di DB.
+
+Dipakai sekali setelah `VAULT_MASTER_KEY` pertama kali di-set; row yang sudah
+sealed dilewati, jadi aman dijalankan ulang. Aplikasi yang sedang jalan ikut
+me-reload snapshot member / module lewat config watcher.
+
+Jalankan dari root repo:
+
+    python -m scripts.vault_seal
+"""
+
+import asyncio
+
+from app.database import sessionmanager
+from app.database.repositories.repo_member import SQLiteMemberRepository
+from app.database.repositories.repo_module import SQLiteModuleRepository
+from app.service.security import vault
+
+
+async def main() -> None:
+    """Seal semua row plaintext lalu cetak jumlahnya."""
+    if not vault.unlock_from_settings():
+        raise SystemExit("VAULT_MASTER_KEY belum di-set")
+    try:
+        async with sessionmanager.session() as session:
+            members = await SQLiteMemberRepository(session).seal_plaintext()
+            modules = await SQLiteModuleRepository(session).seal_plaintext()
+    finally:
+        await sessionmanager.close()
+        vault.lock()
+    print(f"sealed members={members} modules={modules}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
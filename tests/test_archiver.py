@@ -0,0 +1,170 @@
+"""Test archiver bulanan transaksi + lookup riwayat lintas arsip."""
+
+import sqlite3
+from datetime import UTC, datetime
+
+import pytest
+from app.models.db_transaction import InboxMessage, OutboxMessage, Transaction
+from app.schemas.sch_transaction import (
+    InboxStatus,
+    OutboxStatus,
+    TransactionStatus,
+)
+from app.service.archive import TransactionArchiver, TransactionHistory
+from app.service.archive.srv_archiver import archive_months, archive_path
+from app.service.metrics import MetricsRegistry
+from sqlalchemy import delete, func, select
+
+NOW = datetime(2026, 10, 1, tzinfo=UTC)
+
+
+def at(month: int, day: int = 10) -> datetime:
+    # UTC naive seperti created_at di DB
+    return datetime(2026, month, day, 12, 0)
+
+
+async def wipe(session):
+    for model in (OutboxMessage, Transaction, InboxMessage):
+        await session.execute(delete(model))
+    await session.commit()
+
+
+@pytest.fixture
+async def seeded(test_db_session):
+    session = test_db_session
+    await wipe(session)
+
+    def trx(refid, month, status=TransactionStatus.SUCCESS, outbox=OutboxStatus.SENT):
+        inbox = InboxMessage(
+            request_id=f"ARC1:{refid}",
+            memberid="ARC1",
+            status=InboxStatus.COMPLETED,
+            created_at=at(month),
+        )
+        row = Transaction(
+            memberid="ARC1",
+            refid=refid,
+            product="TSEL10",
+            status=status,
+            created_at=at(month),
+        )
+        return inbox, row, outbox
+
+    specs = [
+        trx("R05A", 5),
+        trx("R05B", 5, TransactionStatus.FAILED),
+        trx("R06A", 6),
+        trx("R06P", 6, TransactionStatus.PENDING, OutboxStatus.PENDING),
+        # final tapi outbox masih claimed: belum boleh diarsip
+        trx("R06C", 6, TransactionStatus.SUCCESS, OutboxStatus.CLAIMED),
+        # belum lewat ARCHIVE_AFTER_DAYS
+        trx("R09A", 9),
+    ]
+    for inbox, row, outbox in specs:
+        session.add(inbox)
+        await session.flush()
+        row.inbox_id = inbox.id
+        session.add(row)
+        await session.flush()
+        session.add(
+            OutboxMessage(
+                transaction_id=row.id,
+                moduleid="MOD01",
+                status=outbox,
+                created_at=row.created_at,
+            )
+        )
+    # inbox final tanpa transaksi (request ditolak)
+    session.add(
+        InboxMessage(
+            request_id="ARC1:REJ",
+            memberid="ARC1",
+            status=InboxStatus.FAILED,
+            created_at=at(5, 20),
+        )
+    )
+    await session.commit()
+    yield session
+    await wipe(session)
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def archiver(seeded, test_sessionmanager, tmp_path, registry):  # noqa: ARG001
+    return TransactionArchiver(
+        test_sessionmanager.engine,
+        archive_dir=tmp_path,
+        after_days=30,
+        batch_size=2,
+        pause=0,
+        registry=registry,
+    )
+
+
+def archived_refids(path) -> list[str]:
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT refid FROM transactions ORDER BY id").fetchall()
+    return [r[0] for r in rows]
+
+
+async def live_refids(session) -> set[str]:
+    rows = await session.execute(select(Transaction.refid))
+    return set(rows.scalars())
+
+
+async def test_archiver_moves_final_rows_into_month_files(
+    archiver, seeded, tmp_path, registry
+):
+    result = await archiver.run_once(now=NOW)
+    assert (result.transactions, result.outbox, result.inbox) == (3, 3, 4)
+    assert result.months == {"2026-05": 3, "2026-06": 1}  # 2 trx + 1 inbox ditolak
+    # batch_size=2: 3 transaksi = 2 batch, 1 inbox tanpa transaksi = 1 batch
+    assert result.batches == 3
+    assert registry.counter_value("archive_rows", table="transactions") == 3
+
+    assert archive_months(tmp_path) == ["2026-06", "2026-05"]
+    assert archived_refids(archive_path(tmp_path, "2026-05")) == ["R05A", "R05B"]
+    assert archived_refids(archive_path(tmp_path, "2026-06")) == ["R06A"]
+    assert await live_refids(seeded) == {"R06P", "R06C", "R09A"}
+    seeded.expire_all()
+    inbox_left = await seeded.scalar(select(func.count()).select_from(InboxMessage))
+    assert inbox_left == 3
+    outbox_left = await seeded.scalar(select(func.count()).select_from(OutboxMessage))
+    assert outbox_left == 3
+
+    again = await archiver.run_once(now=NOW)
+    assert (again.batches, again.transactions) == (0, 0)
+
+
+async def test_history_unions_live_and_archives(
+    archiver, test_sessionmanager, tmp_path
+):
+    await archiver.run_once(now=NOW)
+    history = TransactionHistory(
+        test_sessionmanager.engine, archive_dir=tmp_path, attach_limit=1
+    )
+
+    rows = await history.history("arc1")
+    assert [r.refid for r in rows][:3] == ["R09A", "R06C", "R06P"]
+    assert sorted(r.refid for r in rows) == sorted(
+        ["R05A", "R05B", "R06A", "R06C", "R06P", "R09A"]
+    )
+    sources = {r.refid: r.source for r in rows}
+    assert sources["R05A"] == "2026-05"
+    assert sources["R09A"] == "live"
+
+    (found,) = await history.history("ARC1", refid="R05B")
+    assert (found.status, found.source) == (TransactionStatus.FAILED, "2026-05")
+
+    # limit terpenuhi dari bulan yang lebih baru: arsip Mei tidak perlu dibaca
+    newest = await history.history("ARC1", limit=4)
+    assert [r.refid for r in newest] == ["R09A", "R06C", "R06P", "R06A"]
+
+    window = await history.history(
+        "ARC1", since=datetime(2026, 5, 1), until=datetime(2026, 6, 1)
+    )
+    assert sorted(r.refid for r in window) == ["R05A", "R05B"]
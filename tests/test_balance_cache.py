@@ -0,0 +1,122 @@
+"""Test SingleFlight dan BalanceCache (TTL, coalescing, invalidasi)."""
+
+import asyncio
+
+import pytest
+from app.custom.cst_singleflight import SingleFlight
+from app.service.balance import BalanceCache
+from app.service.metrics import MetricsRegistry
+
+
+class FakeClock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class Ledger:
+    def __init__(self):
+        self.balances = {"M1": 1000, "M2": 50}
+        self.reads = 0
+        self.gate: asyncio.Event | None = None
+
+    async def load(self, memberid):
+        self.reads += 1
+        value = self.balances[memberid]
+        if self.gate is not None:
+            await self.gate.wait()
+        else:
+            await asyncio.sleep(0.01)
+        return value
+
+
+@pytest.fixture
+def ledger():
+    return Ledger()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(ledger, clock):
+    return BalanceCache(ledger.load, ttl=2.0, clock=clock, registry=MetricsRegistry())
+
+
+@pytest.mark.asyncio
+async def test_singleflight_shares_result_and_errors():
+    flight: SingleFlight[str, int] = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(flight.do("k", load) for _ in range(20)))
+    assert results == [42] * 20
+    assert calls == 1
+    assert flight.shared == 19
+    assert "k" not in flight
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("down")
+
+    outcomes = await asyncio.gather(
+        *(flight.do("e", boom) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(o, ValueError) for o in outcomes)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_hit_ledger_once(cache, ledger):
+    balances = await asyncio.gather(*(cache.get("M1") for _ in range(200)))
+    assert set(balances) == {1000}
+    assert ledger.reads == 1
+    assert await cache.get("M1") == 1000
+    assert ledger.reads == 1
+    assert cache.metrics.counter_value("balance_cache_hit") == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry_reloads(cache, ledger, clock):
+    await cache.get("M2")
+    clock.now += 1.9
+    await cache.get("M2")
+    assert ledger.reads == 1
+    clock.now += 0.2
+    await cache.get("M2")
+    assert ledger.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_during_load_discards_stale_value(cache, ledger):
+    ledger.gate = asyncio.Event()
+    stale = asyncio.create_task(cache.get("M1"))
+    while not ledger.reads:
+        await asyncio.sleep(0)
+    # write ledger saat load lama masih berjalan
+    ledger.balances["M1"] = 900
+    cache.invalidate("M1")
+    ledger.gate.set()
+    assert await stale == 1000
+    assert cache.peek("M1") is None
+    assert await cache.get("M1") == 900
+    assert ledger.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_entries_are_bounded(ledger, clock):
+    ledger.balances.update({f"X{i}": i for i in range(10)})
+    cache = BalanceCache(ledger.load, ttl=60.0, max_entries=4, clock=clock)
+    for i in range(10):
+        await cache.get(f"X{i}")
+    assert len(cache) == 4
+    assert cache.peek("X9") == 9
+    assert cache.peek("X0") is None
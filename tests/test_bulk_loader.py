@@ -0,0 +1,253 @@
+"""Test bulk loader member / module: streaming reader, duplikat, upsert."""
+
+import contextlib
+import io
+import tempfile
+
+import pytest
+from app.custom.exceptions.cst_exceptions import BulkLoadError
+from app.models.db_member import Member
+from app.models.db_module import Module
+from app.schemas.sch_bulk_load import BulkFormat, BulkLoadKind
+from app.service.admission import MemberAdmission
+from app.service.loader import BulkLoader, detect_format
+from app.service.loader.srv_bulk_loader import iter_yaml_rows
+from app.service.metrics import MetricsRegistry
+from sqlalchemy import delete, select, update
+
+MEMBERS_YAML = """\
+# komentar di atas
+defaults: &defaults
+  ipaddress: 192.168.1.1
+  report_url: http://192.168.1.1:8080/report
+members:
+  - memberid: bulk1
+    name: pertama
+    pin: 012345
+    password: secret123
+    <<: *defaults
+  - memberid: BULK1
+    name: duplikat
+    pin: 777999
+    password: secret123
+    <<: *defaults
+  - memberid: BULK2
+    name: kedua
+    pin: 777999
+    password: secret123
+    ipaddress: bukan-ip
+    report_url: http://192.168.1.1:8080/report
+  - memberid: BULK3
+    name: ketiga
+    pin: 777999
+    password: secret123
+    max_inflight: 3
+    <<: *defaults
+"""
+
+
+@pytest.fixture
+async def clean(test_db_session):
+    session = test_db_session
+    await session.execute(delete(Member).where(Member.memberid.like("BULK%")))
+    await session.execute(delete(Module).where(Module.moduleid.like("BULK%")))
+    await session.commit()
+
+
+@pytest.fixture
+def admission():
+    return MemberAdmission(max_inflight=5, rate=0, burst=1, registry=MetricsRegistry())
+
+
+@pytest.fixture
+def loader(clean, test_sessionmanager, admission):  # noqa: ARG001
+    return BulkLoader(
+        test_sessionmanager.session,
+        batch_size=2,
+        admission=admission,
+        registry=MetricsRegistry(),
+    )
+
+
+async def members_in_db(session):
+    stmt = select(Member).where(Member.memberid.like("BULK%"))
+    return {m.memberid: m for m in (await session.execute(stmt)).scalars()}
+
+
+def test_yaml_reader_streams_section_with_line_numbers():
+    rows = list(
+        iter_yaml_rows(io.StringIO(MEMBERS_YAML), "members", frozenset({"pin"}))
+    )
+    assert [r.row for r in rows] == [6, 11, 16, 22]
+    # merge key + pin tetap teks (bukan oktal)
+    assert rows[0].data["pin"] == "012345"
+    assert rows[0].data["ipaddress"] == "192.168.1.1"
+    assert rows[3].data["max_inflight"] == 3
+
+
+def test_yaml_reader_rejects_malformed_file():
+    with pytest.raises(BulkLoadError):
+        list(iter_yaml_rows(io.StringIO("members:\n  - memberid: [x\n"), "members"))
+
+
+def test_detect_format():
+    assert detect_format("members.yml") is BulkFormat.YAML
+    assert detect_format("members.jsonl") is BulkFormat.NDJSON
+    with pytest.raises(BulkLoadError):
+        detect_format("members.xlsx")
+
+
+async def test_load_yaml_reports_duplicates_and_invalid(
+    loader, test_db_session, admission
+):
+    report = await loader.load(
+        BulkLoadKind.MEMBERS, io.StringIO(MEMBERS_YAML), BulkFormat.YAML
+    )
+    assert (report.total, report.valid, report.created) == (4, 2, 2)
+    assert [(d.row, d.key) for d in report.duplicates] == [(11, "BULK1")]
+    assert report.duplicates[0].detail == "duplicate of row 6"
+    assert [(i.row, i.key) for i in report.invalid] == [(16, "BULK2")]
+    assert "ipaddress" in report.invalid[0].detail
+
+    members = await members_in_db(test_db_session)
+    assert sorted(members) == ["BULK1", "BULK3"]
+    assert members["BULK1"].name == "pertama"
+    assert members["BULK1"].pin == "012345"
+    # limit member baru langsung berlaku di admission
+    slots = {slot["memberid"]: slot for slot in admission.snapshot()}
+    assert slots["BULK3"]["max_inflight"] == 3
+
+
+async def test_second_load_updates_and_restores_soft_deleted(loader, test_db_session):
+    await loader.load(BulkLoadKind.MEMBERS, io.StringIO(MEMBERS_YAML), BulkFormat.YAML)
+    await test_db_session.execute(
+        update(Member).where(Member.memberid == "BULK3").values(is_deleted_flag=True)
+    )
+    await test_db_session.commit()
+
+    changed = MEMBERS_YAML.replace("name: ketiga", "name: ketiga baru")
+    report = await loader.load(
+        BulkLoadKind.MEMBERS, io.StringIO(changed), BulkFormat.YAML, actor="admin"
+    )
+    assert (report.created, report.updated) == (0, 2)
+
+    test_db_session.expire_all()
+    members = await members_in_db(test_db_session)
+    assert members["BULK3"].name == "ketiga baru"
+    assert members["BULK3"].is_deleted_flag is False
+    assert members["BULK3"].updated_by == "admin"
+
+
+async def test_load_csv_and_ndjson(loader, test_db_session):
+    csv_text = (
+        "memberid,name,pin,password,ipaddress,report_url,allow_nosign,rate_limit\n"
+        "bulkc1,csv satu,111111,secret,10.0.0.1,http://10.0.0.1/r,true,\n"
+        "bulkc2,csv dua,222222,secret,10.0.0.2,not a url,false,2.5\n"
+    )
+    report = await loader.load(
+        BulkLoadKind.MEMBERS, io.StringIO(csv_text), BulkFormat.CSV
+    )
+    assert (report.total, report.created, report.invalid_count) == (2, 1, 1)
+    assert report.invalid[0].row == 3
+
+    ndjson = (
+        '{"memberid": "bulkn1", "name": "n1", "pin": 123456, "password": "x",'
+        ' "ipaddress": "10.0.0.3", "report_url": "http://10.0.0.3/r"}\n'
+        "\n"
+        "{not json\n"
+        '["bukan", "mapping"]\n'
+    )
+    report = await loader.load(
+        BulkLoadKind.MEMBERS, io.StringIO(ndjson), BulkFormat.NDJSON
+    )
+    assert (report.total, report.created, report.invalid_count) == (3, 1, 2)
+    assert [i.row for i in report.invalid] == [3, 4]
+
+    members = await members_in_db(test_db_session)
+    assert members["BULKC1"].allow_nosign is True
+    assert members["BULKC1"].rate_limit is None
+    assert members["BULKN1"].pin == "123456"
+
+
+async def test_dry_run_writes_nothing(loader, test_db_session):
+    report = await loader.load(
+        BulkLoadKind.MEMBERS, io.StringIO(MEMBERS_YAML), BulkFormat.YAML, dry_run=True
+    )
+    assert report.valid == 2
+    assert report.created == 0
+    assert await members_in_db(test_db_session) == {}
+
+
+async def test_malformed_file_rolls_back_all_batches(loader, test_db_session):
+    broken = MEMBERS_YAML + "  - memberid: [tidak ditutup\n"
+    with pytest.raises(BulkLoadError):
+        await loader.load(BulkLoadKind.MEMBERS, io.StringIO(broken), BulkFormat.YAML)
+    assert await members_in_db(test_db_session) == {}
+
+
+async def test_load_modules_normalises_provider(loader, test_db_session):
+    modules = """\
+modules:
+  - moduleid: BULKM1
+    provider: digipos
+    name: satu
+    username: user
+    msisdn: 081234567890
+    pin: 123456
+    password: pasxxxxx
+    email: ops@example.com
+    base_url: http://10.0.0.3:10003
+"""
+    report = await loader.load(
+        BulkLoadKind.MODULES, io.StringIO(modules), BulkFormat.YAML
+    )
+    assert report.created == 1
+    row = (
+        await test_db_session.execute(select(Module).where(Module.moduleid == "BULKM1"))
+    ).scalar_one()
+    assert row.provider == "DIGIPOS"
+    assert row.msisdn == "081234567890"
+
+
+async def test_load_bytes_from_spooled_upload(loader, test_db_session):
+    with tempfile.SpooledTemporaryFile(max_size=64) as spool:
+        spool.write(MEMBERS_YAML.encode())
+        spool.seek(0)
+        report = await loader.load_bytes(BulkLoadKind.MEMBERS, spool, BulkFormat.YAML)
+        assert not spool.closed
+    assert report.created == 2
+    assert sorted(await members_in_db(test_db_session)) == ["BULK1", "BULK3"]
+
+
+@pytest.mark.asyncio
+async def test_session_opened_only_after_whole_file_validated(
+    loader, test_sessionmanager, monkeypatch
+):
+    events = []
+    validate = loader._next_batch
+
+    def next_batch(*args):
+        batch = validate(*args)
+        events.append(("batch", len(batch)))
+        return batch
+
+    @contextlib.asynccontextmanager
+    async def session_factory():
+        events.append(("session", 0))
+        async with test_sessionmanager.session() as session:
+            yield session
+
+    monkeypatch.setattr(loader, "_next_batch", next_batch)
+    loader.session_factory = session_factory
+    report = await loader.load(
+        BulkLoadKind.MEMBERS, io.StringIO(MEMBERS_YAML), BulkFormat.YAML
+    )
+    assert report.created == 2
+    # parse + validasi seluruh file selesai sebelum transaksi tulis dibuka
+    assert events == [("batch", 2), ("batch", 0), ("session", 0)]
+
+    events.clear()
+    await loader.load(
+        BulkLoadKind.MEMBERS, io.StringIO(MEMBERS_YAML), BulkFormat.YAML, dry_run=True
+    )
+    assert ("session", 0) not in events
@@ -0,0 +1,210 @@
+"""Test antrian callback (coalescing, backoff) dan CallbackDeliveryEngine."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from app.database.repositories.repo_callback import SQLiteCallbackRepository
+from app.models.db_callback import CallbackMessage
+from app.models.db_member import Member
+from app.models.db_transaction import Transaction
+from app.schemas.sch_callback import CallbackResult, CallbackStatus
+from app.service.callback import CallbackDeliveryEngine, backoff_delay
+from app.service.metrics import MetricsRegistry
+from app.service.scheduler import PendingTimeouts, TimeoutScheduler, TimerWheel
+from sqlalchemy import delete, select
+
+
+@pytest.fixture
+async def clean_callbacks(test_db_session):
+    await test_db_session.execute(delete(CallbackMessage))
+    await test_db_session.commit()
+    yield test_db_session
+    await test_db_session.execute(delete(CallbackMessage))
+    await test_db_session.commit()
+
+
+async def _rows(session):
+    rows = (await session.execute(select(CallbackMessage))).scalars().all()
+    for row in rows:
+        await session.refresh(row)
+    return rows
+
+
+def test_backoff_delay_is_bounded():
+    for attempts in range(1, 12):
+        delay = backoff_delay(attempts, base=2.0, cap=60.0)
+        full = min(60.0, 2.0 * 2 ** (attempts - 1))
+        assert full / 2 <= delay <= full
+
+
+@pytest.mark.asyncio
+async def test_enqueue_coalesces_pending_per_refid(clean_callbacks):
+    repo = SQLiteCallbackRepository(clean_callbacks)
+    url = "http://member.test/report"
+    first = await repo.enqueue("M1", "R1", url, {"status": "pending"})
+    second = await repo.enqueue("M1", "R1", url, {"status": "success"})
+    other = await repo.enqueue("M1", "R2", url, {"status": "pending"})
+    assert first == second
+    assert other != first
+    rows = {r.id: r for r in await _rows(clean_callbacks)}
+    assert rows[first].payload == {"status": "success"}
+    assert rows[first].coalesced == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_delivers_and_backs_off(clean_callbacks, test_sessionmanager):
+    repo = SQLiteCallbackRepository(clean_callbacks)
+    await repo.enqueue("M1", "R1", "http://ok.test/cb", {"refid": "R1"})
+    await repo.enqueue("M2", "R2", "http://down.test/cb", {"refid": "R2"})
+
+    in_flight = {"ok.test": 0}
+    peak = {"ok.test": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "down.test":
+            return httpx.Response(503)
+        in_flight["ok.test"] += 1
+        peak["ok.test"] = max(peak["ok.test"], in_flight["ok.test"])
+        await asyncio.sleep(0.005)
+        in_flight["ok.test"] -= 1
+        assert request.url.params["refid"] == "R1"
+        return httpx.Response(200, text="OK")
+
+    registry = MetricsRegistry()
+    engine = CallbackDeliveryEngine(
+        test_sessionmanager.session,
+        max_attempts=2,
+        host_concurrency=1,
+        transport=httpx.MockTransport(handler),
+        registry=registry,
+    )
+    try:
+        assert await engine.run_once() == 2
+        rows = {r.memberid: r for r in await _rows(clean_callbacks)}
+        assert rows["M1"].status == CallbackStatus.DELIVERED
+        assert rows["M2"].status == CallbackStatus.PENDING
+        assert rows["M2"].next_attempt_at > time.time()
+        assert rows["M2"].last_error == "HTTP 503"
+        # belum jatuh tempo → tidak di-claim lagi
+        assert await engine.run_once() == 0
+        assert registry.counter_value("callback_delivered", member="M1") == 1
+        assert registry.gauge_value("callback_success_rate", member="M2") == 0
+        assert registry.latency("callback_lag_seconds", member="M1").count == 1
+        assert peak["ok.test"] <= 1
+    finally:
+        await engine.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_release_is_superseded_by_newer_pending(clean_callbacks):
+    repo = SQLiteCallbackRepository(clean_callbacks)
+    url = "http://member.test/report"
+    first = await repo.enqueue("M1", "R1", url, {"status": "pending"})
+    (claim,) = await repo.claim_due("w1", limit=10, lease_seconds=30)
+    assert claim.id == first
+    # status baru saat A sedang dikirim: row baru, A masih claimed
+    second = await repo.enqueue("M1", "R1", url, {"status": "success"})
+    assert second != first
+    # B tidak di-claim selama A masih in-flight (urutan terjaga)
+    assert await repo.claim_due("w2", limit=10, lease_seconds=30) == []
+    failed = CallbackResult(id=first, ok=False, error="HTTP 503")
+    assert await repo.complete_batch("w1", [failed], max_attempts=5) == 1
+
+    rows = {r.id: r for r in await _rows(clean_callbacks)}
+    assert rows[first].status == CallbackStatus.SUPERSEDED
+    assert rows[second].status == CallbackStatus.PENDING
+    # enqueue berikutnya coalesce ke satu-satunya row pending
+    third = await repo.enqueue("M1", "R1", url, {"status": "refunded"})
+    assert third == second
+    (claim,) = await repo.claim_due("w2", limit=10, lease_seconds=30)
+    assert (claim.id, claim.payload) == (second, {"status": "refunded"})
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_superseded_by_newer_pending(clean_callbacks):
+    repo = SQLiteCallbackRepository(clean_callbacks)
+    url = "http://member.test/report"
+    first = await repo.enqueue("M1", "R1", url, {"status": "pending"})
+    await repo.claim_due("crashed", limit=10, lease_seconds=-1)
+    second = await repo.enqueue("M1", "R1", url, {"status": "success"})
+    (claim,) = await repo.claim_due("w2", limit=10, lease_seconds=30)
+    assert claim.id == second
+    rows = {r.id: r for r in await _rows(clean_callbacks)}
+    assert rows[first].status == CallbackStatus.SUPERSEDED
+
+
+@pytest.mark.asyncio
+async def test_poison_callback_fails_after_max_attempts(clean_callbacks):
+    repo = SQLiteCallbackRepository(clean_callbacks)
+    url = "http://member.test/report"
+    first = await repo.enqueue("M1", "R1", url, {"status": "pending"})
+    # worker crash berulang: lease selalu expired tanpa complete_batch
+    for _ in range(3):
+        (claim,) = await repo.claim_due(
+            "crashed", limit=10, lease_seconds=-1, max_attempts=3
+        )
+        assert claim.id == first
+    assert await repo.claim_due("w2", limit=10, lease_seconds=30, max_attempts=3) == []
+    (row,) = await _rows(clean_callbacks)
+    assert row.status == CallbackStatus.FAILED
+    assert row.attempts == 3
+    assert row.last_error == "lease expired after max attempts"
+
+
+@pytest.fixture
+async def final_trx(clean_callbacks):
+    session = clean_callbacks
+    await session.execute(delete(Transaction))
+    await session.execute(delete(Member).where(Member.memberid == "CBM1"))
+    session.add(
+        Member(
+            memberid="CBM1",
+            name="Callback Member",
+            ipaddress="127.0.0.1",
+            report_url="http://cbm1.test/report",
+            pin="1234",
+            password="secret",
+        )
+    )
+    rows = [
+        Transaction(memberid="CBM1", refid="X1", product="TSEL10", dest="0812"),
+        Transaction(memberid="CBM1", refid=None, product="TSEL10"),
+        Transaction(memberid="NOPE", refid="X3", product="TSEL10"),
+    ]
+    session.add_all(rows)
+    await session.commit()
+    yield [r.id for r in rows]
+    await session.execute(delete(Transaction))
+    await session.execute(delete(Member).where(Member.memberid == "CBM1"))
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_final_timeout_enqueues_member_callback(
+    final_trx, clean_callbacks, test_sessionmanager
+):
+    now = [1000.0]
+    scheduler = TimeoutScheduler(
+        TimerWheel(tick=0.1, slots=8, levels=3, clock=lambda: now[0]),
+        registry=MetricsRegistry(),
+    )
+    timeouts = PendingTimeouts(
+        test_sessionmanager.session,
+        scheduler=scheduler,
+        registry=scheduler.metrics,
+        pending_timeout=1.0,
+        clock=lambda: now[0],
+    )
+    for trx_id in final_trx:
+        timeouts.track(trx_id)
+    now[0] += 2.0
+    await scheduler.fire_due()
+
+    (row,) = await _rows(clean_callbacks)
+    assert (row.memberid, row.refid, row.transaction_id) == ("CBM1", "X1", final_trx[0])
+    assert row.report_url == "http://cbm1.test/report"
+    assert row.status == CallbackStatus.PENDING
+    assert row.payload["status"] == "failed"
+    assert row.payload["dest"] == "0812"
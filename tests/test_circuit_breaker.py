@@ -0,0 +1,128 @@
+"""Test CircuitBreaker, AIMDLimiter dan ModuleGuard (pakai fake clock)."""
+
+import pytest
+from app.custom.exceptions.cst_exceptions import (
+    CircuitOpenError,
+    ModuleOverloadedError,
+)
+from app.schemas.sch_module import BreakerState
+from app.service.supplier import (
+    AIMDLimiter,
+    CircuitBreaker,
+    ModuleGuard,
+    ModuleGuardRegistry,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock):
+    return CircuitBreaker(
+        window=10,
+        min_requests=4,
+        error_rate_threshold=0.5,
+        open_seconds=5,
+        half_open_probes=2,
+        clock=clock,
+    )
+
+
+def test_breaker_trips_on_error_rate_and_recovers():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for ok in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record(ok)
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.allow() is False
+
+    clock.now += 5
+    # half-open: hanya 2 probe yang boleh lewat
+    assert breaker.allow() and breaker.allow()
+    assert breaker.allow() is False
+    assert breaker.state is BreakerState.HALF_OPEN
+    breaker.record(True)
+    breaker.record(True)
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.counts() == (0, 0)
+
+
+def test_breaker_half_open_failure_reopens():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record(False)
+    clock.now += 6
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state is BreakerState.OPEN
+
+
+def test_breaker_window_forgets_old_errors():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    breaker.record(False)
+    breaker.record(False)
+    clock.now += 11
+    breaker.record(True)
+    breaker.record(False)
+    assert breaker.counts() == (2, 1)
+    assert breaker.state is BreakerState.CLOSED
+
+
+def test_aimd_increase_and_decrease():
+    clock = FakeClock()
+    limiter = AIMDLimiter(
+        initial=4,
+        min_limit=1,
+        max_limit=8,
+        target_latency=1.0,
+        backoff=0.5,
+        clock=clock,
+    )
+    for _ in range(4):
+        assert limiter.try_acquire()
+    assert limiter.try_acquire() is False
+    for _ in range(4):
+        limiter.release(0.1, True)
+    assert limiter.limit == pytest.approx(5.0, rel=0.05)
+    limiter.release(3.0, True)  # lambat → multiplicative decrease
+    assert limiter.limit < 3
+    limiter.release(3.0, True)  # masih dalam cooldown, tidak turun lagi
+    assert limiter.limit > 2
+
+
+def test_module_guard_sheds_fast():
+    clock = FakeClock()
+    limiter = AIMDLimiter(
+        initial=1,
+        min_limit=1,
+        max_limit=2,
+        target_latency=1.0,
+        backoff=0.5,
+        clock=clock,
+    )
+    guard = ModuleGuard("DIGI01", make_breaker(clock), limiter, clock=clock)
+    started = guard.acquire()
+    with pytest.raises(ModuleOverloadedError):
+        guard.acquire()
+    guard.release(started, False)
+    for _ in range(3):
+        guard.release(guard.acquire(), False)
+    with pytest.raises(CircuitOpenError):
+        guard.acquire()
+    health = guard.health()
+    assert health.state is BreakerState.OPEN
+    assert health.shed_count == 2
+
+
+def test_registry_snapshot():
+    registry = ModuleGuardRegistry(clock=FakeClock())
+    assert registry.guard("DIGI01") is registry.guard("DIGI01")
+    assert [h.moduleid for h in registry.snapshot()] == ["DIGI01"]
@@ -0,0 +1,180 @@
+"""Test hot reload member / module: trigger versi, diff snapshot, swap."""
+
+import httpx
+import pytest
+from app.models.db_config_version import ConfigVersion
+from app.models.db_ledger import MemberBalance
+from app.models.db_member import Member
+from app.models.db_module import Module
+from app.schemas.sch_bulk_load import BulkLoadKind
+from app.schemas.sch_member import AdmissionVerdict
+from app.service.admission import MemberAdmission
+from app.service.metrics import MetricsRegistry
+from app.service.supplier import SupplierClientRegistry
+from app.service.watcher import ConfigWatcher, diff_config
+from app.service.watcher.srv_config_watcher import EMPTY_SNAPSHOT
+from sqlalchemy import delete, select, update
+
+
+def make_module(moduleid="CFGW1", base_url="http://10.0.0.1:8000"):
+    return Module(
+        moduleid=moduleid,
+        name=moduleid,
+        provider="DIGIPOS",
+        username="user",
+        msisdn="0812",
+        pin="123456",
+        password="secret1",
+        email="ops@example.com",
+        base_url=base_url,
+    )
+
+
+@pytest.fixture
+async def seeded(test_db_session):
+    session = test_db_session
+    await session.execute(delete(Member).where(Member.memberid.like("CFGW%")))
+    await session.execute(delete(Module).where(Module.moduleid.like("CFGW%")))
+    session.add(
+        Member(
+            memberid="CFGW1",
+            name="watch",
+            ipaddress="127.0.0.1",
+            report_url="http://127.0.0.1/report",
+            pin="777999",
+            password="secret123",
+        )
+    )
+    session.add(make_module())
+    await session.commit()
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+async def watcher(seeded, test_sessionmanager, registry, tmp_path):  # noqa: ARG001
+    clients = SupplierClientRegistry(
+        transport=httpx.MockTransport(lambda _: httpx.Response(200)),
+        registry=registry,
+    )
+    watcher = ConfigWatcher(
+        test_sessionmanager.engine,
+        test_sessionmanager.session,
+        admission=MemberAdmission(max_inflight=5, rate=0, registry=registry),
+        clients=clients,
+        sync_yaml=False,
+        yaml_paths={BulkLoadKind.MEMBERS: tmp_path / "members.yaml"},
+        registry=registry,
+    )
+    yield watcher
+    await watcher.stop()
+    await clients.aclose()
+
+
+async def run_sql(session, stmt):
+    await session.execute(stmt)
+    await session.commit()
+
+
+def test_diff_config_reports_changed_and_removed():
+    first = diff_config(EMPTY_SNAPSHOT, [("m1", None, None, None)], [])
+    assert [m.memberid for m in first.changed_members] == ["M1"]
+    snapshot = EMPTY_SNAPSHOT._replace(members=first.members)
+    same = diff_config(snapshot, [("M1", None, None, None)], [])
+    assert not same.changed
+    changed = diff_config(snapshot, [("M1", 3, None, None), ("M2", None, 1.0, 2)], [])
+    assert [m.memberid for m in changed.changed_members] == ["M1", "M2"]
+    removed = diff_config(snapshot, [], [])
+    assert removed.removed_members == ["M1"]
+
+
+async def test_triggers_bump_config_versions(seeded, test_db_session):  # noqa: ARG001
+    stmt = select(ConfigVersion.version).where(ConfigVersion.name == "members")
+    before = (await test_db_session.execute(stmt)).scalar_one()
+    await run_sql(
+        test_db_session,
+        update(Member).where(Member.memberid == "CFGW1").values(name="baru"),
+    )
+    assert (await test_db_session.execute(stmt)).scalar_one() == before + 1
+
+
+async def test_reload_then_poll_only_reacts_to_config_changes(
+    watcher, test_db_session, registry
+):
+    first = await watcher.reload()
+    assert first.version == 1
+    assert "CFGW1" in watcher.admission
+    assert "CFGW1" in watcher.clients
+    assert await watcher.check() is None
+
+    # commit di tabel lain: data_version berubah, config_versions tidak
+    await run_sql(test_db_session, delete(MemberBalance))
+    assert await watcher.check() is None
+    assert watcher.version == 1
+
+    # limit member berubah: slot dikonfigurasi ulang, counter in-flight tetap
+    assert watcher.admission.admit("CFGW1") is AdmissionVerdict.ADMITTED
+    await run_sql(
+        test_db_session,
+        update(Member).where(Member.memberid == "CFGW1").values(max_inflight=1),
+    )
+    result = await watcher.check()
+    assert result is not None
+    assert (result.version, result.members_changed) == (2, 1)
+    assert watcher.admission.admit("CFGW1") is AdmissionVerdict.INFLIGHT_LIMIT
+    assert registry.gauge_value("config_version") == 2
+    assert registry.latency("config_reload_seconds").count == 2
+
+
+async def test_module_base_url_change_swaps_client(watcher, test_db_session):
+    await watcher.reload()
+    old_client = watcher.clients.get("CFGW1")
+    await run_sql(
+        test_db_session,
+        update(Module)
+        .where(Module.moduleid == "CFGW1")
+        .values(base_url="http://10.0.0.2:9000"),
+    )
+    result = await watcher.check()
+    assert result.modules_changed == 1
+    new_client = watcher.clients.get("CFGW1")
+    assert new_client is not old_client
+    assert str(new_client.base_url).startswith("http://10.0.0.2:9000")
+
+
+async def test_deactivated_member_and_module_are_removed(watcher, test_db_session):
+    await watcher.reload()
+    await run_sql(
+        test_db_session,
+        update(Member).where(Member.memberid == "CFGW1").values(is_active=False),
+    )
+    await run_sql(test_db_session, delete(Module).where(Module.moduleid == "CFGW1"))
+    result = await watcher.check()
+    assert (result.members_removed, result.modules_removed) == (1, 1)
+    assert watcher.admission.admit("CFGW1") is AdmissionVerdict.UNKNOWN_MEMBER
+    assert "CFGW1" not in watcher.clients
+
+
+async def test_yaml_sync_upserts_file_then_reloads(watcher, test_db_session, tmp_path):
+    await watcher.reload()
+    watcher.sync_yaml = True
+    (tmp_path / "members.yaml").write_text(
+        "members:\n"
+        "  - memberid: CFGW2\n"
+        "    name: dari yaml\n"
+        "    pin: 777999\n"
+        "    password: secret123\n"
+        "    ipaddress: 127.0.0.1\n"
+        "    report_url: http://127.0.0.1/report\n",
+        encoding="utf-8",
+    )
+    result = await watcher.check()
+    assert result is not None
+    assert "CFGW2" in watcher.admission
+    # mtime sama: tidak di-load ulang
+    assert await watcher.check() is None
+    member = await test_db_session.get(Member, "CFGW2")
+    assert member.updated_by == "config-watcher"
@@ -0,0 +1,161 @@
+"""Test propagasi deadline request (contextvar) ke DB, UoW dan supplier."""
+
+import asyncio
+
+import httpx
+import pytest
+from app.custom.cst_deadline import (
+    check_deadline,
+    current_deadline,
+    deadline,
+    deadline_scope,
+    remaining,
+)
+from app.custom.cst_middleware import DeadlineMiddleware
+from app.custom.exceptions.cst_exceptions import DeadlineExceededError
+from app.database import DatabaseSessionManager, UnitOfWork
+from app.schemas.sch_module import ModuleInDB, ProviderEnums
+from app.service.metrics import MetricsRegistry
+from app.service.supplier import ModuleGuardRegistry, SupplierClientRegistry
+from sqlalchemy import text
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+def test_no_deadline_is_noop():
+    assert current_deadline() is None
+    assert remaining() is None
+    assert check_deadline("test") is None
+
+
+def test_nested_deadline_never_extends_outer():
+    with deadline(0.5) as outer:
+        with deadline(10.0) as inner:
+            assert inner == outer
+        with deadline(0.1) as shorter:
+            assert shorter < outer
+        assert current_deadline() == outer
+    assert current_deadline() is None
+
+
+@pytest.mark.asyncio
+async def test_scope_cancels_work_past_deadline():
+    with deadline(0.05), pytest.raises(DeadlineExceededError) as exc:
+        async with deadline_scope("work"):
+            await asyncio.sleep(1)
+    assert exc.value.status_code == 504
+    assert exc.value.context["stage"] == "work"
+
+
+@pytest.mark.asyncio
+async def test_expired_deadline_fails_fast():
+    with deadline(0.01):
+        await asyncio.sleep(0.02)
+        with pytest.raises(DeadlineExceededError):
+            check_deadline("late")
+
+
+@pytest.fixture
+async def memory_db():
+    manager = DatabaseSessionManager("sqlite+aiosqlite:///:memory:")
+    yield manager
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_session_is_bounded_by_deadline(memory_db):
+    with deadline(0.05):
+        with pytest.raises(DeadlineExceededError):
+            async with memory_db.session() as session:
+                await session.execute(text("select 1"))
+                await asyncio.sleep(1)
+        with pytest.raises(DeadlineExceededError):
+            async with memory_db.session():
+                pass
+    # tanpa deadline session berjalan normal
+    async with memory_db.session() as session:
+        assert (await session.execute(text("select 1"))).scalar() == 1
+
+
+@pytest.mark.asyncio
+async def test_uow_rolls_back_when_deadline_passes(memory_db):
+    async with memory_db.session() as session:
+        await session.execute(text("create table t (x integer)"))
+        await session.commit()
+        with deadline(0.05), pytest.raises(DeadlineExceededError):
+            async with UnitOfWork(session):
+                await session.execute(text("insert into t values (1)"))
+                await asyncio.sleep(1)
+        count = await session.execute(text("select count(*) from t"))
+        assert count.scalar() == 0
+
+
+async def slow_supplier(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+    await asyncio.sleep(1)
+    return httpx.Response(200, text="late")
+
+
+@pytest.mark.asyncio
+async def test_supplier_call_abandoned_without_counting_failure():
+    guards = ModuleGuardRegistry()
+    clients = SupplierClientRegistry(
+        transport=httpx.MockTransport(slow_supplier),
+        registry=MetricsRegistry(),
+        guards=guards,
+    )
+    clients.register(
+        ModuleInDB(
+            moduleid="SLOW1",
+            name="Slow",
+            provider=ProviderEnums.DIGIPOS,
+            username="user",
+            msisdn="628111111111",
+            email="digi@example.com",
+            base_url="http://slow.local",
+            pin="123456",
+            password="secret123",
+        )
+    )
+    try:
+        with deadline(0.05), pytest.raises(DeadlineExceededError):
+            await clients.request("SLOW1", "GET", "/trx")
+        guard = guards.guard("SLOW1")
+        assert guard.limiter.in_flight == 0
+        assert guard.success_counts() == (0, 0)
+    finally:
+        await clients.aclose()
+
+
+@pytest.mark.asyncio
+async def test_middleware_sets_budget_from_header():
+    async def endpoint(request):  # noqa: ARG001
+        return JSONResponse({"remaining": remaining()})
+
+    app = DeadlineMiddleware(Starlette(routes=[Route("/", endpoint)]), seconds=5.0)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        default = (await client.get("/")).json()["remaining"]
+        shorter = (await client.get("/", headers={"X-Request-Timeout": "1"})).json()
+        longer = (await client.get("/", headers={"X-Request-Timeout": "60"})).json()
+    assert 4.0 < default <= 5.0
+    assert 0.0 < shorter["remaining"] <= 1.0
+    assert 4.0 < longer["remaining"] <= 5.0
+
+
+@pytest.mark.asyncio
+async def test_middleware_exempt_path_has_no_deadline():
+    async def endpoint(request):  # noqa: ARG001
+        return JSONResponse({"remaining": remaining()})
+
+    app = DeadlineMiddleware(
+        Starlette(
+            routes=[Route("/", endpoint), Route("/admin/bulk/members", endpoint)]
+        ),
+        seconds=5.0,
+        exempt=["/admin/bulk/"],
+    )
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        assert (await client.get("/")).json()["remaining"] is not None
+        assert (await client.get("/admin/bulk/members")).json()["remaining"] is None
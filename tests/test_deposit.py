@@ -0,0 +1,241 @@
+"""Test tiket deposit: sign, kode unik, konfirmasi batch idempotent."""
+
+import random
+
+import httpx
+import pytest
+from app.api.v1 import admin_router, otomax_router
+from app.custom.exceptions.cst_exceptions import (
+    AppExceptionError,
+    DepositTicketError,
+    SignatureInvalidError,
+)
+from app.deps.deps_security import get_current_admin
+from app.models.db_deposit import DepositTicket
+from app.models.db_ledger import LedgerEntry, MemberBalance
+from app.models.db_member import Member
+from app.schemas.sch_deposit import DepositPayment, DepositTicketStatus
+from app.service.balance import BalanceCache
+from app.service.ledger import DepositService, LedgerService
+from app.service.metrics import MetricsRegistry
+from app.service.security import OtomaxSignatureService
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select
+
+PIN = "777999"
+PASSWORD = "secret123"
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def sign(memberid, amount):
+    return OtomaxSignatureService.generate_deposit_ticket_signature(
+        memberid, PIN, PASSWORD, str(amount)
+    )
+
+
+@pytest.fixture
+async def members(test_db_session):
+    session = test_db_session
+    for model in (DepositTicket, LedgerEntry, MemberBalance):
+        await session.execute(delete(model))
+    await session.execute(delete(Member).where(Member.memberid.like("DEP%")))
+    for memberid, nosign in (("DEPA", False), ("DEPB", True)):
+        session.add(
+            Member(
+                memberid=memberid,
+                name=memberid,
+                ipaddress="127.0.0.1",
+                report_url="http://127.0.0.1/report",
+                pin=PIN,
+                password=PASSWORD,
+                allow_nosign=nosign,
+            )
+        )
+    await session.commit()
+
+
+@pytest.fixture
+def deposits(members, test_sessionmanager):  # noqa: ARG001
+    cache = BalanceCache(ttl=60.0, registry=MetricsRegistry())
+    ledger = LedgerService(test_sessionmanager.session, cache=cache)
+    service = DepositService(
+        test_sessionmanager.session,
+        cache=cache,
+        registry=MetricsRegistry(),
+        clock=FakeClock(),
+        rng=random.Random(7),
+    )
+    return service, ledger
+
+
+@pytest.mark.asyncio
+async def test_create_ticket_requires_valid_signature(deposits):
+    service, _ = deposits
+    with pytest.raises(SignatureInvalidError):
+        await service.create_ticket("DEPA", 50_000, sign="x" * 27)
+    with pytest.raises(SignatureInvalidError):
+        await service.create_ticket("DEPA", 50_000)
+
+    ticket = await service.create_ticket("depa", 50_000, sign=sign("depa", 50_000))
+    assert ticket.memberid == "DEPA"
+    assert ticket.status is DepositTicketStatus.PENDING
+    assert 50_001 <= ticket.transfer_amount <= 50_000 + service.code_max
+    # member allow_nosign tidak perlu sign
+    assert (await service.create_ticket("DEPB", 20_000)).memberid == "DEPB"
+
+
+@pytest.mark.asyncio
+async def test_create_ticket_rejects_out_of_range_amount(deposits):
+    service, _ = deposits
+    with pytest.raises(DepositTicketError):
+        await service.create_ticket("DEPB", service.min_amount - 1)
+
+
+@pytest.mark.asyncio
+async def test_unique_codes_exhausted(deposits):
+    service, _ = deposits
+    service.code_max = 3
+    codes = {
+        (await service.create_ticket("DEPB", 10_000)).transfer_amount for _ in range(3)
+    }
+    assert codes == {10_001, 10_002, 10_003}
+    with pytest.raises(DepositTicketError):
+        await service.create_ticket("DEPB", 10_000)
+    # tiket expired membebaskan kodenya
+    service.clock.now += service.ttl + 1
+    assert (await service.create_ticket("DEPB", 10_000)).transfer_amount in codes
+
+
+@pytest.mark.asyncio
+async def test_confirm_batch_credits_once(deposits, test_db_session):
+    service, ledger = deposits
+    t1 = await service.create_ticket("DEPB", 100_000)
+    t2 = await service.create_ticket("DEPB", 25_000)
+    t3 = await service.create_ticket("DEPA", 40_000, sign=sign("DEPA", 40_000))
+    payments = [
+        DepositPayment(payment_ref="BANK-1", amount=t1.transfer_amount),
+        DepositPayment(
+            payment_ref="BANK-2", amount=t2.transfer_amount, ticket_id=t2.id
+        ),
+        DepositPayment(payment_ref="BANK-3", amount=t3.transfer_amount),
+        DepositPayment(payment_ref="BANK-4", amount=12_345),
+        DepositPayment(
+            payment_ref="BANK-5", amount=t3.transfer_amount + 1, ticket_id=t3.id
+        ),
+    ]
+    result = await service.confirm(payments)
+    assert sorted(result.credited) == ["BANK-1", "BANK-2", "BANK-3"]
+    assert sorted(result.unmatched) == ["BANK-4", "BANK-5"]
+    assert await ledger.balance("DEPB") == t1.transfer_amount + t2.transfer_amount
+    assert await ledger.balance("DEPA") == t3.transfer_amount
+
+    # replay seluruh batch: tidak ada saldo tambahan
+    replay = await service.confirm(payments)
+    assert replay.credited == []
+    assert sorted(replay.duplicate) == ["BANK-1", "BANK-2", "BANK-3"]
+    assert await ledger.balance("DEPB") == t1.transfer_amount + t2.transfer_amount
+
+    entries = (
+        (
+            await test_db_session.execute(
+                select(LedgerEntry)
+                .where(LedgerEntry.memberid == "DEPB")
+                .order_by(LedgerEntry.id)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert {e.ref for e in entries} == {f"ticket:{t1.id}", f"ticket:{t2.id}"}
+    running = 0
+    for entry in entries:
+        running += entry.amount
+        assert entry.balance_after == running
+    ticket = await test_db_session.get(DepositTicket, t1.id, populate_existing=True)
+    assert ticket.status == DepositTicketStatus.PAID
+    assert ticket.payment_ref == "BANK-1"
+
+
+@pytest.mark.asyncio
+async def test_same_ticket_paid_twice_in_batch(deposits):
+    service, ledger = deposits
+    ticket = await service.create_ticket("DEPB", 30_000)
+    result = await service.confirm(
+        [
+            DepositPayment(payment_ref="TRF-1", amount=ticket.transfer_amount),
+            DepositPayment(payment_ref="TRF-2", amount=ticket.transfer_amount),
+        ]
+    )
+    assert result.credited == ["TRF-1"]
+    assert result.unmatched == ["TRF-2"]
+    assert await ledger.balance("DEPB") == ticket.transfer_amount
+
+
+@pytest.mark.asyncio
+async def test_expired_ticket_is_not_matched(deposits):
+    service, ledger = deposits
+    ticket = await service.create_ticket("DEPB", 15_000)
+    service.clock.now += service.ttl + 1
+    result = await service.confirm(
+        [DepositPayment(payment_ref="LATE-1", amount=ticket.transfer_amount)]
+    )
+    assert result.unmatched == ["LATE-1"]
+    assert await ledger.balance("DEPB") == 0
+
+
+@pytest.fixture
+async def api(deposits):
+    service, ledger = deposits
+    app = FastAPI()
+    app.include_router(otomax_router)
+    app.include_router(admin_router)
+    app.state.deposits = service
+
+    @app.exception_handler(AppExceptionError)
+    async def handle(request, exc):  # noqa: ARG001
+        return JSONResponse(status_code=exc.status_code or 500, content=exc.to_dict())
+
+    app.dependency_overrides[get_current_admin] = lambda: None
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        yield client, ledger
+
+
+@pytest.mark.asyncio
+async def test_deposit_endpoints_create_ticket_and_confirm(api):
+    client, ledger = api
+    denied = await client.get(
+        "/api/v1/otomax/deposit",
+        params={"memberID": "DEPA", "amount": 50_000, "sign": "x" * 27},
+    )
+    assert denied.status_code == 401
+
+    resp = await client.get(
+        "/api/v1/otomax/deposit",
+        params={"memberID": "DEPA", "amount": 50_000, "sign": sign("DEPA", 50_000)},
+    )
+    assert resp.status_code == 200
+    ticket = resp.json()
+    assert ticket["status"] == DepositTicketStatus.PENDING
+
+    payments = [
+        {"payment_ref": "API-1", "amount": ticket["transfer_amount"]},
+        {"payment_ref": "API-2", "amount": 1},
+    ]
+    resp = await client.post("/api/v1/admin/deposits/confirm", json=payments)
+    assert resp.json() == {
+        "credited": ["API-1"],
+        "duplicate": [],
+        "unmatched": ["API-2"],
+    }
+    resp = await client.post("/api/v1/admin/deposits/confirm", json=payments[:1])
+    assert resp.json()["duplicate"] == ["API-1"]
+    assert await ledger.balance("DEPA") == ticket["transfer_amount"]
@@ -0,0 +1,157 @@
+"""Test ledger saldo member: debit atomik ber-guard, jurnal, invalidasi cache."""
+
+import asyncio
+
+import pytest
+from app.custom.exceptions.cst_exceptions import (
+    DuplicateLedgerEntryError,
+    InsufficientBalanceError,
+    LedgerAccountNotFoundError,
+    LedgerError,
+)
+from app.database.repositories.repo_ledger import SQLiteLedgerRepository
+from app.models.db_ledger import LedgerEntry, MemberBalance
+from app.schemas.sch_ledger import LedgerCredit, LedgerKind
+from app.service.balance import BalanceCache
+from app.service.ledger import LedgerService
+from app.service.metrics import MetricsRegistry
+from sqlalchemy import delete, func, select, text
+
+
+@pytest.fixture
+async def ledger(test_db_session, test_sessionmanager):
+    await test_db_session.execute(delete(LedgerEntry))
+    await test_db_session.execute(delete(MemberBalance))
+    await test_db_session.commit()
+    cache = BalanceCache(ttl=60.0, registry=MetricsRegistry())
+    return LedgerService(
+        test_sessionmanager.session, cache=cache, registry=MetricsRegistry()
+    )
+
+
+async def _entries(session, memberid):
+    stmt = (
+        select(LedgerEntry)
+        .where(LedgerEntry.memberid == memberid)
+        .order_by(LedgerEntry.id)
+    )
+    return list((await session.execute(stmt)).scalars())
+
+
+@pytest.mark.asyncio
+async def test_credit_then_debit_writes_journal(ledger, test_db_session):
+    posting = await ledger.credit("LDG1", 10_000, ref="dep:1")
+    assert posting.balance_after == 10_000
+    posting = await ledger.debit("LDG1", 2_500, ref="trx:1")
+    assert posting.amount == -2_500
+    assert posting.balance_after == 7_500
+
+    entries = await _entries(test_db_session, "LDG1")
+    assert [(e.kind, e.amount, e.balance_after) for e in entries] == [
+        (LedgerKind.CREDIT, 10_000, 10_000),
+        (LedgerKind.DEBIT, -2_500, 7_500),
+    ]
+    assert await ledger.balance("LDG1") == 7_500
+
+
+@pytest.mark.asyncio
+async def test_debit_insufficient_changes_nothing(ledger, test_db_session):
+    await ledger.credit("LDG2", 1_000)
+    with pytest.raises(InsufficientBalanceError) as exc:
+        await ledger.debit("LDG2", 1_001, ref="trx:2")
+    assert exc.value.status_code == 402
+    assert await ledger.balance("LDG2") == 1_000
+    assert len(await _entries(test_db_session, "LDG2")) == 1
+    assert ledger.metrics.counter_value("ledger_insufficient") == 1
+
+
+@pytest.mark.asyncio
+async def test_debit_unknown_member_and_invalid_amount(ledger):
+    with pytest.raises(LedgerAccountNotFoundError):
+        await ledger.debit("NOPE1", 10)
+    with pytest.raises(LedgerError):
+        await ledger.debit("NOPE1", 0)
+    assert await ledger.balance("NOPE1") == 0
+
+
+@pytest.mark.asyncio
+async def test_duplicate_ref_rolls_back_balance(ledger, test_db_session):
+    await ledger.credit("LDG3", 5_000)
+    await ledger.debit("LDG3", 1_000, ref="trx:3")
+    with pytest.raises(DuplicateLedgerEntryError):
+        await ledger.debit("LDG3", 1_000, ref="trx:3")
+    # UPDATE saldo ikut di-rollback bersama INSERT entry yang gagal
+    assert await ledger.balance("LDG3") == 4_000
+    assert len(await _entries(test_db_session, "LDG3")) == 2
+
+
+@pytest.mark.asyncio
+async def test_write_invalidates_cached_balance(ledger):
+    await ledger.credit("LDG4", 300)
+    assert await ledger.balance("LDG4") == 300
+    assert ledger.cache.peek("LDG4") == 300
+    await ledger.debit("LDG4", 100)
+    assert ledger.cache.peek("LDG4") is None
+    assert await ledger.balance("LDG4") == 200
+
+
+@pytest.mark.asyncio
+async def test_concurrent_debits_never_overdraw(ledger, test_db_session):
+    await ledger.credit("HOT01", 1_000)
+
+    async def attempt(i):
+        try:
+            await ledger.debit("HOT01", 30, ref=f"trx:hot:{i}")
+        except InsufficientBalanceError:
+            return False
+        return True
+
+    results = await asyncio.gather(*(attempt(i) for i in range(50)))
+    assert sum(results) == 33
+    assert await ledger.balance("HOT01") == 10
+    total = await test_db_session.scalar(
+        select(func.sum(LedgerEntry.amount)).where(LedgerEntry.memberid == "HOT01")
+    )
+    assert total == 10
+
+
+@pytest.mark.asyncio
+async def test_credit_batch_only_appends_entries(
+    ledger,  # noqa: ARG001
+    test_db_session,
+):
+    await test_db_session.execute(
+        text(
+            "CREATE TRIGGER ledger_append_only BEFORE UPDATE ON ledger_entries "
+            "BEGIN SELECT RAISE(ABORT, 'ledger_entries is append-only'); END"
+        )
+    )
+    await test_db_session.commit()
+    try:
+        async with test_db_session.begin():
+            repo = SQLiteLedgerRepository(test_db_session, autocommit=False)
+            await repo.credit("LDG6", 1_000, ref="dep:6")
+            postings = await repo.credit_batch(
+                [
+                    LedgerCredit(memberid="LDG6", amount=200, ref="dep:6"),
+                    LedgerCredit(memberid="LDG6", amount=300, ref="dep:7"),
+                    LedgerCredit(memberid="LDG7", amount=50, ref="dep:8"),
+                    LedgerCredit(memberid="LDG6", amount=400, ref="dep:7"),
+                    LedgerCredit(memberid="LDG6", amount=500, ref="dep:9"),
+                ]
+            )
+    finally:
+        await test_db_session.execute(text("DROP TRIGGER ledger_append_only"))
+        await test_db_session.commit()
+
+    assert [(p.ref, p.balance_after) for p in postings] == [
+        ("dep:7", 1_300),
+        ("dep:8", 50),
+        ("dep:9", 1_800),
+    ]
+    entries = await _entries(test_db_session, "LDG6")
+    assert [(e.ref, e.balance_after) for e in entries] == [
+        ("dep:6", 1_000),
+        ("dep:7", 1_300),
+        ("dep:9", 1_800),
+    ]
@@ -0,0 +1,265 @@
+"""Test admission control per member + endpoint transaksi OtomaX."""
+
+import asyncio
+
+import httpx
+import pytest
+from app.api.v1.rtr_otomax import balance_inflight, router, trx_inflight
+from app.models.db_member import Member
+from app.models.db_transaction import InboxMessage
+from app.schemas.sch_member import AdmissionVerdict, MemberLimits
+from app.service.admission import MemberAdmission, member_admission
+from app.service.balance import BalanceCache
+from app.service.ledger import LedgerService
+from app.service.metrics import MetricsRegistry
+from app.service.security import OtomaxSignatureService
+from app.service.transaction import TransactionIntake
+from fastapi import FastAPI
+from sqlalchemy import delete, func, select
+
+PIN = "777999"
+PASSWORD = "secret123"
+
+
+class FakeClock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_admission(clock=None):
+    return MemberAdmission(
+        max_inflight=2,
+        rate=0,
+        burst=5,
+        clock=clock or FakeClock(),
+        registry=MetricsRegistry(),
+    )
+
+
+def test_inflight_cap_and_release():
+    admission = make_admission()
+    admission.load([MemberLimits(memberid="M1")])
+    assert admission.admit("m1") is AdmissionVerdict.ADMITTED
+    assert admission.admit("M1") is AdmissionVerdict.ADMITTED
+    assert admission.admit("M1") is AdmissionVerdict.INFLIGHT_LIMIT
+    admission.release("M1")
+    assert admission.admit("M1") is AdmissionVerdict.ADMITTED
+    assert admission.admit("X1") is AdmissionVerdict.UNKNOWN_MEMBER
+    assert (
+        admission.metrics.counter_value(
+            "member_admission_rejected", reason="inflight_limit"
+        )
+        == 1
+    )
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    admission = make_admission(clock)
+    admission.load(
+        [MemberLimits(memberid="M1", max_inflight=100, rate_limit=2.0, rate_burst=3)]
+    )
+    verdicts = [admission.admit("M1") for _ in range(4)]
+    assert verdicts[:3] == [AdmissionVerdict.ADMITTED] * 3
+    assert verdicts[3] is AdmissionVerdict.RATE_LIMIT
+    clock.now += 0.5  # +1 token
+    assert admission.admit("M1") is AdmissionVerdict.ADMITTED
+    assert admission.admit("M1") is AdmissionVerdict.RATE_LIMIT
+    clock.now += 60  # refill dibatasi burst
+    assert [admission.admit("M1") for _ in range(4)].count(
+        AdmissionVerdict.ADMITTED
+    ) == 3
+
+
+def test_members_are_isolated():
+    admission = make_admission()
+    admission.load([MemberLimits(memberid="NOISY"), MemberLimits(memberid="QUIET")])
+    while admission.admit("NOISY") is AdmissionVerdict.ADMITTED:
+        pass
+    assert admission.admit("QUIET") is AdmissionVerdict.ADMITTED
+
+
+def test_reload_keeps_counters_and_drops_removed_members():
+    admission = make_admission()
+    admission.load([MemberLimits(memberid="M1"), MemberLimits(memberid="M2")])
+    admission.admit("M1")
+    admission.admit("M1")
+    admission.load([MemberLimits(memberid="M1", max_inflight=3)])
+    assert "M2" not in admission
+    assert admission.admit("M1") is AdmissionVerdict.ADMITTED
+    assert admission.admit("M1") is AdmissionVerdict.INFLIGHT_LIMIT
+    assert admission.snapshot()[0]["in_flight"] == 3
+
+
+def _sign(refid):
+    return OtomaxSignatureService.generate_transaction_signature(
+        "ADMT1", "TSEL10", "081234567890", refid, PIN, PASSWORD
+    )
+
+
+@pytest.fixture
+async def client(test_db_session, test_sessionmanager):
+    await test_db_session.execute(delete(Member).where(Member.memberid == "ADMT1"))
+    await test_db_session.execute(delete(InboxMessage))
+    test_db_session.add(
+        Member(
+            memberid="ADMT1",
+            name="admission test",
+            ipaddress="127.0.0.1",
+            report_url="http://127.0.0.1/report",
+            pin=PIN,
+            password=PASSWORD,
+            max_inflight=1,
+        )
+    )
+    await test_db_session.commit()
+    app = FastAPI()
+    app.include_router(router)
+    app.state.trx_intake = TransactionIntake(
+        test_sessionmanager.session, registry=MetricsRegistry()
+    )
+    app.state.ledger = LedgerService(
+        test_sessionmanager.session,
+        cache=BalanceCache(ttl=60.0, registry=MetricsRegistry()),
+        registry=MetricsRegistry(),
+    )
+    member_admission.load([MemberLimits(memberid="ADMT1", max_inflight=1)])
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+        yield c
+    member_admission.load([])
+
+
+def _query(refid, sign=None):
+    return (
+        f"/api/v1/otomax/trx?memberID=ADMT1&product=TSEL10&dest=081234567890"
+        f"&refID={refid}&sign={sign or _sign(refid)}"
+    )
+
+
+@pytest.mark.asyncio
+async def test_trx_endpoint_accepts_and_records_inbox(client, test_db_session):
+    resp = await client.get(_query("R1"))
+    assert resp.status_code == 200
+    assert resp.text.startswith("R#R1 TSEL10.081234567890 akan diproses")
+    # retry OtomaX dengan refid sama tidak membuat inbox baru
+    await client.get(_query("R1"))
+    count = await test_db_session.scalar(select(func.count()).select_from(InboxMessage))
+    assert count == 1
+
+    bad = await client.get(_query("R2", sign="A" * 27))
+    assert "Signature tidak valid" in bad.text
+
+
+@pytest.mark.asyncio
+async def test_trx_endpoint_busy_reply_without_db(client, monkeypatch):
+    member_admission.admit("ADMT1")  # slot in-flight satu-satunya terpakai
+
+    async def fail_accept(trx):  # noqa: ARG001
+        raise AssertionError("intake must not run for rejected requests")
+
+    monkeypatch.setattr(client._transport.app.state.trx_intake, "accept", fail_accept)
+    resp = await client.get(_query("R3"))
+    assert "sistem sibuk" in resp.text
+    member_admission.release("ADMT1")
+
+    unknown = await client.get(
+        "/api/v1/otomax/trx?memberID=NOPE&product=X&dest=0812345&refID=1"
+    )
+    assert "Member tidak terdaftar" in unknown.text
+
+
+@pytest.mark.asyncio
+async def test_concurrent_retries_share_one_processing(client, monkeypatch):
+    intake = client._transport.app.state.trx_intake
+    original = intake.accept
+    calls = []
+    release = asyncio.Event()
+
+    async def slow_accept(trx):
+        calls.append(trx.refid)
+        await release.wait()
+        return await original(trx)
+
+    monkeypatch.setattr(intake, "accept", slow_accept)
+    # max_inflight=1: tanpa coalescing, retry akan dibalas "busy"
+    first = asyncio.ensure_future(client.get(_query("R9")))
+    while not calls:
+        await asyncio.sleep(0)
+    retries = [asyncio.ensure_future(client.get(_query("R9"))) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    release.set()
+    replies = await asyncio.gather(first, *retries)
+    assert calls == ["R9"]
+    assert {r.text for r in replies} == {replies[0].text}
+    assert "akan diproses" in replies[0].text
+    assert len(trx_inflight) == 0
+
+
+@pytest.mark.asyncio
+async def test_forged_sign_does_not_share_genuine_reply(client, monkeypatch):
+    intake = client._transport.app.state.trx_intake
+    original = intake.accept
+    calls = []
+    release = asyncio.Event()
+
+    async def slow_accept(trx):
+        calls.append(trx.refid)
+        await release.wait()
+        return await original(trx)
+
+    monkeypatch.setattr(intake, "accept", slow_accept)
+    genuine = asyncio.ensure_future(client.get(_query("R10")))
+    while not calls:
+        await asyncio.sleep(0)
+    # refid sama, sign palsu: tidak ikut menunggu hasil request asli, tapi
+    # diproses sendiri (di sini ditolak admission karena max_inflight=1)
+    forged = await client.get(_query("R10", sign="A" * 27))
+    release.set()
+    assert "sistem sibuk" in forged.text
+    assert "akan diproses" in (await genuine).text
+    assert calls == ["R10"]
+    assert len(trx_inflight) == 0
+
+
+def _balance_query(sign=None):
+    sign = sign or OtomaxSignatureService.generate_balance_check_signature(
+        "ADMT1", PIN, PASSWORD
+    )
+    return f"/api/v1/otomax/balance?memberID=ADMT1&sign={sign}"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_balance_polls_load_once(client):
+    cache = client._transport.app.state.ledger.cache
+    load = cache.loader
+    loads = []
+    release = asyncio.Event()
+
+    async def slow_load(memberid):
+        loads.append(memberid)
+        await release.wait()
+        return await load(memberid)
+
+    cache.bind(slow_load)
+    # max_inflight=1: tanpa coalescing, poll kedua dst. dibalas "busy"
+    polls = [asyncio.ensure_future(client.get(_balance_query())) for _ in range(20)]
+    while not loads:
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.01)
+    release.set()
+    replies = await asyncio.gather(*polls)
+    assert loads == ["ADMT1"]
+    assert {r.text.rsplit(" @", 1)[0] for r in replies} == {"Saldo ADMT1 0"}
+    assert len(balance_inflight) == 0
+
+    # poll berikutnya dilayani cache, tanpa load baru
+    again = await client.get(_balance_query())
+    assert again.text.startswith("Saldo ADMT1 0")
+    assert loads == ["ADMT1"]
+
+    bad = await client.get(_balance_query(sign="A" * 27))
+    assert "Signature tidak valid" in bad.text
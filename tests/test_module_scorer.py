@@ -0,0 +1,84 @@
+"""Test scorer pemilihan module (success rate, EWMA latency, load, cost)."""
+
+import pytest
+from app.custom.exceptions.cst_exceptions import RoutingError
+from app.service.metrics import MetricsRegistry
+from app.service.routing import ModuleScorer, RoutingRegistry
+from app.service.supplier import ModuleGuardRegistry
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+TABLE = {
+    "operators": {"TELKOMSEL": ["0812"]},
+    "routes": {"TELKOMSEL": {"modules": ["A", "B", "C"]}},
+    "products": {"TSEL10": {"A": 10000, "B": 10100, "C": 12000, "Z": 9000}},
+}
+
+
+@pytest.fixture
+def setup(tmp_path):
+    clock = FakeClock()
+    guards = ModuleGuardRegistry(clock=clock)
+    routes = RoutingRegistry(tmp_path / "unused.yaml")
+    routes.load(TABLE)
+    scorer = ModuleScorer(guards=guards, routes=routes, registry=MetricsRegistry())
+    return scorer, guards, clock
+
+
+def _traffic(guards, clock, moduleid, n, ok, latency):
+    guard = guards.guard(moduleid)
+    for _ in range(n):
+        started = guard.acquire()
+        clock.now += latency
+        guard.release(started, ok)
+
+
+def test_precomputed_candidates_sorted_by_cost(setup):
+    scorer, _, _ = setup
+    table = scorer.routes.table
+    assert [mid for mid, _ in table.candidates["TSEL10"]] == ["Z", "A", "B", "C"]
+    # dibatasi module eligible dari route operator
+    assert [mid for mid, _ in table.candidates_for("tsel10", ("B", "C"))] == ["B", "C"]
+
+
+def test_cheapest_wins_when_stats_equal(setup):
+    scorer, _, _ = setup
+    decision = scorer.select("081212345678", "TSEL10")
+    assert decision.moduleid == "A"
+    assert {c.moduleid for c in decision.candidates} == {"A", "B", "C"}
+
+
+def test_failures_and_latency_shift_choice(setup):
+    scorer, guards, clock = setup
+    _traffic(guards, clock, "A", 10, ok=False, latency=0.1)
+    _traffic(guards, clock, "B", 10, ok=True, latency=0.2)
+    decision = scorer.choose("TSEL10", ("A", "B"))
+    assert decision.moduleid == "B"
+    reasons = decision.as_dict()["candidates"]
+    assert reasons[0]["moduleid"] == "A"
+    assert reasons[0]["success_rate"] < reasons[1]["success_rate"]
+    assert guards.guard("B").ewma_latency == pytest.approx(0.2)
+
+
+def test_open_breaker_is_excluded(setup):
+    scorer, guards, clock = setup
+    _traffic(guards, clock, "A", 20, ok=False, latency=0.01)
+    decision = scorer.choose("TSEL10", ("A", "C"))
+    assert decision.moduleid == "C"
+    excluded = {c.moduleid: c.excluded for c in decision.candidates}
+    assert excluded["A"] == "circuit_open"
+
+
+def test_no_candidate_raises(setup):
+    scorer, _, _ = setup
+    with pytest.raises(RoutingError):
+        scorer.choose("UNKNOWN")
+    with pytest.raises(RoutingError):
+        scorer.choose("TSEL10", ("X",))
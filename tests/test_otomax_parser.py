@@ -0,0 +1,103 @@
+"""Test parser request OtomaX (raw bytes) dan kesetaraannya dengan jalur pydantic."""
+
+import time
+from urllib.parse import parse_qsl
+
+import pytest
+from app.custom.exceptions.cst_exceptions import RequestParseError
+from app.parser import OtomaxRequest, parse_otomax_request
+from app.schemas.sch_otomax import OtomaxTrxRequest
+from pydantic import ValidationError
+
+SIGNED = (
+    b"memberID=OTOTEST1&product=CLPDATA&dest=081295221639&refID=3040881"
+    b"&sign=MsP6Aticed6s1rlEhvj4NKceFVQ"
+)
+
+
+def test_parse_canonical_signed_request():
+    req = parse_otomax_request(SIGNED)
+    assert isinstance(req, OtomaxRequest)
+    assert req == OtomaxRequest(
+        "OTOTEST1", "CLPDATA", "081295221639", "3040881", "MsP6Aticed6s1rlEhvj4NKceFVQ"
+    )
+    assert not hasattr(req, "__dict__")
+
+
+def test_parse_any_order_case_and_percent_encoding():
+    raw = (
+        b"REFID=INV-1&Dest=%2B6281295221639&pin=777999&unknown=x"
+        b"&password=secret123&PRODUCT=TSEL10&memberid=OTOTEST1"
+    )
+    req = parse_otomax_request(raw)
+    assert req.dest == "+6281295221639"
+    assert req.refid == "INV-1"
+    assert (req.pin, req.password, req.sign) == ("777999", "secret123", None)
+    assert "password" not in req.as_dict()
+
+
+def test_raw_plus_decodes_the_same_in_any_field_order():
+    fields = {
+        "memberID": "OTOTEST1",
+        "product": "TSEL10",
+        "dest": "+6281295221639",
+        "refID": "3040881",
+        "sign": "MsP6Aticed6s1rlEhvj4NKceFVQ",
+    }
+    canonical = "&".join(f"{k}={v}" for k, v in fields.items()).encode()
+    shuffled = "&".join(f"{k}={v}" for k, v in reversed(fields.items())).encode()
+    fast = parse_otomax_request(canonical)
+    generic = parse_otomax_request(shuffled)
+    assert fast == generic
+    assert generic.dest == "+6281295221639"
+    encoded = shuffled.replace(b"dest=+", b"dest=%2B")
+    assert parse_otomax_request(encoded) == fast
+
+
+@pytest.mark.parametrize(
+    ("raw", "field"),
+    [
+        (b"memberID=BAD ID&product=X&dest=0812345&refID=1", "memberid"),
+        (b"memberID=A&product=X&dest=08;rm&refID=1", "dest"),
+        (b"refID=1&dest=0812%20345&product=X&memberID=A", "dest"),
+        (b"memberID=A&product=X&dest=0812345&refID=1&sign=short", "sign"),
+    ],
+)
+def test_parse_rejects_invalid_values(raw, field):
+    with pytest.raises(RequestParseError) as exc:
+        parse_otomax_request(raw)
+    assert exc.value.context["field"] == field
+    assert exc.value.status_code == 400
+
+
+def test_parse_reports_missing_fields():
+    with pytest.raises(RequestParseError) as exc:
+        parse_otomax_request(b"memberID=A&product=X")
+    assert exc.value.context["missing"] == ["dest", "refid"]
+
+
+def test_pydantic_schema_uses_same_patterns():
+    req = parse_otomax_request(SIGNED)
+    model = OtomaxTrxRequest.model_validate(req.as_dict())
+    assert model.model_dump(exclude_none=True) == {
+        k: v for k, v in req.as_dict().items() if v is not None
+    }
+    with pytest.raises(ValidationError):
+        OtomaxTrxRequest(memberid="BAD ID", product="X", dest="0812345", refid="1")
+
+
+@pytest.mark.performance
+def test_raw_parser_not_slower_than_pydantic_path():
+    def pydantic_path(raw):
+        pairs = parse_qsl(raw.decode(), keep_blank_values=True)
+        return OtomaxTrxRequest.model_validate({k.lower(): v for k, v in pairs})
+
+    def run(fn, n=5000):
+        start = time.perf_counter()
+        for _ in range(n):
+            fn(SIGNED)
+        return time.perf_counter() - start
+
+    run(parse_otomax_request, 100)
+    run(pydantic_path, 100)
+    assert run(parse_otomax_request) < run(pydantic_path)
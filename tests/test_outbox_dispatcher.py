@@ -0,0 +1,128 @@
+"""Test outbox claim (lease) dan OutboxDispatcher."""
+
+import asyncio
+import time
+
+import pytest
+from app.database.repositories.repo_outbox import SQLiteOutboxRepository
+from app.models.db_transaction import OutboxMessage
+from app.schemas.sch_transaction import OutboxResult, OutboxStatus
+from app.service.metrics import MetricsRegistry
+from app.service.outbox import OutboxDispatcher
+from sqlalchemy import delete, select, update
+
+
+@pytest.fixture
+async def clean_outbox(test_db_session):
+    await test_db_session.execute(delete(OutboxMessage))
+    await test_db_session.commit()
+    yield test_db_session
+    await test_db_session.execute(delete(OutboxMessage))
+    await test_db_session.commit()
+
+
+async def _seed(session, n, moduleid="DIGI01"):
+    session.add_all(
+        OutboxMessage(moduleid=moduleid, supplier_request={"seq": i}) for i in range(n)
+    )
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_never_overlaps(clean_outbox):
+    await _seed(clean_outbox, 5)
+    repo = SQLiteOutboxRepository(clean_outbox)
+    first = await repo.claim_batch("w1", limit=3, lease_seconds=30)
+    second = await repo.claim_batch("w2", limit=3, lease_seconds=30)
+    assert len(first) == 3
+    assert len(second) == 2
+    assert not {c.id for c in first} & {c.id for c in second}
+    assert await repo.claim_batch("w3", limit=3, lease_seconds=30) == []
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed(clean_outbox):
+    await _seed(clean_outbox, 2)
+    repo = SQLiteOutboxRepository(clean_outbox)
+    claims = await repo.claim_batch("crashed", limit=2, lease_seconds=30)
+    # simulasi worker crash: lease sudah lewat
+    await clean_outbox.execute(
+        update(OutboxMessage).values(lease_expires_at=time.time() - 1)
+    )
+    await clean_outbox.commit()
+    again = await repo.claim_batch("w2", limit=10, lease_seconds=30)
+    assert {c.id for c in again} == {c.id for c in claims}
+    assert all(c.attempts == 2 for c in again)
+    # worker lama tidak bisa menimpa hasil (fenced by claimed_by)
+    stale = [OutboxResult(id=c.id, ok=True) for c in claims]
+    assert await repo.complete_batch("crashed", stale, max_attempts=3) == 0
+
+
+@pytest.mark.asyncio
+async def test_reclaim_expired_resets_to_pending(clean_outbox):
+    await _seed(clean_outbox, 1)
+    repo = SQLiteOutboxRepository(clean_outbox)
+    await repo.claim_batch("w1", limit=1, lease_seconds=-1)
+    assert await repo.reclaim_expired() == 1
+    row = (await clean_outbox.execute(select(OutboxMessage))).scalar_one()
+    await clean_outbox.refresh(row)
+    assert row.status == OutboxStatus.PENDING
+    assert row.claimed_by is None
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_run_once_respects_module_limit(
+    clean_outbox, test_sessionmanager
+):
+    await _seed(clean_outbox, 6, moduleid="DIGI01")
+    await _seed(clean_outbox, 2, moduleid="DIGI02")
+    in_flight: dict[str, int] = {"DIGI01": 0, "DIGI02": 0}
+    peak: dict[str, int] = {"DIGI01": 0, "DIGI02": 0}
+
+    async def sender(claim):
+        in_flight[claim.moduleid] += 1
+        peak[claim.moduleid] = max(peak[claim.moduleid], in_flight[claim.moduleid])
+        await asyncio.sleep(0.01)
+        in_flight[claim.moduleid] -= 1
+        if claim.supplier_request["seq"] == 1 and claim.moduleid == "DIGI02":
+            raise RuntimeError("supplier down")
+        return {"ok": True}
+
+    registry = MetricsRegistry()
+    dispatcher = OutboxDispatcher(
+        test_sessionmanager.session,
+        sender,
+        batch_size=20,
+        module_limits={"DIGI01": 2},
+        max_attempts=1,
+        registry=registry,
+    )
+    assert await dispatcher.run_once() == 8
+    assert peak["DIGI01"] <= 2
+
+    rows = (await clean_outbox.execute(select(OutboxMessage))).scalars().all()
+    for row in rows:
+        await clean_outbox.refresh(row)
+    statuses = sorted(r.status for r in rows)
+    assert statuses.count(OutboxStatus.SENT) == 7
+    assert statuses.count(OutboxStatus.FAILED) == 1
+    assert registry.latency("outbox_claim_seconds").count == 1
+    assert registry.counter_value("outbox_dispatch_sent", module="DIGI01") == 6
+
+
+@pytest.mark.asyncio
+async def test_poison_row_fails_after_max_attempts(clean_outbox):
+    await _seed(clean_outbox, 1)
+    repo = SQLiteOutboxRepository(clean_outbox)
+    # worker crash berulang: lease selalu expired sebelum complete
+    for attempt in (1, 2):
+        (claim,) = await repo.claim_batch(
+            f"w{attempt}", limit=1, lease_seconds=-1, max_attempts=2
+        )
+        assert claim.attempts == attempt
+    assert await repo.claim_batch("w3", limit=1, lease_seconds=30, max_attempts=2) == []
+    assert await repo.reclaim_expired(max_attempts=2) == 0
+    row = (await clean_outbox.execute(select(OutboxMessage))).scalar_one()
+    await clean_outbox.refresh(row)
+    assert row.status == OutboxStatus.FAILED
+    assert row.claimed_by is None
@@ -0,0 +1,168 @@
+"""Test laporan rekonsiliasi harian (batch agregasi, batas hari WIB, arsip)."""
+
+import csv
+import io
+import json
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+import pytest
+from app.models.db_transaction import InboxMessage, OutboxMessage, Transaction
+from app.schemas.sch_report import ReportFormat
+from app.schemas.sch_transaction import TransactionStatus
+from app.service.archive import TransactionArchiver
+from app.service.metrics import MetricsRegistry
+from app.service.report import ReconciliationReporter
+from sqlalchemy import delete, text
+
+DAY = date(2026, 5, 10)  # WIB: 2026-05-09 17:00 .. 2026-05-10 17:00 UTC
+
+
+async def wipe(session):
+    for model in (OutboxMessage, Transaction, InboxMessage):
+        await session.execute(delete(model))
+    await session.commit()
+
+
+@pytest.fixture
+async def seeded(test_db_session):
+    session = test_db_session
+    await wipe(session)
+    specs = [
+        # (memberid, moduleid, status, amount, created_at UTC)
+        ("RC1", "MODA", TransactionStatus.SUCCESS, "10000", datetime(2026, 5, 9, 18)),
+        ("RC1", "MODA", TransactionStatus.FAILED, "5000", datetime(2026, 5, 10, 3)),
+        (
+            "RC1",
+            "MODB",
+            TransactionStatus.REFUNDED,
+            "2500.50",
+            datetime(2026, 5, 10, 10),
+        ),
+        (
+            "RC2",
+            "MODA",
+            TransactionStatus.SUCCESS,
+            "7000",
+            datetime(2026, 5, 10, 16, 59, 59),
+        ),
+        ("RC2", "MODB", TransactionStatus.PENDING, "3000", datetime(2026, 5, 10, 12)),
+        # di luar hari WIB (sebelum / sesudah)
+        ("RC2", "MODB", TransactionStatus.SUCCESS, "1", datetime(2026, 5, 9, 16, 59)),
+        ("RC2", "MODA", TransactionStatus.SUCCESS, "9999", datetime(2026, 5, 10, 17)),
+    ]
+    for i, (memberid, moduleid, status, amount, created_at) in enumerate(specs):
+        session.add(
+            Transaction(
+                memberid=memberid,
+                refid=f"RC{i}",
+                product="TSEL10",
+                moduleid=moduleid,
+                amount=Decimal(amount),
+                status=status,
+                created_at=created_at,
+            )
+        )
+    await session.commit()
+    yield session
+    await wipe(session)
+
+
+def reporter(sessionmanager, tmp_path, **kwargs):
+    return ReconciliationReporter(
+        sessionmanager.engine,
+        archive_dir=tmp_path,
+        utc_offset_hours=7,
+        registry=MetricsRegistry(),
+        **kwargs,
+    )
+
+
+def by_key(report) -> dict[tuple[str, str], dict]:
+    return {(r["scope"], r["key"]): r for r in report.rows()}
+
+
+async def test_report_sums_per_member_and_module(
+    seeded,  # noqa: ARG001
+    test_sessionmanager,
+    tmp_path,
+):
+    report = await reporter(test_sessionmanager, tmp_path).build(DAY)
+    summary = report.summary
+    assert (summary.start, summary.end) == (
+        datetime(2026, 5, 9, 17),
+        datetime(2026, 5, 10, 17),
+    )
+    assert summary.transactions == 5
+    assert summary.sources == ["live"]
+    rows = by_key(report)
+    assert list(rows) == [
+        ("member", "RC1"),
+        ("member", "RC2"),
+        ("module", "MODA"),
+        ("module", "MODB"),
+        ("total", ""),
+    ]
+    rc1 = rows["member", "RC1"]
+    assert (rc1["count"], rc1["amount"]) == (3, "17500.50")
+    assert (rc1["failed_count"], rc1["failed_amount"]) == (1, "5000.00")
+    assert (rc1["refunded_count"], rc1["refunded_amount"]) == (1, "2500.50")
+    moda = rows["module", "MODA"]
+    assert (moda["success_count"], moda["success_amount"]) == (2, "17000.00")
+    total = rows["total", ""]
+    assert (total["count"], total["amount"]) == (5, "27500.50")
+    assert (total["pending_count"], total["pending_amount"]) == (1, "3000.00")
+
+
+async def test_small_batches_give_same_report(
+    seeded,  # noqa: ARG001
+    test_sessionmanager,
+    tmp_path,
+):
+    whole = await reporter(test_sessionmanager, tmp_path).build(DAY)
+    batched = await reporter(test_sessionmanager, tmp_path, batch_size=2).build(DAY)
+    assert list(batched.rows()) == list(whole.rows())
+    assert batched.summary.batches == 3
+    assert batched.summary.transactions == 5
+
+
+async def test_csv_and_ndjson_output(
+    seeded,  # noqa: ARG001
+    test_sessionmanager,
+    tmp_path,
+):
+    report = await reporter(test_sessionmanager, tmp_path).build(DAY)
+    parsed = list(
+        csv.DictReader(io.StringIO("".join(report.iter_lines(ReportFormat.CSV))))
+    )
+    assert [r["key"] for r in parsed] == ["RC1", "RC2", "MODA", "MODB", ""]
+    assert parsed[-1]["amount"] == "27500.50"
+
+    path = report.write_file(tmp_path / "reco.ndjson", ReportFormat.NDJSON)
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert lines == list(report.rows())
+
+
+async def test_archived_rows_are_included_and_connection_is_writable(
+    seeded, test_sessionmanager, tmp_path
+):
+    before = await reporter(test_sessionmanager, tmp_path).build(DAY)
+    archiver = TransactionArchiver(
+        test_sessionmanager.engine,
+        archive_dir=tmp_path,
+        after_days=30,
+        pause=0,
+        registry=MetricsRegistry(),
+    )
+    archived = await archiver.run_once(now=datetime(2026, 10, 1, tzinfo=UTC))
+    assert archived.transactions == 6  # semua final; yang pending tetap aktif
+
+    after = await reporter(test_sessionmanager, tmp_path).build(DAY)
+    assert after.summary.sources == ["live", "2026-05"]
+    assert list(after.rows()) == list(before.rows())
+
+    # query_only dikembalikan: koneksi pool bisa dipakai menulis lagi
+    async with test_sessionmanager.engine.connect() as conn:
+        assert (await conn.execute(text("PRAGMA query_only"))).scalar_one() == 0
+    seeded.add(Transaction(memberid="RC3", refid="W1", status="pending"))
+    await seeded.commit()
@@ -0,0 +1,104 @@
+"""Test template reply member: compile, render bytes, fallback dan hot reload."""
+
+import json
+import os
+
+import pytest
+from app.custom.exceptions.cst_exceptions import ReplyTemplateError
+from app.service.reply import ReplyTemplateRegistry, compile_reply_templates
+
+VALUES = {
+    "refid": "3040881",
+    "product": "CLPDATA",
+    "dest": "081295221639",
+    "sn": "0412",
+    "price": 10500,
+    "balance": 1500000,
+    "time": "12:00:01",
+}
+
+YAML = """
+replies:
+  success:
+    template: "R#{refid} {product}.{dest} SUKSES. SN:{sn}. Harga {price:,} @{time}"
+  status:
+    format: json
+    fields:
+      refid: "{refid}"
+      price: "{price}"
+      note: "SN {sn}"
+      version: 2
+"""
+
+
+@pytest.fixture
+def registry(tmp_path):
+    path = tmp_path / "replies.yaml"
+    path.write_text(YAML, encoding="utf-8")
+    reg = ReplyTemplateRegistry(path, reload_interval=0)
+    reg.load()
+    return reg
+
+
+def test_render_text_to_bytes(registry):
+    body = registry.render("success", VALUES)
+    assert body == (
+        b"R#3040881 CLPDATA.081295221639 SUKSES. SN:0412. Harga 10,500 @12:00:01"
+    )
+    assert registry.get("success").content_type == "text/plain; charset=utf-8"
+
+
+def test_render_missing_and_none_fields_are_blank(registry):
+    body = registry.render("success", {"refid": "1", "price": None})
+    assert body == b"R#1 . SUKSES. SN:. Harga  @"
+
+
+def test_render_value_not_matching_spec_falls_back_to_str(registry):
+    body = registry.render("success", {**VALUES, "price": "gratis"})
+    assert b"Harga gratis @" in body
+
+
+def test_render_json_keeps_types(registry):
+    template = registry.get("status")
+    assert template.content_type == "application/json"
+    assert json.loads(template.render(VALUES)) == {
+        "refid": "3040881",
+        "price": 10500,
+        "note": "SN 0412",
+        "version": 2,
+    }
+    assert template.fields == {"refid", "price", "sn"}
+
+
+def test_response_uses_cached_content_type(registry):
+    response = registry.response("status", VALUES, status_code=202)
+    assert response.status_code == 202
+    assert response.headers["content-type"] == "application/json"
+
+
+@pytest.mark.parametrize(
+    "template",
+    ["{refid.__class__}", "{refid[0]}", "{refid:{time}}", "{refid!a}", "{0}", "{}"],
+)
+def test_compile_rejects_expressions(template):
+    with pytest.raises(ReplyTemplateError):
+        compile_reply_templates({"replies": {"bad": {"template": template}}})
+
+
+def test_unknown_template_raises(registry):
+    with pytest.raises(ReplyTemplateError):
+        registry.get("nope")
+
+
+def test_hot_reload_on_mtime_change_keeps_old_on_error(registry):
+    path = registry.path
+    path.write_text('replies:\n  success:\n    template: "OK {refid}"\n')
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+    assert registry.reload_if_changed() is True
+    assert registry.render("success", VALUES) == b"OK 3040881"
+
+    path.write_text("replies: [broken")
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    assert registry.reload_if_changed() is False
+    assert registry.render("success", VALUES) == b"OK 3040881"
@@ -0,0 +1,108 @@
+"""Test normalisasi MSISDN dan routing prefix operator -> module."""
+
+import pytest
+from app.custom.exceptions.cst_exceptions import RoutingConfigError, RoutingError
+from app.service.routing import (
+    PrefixTrie,
+    RoutingRegistry,
+    normalize_msisdn,
+    to_international,
+)
+
+TABLE = {
+    "operators": {
+        "telkomsel": ["0811", "0812", "0852"],
+        "INDOSAT": ["0856"],
+        "BYRU": ["08681"],
+        "SMARTFREN": ["0868"],
+    },
+    "routes": {
+        "TELKOMSEL": {"modules": ["DIGI01", "DIGI03"], "products": ["tsel10"]},
+        "INDOSAT": {"modules": ["DIGI02"]},
+        "SMARTFREN": {"modules": []},
+    },
+}
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = RoutingRegistry(tmp_path / "unused.yaml")
+    registry.load(TABLE)
+    return registry
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("081295221639", "081295221639"),
+        ("6281295221639", "081295221639"),
+        ("+62 812-9522-1639", "081295221639"),
+        ("81295221639", "081295221639"),
+        ("12345678901", None),
+        ("0812", None),
+        ("0812abc45678", None),
+    ],
+)
+def test_normalize_msisdn(raw, expected):
+    assert normalize_msisdn(raw) == expected
+
+
+def test_to_international():
+    assert to_international("0812-9522-1639") == "6281295221639"
+
+
+def test_trie_longest_prefix_wins():
+    trie = PrefixTrie([("0868", "SMARTFREN"), ("08681", "BYRU")])
+    assert trie.longest_match("086812345678") == "BYRU"
+    assert trie.longest_match("086891234567") == "SMARTFREN"
+    assert trie.longest_match("0899") is None
+    assert trie.size == 2
+
+
+def test_resolve_dest_to_modules(registry):
+    route = registry.resolve("+6285212345678", "TSEL10")
+    assert route.operator == "TELKOMSEL"
+    assert route.dest == "085212345678"
+    assert route.modules == ("DIGI01", "DIGI03")
+    assert registry.resolve("6285612345678", "ANY").modules == ("DIGI02",)
+
+
+def test_resolve_non_mobile_dest_passes_through(registry):
+    route = registry.resolve("512345678901", "PLN20")
+    assert route.operator is None
+    assert route.modules == ()
+
+
+@pytest.mark.parametrize(
+    ("dest", "product"),
+    [
+        ("089912345678", None),  # prefix tidak dikenal
+        ("086812345678", None),  # operator tanpa module
+        ("081212345678", "I10"),  # produk tidak valid untuk operator
+    ],
+)
+def test_resolve_errors(registry, dest, product):
+    with pytest.raises(RoutingError):
+        registry.resolve(dest, product)
+
+
+def test_reload_swaps_table(registry):
+    before = registry.table
+    registry.load({"operators": {"INDOSAT": ["0856"]}, "routes": {}})
+    assert registry.table is not before
+    assert before.operator_of("081212345678") == "TELKOMSEL"
+    assert registry.table.operator_of("081212345678") is None
+
+
+def test_invalid_table_keeps_current(registry):
+    current = registry.table
+    with pytest.raises(RoutingConfigError):
+        registry.load({"operators": {"X": ["08a1"]}})
+    with pytest.raises(RoutingConfigError):
+        registry.load({"operators": {}, "routes": {"GHOST": {"modules": ["M"]}}})
+    assert registry.table is current
+
+
+def test_default_routing_file_loads():
+    registry = RoutingRegistry()
+    assert registry.table.operator_of("0895 1234 5678") == "TRI"
@@ -0,0 +1,242 @@
+"""Test StatusPoller: batch per module, satu write per batch, backoff interval."""
+
+import httpx
+import pytest
+from app.config import get_settings
+from app.database.repositories.repo_transaction import SQLiteTransactionRepository
+from app.models.db_transaction import InboxMessage, Transaction
+from app.parser import SupplierRuleEngine
+from app.schemas.sch_module import ModuleInDB, ProviderEnums
+from app.schemas.sch_transaction import InboxStatus, TransactionStatus
+from app.service.metrics import MetricsRegistry
+from app.service.poller import StatusPoller
+from app.service.scheduler import (
+    EXPIRE,
+    STATUS_CHECK,
+    PendingTimeouts,
+    TimeoutScheduler,
+    TimerWheel,
+)
+from app.service.supplier import SupplierClientRegistry
+from sqlalchemy import delete, select
+
+DIGIPOS_STATUS = {
+    "P1": {"status": "00", "data": {"sn": "SN-P1-0001"}},
+    "P2": {"status": "68", "message": "process"},
+    "P3": {"status": "14", "message": "nomor salah"},
+}
+ISIMPLE_STATUS = {
+    "I1": {"status": "1", "sn": "ISN000111"},
+    "I2": {"status": "2"},
+}
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_module(moduleid, provider, host):
+    return ModuleInDB(
+        moduleid=moduleid,
+        name=moduleid,
+        provider=provider,
+        username="user",
+        msisdn="628111111111",
+        email="mod@example.com",
+        base_url=f"http://{host}",
+        pin="123456",
+        password="secret123",
+    )
+
+
+@pytest.fixture
+async def supplier():
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(
+            f"{request.url.host}{request.url.path}?{request.url.query.decode()}"
+        )
+        if request.url.host == "digipos.local":
+            body = DIGIPOS_STATUS[request.url.params["refid"]]
+            return httpx.Response(200, json=body)
+        refids = request.url.params["refids"].split(",")
+        data = [{"refid": r, "result": ISIMPLE_STATUS[r]} for r in refids]
+        return httpx.Response(200, json={"data": data})
+
+    clients = SupplierClientRegistry(
+        transport=httpx.MockTransport(handler), registry=MetricsRegistry()
+    )
+    clients.register(make_module("DIGI01", ProviderEnums.DIGIPOS, "digipos.local"))
+    clients.register(make_module("ISIM01", ProviderEnums.ISIMPLE, "isimple.local"))
+    yield clients, seen
+    await clients.aclose()
+
+
+@pytest.fixture
+async def pending_rows(test_db_session):
+    session = test_db_session
+    await session.execute(delete(Transaction))
+    await session.execute(delete(InboxMessage))
+    inbox = InboxMessage(request_id="poll-1", memberid="OTOTEST1", payload={})
+    session.add(inbox)
+    await session.flush()
+    rows = {
+        refid: Transaction(
+            memberid="OTOTEST1",
+            refid=refid,
+            moduleid=moduleid,
+            inbox_id=inbox.id if refid == "P1" else None,
+        )
+        for refid, moduleid in (
+            ("P1", "DIGI01"),
+            ("P2", "DIGI01"),
+            ("P3", "DIGI01"),
+            ("I1", "ISIM01"),
+            ("I2", "ISIM01"),
+        )
+    }
+    session.add_all(rows.values())
+    await session.commit()
+    yield session, {refid: row.id for refid, row in rows.items()}, inbox.id
+    await session.execute(delete(Transaction))
+    await session.execute(delete(InboxMessage))
+    await session.commit()
+
+
+@pytest.fixture
+def poller(supplier, test_sessionmanager):
+    clients, _ = supplier
+    clock = FakeClock()
+    registry = MetricsRegistry()
+    scheduler = TimeoutScheduler(
+        TimerWheel(tick=0.1, slots=64, levels=3, clock=clock), registry=registry
+    )
+    timeouts = PendingTimeouts(
+        test_sessionmanager.session,
+        scheduler=scheduler,
+        registry=registry,
+        pending_timeout=3600.0,
+        clock=clock,
+    )
+    rules = SupplierRuleEngine(get_settings().SUPPLIER_RULES_PATH)
+    rules.load()
+    return StatusPoller(
+        test_sessionmanager.session,
+        timeouts,
+        clients=clients,
+        rules=rules,
+        registry=registry,
+        clock=clock,
+    )
+
+
+@pytest.mark.asyncio
+async def test_poll_batches_per_module_and_writes_once(poller, supplier, pending_rows):
+    _, seen = supplier
+    session, ids, inbox_id = pending_rows
+    clock = poller.clock
+    for trx_id in ids.values():
+        poller.track(trx_id, created_at=clock.now)
+    scheduler = poller.timeouts.scheduler
+
+    clock.now += poller.first_check + 0.2
+    await scheduler.fire_due()
+
+    # DIGIPOS: request per transaksi; ISIMPLE: satu request batch
+    assert sorted(s for s in seen if s.startswith("digipos")) == [
+        f"digipos.local/trx/status?refid={r}" for r in ("P1", "P2", "P3")
+    ]
+    assert [s for s in seen if s.startswith("isimple")] == [
+        "isimple.local/api/status?refids=I1%2CI2"
+    ]
+    rows = (await session.execute(select(Transaction))).scalars().all()
+    for row in rows:
+        await session.refresh(row)
+    by_refid = {row.refid: row for row in rows}
+    assert by_refid["P1"].status == TransactionStatus.SUCCESS
+    assert by_refid["P1"].sn == "SN-P1-0001"
+    assert by_refid["P3"].status == TransactionStatus.FAILED
+    assert by_refid["I1"].status == TransactionStatus.SUCCESS
+    assert by_refid["I1"].sn == "ISN000111"
+    assert by_refid["P2"].status == TransactionStatus.PENDING
+    assert by_refid["I2"].status == TransactionStatus.PENDING
+    inbox = await session.get(InboxMessage, inbox_id)
+    await session.refresh(inbox)
+    assert inbox.status == InboxStatus.COMPLETED
+
+    # yang final lepas dari wheel, yang pending dijadwalkan ulang
+    for refid in ("P1", "P3", "I1"):
+        assert not scheduler.pending(EXPIRE, ids[refid])
+    for refid in ("P2", "I2"):
+        assert scheduler.pending(STATUS_CHECK, ids[refid])
+    assert poller.metrics.counter_value("poller_resolved", status="success") == 2
+
+
+def test_next_delay_backs_off_with_age_and_aligns(poller):
+    poller.clock.now = 1002.0
+    young = poller.next_delay(0.0)
+    old = poller.next_delay(400.0)
+    ancient = poller.next_delay(86400.0)
+    assert poller.base_interval <= young < poller.base_interval + poller.align
+    assert young < old < ancient
+    assert ancient <= poller.max_interval + poller.align
+    for delay in (young, old, ancient):
+        assert (poller.clock.now + delay) % poller.align == pytest.approx(0.0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method", ["pending_by_ids", "apply_status_batch"])
+async def test_repository_error_reschedules_whole_batch(
+    poller, pending_rows, monkeypatch, method
+):
+    async def broken(self, *args):  # noqa: ARG001
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(SQLiteTransactionRepository, method, broken)
+    session, ids, _ = pending_rows
+    clock = poller.clock
+    for trx_id in ids.values():
+        poller.track(trx_id, created_at=clock.now)
+    scheduler = poller.timeouts.scheduler
+
+    clock.now += poller.first_check + 0.2
+    assert await scheduler.fire_due() == len(ids)
+
+    # timer batch sudah jatuh tempo, tapi tidak ada yang hilang dari wheel
+    for trx_id in ids.values():
+        assert scheduler.pending(STATUS_CHECK, trx_id)
+        assert scheduler.pending(EXPIRE, trx_id)
+    rows = (await session.execute(select(Transaction))).scalars().all()
+    for row in rows:
+        await session.refresh(row)
+    assert {row.status for row in rows} == {TransactionStatus.PENDING}
+
+
+@pytest.mark.asyncio
+async def test_module_error_does_not_block_other_modules(
+    poller, pending_rows, monkeypatch
+):
+    original = StatusPoller._fetch_batch
+
+    async def broken(self, moduleid, *args):
+        if moduleid == "ISIM01":
+            raise ValueError("bad batch response")
+        return await original(self, moduleid, *args)
+
+    monkeypatch.setattr(StatusPoller, "_fetch_batch", broken)
+    _, ids, _ = pending_rows
+    clock = poller.clock
+    for trx_id in ids.values():
+        poller.track(trx_id, created_at=clock.now)
+
+    assert await poller.poll(list(ids.values())) == 2  # P1 + P3 (DIGIPOS)
+    scheduler = poller.timeouts.scheduler
+    for refid in ("I1", "I2", "P2"):
+        assert scheduler.pending(STATUS_CHECK, ids[refid])
+    assert not scheduler.pending(EXPIRE, ids["P1"])
+    assert poller.metrics.counter_value("poller_errors", module="ISIM01") == 1
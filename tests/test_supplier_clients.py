@@ -0,0 +1,150 @@
+"""Test SupplierClientRegistry (pooled client per module)."""
+
+import asyncio
+
+import httpx
+import pytest
+from app.custom.exceptions.cst_exceptions import (
+    SupplierError,
+    SupplierNotConfiguredError,
+)
+from app.schemas.sch_module import ModuleInDB, ProviderEnums
+from app.schemas.sch_transaction import OutboxClaim
+from app.service.metrics import MetricsRegistry
+from app.service.supplier import SupplierClientRegistry
+
+
+def make_module(moduleid="DIGI01", base_url="http://digipos.local:10003", **kw):
+    data = {
+        "moduleid": moduleid,
+        "name": "Digipos Test",
+        "provider": ProviderEnums.DIGIPOS,
+        "username": "user",
+        "msisdn": "628111111111",
+        "email": "digi@example.com",
+        "base_url": base_url,
+        "pin": "123456",
+        "password": "secret123",
+    }
+    data.update(kw)
+    return ModuleInDB(**data)
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/down":
+        return httpx.Response(503, text="maintenance")
+    return httpx.Response(200, text=f"{request.url.host}:{request.url.path}")
+
+
+@pytest.fixture
+async def registry():
+    reg = SupplierClientRegistry(
+        transport=httpx.MockTransport(handler), registry=MetricsRegistry()
+    )
+    yield reg
+    await reg.aclose()
+
+
+@pytest.mark.asyncio
+async def test_warm_reuses_one_client_per_module(registry):
+    modules = [make_module(), make_module("DIGI02", is_active=False)]
+    assert await registry.warm(modules) == 1
+    client = registry.get("DIGI01")
+    # register ulang dengan base_url sama tidak membuat client baru
+    assert registry.register(make_module()) is client
+    assert "DIGI02" not in registry
+    # base_url berubah → client diganti
+    replaced = registry.register(make_module(base_url="http://other.local"))
+    assert replaced is not client
+
+
+@pytest.mark.asyncio
+async def test_request_and_outbox_sender(registry):
+    await registry.warm([make_module()])
+    resp = await registry.request("DIGI01", "GET", "/trx")
+    assert resp.text == "digipos.local:/trx"
+    claim = OutboxClaim(id=1, moduleid="DIGI01", supplier_request={"path": "/trx"})
+    result = await registry.send_outbox_claim(claim)
+    assert result["status_code"] == 200
+    assert result["parsed"]["status"] is None  # body tanpa keyword status
+    down = OutboxClaim(id=2, moduleid="DIGI01", supplier_request={"path": "/down"})
+    with pytest.raises(SupplierError):
+        await registry.send_outbox_claim(down)
+    assert registry.metrics.latency("supplier_request_seconds", module="DIGI01")
+
+
+@pytest.mark.asyncio
+async def test_non_http_error_releases_guard_slot(registry):
+    await registry.warm([make_module()])
+    guard = registry.guards.guard("DIGI01")
+    with pytest.raises(TypeError):
+        await registry.request("DIGI01", "GET", "/trx", bogus=True)
+    assert guard.limiter.in_flight == 0
+    assert registry.metrics.counter_value("supplier_request_errors", module="DIGI01")
+
+
+@pytest.mark.asyncio
+async def test_unknown_module_raises(registry):
+    with pytest.raises(SupplierNotConfiguredError):
+        await registry.request("NOPE1", "GET", "/")
+
+
+@pytest.mark.asyncio
+async def test_replaced_client_closes_after_in_flight_request():
+    started = asyncio.Event()
+    finish = asyncio.Event()
+
+    async def slow(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/slow":
+            started.set()
+            await finish.wait()
+        return httpx.Response(200, text="ok")
+
+    reg = SupplierClientRegistry(
+        transport=httpx.MockTransport(slow),
+        registry=MetricsRegistry(),
+        drain_timeout=5,
+    )
+    await reg.warm([make_module()])
+    old = reg.get("DIGI01")
+    pending = asyncio.create_task(reg.request("DIGI01", "GET", "/slow"))
+    await started.wait()
+
+    reg.register(make_module(base_url="http://other.local"))
+    await asyncio.sleep(0.01)
+    # request yang sedang jalan menahan client lama tetap terbuka
+    assert not old.is_closed
+    finish.set()
+    assert (await pending).text == "ok"
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert old.is_closed
+    await reg.aclose()
+
+
+@pytest.mark.asyncio
+async def test_drain_timeout_and_shutdown_close_retired_clients():
+    hang = asyncio.Event()
+
+    async def stuck(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        await hang.wait()
+        return httpx.Response(200)
+
+    reg = SupplierClientRegistry(
+        transport=httpx.MockTransport(stuck),
+        registry=MetricsRegistry(),
+        drain_timeout=60,
+    )
+    await reg.warm([make_module()])
+    old = reg.get("DIGI01")
+    pending = asyncio.create_task(reg.request("DIGI01", "GET", "/"))
+    await asyncio.sleep(0.01)
+    reg.unregister("DIGI01")
+    await asyncio.sleep(0.01)
+    assert not old.is_closed
+    # shutdown tidak menunggu drain_timeout
+    await asyncio.wait_for(reg.aclose(), 1)
+    assert old.is_closed
+    pending.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await pending
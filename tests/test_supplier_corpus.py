@@ -0,0 +1,37 @@
+"""Replay corpus response supplier (offline) terhadap golden file."""
+
+from pathlib import Path
+
+import pytest
+from app.parser import SupplierRuleEngine
+from app.parser.prs_corpus_replay import load_corpus, load_golden, replay_corpus
+
+CORPUS = Path(__file__).parent / "fixtures" / "supplier_corpus"
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = SupplierRuleEngine()
+    engine.load()
+    return engine
+
+
+def test_corpus_matches_golden(engine):
+    records = load_corpus(CORPUS)
+    golden = load_golden(CORPUS / "golden.json")
+    assert {r.provider for r in records} == {"DIGIPOS", "ISIMPLE"}
+    assert set(golden) == {r.id for r in records}
+    report = replay_corpus(engine, records, golden=golden)
+    assert report.diffs == [], [d._asdict() for d in report.diffs]
+
+
+@pytest.mark.performance
+def test_corpus_replay_report(engine):
+    records = load_corpus(CORPUS)
+    report = replay_corpus(engine, records, rounds=20)
+    summary = report.summary()
+    assert summary["responses"] == len(records) * 20
+    assert summary["responses_per_second"] > 0
+    for provider in ("DIGIPOS", "ISIMPLE"):
+        stats = summary["providers"][provider]
+        assert stats["p50_us"] <= stats["p99_us"]
@@ -0,0 +1,120 @@
+"""Test hedged request ke supplier (SupplierHedger)."""
+
+import asyncio
+
+import httpx
+import pytest
+from app.schemas.sch_module import ModuleInDB, ProviderEnums
+from app.service.metrics import MetricsRegistry
+from app.service.supplier import (
+    HedgeBudget,
+    ModuleGuardRegistry,
+    SupplierClientRegistry,
+    SupplierHedger,
+)
+
+DELAYS = {"slow.local": 0.5, "fast.local": 0.0}
+
+
+def make_module(moduleid, host):
+    return ModuleInDB(
+        moduleid=moduleid,
+        name=f"Module {moduleid}",
+        provider=ProviderEnums.DIGIPOS,
+        username="user",
+        msisdn="628111111111",
+        email="digi@example.com",
+        base_url=f"http://{host}",
+        pin="123456",
+        password="secret123",
+    )
+
+
+async def handler(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(DELAYS.get(request.url.host, 0.0))
+    if request.url.host == "down.local":
+        return httpx.Response(503, text="maintenance")
+    return httpx.Response(200, text=request.url.host)
+
+
+@pytest.fixture
+async def setup():
+    reg = MetricsRegistry()
+    guards = ModuleGuardRegistry()
+    clients = SupplierClientRegistry(
+        transport=httpx.MockTransport(handler), registry=reg, guards=guards
+    )
+    for moduleid, host in (
+        ("SLOW1", "slow.local"),
+        ("FAST1", "fast.local"),
+        ("DOWN1", "down.local"),
+    ):
+        clients.register(make_module(moduleid, host))
+    hedger = SupplierHedger(
+        clients=clients, registry=reg, budget=HedgeBudget(ratio=1.0, burst=2.0)
+    )
+    hedger.default_delay = 0.05
+    yield hedger, guards, reg
+    await clients.aclose()
+
+
+def build(moduleid):
+    return {"method": "GET", "path": "/inquiry", "params": {"module": moduleid}}
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_loser_cancelled(setup):
+    hedger, guards, reg = setup
+    result = await hedger.request("CEKSALDO", ["SLOW1", "FAST1"], build)
+    assert result.moduleid == "FAST1"
+    assert result.hedged is True
+    assert result.response.text == "fast.local"
+    assert reg.counter_value("hedge_fired", module="FAST1") == 1
+    assert reg.counter_value("hedge_won", module="FAST1") == 1
+    # loser di-cancel: slot dilepas, tidak dihitung gagal
+    assert reg.counter_value("supplier_cancelled", module="SLOW1") == 1
+    slow = guards.guard("SLOW1")
+    assert slow.limiter.in_flight == 0
+    assert slow.success_counts() == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_product_is_never_hedged(setup):
+    hedger, _, reg = setup
+    result = await hedger.request("TSEL10", ["SLOW1", "FAST1"], build)
+    assert (result.moduleid, result.hedged) == ("SLOW1", False)
+    assert reg.counter_value("hedge_fired", module="FAST1") == 0
+
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_waits_for_primary(setup):
+    hedger, _, reg = setup
+    hedger.budget = HedgeBudget(ratio=0.1, burst=1.0)
+    result = await hedger.request("CEKSALDO", ["SLOW1", "FAST1"], build)
+    assert (result.moduleid, result.hedged) == ("SLOW1", False)
+    assert reg.counter_value("hedge_budget_exhausted", module="FAST1") == 1
+    assert reg.counter_value("hedge_fired", module="FAST1") == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_primary_falls_back_to_backup(setup):
+    hedger, _, _ = setup
+    result = await hedger.request("INQPLN", ["DOWN1", "FAST1"], build)
+    assert (result.moduleid, result.hedged) == ("FAST1", True)
+
+
+def test_hedge_delay_uses_p95_after_min_samples(setup):
+    hedger, _, reg = setup
+    assert hedger.hedge_delay("FAST1") == 0.05
+    for i in range(hedger.min_samples):
+        reg.observe("supplier_request_seconds", 0.1 + i / 100, module="SLOW1")
+    assert hedger.hedge_delay("SLOW1") == pytest.approx(0.28)
+
+
+def test_budget_is_capped_by_burst():
+    budget = HedgeBudget(ratio=0.5, burst=1.0)
+    for _ in range(10):
+        budget.deposit("A")
+    assert budget.tokens("A") == 1.0
+    assert budget.try_spend("A") is True
+    assert budget.try_spend("A") is False
@@ -0,0 +1,122 @@
+"""Test rule engine parser response supplier (YAML → pattern gabungan)."""
+
+import pytest
+from app.custom.exceptions.cst_exceptions import SupplierRuleError
+from app.parser import SupplierRuleEngine
+from app.schemas.sch_transaction import TransactionStatus
+
+RULES = {
+    "providers": {
+        "digipos": {
+            "json": {
+                "status": ["status", "data.status"],
+                "sn": "data.items.0.sn",
+                "price": "data.price",
+            },
+            "regex": [
+                {"name": "sn", "pattern": r"\bSN\s*[:=]\s*(?P<sn>[0-9A-Z]{4,})"},
+                {"name": "price", "pattern": r"Harga\s*(?P<price>\d[\d.,]*)"},
+                {"name": "never", "pattern": r"ZZZ(?P<message>\d+)"},
+            ],
+            "keywords": {
+                "failed": ["GAGAL", "saldo tidak cukup"],
+                "success": ["SUKSES"],
+            },
+            "status_map": {"00": "success", "14": "failed"},
+        }
+    }
+}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = SupplierRuleEngine(tmp_path / "unused.yaml")
+    engine.load(RULES)
+    return engine
+
+
+def test_parse_text_single_pass(engine):
+    result = engine.parse("DIGIPOS", "Trx TSEL10 SUKSES. SN: 0412ABCD. Harga 10.500,00")
+    assert result.status is TransactionStatus.SUCCESS
+    assert (result.sn, result.price) == ("0412ABCD", 10500)
+    assert set(result.rules) == {"keyword:success", "regex:sn", "regex:price"}
+
+
+def test_failed_keyword_outranks_success(engine):
+    result = engine.parse("DIGIPOS", b"SUKSES dibatalkan: Saldo Tidak Cukup")
+    assert result.status is TransactionStatus.FAILED
+
+
+def test_keyword_inside_extractor_match_still_counts(engine):
+    engine.load(
+        {
+            "providers": {
+                "isimple": {
+                    "regex": [
+                        {"name": "message", "pattern": r"\bKet\s*:\s*(?P<message>.+)"}
+                    ],
+                    "keywords": {"failed": ["GAGAL"]},
+                }
+            }
+        }
+    )
+    result = engine.parse(
+        "ISIMPLE", "Trx I10.0856 Ket: Transaksi GAGAL nomor tidak aktif"
+    )
+    assert result.status is TransactionStatus.FAILED
+    assert result.message == "Transaksi GAGAL nomor tidak aktif"
+    assert set(result.rules) == {"regex:message", "keyword:failed"}
+
+
+def test_parse_json_paths_and_status_map(engine):
+    body = '{"status": "14", "data": {"items": [{"sn": "X1"}], "price": 5000}}'
+    result = engine.parse("DIGIPOS", body)
+    assert result.status is TransactionStatus.FAILED
+    assert (result.sn, result.price) == ("X1", 5000)
+    assert result.as_dict()["rules"][0] == "json:status:status"
+
+
+def test_unclassified_response(engine):
+    result = engine.parse("digipos", "maintenance")
+    assert result.status is None
+    assert result.rules == ()
+
+
+def test_hit_counters_and_dead_rules(engine):
+    engine.parse("DIGIPOS", "SUKSES SN: 1234")
+    engine.parse("DIGIPOS", "GAGAL")
+    hits = {row["rule"]: row["hits"] for row in engine.stats()}
+    assert hits["keyword:success"] == 1
+    assert hits["keyword:failed"] == 1
+    assert hits["regex:sn"] == 1
+    dead = {row["rule"] for row in engine.dead_rules()}
+    assert "regex:never" in dead
+    assert "regex:sn" not in dead
+    cost = engine.get("DIGIPOS").profile(["SUKSES SN: 1234"] * 10)
+    assert set(cost) == {
+        "regex:sn",
+        "regex:price",
+        "regex:never",
+        "keyword:failed",
+        "keyword:success",
+    }
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {"regex": [{"name": "bad", "pattern": "(?P<sn>["}]},
+        {"regex": [{"name": "field", "pattern": "(?P<balance>\\d+)"}]},
+        {"keywords": {"refunded_later": ["X"]}},
+    ],
+)
+def test_invalid_rules_raise(engine, spec):
+    with pytest.raises(SupplierRuleError):
+        engine.load({"providers": {"ISIMPLE": spec}})
+
+
+def test_default_rules_file_compiles():
+    engine = SupplierRuleEngine()
+    assert engine.load() == 2
+    assert "ISIMPLE" in engine
+    assert engine.parse("ISIMPLE", "I10 ke 0856 GAGAL").status == "failed"
@@ -0,0 +1,159 @@
+"""Test hierarchical timer wheel, TimeoutScheduler dan final timeout transaksi."""
+
+import pytest
+from app.database.repositories.repo_transaction import SQLiteTransactionRepository
+from app.models.db_transaction import InboxMessage, Transaction
+from app.schemas.sch_transaction import InboxStatus, TransactionStatus
+from app.service.metrics import MetricsRegistry
+from app.service.scheduler import (
+    EXPIRE,
+    STATUS_CHECK,
+    PendingTimeouts,
+    TimeoutScheduler,
+    TimerWheel,
+)
+from sqlalchemy import delete, select
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_wheel(clock, slots=8, levels=3):
+    return TimerWheel(tick=0.1, slots=slots, levels=levels, clock=clock)
+
+
+def test_timers_fire_in_order_never_early(clock):
+    wheel = make_wheel(clock)
+    delays = [0.05, 0.3, 0.75, 2.0, 5.5, 30.0, 100.0]  # termasuk > range wheel
+    for i, delay in enumerate(delays):
+        wheel.schedule_in(i, delay)
+    fired: list[tuple[int, float]] = []
+    while len(wheel):
+        clock.now += 0.1
+        fired.extend((h.key, clock.now) for h in wheel.advance())
+    assert [key for key, _ in fired] == list(range(len(delays)))
+    for key, at in fired:
+        deadline = 1000.0 + delays[key]
+        assert deadline - 1e-9 <= at <= deadline + 0.2
+
+
+def test_cancel_and_reschedule_are_keyed(clock):
+    wheel = make_wheel(clock)
+    wheel.schedule_in("a", 1.0)
+    wheel.schedule_in("b", 1.0)
+    assert wheel.cancel("a") is True
+    assert wheel.cancel("a") is False
+    wheel.schedule_in("b", 3.0)  # ganti timer lama
+    assert len(wheel) == 1
+    clock.now += 2.0
+    assert wheel.advance() == []
+    clock.now += 1.1
+    assert [h.key for h in wheel.advance()] == ["b"]
+    assert len(wheel) == 0
+
+
+def test_advance_after_long_pause(clock):
+    wheel = make_wheel(clock)
+    for i in range(100):
+        wheel.schedule_in(i, i * 0.37)
+    clock.now += 60.0
+    assert sorted(h.key for h in wheel.advance()) == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_scheduler_batches_keys_per_kind(clock):
+    scheduler = TimeoutScheduler(make_wheel(clock), registry=MetricsRegistry())
+    seen: dict[str, list] = {}
+
+    async def handler(keys):
+        seen.setdefault("check", []).append(sorted(keys))
+
+    scheduler.on("check", handler)
+    for i in range(5):
+        scheduler.schedule("check", i, 0.2)
+    scheduler.schedule("other", 1, 0.2)
+    assert scheduler.cancel("check", 4) is True
+    clock.now += 0.3
+    assert await scheduler.fire_due() == 5
+    assert seen == {"check": [[0, 1, 2, 3]]}
+    assert scheduler.metrics.counter_value("timers_fired", kind="check") == 4
+
+
+@pytest.fixture
+async def pending_trx(test_db_session):
+    session = test_db_session
+    await session.execute(delete(Transaction))
+    await session.execute(delete(InboxMessage))
+    inbox = InboxMessage(request_id="tw-1", memberid="OTOTEST1", payload={})
+    session.add(inbox)
+    await session.flush()
+    pending = Transaction(inbox_id=inbox.id, memberid="OTOTEST1", refid="TW1")
+    done = Transaction(
+        memberid="OTOTEST1", refid="TW2", status=TransactionStatus.SUCCESS
+    )
+    session.add_all([pending, done])
+    await session.commit()
+    yield session, pending.id, done.id, inbox.id
+    await session.execute(delete(Transaction))
+    await session.execute(delete(InboxMessage))
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_final_timeout_fails_pending_rows(pending_trx, test_db_session, clock):
+    session, pending_id, done_id, inbox_id = pending_trx
+
+    class _Factory:
+        async def __aenter__(self):
+            return test_db_session
+
+        async def __aexit__(self, *exc):
+            return False
+
+    scheduler = TimeoutScheduler(make_wheel(clock), registry=MetricsRegistry())
+    timeouts = PendingTimeouts(
+        _Factory,
+        scheduler=scheduler,
+        registry=scheduler.metrics,
+        pending_timeout=5.0,
+        clock=clock,
+    )
+    checked: list = []
+
+    async def on_check(keys):
+        checked.extend(keys)
+
+    timeouts.on_status_check(on_check)
+    assert await timeouts.rearm() == 1
+    assert scheduler.pending(STATUS_CHECK, pending_id)
+    timeouts.track(done_id, check_in=1.0)
+    timeouts.resolve(done_id)
+    assert not timeouts.is_tracked(done_id)
+
+    clock.now += 6.0
+    await scheduler.fire_due()
+    assert checked == [pending_id]
+    assert not scheduler.pending(EXPIRE, pending_id)
+    statuses = dict(
+        (await session.execute(select(Transaction.id, Transaction.status))).all()
+    )
+    assert statuses == {
+        pending_id: TransactionStatus.FAILED,
+        done_id: TransactionStatus.SUCCESS,
+    }
+    inbox = await session.get(InboxMessage, inbox_id)
+    await session.refresh(inbox)
+    assert inbox.status == InboxStatus.FAILED
+    assert scheduler.metrics.counter_value("trx_expired") == 1
+    # expire kedua kali tidak menyentuh row yang sudah final
+    assert await SQLiteTransactionRepository(session).expire_pending([pending_id]) == []
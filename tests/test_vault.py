@@ -0,0 +1,184 @@
+"""Test vault kredensial: seal / reveal, cache per token, integrasi repo."""
+
+import pickle
+
+import pytest
+from app.custom.exceptions.cst_exceptions import VaultError
+from app.database.repositories.repo_member import SQLiteMemberRepository
+from app.database.repositories.repo_module import SQLiteModuleRepository
+from app.models.db_member import Member
+from app.models.db_module import Module
+from app.parser import OtomaxRequest
+from app.service.metrics import MetricsRegistry
+from app.service.security import (
+    SEALED_PREFIX,
+    CredentialVault,
+    OtomaxSignatureService,
+    vault,
+)
+from app.service.transaction.srv_intake import verify_request
+from sqlalchemy import delete, select
+
+# cost scrypt minimum: test tidak perlu KDF yang mahal
+COST = 2**4
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def local_vault(registry):
+    v = CredentialVault(registry=registry)
+    v.unlock("master-key", "salt", COST)
+    return v
+
+
+@pytest.fixture
+def unlocked():
+    vault.unlock("master-key", "salt", COST)
+    yield vault
+    vault.lock()
+
+
+@pytest.fixture
+async def clean(test_db_session):
+    await test_db_session.execute(delete(Member).where(Member.memberid.like("VLT%")))
+    await test_db_session.execute(delete(Module).where(Module.moduleid.like("VLT%")))
+    await test_db_session.commit()
+    yield
+    # seal_plaintext ikut men-seal row test lain; test lain jalan tanpa vault
+    sealed = f"{SEALED_PREFIX}%"
+    await test_db_session.execute(delete(Member).where(Member.pin.like(sealed)))
+    await test_db_session.execute(delete(Module).where(Module.pin.like(sealed)))
+    await test_db_session.commit()
+
+
+def member_row(memberid="VLT1", pin="777999", password="secret123"):
+    return {
+        "memberid": memberid,
+        "name": "vault",
+        "ipaddress": "127.0.0.1",
+        "report_url": "http://127.0.0.1/report",
+        "pin": pin,
+        "password": password,
+        "allow_nosign": False,
+        "is_active": True,
+    }
+
+
+def test_seal_and_reveal_roundtrip(local_vault):
+    sealed = local_vault.seal("777999")
+    assert sealed.startswith(SEALED_PREFIX)
+    assert "777999" not in sealed
+    # token Fernet acak per enkripsi; seal ulang nilai sealed = apa adanya
+    assert local_vault.seal("777999") != sealed
+    assert local_vault.seal(sealed) == sealed
+    assert local_vault.reveal("member:X", "pin", sealed) == "777999"
+    # row lama plaintext tetap terbaca
+    assert local_vault.reveal("member:X", "pin", "plain") == "plain"
+
+
+def test_reveal_caches_per_stored_token(local_vault, registry):
+    sealed = local_vault.seal("777999")
+    for _ in range(3):
+        assert local_vault.reveal("member:X", "pin", sealed) == "777999"
+    assert registry.counter_value("vault_decrypt") == 1
+
+    # row berubah (token lain): cache tidak dipakai
+    resealed = local_vault.seal("111222")
+    assert local_vault.reveal("member:X", "pin", resealed) == "111222"
+    assert registry.counter_value("vault_decrypt") == 2
+
+    local_vault.invalidate(["member:X"])
+    local_vault.reveal("member:X", "pin", resealed)
+    assert registry.counter_value("vault_decrypt") == 3
+
+
+def test_wrong_key_and_locked_vault_raise(local_vault):
+    sealed = local_vault.seal("777999")
+    other = CredentialVault(registry=MetricsRegistry())
+    with pytest.raises(VaultError):
+        other.reveal("member:X", "pin", sealed)
+    other.unlock("kunci-lain", "salt", COST)
+    with pytest.raises(VaultError):
+        other.reveal("member:X", "pin", sealed)
+    # tanpa master key seal tidak mengubah nilai
+    other.lock()
+    assert other.seal("777999") == "777999"
+
+
+def test_vault_does_not_leak_plaintext(local_vault):
+    local_vault.reveal("member:X", "pin", local_vault.seal("777999"))
+    assert "777999" not in repr(local_vault)
+    with pytest.raises(TypeError):
+        pickle.dumps(local_vault)
+    local_vault.lock()
+    assert not local_vault.unlocked
+    assert repr(local_vault) == "<CredentialVault unlocked=False cached=0>"
+
+
+async def test_upsert_stores_sealed_and_sign_verifies(
+    unlocked,  # noqa: ARG001
+    clean,  # noqa: ARG001
+    test_db_session,
+):
+    repo = SQLiteMemberRepository(test_db_session)
+    await repo.upsert_many([member_row()])
+    stored = await test_db_session.scalar(
+        select(Member.pin).where(Member.memberid == "VLT1")
+    )
+    assert stored.startswith(SEALED_PREFIX)
+
+    member = await repo.get_by_id("vlt1")
+    assert (member.pin, member.password) == ("777999", "secret123")
+    sign = OtomaxSignatureService.generate_transaction_signature(
+        "VLT1", "TSEL10", "081234567890", "R1", "777999", "secret123"
+    )
+    verify_request(member, OtomaxRequest("VLT1", "TSEL10", "081234567890", "R1", sign))
+
+    # update lewat upsert: cache di-invalidate, kredensial baru langsung berlaku
+    await repo.upsert_many([member_row(pin="123123")])
+    assert (await repo.get_by_id("VLT1")).pin == "123123"
+
+
+async def test_seal_plaintext_migrates_existing_rows(
+    unlocked,  # noqa: ARG001
+    clean,  # noqa: ARG001
+    test_db_session,
+):
+    test_db_session.add(Member(**member_row("VLT2")))
+    test_db_session.add(
+        Module(
+            moduleid="VLTM1",
+            name="vault",
+            provider="DIGIPOS",
+            username="user",
+            msisdn="0812",
+            pin="654321",
+            password="modsecret",
+            email="ops@example.com",
+            base_url="http://10.0.0.1:8000",
+        )
+    )
+    await test_db_session.commit()
+
+    members = SQLiteMemberRepository(test_db_session)
+    modules = SQLiteModuleRepository(test_db_session)
+    assert await members.seal_plaintext() >= 1
+    assert await modules.seal_plaintext() >= 1
+    assert await members.seal_plaintext() == 0
+
+    rows = await test_db_session.execute(
+        select(Member.pin, Member.password).where(Member.memberid == "VLT2")
+    )
+    assert all(v.startswith(SEALED_PREFIX) for v in rows.one())
+    assert (await members.get_by_id("VLT2")).password == "secret123"
+    module = await modules.get_by_id("VLTM1")
+    assert module.pin.get_secret_value() == "654321"
+
+
+async def test_seal_plaintext_requires_unlocked_vault(test_db_session):
+    with pytest.raises(VaultError):
+        await SQLiteMemberRepository(test_db_session).seal_plaintext()